@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Recall Benchmark Suite
+
+Measures latency (p50/p95/p99) and throughput of the memory hot paths
+against synthetic corpora built by synthetic_corpus.py:
+
+- read:        recall, recall_about, memory_deep_context, memory_multi_recall
+- write:       remember_fact, memory_batch (_handle_batch)
+- maintenance: run_full_consolidation, export_all
+
+MCP tools are called through call_tool, so dispatcher lanes and response
+serialization are included. Ollama is replaced by the deterministic
+FakeEmbeddingService, LLM consolidation and pre-consolidation backups are
+off, and HOME points at the work directory so nothing touches ~/.claudia.
+
+Every size runs on a fresh copy of its cached corpus. Reads run before
+writes, and maintenance runs last. Results are written as JSON keyed by
+corpus size and operation. --compare prints per-operation deltas against an
+earlier results file, so runs from two commits can be diffed.
+
+Run: python benchmarks/bench_recall.py [--sizes 1000,10000] [--iterations 200]
+         [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_SIZES = "1000,10000"
+READ_OPS = ("recall", "recall_about", "memory_deep_context", "memory_multi_recall")
+WRITE_OPS = ("remember_fact", "memory_batch")
+MAINTENANCE_OPS = ("run_full_consolidation", "export_all")
+TOPIC_WORDS = (
+    "pitch deck", "intro", "hiring", "pricing", "board", "investor update",
+    "contract", "roadmap", "beta feedback", "partnership", "follow up", "deadline",
+)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies_ms: List[float], wall_seconds: float, errors: int = 0) -> Dict[str, float]:
+    ordered = sorted(latencies_ms)
+    return {
+        "n": len(ordered),
+        "errors": errors,
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(_percentile(ordered, 50), 3),
+        "p95_ms": round(_percentile(ordered, 95), 3),
+        "p99_ms": round(_percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        "qps": round(len(ordered) / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+    }
+
+
+def measure(fn: Callable[[int], object], iterations: int, warmup: int = 0, concurrency: int = 1) -> Dict[str, float]:
+    """Call fn(i) iterations times and summarize per-call latency and QPS."""
+    for i in range(warmup):
+        fn(-1 - i)
+
+    errors = 0
+
+    def timed(i: int) -> Optional[float]:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            fn(i)
+        except Exception as e:
+            errors += 1
+            logging.getLogger(__name__).debug(f"benchmark call {i} failed: {e}")
+            return None
+        return (time.perf_counter() - start) * 1000.0
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(timed, range(iterations)))
+    else:
+        samples = [timed(i) for i in range(iterations)]
+    wall = time.perf_counter() - started
+    return summarize([s for s in samples if s is not None], wall, errors)
+
+
+# ---------------------------------------------------------------------------
+# Environment
+# ---------------------------------------------------------------------------
+
+def isolate_home(workdir: Path) -> None:
+    """Point HOME at workdir so config, registry, vault and caches stay local."""
+    home = workdir / "home"
+    home.mkdir(parents=True, exist_ok=True)
+    os.environ["HOME"] = str(home)
+    os.environ["USERPROFILE"] = str(home)
+
+
+def configure() -> None:
+    from claudia_memory.config import get_config
+
+    config = get_config()
+    config.language_model = ""
+    config.enable_llm_consolidation = False
+    config.enable_pre_consolidation_backup = False
+
+
+def open_corpus(path: Path):
+    """Make path the global database and drop every cached service."""
+    from claudia_memory import database as db_mod
+    from claudia_memory.mcp.dispatch import reset_dispatcher
+    from claudia_memory.services import consolidate as con_mod
+    from claudia_memory.services import recall as rec_mod
+    from claudia_memory.services import remember as rem_mod
+
+    if db_mod._db is not None:
+        db_mod.reset_db()
+    reset_dispatcher()
+    db = db_mod.Database(path)
+    db.initialize()
+    db_mod._db = db
+    rec_mod._service = None
+    rem_mod._service = None
+    con_mod._service = None
+    return db
+
+
+def git_revision() -> Dict[str, object]:
+    root = Path(__file__).resolve().parent.parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+            capture_output=True, text=True, timeout=30,
+        ).stdout.strip())
+    except Exception:
+        return {"commit": None, "dirty": None}
+    return {"commit": commit or None, "dirty": dirty}
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+class Workload:
+    """Deterministic query and write inputs drawn from a corpus."""
+
+    def __init__(self, db, seed: int):
+        rng = random.Random(seed)
+        entities = db.execute(
+            "SELECT name, type FROM entities WHERE deleted_at IS NULL ORDER BY id", fetch=True,
+        ) or []
+        # Hubs are what people ask about most
+        hubs = db.execute(
+            """
+            SELECT e.name FROM entities e
+            JOIN memory_entities me ON me.entity_id = e.id
+            GROUP BY e.id ORDER BY COUNT(*) DESC, e.id LIMIT 50
+            """,
+            fetch=True,
+        ) or []
+        samples = db.execute(
+            "SELECT content FROM memories ORDER BY id LIMIT 2000", fetch=True,
+        ) or []
+
+        self.people = [r["name"] for r in entities if r["type"] == "person"] or ["Sarah Chen"]
+        names = [r["name"] for r in hubs] or self.people
+        self.entity_queries = [names[i % len(names)] if i % 3 else rng.choice(self.people) for i in range(256)]
+
+        self.queries = []
+        for i in range(256):
+            roll = i % 4
+            if roll == 0:
+                self.queries.append(rng.choice(names))
+            elif roll == 1:
+                self.queries.append(f"{rng.choice(names)} {rng.choice(TOPIC_WORDS)}")
+            elif roll == 2:
+                self.queries.append(rng.choice(TOPIC_WORDS))
+            else:
+                words = rng.choice(samples)["content"].split() if samples else TOPIC_WORDS
+                start = rng.randrange(max(1, len(words) - 4))
+                self.queries.append(" ".join(words[start:start + 4]))
+
+        self.facts = [
+            f"{rng.choice(self.people)} mentioned {rng.choice(TOPIC_WORDS)} during bench run {seed}-{i}."
+            for i in range(4096)
+        ]
+        self.fact_entities = [[rng.choice(self.people)] for _ in range(4096)]
+
+    def query(self, i: int) -> str:
+        return self.queries[i % len(self.queries)]
+
+    def entity(self, i: int) -> str:
+        return self.entity_queries[i % len(self.entity_queries)]
+
+    def fact(self, i: int) -> str:
+        return self.facts[i % len(self.facts)] + ("" if i >= 0 else " (warmup)")
+
+    def batch(self, i: int, size: int = 5) -> List[dict]:
+        ops = []
+        for k in range(size):
+            j = (i * size + k) % len(self.facts)
+            ops.append({
+                "op": "remember",
+                "content": f"Batch {i}/{k}: {self.facts[j]}",
+                "about": self.fact_entities[j],
+            })
+        return ops
+
+
+def build_operations(workload: Workload, loop: asyncio.AbstractEventLoop, vault_dir: Path) -> Dict[str, Callable[[int], object]]:
+    from claudia_memory.mcp.server import call_tool
+    from claudia_memory.services.consolidate import get_consolidate_service
+    from claudia_memory.services.recall import get_recall_service
+    from claudia_memory.services.remember import get_remember_service
+    from claudia_memory.services.vault_sync import VaultSyncService
+
+    def tool(name: str, arguments: dict) -> object:
+        result = asyncio.run_coroutine_threadsafe(call_tool(name, arguments), loop).result()
+        if getattr(result, "isError", False):
+            raise RuntimeError(result.content[0].text if result.content else name)
+        return result
+
+    return {
+        "recall": lambda i: get_recall_service().recall(workload.query(i), limit=10),
+        "recall_about": lambda i: get_recall_service().recall_about(workload.entity(i)),
+        "memory_deep_context": lambda i: tool("memory_deep_context", {"target": workload.entity(i)}),
+        "memory_multi_recall": lambda i: tool("memory_multi_recall", {
+            "queries": [workload.query(i), workload.query(i + 7), workload.query(i + 13)],
+            "limit": 10,
+        }),
+        "remember_fact": lambda i: get_remember_service().remember_fact(
+            workload.fact(i), about_entities=workload.fact_entities[i % len(workload.fact_entities)],
+        ),
+        "memory_batch": lambda i: tool("memory_batch", {"operations": workload.batch(i)}),
+        "run_full_consolidation": lambda i: get_consolidate_service().run_full_consolidation(),
+        "export_all": lambda i: VaultSyncService(vault_dir / f"run-{i}").export_all(),
+    }
+
+
+def run_size(size: int, args, workdir: Path) -> Dict[str, object]:
+    from synthetic_corpus import cached_corpus, copy_corpus
+
+    corpus_path, corpus_stats = cached_corpus(workdir / "corpora", size, seed=args.seed, rebuild=args.rebuild)
+    scratch = copy_corpus(corpus_path, workdir / "scratch" / f"bench-{size}.db")
+    db = open_corpus(scratch)
+
+    loop = asyncio.new_event_loop()
+    runner = ThreadPoolExecutor(max_workers=1)
+    runner.submit(loop.run_forever)
+    try:
+        workload = Workload(db, args.seed)
+        operations = build_operations(workload, loop, workdir / "vault")
+        selected = [op for op in READ_OPS + WRITE_OPS + MAINTENANCE_OPS if op in args.ops]
+
+        results = {}
+        for op in selected:
+            if op in MAINTENANCE_OPS:
+                iterations, warmup, concurrency = args.maintenance_runs, 0, 1
+            elif op in WRITE_OPS:
+                iterations = max(1, args.iterations // (5 if op == "memory_batch" else 1))
+                warmup, concurrency = args.warmup, 1
+            else:
+                iterations, warmup, concurrency = args.iterations, args.warmup, args.concurrency
+            print(f"  [{size}] {op} x{iterations}", file=sys.stderr)
+            results[op] = measure(operations[op], iterations, warmup=warmup, concurrency=concurrency)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.shutdown(wait=True)
+        loop.close()
+        from claudia_memory.database import reset_db
+        from claudia_memory.mcp.dispatch import reset_dispatcher
+        reset_dispatcher()
+        reset_db()
+
+    return {"corpus": corpus_stats, "operations": results}
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def compare(baseline: dict, current: dict) -> List[str]:
+    """Per-operation p50/p95 and QPS changes, as printable lines."""
+    lines = [
+        f"baseline {baseline.get('meta', {}).get('git', {}).get('commit')} -> "
+        f"current {current.get('meta', {}).get('git', {}).get('commit')}",
+        f"{'size':>8}  {'operation':<24}{'p50 ms':>18}{'p95 ms':>18}{'qps':>18}",
+    ]
+
+    def delta(old: float, new: float) -> str:
+        if not old:
+            return f"{new:>10.2f}       "
+        return f"{new:>10.2f} {100.0 * (new - old) / old:+6.1f}%"
+
+    for size, entry in current.get("results", {}).items():
+        base_ops = baseline.get("results", {}).get(size, {}).get("operations", {})
+        for op, stats in entry.get("operations", {}).items():
+            old = base_ops.get(op)
+            if old is None:
+                continue
+            lines.append(
+                f"{size:>8}  {op:<24}{delta(old['p50_ms'], stats['p50_ms'])}"
+                f"{delta(old['p95_ms'], stats['p95_ms'])}{delta(old['qps'], stats['qps'])}"
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall, write and maintenance paths on synthetic corpora")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated memory counts (e.g. 1000,10000,100000,1000000)")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per read/write operation")
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded calls before each read/write operation")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent callers for read operations")
+    parser.add_argument("--maintenance-runs", type=int, default=1, help="Runs of consolidation and export")
+    parser.add_argument("--ops", default=",".join(READ_OPS + WRITE_OPS + MAINTENANCE_OPS), help="Comma-separated operations to run")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus and workload seed")
+    parser.add_argument("--workdir", type=Path, default=Path(tempfile.gettempdir()) / "claudia-bench", help="Corpus cache and scratch directory")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild cached corpora")
+    parser.add_argument("--output", type=Path, help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to diff against")
+    args = parser.parse_args()
+    args.ops = {op.strip() for op in args.ops.split(",") if op.strip()}
+
+    logging.basicConfig(level=logging.ERROR)
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    isolate_home(args.workdir)
+    configure()
+
+    from synthetic_corpus import install_fake_embeddings
+    install_fake_embeddings()
+
+    report = {
+        "meta": {
+            "git": git_revision(),
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+        },
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        report["results"][str(size)] = run_size(size, args, args.workdir)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print("\n".join(compare(baseline, report)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Vector Codec Benchmark
+
+Compares the legacy JSON text encoding of embeddings (json.dumps of a
+List[float]) against packed float32 blobs (claudia_memory.vector_codec) for:
+
+- encode: turning one embedding into a vec0 parameter
+- insert: INSERT into a vec0 table
+- query:  KNN MATCH query against that table
+- memory: bytes held per cached embedding
+
+Insert and query phases need sqlite-vec and a Python build with
+load_extension; they are skipped (and reported as such) otherwise.
+
+Run: python benchmarks/bench_vector_codec.py [--rows 5000] [--queries 200] [--dims 384]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from array import array
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from claudia_memory.database import load_sqlite_vec
+from claudia_memory.vector_codec import encode
+
+
+def _random_vectors(count: int, dims: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dims)] for _ in range(count)]
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds > 0 else float("inf")
+
+
+def bench_encode(vectors: list, repeat: int = 3) -> dict:
+    arrays = [array("f", v) for v in vectors]
+    best_json = best_blob = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for v in vectors:
+            json.dumps(v)
+        best_json = min(best_json, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for a in arrays:
+            encode(a)
+        best_blob = min(best_blob, time.perf_counter() - start)
+    return {
+        "json_per_sec": _rate(len(vectors), best_json),
+        "blob_per_sec": _rate(len(vectors), best_blob),
+        "speedup": round(best_json / best_blob, 1) if best_blob else None,
+    }
+
+
+def bench_memory(vectors: list) -> dict:
+    sample = vectors[0]
+    as_list = sys.getsizeof(sample) + sum(sys.getsizeof(x) for x in sample)
+    as_array = sys.getsizeof(array("f", sample))
+    return {
+        "list_bytes": as_list,
+        "array_bytes": as_array,
+        "ratio": round(as_list / as_array, 1),
+    }
+
+
+def _vec0_connection(dims: int):
+    conn = sqlite3.connect(":memory:")
+    if not load_sqlite_vec(conn):
+        conn.close()
+        return None
+    conn.execute(f"CREATE VIRTUAL TABLE json_emb USING vec0(id INTEGER PRIMARY KEY, embedding FLOAT[{dims}])")
+    conn.execute(f"CREATE VIRTUAL TABLE blob_emb USING vec0(id INTEGER PRIMARY KEY, embedding FLOAT[{dims}])")
+    return conn
+
+
+def bench_vec0(vectors: list, queries: list, dims: int) -> dict:
+    conn = _vec0_connection(dims)
+    if conn is None:
+        return {"skipped": "sqlite-vec not loadable in this Python build"}
+
+    arrays = [array("f", v) for v in vectors]
+    query_arrays = [array("f", q) for q in queries]
+
+    start = time.perf_counter()
+    for i, v in enumerate(vectors):
+        conn.execute("INSERT INTO json_emb (id, embedding) VALUES (?, ?)", (i, json.dumps(v)))
+    conn.commit()
+    json_insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, a in enumerate(arrays):
+        conn.execute("INSERT INTO blob_emb (id, embedding) VALUES (?, ?)", (i, encode(a)))
+    conn.commit()
+    blob_insert = time.perf_counter() - start
+
+    knn = "SELECT id, distance FROM {table} WHERE embedding MATCH ? AND k = 10"
+
+    start = time.perf_counter()
+    for q in queries:
+        conn.execute(knn.format(table="json_emb"), (json.dumps(q),)).fetchall()
+    json_query = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for q in query_arrays:
+        conn.execute(knn.format(table="blob_emb"), (encode(q),)).fetchall()
+    blob_query = time.perf_counter() - start
+
+    # Both encodings must produce identical neighbours
+    probe = queries[0]
+    same = (
+        [r[0] for r in conn.execute(knn.format(table="json_emb"), (json.dumps(probe),))]
+        == [r[0] for r in conn.execute(knn.format(table="blob_emb"), (encode(array("f", probe)),))]
+    )
+    conn.close()
+
+    return {
+        "insert": {
+            "json_per_sec": _rate(len(vectors), json_insert),
+            "blob_per_sec": _rate(len(vectors), blob_insert),
+            "speedup": round(json_insert / blob_insert, 2),
+        },
+        "query": {
+            "json_qps": _rate(len(queries), json_query),
+            "blob_qps": _rate(len(queries), blob_query),
+            "speedup": round(json_query / blob_query, 2),
+        },
+        "same_neighbours": same,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs packed float32 embedding encoding")
+    parser.add_argument("--rows", type=int, default=5000, help="Vectors to encode/insert")
+    parser.add_argument("--queries", type=int, default=200, help="KNN queries to run")
+    parser.add_argument("--dims", type=int, default=384, help="Embedding dimensions")
+    args = parser.parse_args()
+
+    vectors = _random_vectors(args.rows, args.dims)
+    queries = _random_vectors(args.queries, args.dims, seed=11)
+
+    report = {
+        "rows": args.rows,
+        "queries": args.queries,
+        "dims": args.dims,
+        "encode": bench_encode(vectors),
+        "memory_per_embedding": bench_memory(vectors),
+        "vec0": bench_vec0(vectors, queries, args.dims),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
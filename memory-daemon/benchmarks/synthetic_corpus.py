@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Synthetic Corpus Generator
+
+Builds benchmark databases of a given memory count (1k, 10k, 100k, 1M) that
+look like a real Claudia install:
+
+- The seed_demo.py network (people, organizations, projects, relationships,
+  memories, patterns, episodes) is loaded first and used as the template
+  for everything generated after it.
+- Extra entities are named from the seed's name pools, about one per ten
+  memories, and keep the seed's person/organization/project mix.
+- Relationships use preferential attachment, so a few hubs end up with
+  hundreds of edges while most entities have a handful.
+- Memories re-use the seed's sentences with their entity names swapped
+  for generated ones. Each links to 1-3 entities, with hubs mentioned most.
+- Embeddings come from FakeEmbeddingService, a deterministic feature-hashing
+  stand-in for Ollama. Texts sharing words get similar vectors.
+
+Embedding dimensions follow config.embedding_dimensions. Built corpora are
+cached by (memories, seed, dimensions), so repeated benchmark runs reuse
+them.
+
+Run: python benchmarks/synthetic_corpus.py --memories 10000 [--out corpus.db] [--seed 42]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import shutil
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from claudia_memory.config import get_config
+from claudia_memory.database import Database
+from claudia_memory.embeddings import EmbeddingService
+from claudia_memory.extraction.entity_extractor import get_extractor
+from claudia_memory.services.remember import content_hash
+from claudia_memory.vector_codec import encode
+
+import seed_demo
+
+# Bump when the generator changes shape so stale cached corpora are rebuilt
+CORPUS_VERSION = 2
+
+MEMORIES_PER_ENTITY = 10
+CHUNK = 5000
+TYPE_MIX = (("person", 0.70), ("organization", 0.15), ("project", 0.10), ("concept", 0.05))
+ORG_SUFFIXES = ("Labs", "Capital", "Group", "Systems", "Partners", "Ventures", "Studio")
+PROJECT_SUFFIXES = ("Initiative", "Rollout", "Launch", "Review", "Pilot", "Migration")
+CONCEPT_WORDS = ("Pricing", "Hiring", "Retention", "Security", "Onboarding", "Fundraising", "Churn")
+CONTEXT_CLAUSES = (
+    "Came up on the weekly sync.",
+    "Mentioned over email.",
+    "From the follow-up call.",
+    "Noted after the board prep.",
+    "Raised during the offsite.",
+    "Heard it at the dinner.",
+    "",
+)
+
+
+# ---------------------------------------------------------------------------
+# Fake embeddings
+# ---------------------------------------------------------------------------
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def fake_embedding(text: str, dimensions: int) -> array:
+    """Deterministic unit vector from hashed word unigrams and bigrams."""
+    vec = array("f", bytes(4 * dimensions))
+    tokens = _TOKEN.findall(text.lower())
+    features = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dimensions
+        vec[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    for i in range(dimensions):
+        vec[i] /= norm
+    return vec
+
+
+class FakeEmbeddingService(EmbeddingService):
+    """EmbeddingService that never talks to Ollama.
+
+    Only the transport is replaced: caching, batching and the public API are
+    the real implementation, so benchmarks exercise the same code paths.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._disk_cache = None
+        self._available = True
+        self._batch_endpoint = True
+        self.requests = 0
+
+    async def is_available(self) -> bool:
+        return True
+
+    def is_available_sync(self) -> bool:
+        return True
+
+    def _post_batch_sync(self, texts: List[str]) -> List[Optional[array]]:
+        self.requests += 1
+        return [fake_embedding(t, self.dimensions) for t in texts]
+
+    async def _post_batch(self, texts: List[str]) -> List[Optional[array]]:
+        return self._post_batch_sync(texts)
+
+
+def install_fake_embeddings() -> FakeEmbeddingService:
+    """Make get_embedding_service() (and embed/embed_sync) return the fake."""
+    from claudia_memory import embeddings
+
+    service = FakeEmbeddingService()
+    embeddings._embedding_service = service
+    return service
+
+
+# ---------------------------------------------------------------------------
+# Corpus generation
+# ---------------------------------------------------------------------------
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat()
+
+
+def _has_table(db: Database, name: str) -> bool:
+    rows = db.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,), fetch=True)
+    return bool(rows)
+
+
+class CorpusBuilder:
+    """Grows a seed_demo database to a target memory count."""
+
+    def __init__(self, db: Database, memories: int, seed: int):
+        self.db = db
+        self.target = memories
+        self.rng = random.Random(seed)
+        self.dimensions = get_config().embedding_dimensions
+        self.now = datetime.utcnow()
+        self.vec0 = _has_table(db, "memory_embeddings")
+        # Entity id repeated once per edge endpoint (plus once on creation):
+        # sampling from it is preferential attachment.
+        self._attachment: List[int] = []
+        self._names: Dict[int, str] = {}
+        self._by_type: Dict[str, List[int]] = {}
+
+    # -- seed -------------------------------------------------------------
+
+    def load_seed(self) -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_demo.seed_database(self.db)
+
+        # seed_demo writes slug-style canonical names ("sarah_chen"); use the
+        # extractor's form so lookups by name find the seeded hubs.
+        extractor = get_extractor()
+        rows = self.db.execute("SELECT id, name, type FROM entities", fetch=True) or []
+        with self.db.transaction():
+            self.db.execute_many(
+                "UPDATE OR IGNORE entities SET canonical_name = ? WHERE id = ?",
+                [(extractor.canonical_name(row["name"]), row["id"]) for row in rows],
+            )
+        for row in rows:
+            self._register(row["id"], row["name"], row["type"])
+        for row in self.db.execute(
+            "SELECT source_entity_id, target_entity_id FROM relationships", fetch=True,
+        ) or []:
+            self._attachment += [row["source_entity_id"], row["target_entity_id"]]
+
+        self.rel_types = sorted({
+            r["relationship_type"]
+            for r in self.db.execute("SELECT DISTINCT relationship_type FROM relationships", fetch=True) or []
+        }) or ["knows"]
+
+        people = self._by_type.get("person", [])
+        self.first_names = sorted({self._names[e].split()[0] for e in people})
+        self.last_names = sorted({self._names[e].split()[-1] for e in people if " " in self._names[e]})
+        self.org_words = sorted({
+            w for e in self._by_type.get("organization", []) for w in self._names[e].split()
+            if w[:1].isupper() and w not in ORG_SUFFIXES
+        })
+        self.project_words = sorted({
+            w for e in self._by_type.get("project", []) for w in self._names[e].split() if w[:1].isupper()
+        })
+        self.templates = self._memory_templates()
+
+    def _register(self, entity_id: int, name: str, entity_type: str) -> None:
+        self._names[entity_id] = name
+        self._by_type.setdefault(entity_type, []).append(entity_id)
+        self._attachment.append(entity_id)
+
+    def _memory_templates(self) -> List[tuple]:
+        """Seed memory sentences with their linked entity names as slots."""
+        rows = self.db.execute(
+            """
+            SELECT m.id, m.content, m.type, e.name, e.type AS etype
+            FROM memories m
+            JOIN memory_entities me ON me.memory_id = m.id
+            JOIN entities e ON e.id = me.entity_id
+            ORDER BY m.id
+            """,
+            fetch=True,
+        ) or []
+        by_memory: Dict[int, list] = {}
+        for row in rows:
+            by_memory.setdefault(row["id"], [row["content"], row["type"], []])[2].append(
+                (row["name"], row["etype"])
+            )
+
+        templates = []
+        for content, mtype, linked in by_memory.values():
+            text = content.replace("{", "{{").replace("}", "}}")
+            slots = []
+            for name, etype in linked:
+                # Full name first, so "Sarah Chen" wins over "Sarah"
+                variants = [name] + ([name.split()[0]] if etype == "person" and " " in name else [])
+                pattern = re.compile(r"\b(?:%s)\b" % "|".join(re.escape(v) for v in variants))
+                text, hits = pattern.subn("{%d}" % len(slots), text)
+                if hits:
+                    slots.append(etype)
+            if slots:
+                templates.append((text, mtype, slots))
+        return templates
+
+    # -- entities ---------------------------------------------------------
+
+    def _new_name(self, entity_type: str, attempt: int) -> str:
+        rng = self.rng
+        if entity_type == "person":
+            first, last = rng.choice(self.first_names), rng.choice(self.last_names)
+            # Middle initials (and extra words below) widen the name space
+            # once plain names run out
+            return f"{first} {last}" if attempt < 3 else f"{first} {chr(65 + rng.randrange(26))}. {last}"
+        if entity_type == "organization":
+            words = rng.sample(self.org_words, 1 if attempt < 2 else 2)
+            return f"{' '.join(words)} {rng.choice(ORG_SUFFIXES)}"
+        if entity_type == "project":
+            words = rng.sample(self.project_words, 1 if attempt < 2 else 2)
+            return f"{' '.join(words)} {rng.choice(PROJECT_SUFFIXES)}"
+        return f"{rng.choice(CONCEPT_WORDS)} {rng.choice(('Strategy', 'Model', 'Playbook', 'Principle'))}"
+
+    def _unique_name(self, entity_type: str, seen: set, serial: int) -> str:
+        for attempt in range(6):
+            name = self._new_name(entity_type, attempt)
+            if (name.lower(), entity_type) not in seen:
+                return name
+        return f"{name} {serial}"
+
+    def _pick_type(self) -> str:
+        roll = self.rng.random()
+        for entity_type, share in TYPE_MIX:
+            if roll < share:
+                return entity_type
+            roll -= share
+        return TYPE_MIX[0][0]
+
+    def add_entities(self) -> int:
+        wanted = max(0, self.target // MEMORIES_PER_ENTITY - len(self._names))
+        extractor = get_extractor()
+        seen = {(n.lower(), t) for t, ids in self._by_type.items() for n in (self._names[i] for i in ids)}
+        created = 0
+        while created < wanted:
+            batch = []
+            while len(batch) < min(CHUNK, wanted - created):
+                entity_type = self._pick_type()
+                name = self._unique_name(entity_type, seen, created + len(batch))
+                seen.add((name.lower(), entity_type))
+                age = self.rng.randint(0, 720)
+                batch.append((
+                    name, entity_type, extractor.canonical_name(name), round(self.rng.uniform(0.2, 1.0), 3),
+                    _iso(self.now - timedelta(days=age)), _iso(self.now - timedelta(days=age // 2)),
+                ))
+            with self.db.transaction():
+                for row in batch:
+                    entity_id = self.db.insert("entities", dict(zip(
+                        ("name", "type", "canonical_name", "importance", "created_at", "updated_at"), row,
+                    )))
+                    self._register(entity_id, row[0], row[1])
+                    self._link(entity_id)
+            created += len(batch)
+        return created
+
+    def _link(self, entity_id: int) -> None:
+        """Give a new entity its edges (Pareto fan-out, preferential targets)."""
+        degree = min(200, int(self.rng.paretovariate(1.6)))
+        for _ in range(degree):
+            target = self.rng.choice(self._attachment)
+            if target == entity_id:
+                continue
+            age = self.rng.randint(0, 365)
+            self.db.execute(
+                """
+                INSERT OR IGNORE INTO relationships
+                    (source_entity_id, target_entity_id, relationship_type, strength, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    entity_id, target, self.rng.choice(self.rel_types),
+                    round(self.rng.uniform(0.2, 1.0), 2),
+                    _iso(self.now - timedelta(days=age)), _iso(self.now - timedelta(days=age)),
+                ),
+            )
+            self._attachment += [entity_id, target]
+
+    # -- memories ---------------------------------------------------------
+
+    def add_memories(self) -> int:
+        existing = self.db.execute("SELECT COUNT(*) AS n FROM memories", fetch=True)[0]["n"]
+        wanted = max(0, self.target - existing)
+        pools = {t: (ids, set(ids)) for t, ids in self._by_type.items()}
+        seen_hashes = {
+            r["content_hash"] for r in self.db.execute("SELECT content_hash FROM memories", fetch=True) or []
+        }
+        created = 0
+        while created < wanted:
+            n = min(CHUNK, wanted - created)
+            rows = []
+            for i in range(n):
+                template, mtype, slots = self.rng.choice(self.templates)
+                ids = []
+                for slot in slots:
+                    pool, members = pools.get(slot) or pools["person"]
+                    pick = self.rng.choice(self._attachment)
+                    ids.append(pick if pick in members else self.rng.choice(pool))
+                text = template.format(*(self._names[e] for e in ids))
+                if text[-1:].isalnum():
+                    text += "."
+                content = f"{text} {self.rng.choice(CONTEXT_CLAUSES)}".strip()
+                digest = content_hash(content)
+                if digest in seen_hashes:
+                    content = f"{content} (#{existing + created + i})"
+                    digest = content_hash(content)
+                seen_hashes.add(digest)
+                age = int(self.rng.expovariate(1 / 120.0))
+                stamp = _iso(self.now - timedelta(days=min(age, 1500), minutes=self.rng.randint(0, 1440)))
+                rows.append((content, digest, mtype, ids, stamp))
+
+            embeddings = [fake_embedding(r[0], self.dimensions) for r in rows] if self.vec0 else None
+            with self.db.transaction():
+                for j, (content, digest, mtype, ids, stamp) in enumerate(rows):
+                    memory_id = self.db.insert("memories", {
+                        "content": content,
+                        "content_hash": digest,
+                        "type": mtype,
+                        "importance": round(min(1.0, 0.1 + self.rng.betavariate(2, 2)), 3),
+                        "created_at": stamp,
+                        "updated_at": stamp,
+                        "access_count": int(self.rng.expovariate(0.5)),
+                    })
+                    self.db.execute_many(
+                        "INSERT OR IGNORE INTO memory_entities (memory_id, entity_id) VALUES (?, ?)",
+                        [(memory_id, e) for e in ids],
+                    )
+                    if embeddings is not None:
+                        self.db.execute(
+                            "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
+                            (memory_id, encode(embeddings[j])),
+                        )
+            created += n
+        return created
+
+    def add_entity_embeddings(self) -> None:
+        if not _has_table(self.db, "entity_embeddings"):
+            return
+        ids = list(self._names)
+        for start in range(0, len(ids), CHUNK):
+            chunk = ids[start:start + CHUNK]
+            with self.db.transaction():
+                self.db.execute_many(
+                    "INSERT OR REPLACE INTO entity_embeddings (entity_id, embedding) VALUES (?, ?)",
+                    [(e, encode(fake_embedding(f"{self._names[e]}. ", self.dimensions))) for e in chunk],
+                )
+
+
+def corpus_stats(db: Database) -> Dict[str, int]:
+    def count(sql: str) -> int:
+        return db.execute(sql, fetch=True)[0][0]
+
+    degrees = db.execute(
+        """
+        SELECT MAX(d) AS max_degree, AVG(d) AS mean_degree FROM (
+            SELECT COUNT(*) AS d FROM (
+                SELECT source_entity_id AS e FROM relationships
+                UNION ALL SELECT target_entity_id FROM relationships
+            ) GROUP BY e
+        )
+        """,
+        fetch=True,
+    )[0]
+    return {
+        "memories": count("SELECT COUNT(*) FROM memories"),
+        "entities": count("SELECT COUNT(*) FROM entities"),
+        "relationships": count("SELECT COUNT(*) FROM relationships"),
+        "memory_entity_links": count("SELECT COUNT(*) FROM memory_entities"),
+        "max_degree": degrees["max_degree"] or 0,
+        "mean_degree": round(degrees["mean_degree"] or 0.0, 2),
+        "vec0": int(_has_table(db, "memory_embeddings")),
+    }
+
+
+def build_corpus(path: Path, memories: int, seed: int = 42) -> Dict[str, int]:
+    """Create a fresh corpus database at path and return its stats."""
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(path) + suffix).unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    db = Database(path)
+    try:
+        db.initialize()
+        builder = CorpusBuilder(db, memories, seed)
+        started = time.perf_counter()
+        builder.load_seed()
+        builder.add_entities()
+        builder.add_memories()
+        builder.add_entity_embeddings()
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        stats = corpus_stats(db)
+        stats["build_seconds"] = round(time.perf_counter() - started, 2)
+    finally:
+        db.close()
+    return stats
+
+
+def cached_corpus(cache_dir: Path, memories: int, seed: int = 42, rebuild: bool = False) -> tuple:
+    """Return (path, stats) for a corpus, building it only when not cached."""
+    dimensions = get_config().embedding_dimensions
+    path = cache_dir / f"corpus-v{CORPUS_VERSION}-{memories}-s{seed}-d{dimensions}.db"
+    meta = path.with_suffix(".json")
+    if not rebuild and path.exists() and meta.exists():
+        return path, json.loads(meta.read_text())
+    stats = build_corpus(path, memories, seed)
+    meta.write_text(json.dumps(stats, indent=2))
+    return path, stats
+
+
+def copy_corpus(source: Path, dest: Path) -> Path:
+    """Copy a cached corpus to a scratch path that benchmarks may mutate."""
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(dest) + suffix).unlink(missing_ok=True)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, dest)
+    return dest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Claudia benchmark database")
+    parser.add_argument("--memories", type=int, default=10000, help="Target memory count")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--out", type=Path, default=Path("corpus.db"), help="Output database path")
+    args = parser.parse_args()
+
+    stats = build_corpus(args.out, args.memories, args.seed)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
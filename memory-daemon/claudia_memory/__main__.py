@@ -22,6 +22,8 @@ from .daemon.health import start_health_server, stop_health_server
 from .daemon.scheduler import start_scheduler, stop_scheduler
 from .database import get_db, load_sqlite_vec
 from .mcp.server import run_server as run_mcp_server
+from .metrics import get_metrics
+from .vector_codec import encode as encode_vector
 
 logger = logging.getLogger(__name__)
 
@@ -493,15 +495,37 @@ def _check_and_repair_indexes(db_path: Path) -> None:
         logger.error(f"Index repair check failed (non-fatal): {e}")
 
 
+# Rows sent to embed_batch_sync per call by the backfill and migration paths.
+# The embedding service splits each chunk into /api/embed micro-batches.
+EMBED_CHUNK_SIZE = 256
+
+
+def _embed_in_chunks(svc, rows, text_of, chunk_size: int = EMBED_CHUNK_SIZE):
+    """Yield ``(chunk, pairs)`` where pairs are ``(row_id, packed_vector)`` for rows that embedded.
+
+    Each chunk of rows is embedded with one batched call instead of one
+    Ollama round-trip per row.
+    """
+    rows = list(rows)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        embeddings = svc.embed_batch_sync([text_of(row) for row in chunk])
+        pairs = [
+            (row["id"], encode_vector(embedding))
+            for row, embedding in zip(chunk, embeddings)
+            if embedding is not None
+        ]
+        yield chunk, pairs
+
+
 def _auto_backfill_embeddings(db_path: Path, mem_count: int, emb_count: int) -> None:
     """Start background thread to generate missing embeddings.
 
     Non-blocking: the MCP server starts immediately while this runs.
     Tolerant: if Ollama isn't running, logs a warning and exits.
-    Batched: processes 25 at a time with progress logging.
+    Batched: embeds EMBED_CHUNK_SIZE rows per batched call and commits each chunk.
     Idempotent: LEFT JOIN ensures only missing embeddings are generated.
     """
-    import json as _json
     import threading
 
     def _backfill_worker():
@@ -544,28 +568,24 @@ def _auto_backfill_embeddings(db_path: Path, mem_count: int, emb_count: int) ->
 
             success = 0
             failed = 0
-            batch_size = 25
+            done = 0
 
-            for i, row in enumerate(missing, 1):
+            for chunk, pairs in _embed_in_chunks(svc, missing, lambda row: row["content"]):
                 try:
-                    embedding = svc.embed_sync(row["content"])
-                    if embedding:
-                        conn.execute(
+                    if pairs:
+                        conn.executemany(
                             "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-                            (row["id"], _json.dumps(embedding)),
+                            pairs,
                         )
-                        success += 1
-                        if success % batch_size == 0:
-                            conn.commit()
-                    else:
-                        failed += 1
+                        conn.commit()
+                    success += len(pairs)
+                    failed += len(chunk) - len(pairs)
                 except Exception as e:
-                    failed += 1
-                    if failed <= 3:
-                        logger.debug(f"Embedding failed for memory {row['id']}: {e}")
+                    failed += len(chunk)
+                    logger.debug(f"Embedding backfill chunk failed: {e}")
 
-                if i % batch_size == 0 or i == total:
-                    logger.info(f"Embedding backfill progress: {i}/{total} (success={success}, failed={failed})")
+                done += len(chunk)
+                logger.info(f"Embedding backfill progress: {done}/{total} (success={success}, failed={failed})")
 
             conn.commit()
             conn.close()
@@ -1005,6 +1025,8 @@ def run_daemon(mcp_mode: bool = True, debug: bool = False, project_id: str = Non
             start_scheduler()
             logger.info("Background scheduler started")
 
+            get_metrics().start(db)
+
         if mcp_mode:
             # Run MCP server (blocks until stdin closes)
             logger.info("Starting MCP server (stdio mode)")
@@ -1025,7 +1047,15 @@ def run_daemon(mcp_mode: bool = True, debug: bool = False, project_id: str = Non
         # Cleanup
         logger.info("Shutting down...")
         stop_scheduler()
+        # Render notes still waiting out the write-through debounce; the
+        # scheduler's observation and session ingest jobs mark them dirty
+        try:
+            from .services.vault_writer import get_vault_writer
+            get_vault_writer(get_db()).stop()
+        except Exception as e:
+            logger.warning(f"Vault write-through flush at shutdown failed: {e}")
         stop_health_server()
+        get_metrics().stop()
         # Close embedding service HTTP clients to avoid resource leak
         try:
             from .embeddings import get_embedding_service
@@ -1085,6 +1115,13 @@ def main():
         action="store_true",
         help="Migrate embeddings to a new model/dimensions (drop and recreate vec0 tables, re-embed all data)",
     )
+    parser.add_argument(
+        "--verify-chain",
+        nargs="?",
+        const="",
+        metavar="FROM,TO",
+        help="Verify the memory hash chain (optionally only memory ids FROM..TO) and exit",
+    )
     parser.add_argument(
         "--backup",
         action="store_true",
@@ -1275,19 +1312,17 @@ def main():
 
         success = 0
         failed = 0
-        for i, row in enumerate(missing, 1):
-            embedding = svc.embed_sync(row["content"])
-            if embedding:
-                import json as _json
-                db.execute(
+        done = 0
+        for chunk, pairs in _embed_in_chunks(svc, missing, lambda row: row["content"]):
+            if pairs:
+                db.execute_many(
                     "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-                    (row["id"], _json.dumps(embedding)),
+                    pairs,
                 )
-                success += 1
-            else:
-                failed += 1
-            if i % 10 == 0 or i == len(missing):
-                print(f"  Progress: {i}/{len(missing)} (success={success}, failed={failed})")
+            success += len(pairs)
+            failed += len(chunk) - len(pairs)
+            done += len(chunk)
+            print(f"  Progress: {done}/{len(missing)} (success={success}, failed={failed})")
 
         # Update stored embedding model to match current config (clears mismatch warning)
         db.execute(
@@ -1524,111 +1559,63 @@ def main():
         print("\nStep 3/4: Re-embedding all data...")
         results = {}
 
+        def _reembed(label, table, pk, rows, text_of, total):
+            success = 0
+            done = 0
+            for chunk, pairs in _embed_in_chunks(svc, rows or [], text_of):
+                if pairs:
+                    db.execute_many(
+                        f"INSERT INTO {table} ({pk}, embedding) VALUES (?, ?)",
+                        pairs,
+                    )
+                success += len(pairs)
+                done += len(chunk)
+                print(f"  {label + ':':<13}{done}/{total}")
+            return success
+
         # 3a. Memory embeddings (largest, most important)
-        if mem_count > 0:
-            memories = db.execute(
+        results["memories"] = _reembed(
+            "Memories", "memory_embeddings", "memory_id",
+            db.execute(
                 "SELECT id, content FROM memories WHERE invalidated_at IS NULL",
                 fetch=True,
-            )
-            success = 0
-            for i, row in enumerate(memories or [], 1):
-                embedding = svc.embed_sync(row["content"])
-                if embedding:
-                    db.execute(
-                        "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-                        (row["id"], _json.dumps(embedding)),
-                    )
-                    success += 1
-                if i % 25 == 0 or i == mem_count:
-                    print(f"  Memories:    {i}/{mem_count}")
-            results["memories"] = success
-        else:
-            results["memories"] = 0
+            ) if mem_count > 0 else [],
+            lambda row: row["content"], mem_count,
+        )
 
         # 3b. Entity embeddings
-        if ent_count > 0:
-            entities = db.execute(
+        results["entities"] = _reembed(
+            "Entities", "entity_embeddings", "entity_id",
+            db.execute(
                 "SELECT id, name, description FROM entities WHERE deleted_at IS NULL",
                 fetch=True,
-            )
-            success = 0
-            for i, row in enumerate(entities or [], 1):
-                text = f"{row['name']}: {row['description'] or ''}"
-                embedding = svc.embed_sync(text)
-                if embedding:
-                    db.execute(
-                        "INSERT INTO entity_embeddings (entity_id, embedding) VALUES (?, ?)",
-                        (row["id"], _json.dumps(embedding)),
-                    )
-                    success += 1
-                if i % 25 == 0 or i == ent_count:
-                    print(f"  Entities:    {i}/{ent_count}")
-            results["entities"] = success
-        else:
-            results["entities"] = 0
+            ) if ent_count > 0 else [],
+            lambda row: f"{row['name']}: {row['description'] or ''}", ent_count,
+        )
 
         # 3c. Episode embeddings (from summaries)
-        if ep_count > 0:
-            episodes = db.execute(
+        results["episodes"] = _reembed(
+            "Episodes", "episode_embeddings", "episode_id",
+            db.execute(
                 "SELECT id, summary FROM episodes WHERE summary IS NOT NULL AND summary != ''",
                 fetch=True,
-            )
-            success = 0
-            for i, row in enumerate(episodes or [], 1):
-                embedding = svc.embed_sync(row["summary"])
-                if embedding:
-                    db.execute(
-                        "INSERT INTO episode_embeddings (episode_id, embedding) VALUES (?, ?)",
-                        (row["id"], _json.dumps(embedding)),
-                    )
-                    success += 1
-                if i % 25 == 0 or i == ep_count:
-                    print(f"  Episodes:    {i}/{ep_count}")
-            results["episodes"] = success
-        else:
-            results["episodes"] = 0
+            ) if ep_count > 0 else [],
+            lambda row: row["summary"], ep_count,
+        )
 
         # 3d. Message embeddings
-        if msg_count > 0:
-            messages = db.execute(
-                "SELECT id, content FROM messages",
-                fetch=True,
-            )
-            success = 0
-            for i, row in enumerate(messages or [], 1):
-                embedding = svc.embed_sync(row["content"])
-                if embedding:
-                    db.execute(
-                        "INSERT INTO message_embeddings (message_id, embedding) VALUES (?, ?)",
-                        (row["id"], _json.dumps(embedding)),
-                    )
-                    success += 1
-                if i % 25 == 0 or i == msg_count:
-                    print(f"  Messages:    {i}/{msg_count}")
-            results["messages"] = success
-        else:
-            results["messages"] = 0
+        results["messages"] = _reembed(
+            "Messages", "message_embeddings", "message_id",
+            db.execute("SELECT id, content FROM messages", fetch=True) if msg_count > 0 else [],
+            lambda row: row["content"], msg_count,
+        )
 
         # 3e. Reflection embeddings
-        if ref_count > 0:
-            reflections = db.execute(
-                "SELECT id, content FROM reflections",
-                fetch=True,
-            )
-            success = 0
-            for i, row in enumerate(reflections or [], 1):
-                embedding = svc.embed_sync(row["content"])
-                if embedding:
-                    db.execute(
-                        "INSERT INTO reflection_embeddings (reflection_id, embedding) VALUES (?, ?)",
-                        (row["id"], _json.dumps(embedding)),
-                    )
-                    success += 1
-                if i % 25 == 0 or i == ref_count:
-                    print(f"  Reflections: {i}/{ref_count}")
-            results["reflections"] = success
-        else:
-            results["reflections"] = 0
+        results["reflections"] = _reembed(
+            "Reflections", "reflection_embeddings", "reflection_id",
+            db.execute("SELECT id, content FROM reflections", fetch=True) if ref_count > 0 else [],
+            lambda row: row["content"], ref_count,
+        )
 
         # Step 4: Update _meta
         print("\nStep 4/4: Updating metadata...")
@@ -1641,8 +1628,8 @@ def main():
             (str(new_dim),),
         )
 
-        # Clear embedding cache (old-dimension entries)
-        svc._cache.clear()
+        # Clear embedding caches (old-model / old-dimension entries)
+        svc._invalidate_caches()
         svc._model_mismatch = False
 
         # Summary
@@ -1657,6 +1644,25 @@ def main():
         print(f"\n  To rollback: restore the backup file.")
         return
 
+    if args.verify_chain is not None:
+        # Streamed check of the SHA-256 memory chain (bounded memory)
+        import json as _json
+        from .services.chain import verify_chain
+
+        setup_logging(debug=args.debug)
+        bounds = [b.strip() for b in args.verify_chain.split(",")] if args.verify_chain else []
+        try:
+            from_id = int(bounds[0]) if bounds and bounds[0] else None
+            to_id = int(bounds[1]) if len(bounds) > 1 and bounds[1] else None
+        except ValueError:
+            print(f"--verify-chain expects FROM,TO memory ids, got {args.verify_chain!r}")
+            sys.exit(2)
+        db = get_db()
+        db.initialize()
+        result = verify_chain(db, from_id=from_id, to_id=to_id)
+        print(_json.dumps(result, indent=2))
+        sys.exit(0 if result["is_valid"] else 1)
+
     if args.backup:
         setup_logging(debug=args.debug)
         db = get_db()
@@ -25,6 +25,11 @@ class MemoryConfig:
     ollama_host: str = "http://localhost:11434"
     embedding_model: str = "all-minilm:l6-v2"
     embedding_dimensions: int = 384
+    embedding_batch_size: int = 32  # Max texts per /api/embed request
+    embedding_batch_max_chars: int = 16000  # Max total characters per /api/embed request
+    embedding_max_concurrency: int = 4  # Max in-flight embedding requests for batch calls
+    embedding_cache_path: Path = field(default_factory=lambda: Path.home() / ".claudia" / "cache" / "embeddings.db")
+    embedding_disk_cache_mb: int = 64  # Size cap for the persistent embedding cache (0 disables it)
 
     # Language model settings (for cognitive tools like ingest/classify)
     # Set to empty string "" to disable cognitive tools entirely
@@ -33,6 +38,8 @@ class MemoryConfig:
     # Decay and consolidation settings
     decay_rate_daily: float = 0.995  # Importance multiplier per day
     min_importance_threshold: float = 0.1  # Below this, excluded from default search
+    decay_rebase_days: int = 7  # Re-anchor stored importance once its decay reference is this old
+    decay_rebase_batch: int = 2000  # Rows re-anchored per UPDATE statement while rebasing
     consolidation_interval_hours: int = 6
     pattern_detection_interval_hours: int = 24
 
@@ -77,6 +84,17 @@ class MemoryConfig:
     # Health check
     health_port: int = 3848
 
+    # MCP dispatch settings
+    mcp_read_workers: int = 4  # Worker threads for read-only tool calls (writes use one writer lane)
+
+    # Recall access tracking (buffered access_count / last_accessed_at writes)
+    access_flush_interval_seconds: int = 30  # How often buffered access counts are written back
+    access_flush_max_pending: int = 500  # Flush early once this many memories have unflushed hits
+
+    # Write queue (single writer thread, group commit)
+    write_group_window_ms: int = 10  # Max wait after the first queued write before committing the group
+    write_group_max_ops: int = 256  # Commit early once a group holds this many writes
+
     # Backup settings
     backup_retention_count: int = 3  # Number of rolling backups to keep
     enable_pre_consolidation_backup: bool = True  # Auto-backup before consolidation
@@ -89,10 +107,29 @@ class MemoryConfig:
     turn_buffer_retention_days: int = 60
     metrics_retention_days: int = 90
 
+    # Latency metrics (timers and counters flushed to the metrics table)
+    metrics_enabled: bool = True
+    metrics_flush_interval_seconds: int = 60
+
+    # Recall result cache
+    recall_cache_size: int = 256  # Cached recall()/recall_about() results (0 disables the cache)
+    recall_cache_ttl_seconds: int = 300  # Upper bound on staleness from writes made by other processes
+
+    # Maintained aggregate counts (stat_counters)
+    stat_counters_reconcile_minutes: int = 60  # How often the daemon recounts them to correct drift
+
+    # Live event stream (health server /events)
+    event_stream_poll_ms: int = 250  # How often the daemon checks audit_log for other processes' writes while streaming
+
     # Vault sync settings (Obsidian integration)
     vault_base_dir: Path = field(default_factory=lambda: Path.home() / ".claudia" / "vault")
     vault_sync_enabled: bool = True
     vault_name: str = "claudia-vault"  # Obsidian vault name (for deep link URIs)
+    vault_write_quiet_ms: int = 500  # Re-render dirty entity notes after this long without new writes (0 = inline)
+    vault_write_max_delay_ms: int = 5000  # Re-render anyway once a note has been dirty this long
+    vault_export_workers: int = 4  # Threads rendering and writing entity notes during a vault export
+    vault_watch_enabled: bool = False  # Daemon imports vault edits as they happen (inotify on Linux, stat scan elsewhere)
+    vault_watch_interval_seconds: int = 15  # How often the daemon checks for vault edits when watching
 
     # Obsidian REST API (optional, for bidirectional communication)
     obsidian_rest_api_port: int = 27124
@@ -115,6 +152,8 @@ class MemoryConfig:
         "dietary", "phobia", "trigger",
     ])
     enable_chain_verification: bool = True  # SHA-256 chain hashing on memories
+    chain_seal_interval_seconds: int = 60  # How often the daemon extends the chain over new memories
+    chain_seal_batch: int = 1000  # Memories hashed per sealing transaction
     context_builder_token_budget: int = 8000  # Default token budget for CRE
     context_builder_max_facts: int = 30       # Max facts in CRE context window
 
@@ -162,12 +201,26 @@ class MemoryConfig:
                     config.embedding_model = data["embedding_model"]
                 if "embedding_dimensions" in data:
                     config.embedding_dimensions = data["embedding_dimensions"]
+                if "embedding_batch_size" in data:
+                    config.embedding_batch_size = data["embedding_batch_size"]
+                if "embedding_batch_max_chars" in data:
+                    config.embedding_batch_max_chars = data["embedding_batch_max_chars"]
+                if "embedding_max_concurrency" in data:
+                    config.embedding_max_concurrency = data["embedding_max_concurrency"]
+                if "embedding_cache_path" in data:
+                    config.embedding_cache_path = Path(data["embedding_cache_path"])
+                if "embedding_disk_cache_mb" in data:
+                    config.embedding_disk_cache_mb = data["embedding_disk_cache_mb"]
                 if "language_model" in data:
                     config.language_model = data["language_model"]
                 if "decay_rate_daily" in data:
                     config.decay_rate_daily = data["decay_rate_daily"]
                 if "min_importance_threshold" in data:
                     config.min_importance_threshold = data["min_importance_threshold"]
+                if "decay_rebase_days" in data:
+                    config.decay_rebase_days = data["decay_rebase_days"]
+                if "decay_rebase_batch" in data:
+                    config.decay_rebase_batch = data["decay_rebase_batch"]
                 if "consolidation_interval_hours" in data:
                     config.consolidation_interval_hours = data["consolidation_interval_hours"]
                 if "pattern_detection_interval_hours" in data:
@@ -184,6 +237,16 @@ class MemoryConfig:
                     config.fts_weight = data["fts_weight"]
                 if "health_port" in data:
                     config.health_port = data["health_port"]
+                if "mcp_read_workers" in data:
+                    config.mcp_read_workers = data["mcp_read_workers"]
+                if "access_flush_interval_seconds" in data:
+                    config.access_flush_interval_seconds = data["access_flush_interval_seconds"]
+                if "access_flush_max_pending" in data:
+                    config.access_flush_max_pending = data["access_flush_max_pending"]
+                if "write_group_window_ms" in data:
+                    config.write_group_window_ms = data["write_group_window_ms"]
+                if "write_group_max_ops" in data:
+                    config.write_group_max_ops = data["write_group_max_ops"]
                 if "backup_retention_count" in data:
                     config.backup_retention_count = data["backup_retention_count"]
                 if "enable_pre_consolidation_backup" in data:
@@ -202,12 +265,34 @@ class MemoryConfig:
                     config.metrics_retention_days = data["metrics_retention_days"]
                 if "log_path" in data:
                     config.log_path = Path(data["log_path"])
+                if "metrics_enabled" in data:
+                    config.metrics_enabled = data["metrics_enabled"]
+                if "metrics_flush_interval_seconds" in data:
+                    config.metrics_flush_interval_seconds = data["metrics_flush_interval_seconds"]
+                if "recall_cache_size" in data:
+                    config.recall_cache_size = data["recall_cache_size"]
+                if "recall_cache_ttl_seconds" in data:
+                    config.recall_cache_ttl_seconds = data["recall_cache_ttl_seconds"]
+                if "stat_counters_reconcile_minutes" in data:
+                    config.stat_counters_reconcile_minutes = data["stat_counters_reconcile_minutes"]
+                if "event_stream_poll_ms" in data:
+                    config.event_stream_poll_ms = data["event_stream_poll_ms"]
                 if "vault_base_dir" in data:
                     config.vault_base_dir = Path(data["vault_base_dir"])
                 if "vault_sync_enabled" in data:
                     config.vault_sync_enabled = data["vault_sync_enabled"]
                 if "vault_name" in data:
                     config.vault_name = data["vault_name"]
+                if "vault_write_quiet_ms" in data:
+                    config.vault_write_quiet_ms = data["vault_write_quiet_ms"]
+                if "vault_write_max_delay_ms" in data:
+                    config.vault_write_max_delay_ms = data["vault_write_max_delay_ms"]
+                if "vault_export_workers" in data:
+                    config.vault_export_workers = data["vault_export_workers"]
+                if "vault_watch_enabled" in data:
+                    config.vault_watch_enabled = data["vault_watch_enabled"]
+                if "vault_watch_interval_seconds" in data:
+                    config.vault_watch_interval_seconds = data["vault_watch_interval_seconds"]
                 if "obsidian_rest_api_port" in data:
                     config.obsidian_rest_api_port = data["obsidian_rest_api_port"]
                 if "obsidian_rest_api_enabled" in data:
@@ -238,6 +323,10 @@ class MemoryConfig:
                     config.sacred_core_keywords = data["sacred_core_keywords"]
                 if "enable_chain_verification" in data:
                     config.enable_chain_verification = data["enable_chain_verification"]
+                if "chain_seal_interval_seconds" in data:
+                    config.chain_seal_interval_seconds = data["chain_seal_interval_seconds"]
+                if "chain_seal_batch" in data:
+                    config.chain_seal_batch = data["chain_seal_batch"]
                 if "context_builder_token_budget" in data:
                     config.context_builder_token_budget = data["context_builder_token_budget"]
                 if "context_builder_max_facts" in data:
@@ -297,6 +386,30 @@ class MemoryConfig:
         weights = self.vector_weight + self.importance_weight + self.recency_weight + self.fts_weight
         if abs(weights - 1.0) > 0.01:
             logger.warning(f"Ranking weights sum to {weights:.3f}, not 1.0. Results may be skewed.")
+        if self.mcp_read_workers < 1:
+            logger.warning(f"mcp_read_workers={self.mcp_read_workers} below minimum, using 1")
+            self.mcp_read_workers = 1
+        for attr in (
+            "access_flush_interval_seconds", "access_flush_max_pending",
+            "decay_rebase_days", "decay_rebase_batch", "write_group_max_ops",
+            "chain_seal_interval_seconds", "chain_seal_batch", "vault_write_max_delay_ms",
+            "vault_export_workers", "vault_watch_interval_seconds",
+            "recall_cache_ttl_seconds", "metrics_flush_interval_seconds",
+            "stat_counters_reconcile_minutes", "event_stream_poll_ms",
+        ):
+            val = getattr(self, attr)
+            if val < 1:
+                logger.warning(f"{attr}={val} below minimum, using 1")
+                setattr(self, attr, 1)
+        if self.write_group_window_ms < 0:
+            logger.warning(f"write_group_window_ms={self.write_group_window_ms} below minimum, using 0")
+            self.write_group_window_ms = 0
+        if self.recall_cache_size < 0:
+            logger.warning(f"recall_cache_size={self.recall_cache_size} below minimum, using 0")
+            self.recall_cache_size = 0
+        if self.vault_write_quiet_ms < 0:
+            logger.warning(f"vault_write_quiet_ms={self.vault_write_quiet_ms} below minimum, using 0")
+            self.vault_write_quiet_ms = 0
         if self.backup_retention_count < 1:
             logger.warning(f"backup_retention_count={self.backup_retention_count} below minimum, using 1")
             self.backup_retention_count = 1
@@ -317,6 +430,14 @@ class MemoryConfig:
                 f"embedding_dimensions={self.embedding_dimensions} is not a common value "
                 f"({sorted(common_dims)}). Verify this matches your embedding model's output."
             )
+        if self.embedding_disk_cache_mb < 0:
+            logger.warning(f"embedding_disk_cache_mb={self.embedding_disk_cache_mb} below 0, disabling disk cache")
+            self.embedding_disk_cache_mb = 0
+        for attr in ("embedding_batch_size", "embedding_batch_max_chars", "embedding_max_concurrency"):
+            val = getattr(self, attr)
+            if val < 1:
+                logger.warning(f"{attr}={val} below minimum, using 1")
+                setattr(self, attr, 1)
         if not (0.0 <= self.auto_dedupe_threshold <= 1.0):
             logger.warning(f"auto_dedupe_threshold={self.auto_dedupe_threshold} out of range [0,1], using default 0.90")
             self.auto_dedupe_threshold = 0.90
@@ -355,9 +476,16 @@ class MemoryConfig:
             "ollama_host": self.ollama_host,
             "embedding_model": self.embedding_model,
             "embedding_dimensions": self.embedding_dimensions,
+            "embedding_batch_size": self.embedding_batch_size,
+            "embedding_batch_max_chars": self.embedding_batch_max_chars,
+            "embedding_max_concurrency": self.embedding_max_concurrency,
+            "embedding_cache_path": str(self.embedding_cache_path),
+            "embedding_disk_cache_mb": self.embedding_disk_cache_mb,
             "language_model": self.language_model,
             "decay_rate_daily": self.decay_rate_daily,
             "min_importance_threshold": self.min_importance_threshold,
+            "decay_rebase_days": self.decay_rebase_days,
+            "decay_rebase_batch": self.decay_rebase_batch,
             "consolidation_interval_hours": self.consolidation_interval_hours,
             "pattern_detection_interval_hours": self.pattern_detection_interval_hours,
             "max_recall_results": self.max_recall_results,
@@ -366,6 +494,11 @@ class MemoryConfig:
             "recency_weight": self.recency_weight,
             "fts_weight": self.fts_weight,
             "health_port": self.health_port,
+            "mcp_read_workers": self.mcp_read_workers,
+            "access_flush_interval_seconds": self.access_flush_interval_seconds,
+            "access_flush_max_pending": self.access_flush_max_pending,
+            "write_group_window_ms": self.write_group_window_ms,
+            "write_group_max_ops": self.write_group_max_ops,
             "backup_retention_count": self.backup_retention_count,
             "enable_pre_consolidation_backup": self.enable_pre_consolidation_backup,
             "audit_log_retention_days": self.audit_log_retention_days,
@@ -373,9 +506,20 @@ class MemoryConfig:
             "turn_buffer_retention_days": self.turn_buffer_retention_days,
             "metrics_retention_days": self.metrics_retention_days,
             "log_path": str(self.log_path),
+            "metrics_enabled": self.metrics_enabled,
+            "metrics_flush_interval_seconds": self.metrics_flush_interval_seconds,
+            "recall_cache_size": self.recall_cache_size,
+            "recall_cache_ttl_seconds": self.recall_cache_ttl_seconds,
+            "stat_counters_reconcile_minutes": self.stat_counters_reconcile_minutes,
+            "event_stream_poll_ms": self.event_stream_poll_ms,
             "vault_base_dir": str(self.vault_base_dir),
             "vault_sync_enabled": self.vault_sync_enabled,
             "vault_name": self.vault_name,
+            "vault_write_quiet_ms": self.vault_write_quiet_ms,
+            "vault_write_max_delay_ms": self.vault_write_max_delay_ms,
+            "vault_export_workers": self.vault_export_workers,
+            "vault_watch_enabled": self.vault_watch_enabled,
+            "vault_watch_interval_seconds": self.vault_watch_interval_seconds,
             "obsidian_rest_api_port": self.obsidian_rest_api_port,
             "obsidian_rest_api_enabled": self.obsidian_rest_api_enabled,
             "vault_layout": self.vault_layout,
@@ -391,6 +535,8 @@ class MemoryConfig:
             "archive_threshold_days": self.archive_threshold_days,
             "enable_auto_sacred": self.enable_auto_sacred,
             "enable_chain_verification": self.enable_chain_verification,
+            "chain_seal_interval_seconds": self.chain_seal_interval_seconds,
+            "chain_seal_batch": self.chain_seal_batch,
             "context_builder_token_budget": self.context_builder_token_budget,
             "context_builder_max_facts": self.context_builder_max_facts,
         }
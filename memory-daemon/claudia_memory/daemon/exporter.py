@@ -0,0 +1,242 @@
+"""
+OpenMetrics exposition for the health server's /metrics route.
+
+Renders this process's metrics registry (MCP tool calls, recall and
+remember stages, Ollama calls, scheduler jobs) plus a handful of gauges
+read at scrape time, so a local Prometheus can scrape many daemons
+cheaply:
+
+- Timers become histograms in seconds. Bucket bounds are fixed
+  (EXPORT_BUCKETS_MS) so series line up across daemons; the registry's
+  finer log-linear buckets are folded into them. A histogram's _count is
+  the request counter, so claudia_mcp_tool_seconds_count{tool=...} is the
+  per-tool call count.
+- Registry counters become OpenMetrics counters (``_total``).
+- Embedding and recall cache hits/misses, SQLite WAL and page statistics,
+  and table row counts are gauges or counters collected per scrape.
+
+Nothing here scans a table on every scrape. Row counts, and live memories
+by type, lifecycle tier and importance bucket, come from the stat_counters
+table that triggers keep current (services/stat_counters.py). The WAL
+figures come from a PASSIVE checkpoint (the same one every new connection
+runs), which never blocks readers or writers; the lag it reports is the
+frames readers are still pinning.
+"""
+
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..metrics import MetricsRegistry, get_metrics
+from ..services.stat_counters import grouped, read_counters, row_counts, table_counts
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+PREFIX = "claudia"
+
+# Histogram bounds in milliseconds (exported as seconds)
+EXPORT_BUCKETS_MS = [
+    0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000,
+]
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def metric_name(name: str, suffix: str = "") -> str:
+    """``mcp.tool`` -> ``claudia_mcp_tool`` (+ suffix)."""
+    return f"{PREFIX}_{_NAME_INVALID.sub('_', name)}{suffix}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, Any]]) -> str:
+    parts = [f'{_NAME_INVALID.sub("_", k)}="{_escape(v)}"' for k, v in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Writer:
+    """Accumulates metric families; each family's samples stay contiguous."""
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, Optional[str], List[str]]] = {}
+
+    def family(self, name: str, kind: str, help_text: str, unit: Optional[str] = None) -> List[str]:
+        if name not in self._families:
+            self._families[name] = (kind, help_text, unit, [])
+        return self._families[name][3]
+
+    def sample(self, family: str, kind: str, help_text: str, value: float,
+               labels: Iterable[Tuple[str, Any]] = (), suffix: str = "") -> None:
+        lines = self.family(family, kind, help_text)
+        lines.append(f"{family}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def render(self) -> str:
+        out = []
+        for name, (kind, help_text, unit, lines) in self._families.items():
+            out.append(f"# TYPE {name} {kind}")
+            if unit:
+                out.append(f"# UNIT {name} {unit}")
+            out.append(f"# HELP {name} {_escape(help_text)}")
+            out.extend(lines)
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+
+# ── Registry ───────────────────────────────────────────────────
+
+
+def _write_registry(writer: _Writer, registry: MetricsRegistry) -> None:
+    timers, counters = registry.series()
+    bounds = [str(b / 1000) for b in EXPORT_BUCKETS_MS] + ["+Inf"]
+    for name, labels, histogram in timers:
+        family = metric_name(name, "_seconds")
+        lines = writer.family(family, "histogram", f"{name} latency", unit="seconds")
+        cumulative = histogram.cumulative(EXPORT_BUCKETS_MS) + [histogram.count]
+        for bound, count in zip(bounds, cumulative):
+            lines.append(f"{family}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+        lines.append(f"{family}_count{_format_labels(labels)} {histogram.count}")
+        lines.append(f"{family}_sum{_format_labels(labels)} {_format_value(histogram.sum_ms / 1000)}")
+    for name, labels, value in counters:
+        writer.sample(metric_name(name), "counter", name, value, labels, "_total")
+
+
+# ── Caches ─────────────────────────────────────────────────────
+
+
+def _write_caches(writer: _Writer, db) -> None:
+    try:
+        from ..embeddings import get_embedding_service
+
+        tiers = get_embedding_service().cache_stats(include_size=False)
+    except Exception as e:
+        logger.debug(f"Embedding cache stats unavailable: {e}")
+        tiers = {}
+    for tier, stats in tiers.items():
+        if not stats:
+            continue
+        labels = (("tier", tier),)
+        hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+        writer.sample(f"{PREFIX}_embedding_cache_hits", "counter",
+                      "Embedding cache hits", hits, labels, "_total")
+        writer.sample(f"{PREFIX}_embedding_cache_misses", "counter",
+                      "Embedding cache misses", misses, labels, "_total")
+        writer.sample(f"{PREFIX}_embedding_cache_hit_ratio", "gauge",
+                      "Embedding cache hits / lookups since start",
+                      hits / (hits + misses) if hits + misses else 0.0, labels)
+        if stats.get("size") is not None:
+            writer.sample(f"{PREFIX}_embedding_cache_entries", "gauge",
+                          "Embeddings held in the cache", stats["size"], labels)
+
+    try:
+        from ..services.recall_cache import get_recall_cache
+
+        recall = get_recall_cache(db).stats()
+    except Exception as e:
+        logger.debug(f"Recall cache stats unavailable: {e}")
+        return
+    writer.sample(f"{PREFIX}_recall_cache_hits", "counter", "Recall cache hits",
+                  recall["hits"], suffix="_total")
+    writer.sample(f"{PREFIX}_recall_cache_misses", "counter", "Recall cache misses",
+                  recall["misses"], suffix="_total")
+    writer.sample(f"{PREFIX}_recall_cache_invalidations", "counter",
+                  "Recall cache write-generation bumps", recall["invalidations"], suffix="_total")
+    writer.sample(f"{PREFIX}_recall_cache_entries", "gauge", "Cached recall results", recall["size"])
+
+
+# ── SQLite ─────────────────────────────────────────────────────
+
+
+def sqlite_stats(db) -> Dict[str, int]:
+    """WAL, checkpoint and page figures for `db` (cheap; no table scans)."""
+    stats: Dict[str, int] = {}
+    path = str(db.db_path)
+    for key, suffix in (("db_bytes", ""), ("wal_bytes", "-wal")):
+        try:
+            stats[key] = os.stat(path + suffix).st_size
+        except OSError:
+            stats[key] = 0
+    with db.connection() as conn:
+        busy, log, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        stats["wal_frames"] = max(log, 0)
+        stats["checkpoint_lag_frames"] = max(log - checkpointed, 0) if log >= 0 else 0
+        stats["checkpoint_busy"] = busy
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        stats["page_size_bytes"] = page_size
+        stats["pages"] = conn.execute("PRAGMA page_count").fetchone()[0]
+        stats["freelist_pages"] = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # Negative cache_size is a KiB budget, positive is a page count
+        stats["cache_size_bytes"] = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+    return stats
+
+
+_SQLITE_HELP = {
+    "db_bytes": ("gauge", "Main database file size"),
+    "wal_bytes": ("gauge", "WAL file size"),
+    "wal_frames": ("gauge", "Frames in the WAL"),
+    "checkpoint_lag_frames": ("gauge", "WAL frames a PASSIVE checkpoint could not copy back"),
+    "checkpoint_busy": ("gauge", "1 if the last checkpoint attempt was blocked"),
+    "page_size_bytes": ("gauge", "Database page size"),
+    "pages": ("gauge", "Pages in the database file"),
+    "freelist_pages": ("gauge", "Unused pages in the database file"),
+    "cache_size_bytes": ("gauge", "Page cache budget per connection"),
+}
+
+
+def _write_sqlite(writer: _Writer, db) -> None:
+    try:
+        stats = sqlite_stats(db)
+    except Exception as e:
+        logger.debug(f"SQLite stats unavailable: {e}")
+        return
+    for key, value in stats.items():
+        kind, help_text = _SQLITE_HELP[key]
+        writer.sample(f"{PREFIX}_sqlite_{key}", kind, help_text, value)
+
+
+# ── Row counts ─────────────────────────────────────────────────
+
+
+def _write_row_counts(writer: _Writer, db) -> None:
+    try:
+        values = read_counters(db)
+        counts = table_counts(values) if values is not None else row_counts(db)
+    except Exception as e:
+        logger.debug(f"Row counts unavailable: {e}")
+        return
+    for table, count in counts.items():
+        writer.sample(f"{PREFIX}_rows", "gauge", "Row counts (entities not deleted, patterns active, predictions pending)",
+                      count, (("table", table),))
+    for prefix, label in (
+        ("memories.type", "type"),
+        ("memories.tier", "tier"),
+        ("memories.importance", "bucket"),
+    ):
+        for value, count in grouped(values or {}, prefix).items():
+            writer.sample(f"{PREFIX}_live_memories", "gauge",
+                          "Live memories by type, lifecycle tier or stored-importance bucket",
+                          count, ((label, value),))
+
+
+def render(db, registry: Optional[MetricsRegistry] = None) -> str:
+    """The full OpenMetrics text exposition for this process and `db`."""
+    writer = _Writer()
+    _write_registry(writer, registry or get_metrics())
+    _write_caches(writer, db)
+    _write_sqlite(writer, db)
+    _write_row_counts(writer, db)
+    return writer.render()
@@ -1,7 +1,8 @@
 """
 Health Check HTTP Server for Claudia Memory System
 
-Provides a simple HTTP endpoint to check daemon status.
+Provides a simple HTTP endpoint to check daemon status, plus a live
+event stream at /events (see stream.py).
 """
 
 import asyncio
@@ -9,14 +10,28 @@ import json
 import logging
 import threading
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
 from ..config import get_config
 from ..database import get_db
 from ..embeddings import get_embedding_service
+from ..events import get_event_bus
+from ..metrics import get_metrics, recent as recent_metrics
+from ..services.recall_cache import get_recall_cache
+from ..services.stat_counters import row_counts
+from .exporter import CONTENT_TYPE as OPENMETRICS_CONTENT_TYPE, render as render_openmetrics
 from .scheduler import get_scheduler
+from .stream import (
+    JSONL_CONTENT_TYPE,
+    SSE_CONTENT_TYPE,
+    AuditTail,
+    format_jsonl,
+    format_sse,
+    pump,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -67,20 +82,12 @@ def build_status_report(*, db=None) -> dict:
         except Exception:
             report["unified_db"] = False
 
-        # Counts
-        for table, query in [
-            ("memories", "SELECT COUNT(*) as c FROM memories"),
-            ("entities", "SELECT COUNT(*) as c FROM entities WHERE deleted_at IS NULL"),
-            ("relationships", "SELECT COUNT(*) as c FROM relationships"),
-            ("episodes", "SELECT COUNT(*) as c FROM episodes"),
-            ("patterns", "SELECT COUNT(*) as c FROM patterns WHERE is_active = 1"),
-            ("reflections", "SELECT COUNT(*) as c FROM reflections"),
-        ]:
-            try:
-                rows = _db.execute(query, fetch=True)
-                report["counts"][table] = rows[0]["c"] if rows else 0
-            except Exception:
-                report["counts"][table] = -1
+        # Counts (maintained in stat_counters)
+        counts = row_counts(_db)
+        for name in ("memories", "entities", "relationships", "episodes"):
+            report["counts"][name] = counts[name]
+        report["counts"]["patterns"] = counts["active_patterns"]
+        report["counts"]["reflections"] = counts["reflections"]
 
         # Backup status (check both new backups/ dir and legacy alongside-DB location)
         try:
@@ -202,6 +209,10 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self._send_flush_response()
         elif self.path == "/briefing":
             self._send_briefing_response()
+        elif urlsplit(self.path).path == "/metrics":
+            self._send_metrics_response()
+        elif urlsplit(self.path).path == "/events":
+            self._send_events_response()
         else:
             self.send_error(404, "Not Found")
 
@@ -259,27 +270,19 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
         """Send memory statistics"""
         try:
             db = get_db()
-
-            # Get counts
-            memories = db.execute("SELECT COUNT(*) as c FROM memories", fetch=True)
-            entities = db.execute("SELECT COUNT(*) as c FROM entities", fetch=True)
-            relationships = db.execute("SELECT COUNT(*) as c FROM relationships", fetch=True)
-            episodes = db.execute("SELECT COUNT(*) as c FROM episodes", fetch=True)
-            patterns = db.execute("SELECT COUNT(*) as c FROM patterns WHERE is_active = 1", fetch=True)
-            predictions = db.execute(
-                "SELECT COUNT(*) as c FROM predictions WHERE is_shown = 0", fetch=True
-            )
+            counts = row_counts(db)
 
             stats = {
                 "timestamp": datetime.utcnow().isoformat(),
                 "counts": {
-                    "memories": memories[0]["c"] if memories else 0,
-                    "entities": entities[0]["c"] if entities else 0,
-                    "relationships": relationships[0]["c"] if relationships else 0,
-                    "episodes": episodes[0]["c"] if episodes else 0,
-                    "active_patterns": patterns[0]["c"] if patterns else 0,
-                    "pending_predictions": predictions[0]["c"] if predictions else 0,
+                    name: counts[name]
+                    for name in (
+                        "memories", "entities", "relationships", "episodes",
+                        "active_patterns", "pending_predictions",
+                    )
                 },
+                "embedding_cache": get_embedding_service().cache_stats(),
+                "recall_cache": get_recall_cache(db).stats(),
             }
 
             self.send_response(200)
@@ -291,6 +294,90 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             logger.exception("Error getting stats")
             self.send_error(500, str(e))
 
+    def _send_metrics_response(self):
+        """Send metrics in OpenMetrics text, or as JSON percentiles.
+
+        Scrapers (and anything else) get the OpenMetrics exposition from
+        exporter.py. ``?format=json`` or ``Accept: application/json`` returns
+        percentiles instead: ``process`` covers this daemon since it
+        started; ``recent`` merges what every process (MCP servers included)
+        flushed to the metrics table in the last ``?minutes=`` (default 15).
+        """
+        query = parse_qs(urlsplit(self.path).query)
+        wants_json = query.get("format", [""])[0] == "json" or self.headers.get(
+            "Accept", ""
+        ).startswith("application/json")
+        if not wants_json:
+            try:
+                body = render_openmetrics(get_db()).encode()
+            except Exception as e:
+                logger.exception("Error rendering metrics")
+                self.send_error(500, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        try:
+            minutes = float(query.get("minutes", ["15"])[0])
+            registry = get_metrics()
+            self._send_json({
+                "timestamp": datetime.utcnow().isoformat(),
+                "process": registry.snapshot(),
+                "recent": {"minutes": minutes, "timers": recent_metrics(get_db(), minutes)},
+                "flusher": registry.stats(),
+            })
+        except ValueError:
+            self.send_error(400, "minutes must be a number")
+        except Exception as e:
+            logger.exception("Error getting metrics")
+            self.send_error(500, str(e))
+
+    def _send_events_response(self):
+        """Stream live events until the client disconnects or the server stops.
+
+        Server-Sent Events by default; ``?format=jsonl`` or
+        ``Accept: application/x-ndjson`` for JSON lines. ``?types=`` filters
+        by event type; Last-Event-ID or ``?after=`` replays held events
+        newer than that id first.
+        """
+        query = parse_qs(urlsplit(self.path).query)
+        jsonl = query.get("format", [""])[0] == "jsonl" or self.headers.get(
+            "Accept", ""
+        ).startswith(JSONL_CONTENT_TYPE)
+        types = {t for value in query.get("types", []) for t in value.split(",") if t} or None
+        after = self.headers.get("Last-Event-ID") or query.get("after", [None])[0]
+        try:
+            after = int(after) if after is not None else None
+        except ValueError:
+            self.send_error(400, "Last-Event-ID / after must be an integer")
+            return
+        try:
+            self.server.ensure_audit_tail()
+        except Exception as e:
+            logger.warning(f"Audit tail unavailable; streaming this process's events only: {e}")
+
+        with get_event_bus().subscribe(after=after) as subscription:
+            self.send_response(200)
+            self.send_header("Content-Type", JSONL_CONTENT_TYPE if jsonl else SSE_CONTENT_TYPE)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            def write(chunk: bytes) -> None:
+                self.wfile.write(chunk)
+                self.wfile.flush()
+
+            if not jsonl:
+                write(b"retry: 1000\n\n")
+            pump(
+                write, subscription,
+                format_jsonl if jsonl else format_sse,
+                self.server.stopping, types,
+                keepalive="\n" if jsonl else ": keepalive\n\n",
+            )
+
     def _send_flush_response(self):
         """Force WAL checkpoint and return status.
 
@@ -336,12 +423,42 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             self.send_error(500, str(e))
 
 
+class _HealthHTTPServer(ThreadingHTTPServer):
+    """One thread per request, so /events streams don't hold up other routes."""
+
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopping = threading.Event()
+        self.audit_tail: Optional[AuditTail] = None
+        self._tail_lock = threading.Lock()
+
+    def ensure_audit_tail(self) -> None:
+        """Start the audit_log tail on the first /events request."""
+        with self._tail_lock:
+            if self.audit_tail is None:
+                tail = AuditTail(
+                    get_db().db_path,
+                    interval_seconds=get_config().event_stream_poll_ms / 1000,
+                )
+                tail.start()
+                self.audit_tail = tail
+
+    def close_streams(self) -> None:
+        self.stopping.set()
+        with self._tail_lock:
+            if self.audit_tail is not None:
+                self.audit_tail.stop()
+                self.audit_tail = None
+
+
 class HealthServer:
     """HTTP server for health checks"""
 
     def __init__(self, port: int = None):
         self.port = port or get_config().health_port
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[_HealthHTTPServer] = None
         self._thread: Optional[threading.Thread] = None
         self._running = False
 
@@ -352,7 +469,7 @@ class HealthServer:
             return
 
         try:
-            self.server = HTTPServer(("localhost", self.port), HealthCheckHandler)
+            self.server = _HealthHTTPServer(("localhost", self.port), HealthCheckHandler)
             self._thread = threading.Thread(target=self._serve, daemon=True)
             self._thread.start()
             self._running = True
@@ -380,7 +497,9 @@ class HealthServer:
     def stop(self) -> None:
         """Stop the health check server"""
         if self.server:
+            self.server.close_streams()
             self.server.shutdown()
+            self.server.server_close()
             self.server = None
         self._running = False
         logger.info("Health server stopped")
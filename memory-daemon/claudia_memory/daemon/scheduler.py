@@ -5,24 +5,30 @@ Runs scheduled consolidation tasks using APScheduler.
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from apscheduler.events import EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from ..config import get_config
+from ..events import publish as publish_event
+from ..metrics import get_metrics
 from ..services.consolidate import (
     detect_patterns,
     run_decay,
     run_full_consolidation,
 )
+from ..services.entity_matcher import EntityMatcher, get_entity_matcher
 from ..services.vault_sync import run_vault_sync
 from ..loops.job_wrapper import run_with_status
 
@@ -67,6 +73,9 @@ def _is_relevant_observation(obs, config, known_entity_names=None):
     2. Input contains a Claudia file path
     3. Content mentions a known entity
     4. Content contains commitment language
+
+    known_entity_names is either an EntityMatcher (whole-word match on
+    names and aliases) or a plain collection of names (substring match).
     """
     if config.observation_capture_all:
         return True
@@ -90,7 +99,13 @@ def _is_relevant_observation(obs, config, known_entity_names=None):
             return True
 
     # Check 3: Known entity mention
-    if known_entity_names:
+    if isinstance(known_entity_names, EntityMatcher):
+        try:
+            if known_entity_names.mentions_any(combined_text):
+                return True
+        except Exception as e:
+            logger.debug(f"Entity matcher unavailable for relevance check: {e}")
+    elif known_entity_names:
         combined_lower = combined_text.lower()
         for name in known_entity_names:
             if name.lower() in combined_lower:
@@ -131,18 +146,15 @@ def _ingest_observations(db, config):
     except OSError:
         return
 
-    # Load known entity names for relevance checking (cached per batch)
-    known_entity_names = set()
-    try:
-        rows = db.execute(
-            "SELECT canonical_name FROM entities WHERE deleted_at IS NULL",
-            fetch=True,
-        ) or []
-        known_entity_names = {row["canonical_name"] for row in rows}
-    except Exception:
-        pass
+    # Known entity names for relevance checking, via the shared name matcher
+    known_entity_names = get_entity_matcher(db)
 
-    ingested = 0
+    # Turns are queued on the writer thread and committed in groups rather
+    # than one transaction per observation
+    from ..services.remember import buffer_turn
+    from ..services.write_queue import get_write_queue
+    writer = get_write_queue(db)
+    futures = []
     try:
         with open(processing_file, "r", encoding="utf-8") as f:
             for line in f:
@@ -158,18 +170,12 @@ def _ingest_observations(db, config):
                     continue
 
                 # Ingest via buffer_turn
-                try:
-                    from ..services.remember import buffer_turn
-                    summary = f"[{obs.get('tool', 'unknown')}] {obs.get('input', '')}"
-                    if obs.get("output"):
-                        summary += f" -> {obs['output']}"
-                    buffer_turn(
-                        assistant_content=summary[:500],
-                        source="hook_capture",
-                    )
-                    ingested += 1
-                except Exception as e:
-                    logger.debug(f"Failed to ingest observation: {e}")
+                summary = f"[{obs.get('tool', 'unknown')}] {obs.get('input', '')}"
+                if obs.get("output"):
+                    summary += f" -> {obs['output']}"
+                futures.append(writer.submit(
+                    lambda text=summary[:500]: buffer_turn(assistant_content=text, source="hook_capture")
+                ))
 
     except Exception as e:
         logger.debug(f"Error reading observations file: {e}")
@@ -180,6 +186,14 @@ def _ingest_observations(db, config):
         except Exception:
             pass
 
+    ingested = 0
+    for future in futures:
+        try:
+            future.result()
+            ingested += 1
+        except Exception as e:
+            logger.debug(f"Failed to ingest observation: {e}")
+
     if ingested > 0:
         logger.debug(f"Ingested {ingested} observations from hook capture")
 
@@ -515,6 +529,34 @@ class MemoryScheduler:
         )
         self.config = get_config()
         self._started = False
+        self.scheduler.add_listener(self._on_job_missed, EVENT_JOB_MISSED)
+
+    def _add_job(self, func, trigger, **kwargs) -> None:
+        """Schedule `func`, recording each run's duration as scheduler.job{job=<id>}.
+
+        Each finished run is also published as a ``job`` event.
+        """
+        job_id = kwargs["id"]
+
+        @functools.wraps(func)
+        def timed():
+            started_at = time.perf_counter()
+            ok = False
+            try:
+                with get_metrics().timer("scheduler.job", job=job_id):
+                    result = func()
+                ok = True
+                return result
+            finally:
+                publish_event(
+                    "job", job=job_id, ok=ok,
+                    duration_ms=round((time.perf_counter() - started_at) * 1000, 1),
+                )
+
+        self.scheduler.add_job(timed, trigger, **kwargs)
+
+    def _on_job_missed(self, event) -> None:
+        get_metrics().incr("scheduler.job_missed", job=event.job_id)
 
     def start(self) -> None:
         """Start the scheduler with all jobs"""
@@ -523,7 +565,7 @@ class MemoryScheduler:
             return
 
         # Daily at 2am: Importance decay
-        self.scheduler.add_job(
+        self._add_job(
             self._run_daily_decay,
             CronTrigger(hour=2, minute=0),
             id="daily_decay",
@@ -532,7 +574,7 @@ class MemoryScheduler:
         )
 
         # Every 6 hours: Pattern detection
-        self.scheduler.add_job(
+        self._add_job(
             self._run_pattern_detection,
             IntervalTrigger(hours=self.config.consolidation_interval_hours),
             id="pattern_detection",
@@ -541,7 +583,7 @@ class MemoryScheduler:
         )
 
         # Daily at 3am: Full consolidation
-        self.scheduler.add_job(
+        self._add_job(
             self._run_full_consolidation,
             CronTrigger(hour=3, minute=0),
             id="full_consolidation",
@@ -550,7 +592,7 @@ class MemoryScheduler:
         )
 
         # Daily at 2:30am: Labeled daily backup (7-day retention)
-        self.scheduler.add_job(
+        self._add_job(
             self._run_daily_backup,
             CronTrigger(hour=2, minute=30),
             id="daily_backup",
@@ -559,7 +601,7 @@ class MemoryScheduler:
         )
 
         # Weekly on Sunday at 2:45am: Labeled weekly backup (4-week retention)
-        self.scheduler.add_job(
+        self._add_job(
             self._run_weekly_backup,
             CronTrigger(day_of_week="sun", hour=2, minute=45),
             id="weekly_backup",
@@ -569,7 +611,7 @@ class MemoryScheduler:
 
         # Daily at 3:15am: Vault sync (after consolidation)
         if self.config.vault_sync_enabled:
-            self.scheduler.add_job(
+            self._add_job(
                 self._run_vault_sync,
                 CronTrigger(hour=3, minute=15),
                 id="vault_sync",
@@ -577,9 +619,20 @@ class MemoryScheduler:
                 replace_existing=True,
             )
 
+        # Every N seconds: import notes the user edited in the vault
+        if self.config.vault_sync_enabled and self.config.vault_watch_enabled:
+            self._add_job(
+                self._run_vault_watch,
+                IntervalTrigger(seconds=self.config.vault_watch_interval_seconds),
+                id="vault_watch",
+                name="Vault edit import",
+                replace_existing=True,
+                misfire_grace_time=60,
+            )
+
         # Every N seconds: Observation ingestion from PostToolUse hook
         if self.config.observation_capture_enabled:
-            self.scheduler.add_job(
+            self._add_job(
                 self._run_observation_ingest,
                 IntervalTrigger(seconds=self.config.observation_ingest_interval),
                 id="observation_ingest",
@@ -590,7 +643,7 @@ class MemoryScheduler:
 
         # Every 60 seconds: Session ingestion from SessionEnd/SessionStart hooks
         if getattr(self.config, "session_capture_enabled", True):
-            self.scheduler.add_job(
+            self._add_job(
                 self._run_session_ingest,
                 IntervalTrigger(seconds=60),
                 id="session_ingest",
@@ -599,6 +652,27 @@ class MemoryScheduler:
                 misfire_grace_time=300,
             )
 
+        # Every minute: extend the memory hash chain over new rows
+        if self.config.enable_chain_verification:
+            self._add_job(
+                self._run_chain_seal,
+                IntervalTrigger(seconds=self.config.chain_seal_interval_seconds),
+                id="chain_seal",
+                name="Hash chain sealing",
+                replace_existing=True,
+                misfire_grace_time=60,
+            )
+
+        # Hourly: correct any drift in the maintained aggregate counts
+        self._add_job(
+            self._run_stat_counters_reconcile,
+            IntervalTrigger(minutes=self.config.stat_counters_reconcile_minutes),
+            id="stat_counters_reconcile",
+            name="Aggregate count reconcile",
+            replace_existing=True,
+            misfire_grace_time=300,
+        )
+
         self.scheduler.start()
         self._started = True
         logger.info("Memory scheduler started")
@@ -607,6 +681,8 @@ class MemoryScheduler:
         """Stop the scheduler"""
         if self._started:
             self.scheduler.shutdown(wait=True)
+            from ..services.vault_index import close_vault_watchers
+            close_vault_watchers()
             self._started = False
             logger.info("Memory scheduler stopped")
 
@@ -715,6 +791,45 @@ class MemoryScheduler:
         except Exception:
             logger.exception("Error in vault sync")
 
+    def _run_vault_watch(self) -> None:
+        """Import vault notes edited since the last run."""
+        try:
+            from ..config import _project_id
+            from ..services.vault_index import get_vault_watcher
+            from ..services.vault_sync import get_vault_sync_service
+
+            def _import():
+                svc = get_vault_sync_service(_project_id)
+                watcher = get_vault_watcher(svc.vault_path, svc.entity_note_dirs())
+                return svc.import_changed_edits(watcher)
+
+            result = run_with_status("vault_watch", _import)
+            if result and result.get("edits_found"):
+                logger.info(f"Imported {result['edits_found']} vault edits")
+        except Exception as e:
+            logger.debug(f"Error in vault edit import: {e}")
+
+    def _run_chain_seal(self) -> None:
+        """Hash newly inserted memories into the integrity chain."""
+        try:
+            from ..database import get_db
+            from ..services.chain import seal_pending
+            run_with_status(
+                "chain_seal",
+                lambda: seal_pending(get_db(), batch=self.config.chain_seal_batch),
+            )
+        except Exception as e:
+            logger.debug(f"Error in chain sealing: {e}")
+
+    def _run_stat_counters_reconcile(self) -> None:
+        """Recount stat_counters from their tables."""
+        try:
+            from ..database import get_db
+            from ..services.stat_counters import reconcile
+            run_with_status("stat_counters_reconcile", lambda: reconcile(get_db()))
+        except Exception as e:
+            logger.debug(f"Error in stat_counters reconcile: {e}")
+
     def _run_observation_ingest(self) -> None:
         """Ingest observations from PostToolUse hook captures."""
         try:
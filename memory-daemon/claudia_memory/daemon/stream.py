@@ -0,0 +1,170 @@
+"""
+Live event stream for the health server's /events route.
+
+Clients (the Brain Monitor, session hooks, curl) hold one connection open
+and receive events from the process's bus (claudia_memory/events.py) as
+they happen, instead of polling. Two wire formats:
+
+- Server-Sent Events (default): ``id:``, ``event:`` and ``data:`` lines
+  per event. A reconnecting client sends Last-Event-ID (or ``?after=``)
+  and first gets the held events it missed.
+- JSON lines (``?format=jsonl`` or ``Accept: application/x-ndjson``): one
+  event object per line.
+
+``?types=write,job`` keeps only those event types. An idle stream carries
+a keepalive every KEEPALIVE_SECONDS, which is also how a client that went
+away is noticed. A client that falls behind gets a ``dropped`` event with
+the number of events it lost.
+
+MCP servers run in their own processes and publish on their own buses, so
+AuditTail carries their audit entries to the daemon's: while anyone is
+subscribed it checks PRAGMA data_version every event_stream_poll_ms (the
+value moves only when another connection commits) and reads audit_log
+past its cursor only when it has moved. One tail serves every client; with
+no subscribers it runs no queries.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Set
+
+from ..events import Event, EventBus, Subscription, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+SSE_CONTENT_TYPE = "text/event-stream; charset=utf-8"
+JSONL_CONTENT_TYPE = "application/x-ndjson"
+
+KEEPALIVE_SECONDS = 15.0
+# How long a stream waits for events before re-checking for shutdown
+_WAIT_SECONDS = 1.0
+# audit_log rows read per tail poll; a full batch is followed by another read
+_TAIL_BATCH = 500
+
+
+def format_sse(event: Event) -> str:
+    # Notices without an id (``dropped``) leave the client's Last-Event-ID alone
+    id_line = f"id: {event['id']}\n" if "id" in event else ""
+    return f"{id_line}event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def format_jsonl(event: Event) -> str:
+    return json.dumps(event) + "\n"
+
+
+def pump(
+    write: Callable[[bytes], None],
+    subscription: Subscription,
+    encode: Callable[[Event], str],
+    stopping: threading.Event,
+    types: Optional[Set[str]] = None,
+    keepalive: str = ": keepalive\n\n",
+) -> None:
+    """Write `subscription`'s events until `stopping` is set or `write` raises OSError."""
+    dropped = 0
+    last_write = time.monotonic()
+    try:
+        while not stopping.is_set():
+            events = subscription.get(timeout=_WAIT_SECONDS)
+            chunks = []
+            if subscription.dropped != dropped:
+                chunks.append(encode({
+                    "type": "dropped",
+                    "data": {"count": subscription.dropped - dropped},
+                }))
+                dropped = subscription.dropped
+            chunks.extend(encode(e) for e in events if types is None or e["type"] in types)
+            if not chunks and time.monotonic() - last_write >= KEEPALIVE_SECONDS:
+                chunks.append(keepalive)
+            if chunks:
+                write("".join(chunks).encode())
+                last_write = time.monotonic()
+    except OSError:
+        # BrokenPipeError / ConnectionResetError: the client went away
+        pass
+
+
+class AuditTail:
+    """Publishes audit_log rows committed by other connections onto a bus."""
+
+    def __init__(self, db_path: Path, bus: Optional[EventBus] = None, interval_seconds: float = 0.25):
+        self.db_path = Path(db_path)
+        self.interval_seconds = interval_seconds
+        self._bus = bus or get_event_bus()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cursor: Optional[int] = None
+        self._version: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="claudia-audit-tail", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval_seconds):
+                try:
+                    self.poll()
+                except sqlite3.Error as e:
+                    logger.debug(f"Audit tail poll failed: {e}")
+                    self._close()
+        finally:
+            self._close()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._cursor = None
+
+    def poll(self) -> int:
+        """Publish audit rows committed since the last poll; returns how many were read."""
+        if self._bus.subscriber_count() == 0:
+            # Nobody listening: skip the queries and start from the head next time
+            self._cursor = None
+            return 0
+        if self._conn is None:
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._conn.row_factory = sqlite3.Row
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._cursor is None:
+            self._cursor = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM audit_log").fetchone()[0]
+            self._version = version
+            return 0
+        if version == self._version:
+            return 0
+        rows = self._conn.execute(
+            """
+            SELECT id, operation, memory_id, entity_id, user_initiated
+            FROM audit_log
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+            """,
+            (self._cursor, _TAIL_BATCH),
+        ).fetchall()
+        # A full batch leaves rows behind; read again on the next poll
+        self._version = None if len(rows) == _TAIL_BATCH else version
+        for r in rows:
+            self._bus.publish_audit(
+                r["id"], r["operation"],
+                memory_id=r["memory_id"], entity_id=r["entity_id"],
+                user_initiated=bool(r["user_initiated"]),
+            )
+        if rows:
+            self._cursor = rows[-1]["id"]
+        return len(rows)
@@ -11,6 +11,7 @@ Handles SQLite connection with:
 import hashlib
 import json
 import logging
+import math
 import os
 import sqlite3
 import sys
@@ -18,12 +19,195 @@ import threading
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
 from .config import get_config
+from .decay import register_functions as register_decay_functions
+from .vector_codec import (
+    decode as decode_vector,
+    encode as encode_vector,
+    normalize as normalize_vector,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sync triggers for the external-content memories_fts index. The update
+# trigger fires only when content changes: access counts, decay and lifecycle
+# transitions write other columns and must not reindex the row.
+_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+)
+
+# Triggers from the original migration 4. memories_au reindexed on every
+# UPDATE, and databases that also went through the FTS setup fallback carry
+# both sets, so each insert was indexed twice.
+_LEGACY_FTS_TRIGGERS = ("memories_ai", "memories_ad", "memories_au")
+
+# Tables with closed-form decay (see decay.py) and the column that decays.
+# Inserting a row, or writing that column, anchors decay_ref_at at now so a
+# new base is not aged by time that passed before it was written (imports
+# with a historical created_at, importance bumps on old memories).
+_DECAY_COLUMNS = (
+    ("memories", "importance"),
+    ("entities", "importance"),
+    ("relationships", "strength"),
+    ("reflections", "importance"),
+)
+_DECAY_REF_TRIGGERS = tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS decay_ref_{table}_{event} AFTER {clause} ON {table}
+    WHEN {condition} BEGIN
+        UPDATE {table} SET decay_ref_at = strftime('%Y-%m-%dT%H:%M:%f', 'now') WHERE id = new.id;
+    END"""
+    for table, column in _DECAY_COLUMNS
+    for event, clause, condition in (
+        ("insert", "INSERT", "new.decay_ref_at IS NULL"),
+        ("update", f"UPDATE OF {column}", "new.decay_ref_at IS old.decay_ref_at"),
+    )
+)
+
+# Row-level change tracking for incremental consolidation (see
+# services/change_log.py). Only structural changes are logged: importance
+# and strength updates from decay touch every row and are left out.
+_CHANGE_LOG_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS change_log_memory_insert AFTER INSERT ON memories BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('memory', new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_memory_update
+    AFTER UPDATE OF created_at, deadline_at, invalidated_at ON memories BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('memory', new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_link_insert AFTER INSERT ON memory_entities BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', new.entity_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_link_delete AFTER DELETE ON memory_entities BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', old.entity_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_link_update
+    AFTER UPDATE OF entity_id, memory_id ON memory_entities BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', old.entity_id);
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', new.entity_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_entity_insert AFTER INSERT ON entities BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_entity_update
+    AFTER UPDATE OF type, deleted_at ON entities BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('entity', new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_relationship_insert AFTER INSERT ON relationships BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('relationship', new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS change_log_relationship_update
+    AFTER UPDATE OF source_entity_id, target_entity_id, relationship_type, invalid_at ON relationships BEGIN
+        INSERT INTO change_log (kind, ref_id) VALUES ('relationship', new.id);
+    END""",
+)
+
+# Aggregate counts kept in stat_counters (see services/stat_counters.py) so
+# stats, status, briefing and the TUI never COUNT(*) a table. Per table: the
+# columns whose updates can move a row between keys, and SQL expressions for
+# the keys a row counts toward ({r} is the row alias; NULL means none).
+# Triggers apply +1/-1 deltas from these expressions and the reconcile job
+# recounts with the same ones, so the two cannot disagree about a key.
+# Importance buckets use the stored base, which can be up to a bucket above
+# the effective (decayed) value; see services/stat_counters.py.
+IMPORTANCE_BUCKETS = 30
+_LIVE_MEMORY = "CASE WHEN {r}.invalidated_at IS NULL THEN "
+_STAT_COUNTERS = (
+    ("memories", "type, lifecycle_tier, importance, invalidated_at", (
+        "'memories'",
+        _LIVE_MEMORY + "'memories.live' END",
+        _LIVE_MEMORY + "'memories.type:' || {r}.type END",
+        _LIVE_MEMORY + "'memories.tier:' || COALESCE({r}.lifecycle_tier, 'active') END",
+        _LIVE_MEMORY + "'memories.importance:' || "
+        f"MAX(0, MIN(CAST({{r}}.importance * {IMPORTANCE_BUCKETS} AS INTEGER), {IMPORTANCE_BUCKETS - 1})) END",
+    )),
+    ("entities", "type, deleted_at", (
+        "CASE WHEN {r}.deleted_at IS NULL THEN 'entities' END",
+        "CASE WHEN {r}.deleted_at IS NULL THEN 'entities.type:' || {r}.type END",
+    )),
+    ("relationships", None, ("'relationships'",)),
+    ("episodes", None, ("'episodes'",)),
+    ("reflections", None, ("'reflections'",)),
+    ("patterns", "is_active", ("CASE WHEN {r}.is_active = 1 THEN 'patterns.active' END",)),
+    ("predictions", "is_shown", ("CASE WHEN {r}.is_shown = 0 THEN 'predictions.pending' END",)),
+)
+
+
+def _stat_counter_delta(keys: Tuple[str, ...], rows: Tuple[Tuple[str, int], ...]) -> str:
+    deltas = " UNION ALL ".join(
+        f"SELECT {key.format(r=alias)} AS key, {sign} AS delta"
+        for alias, sign in rows
+        for key in keys
+    )
+    return f"""INSERT INTO stat_counters (key, value)
+        SELECT key, SUM(delta) FROM ({deltas})
+        WHERE key IS NOT NULL GROUP BY key HAVING SUM(delta) != 0
+        ON CONFLICT(key) DO UPDATE SET value = value + excluded.value;"""
+
+
+_STAT_COUNTER_TRIGGERS = tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS stat_counters_{table}_{event} AFTER {clause} ON {table} BEGIN
+        {_stat_counter_delta(keys, rows)}
+    END"""
+    for table, columns, keys in _STAT_COUNTERS
+    for event, clause, rows in (
+        ("insert", "INSERT", (("new", 1),)),
+        ("delete", "DELETE", (("old", -1),)),
+        ("update", f"UPDATE OF {columns}", (("old", -1), ("new", 1))),
+    )
+    if columns or event != "update"
+)
+
+
+def recount_stat_counters(conn) -> int:
+    """Rewrite stat_counters from the tables it summarizes.
+
+    `conn` is a connection or cursor (inside the caller's transaction; the
+    caller commits). Takes the write lock first so no trigger delta lands
+    between the recount and the rewrite. Returns how many keys had drifted.
+    """
+    conn.execute(
+        "INSERT INTO stat_counters (key, value) VALUES ('_reconciled_at', CAST(strftime('%s', 'now') AS INTEGER)) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+    )
+    exact: Dict[str, int] = {}
+    for table, _columns, keys in _STAT_COUNTERS:
+        exprs = ", ".join(key.format(r=table) for key in keys)
+        groups = conn.execute(
+            f"SELECT {exprs}, COUNT(*) FROM {table} GROUP BY {', '.join(str(i + 1) for i in range(len(keys)))}"
+        ).fetchall()
+        for group in groups:
+            for key in tuple(group)[:-1]:
+                if key is not None:
+                    exact[key] = exact.get(key, 0) + group[-1]
+    stored = {
+        row[0]: row[1]
+        for row in conn.execute("SELECT key, value FROM stat_counters WHERE substr(key, 1, 1) != '_'").fetchall()
+    }
+    drifted = [key for key in exact.keys() | stored.keys() if exact.get(key, 0) != stored.get(key, 0)]
+    for key in drifted:
+        if exact.get(key):
+            conn.execute(
+                "INSERT INTO stat_counters (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, exact[key]),
+            )
+        else:
+            conn.execute("DELETE FROM stat_counters WHERE key = ?", (key,))
+    # Keys a trigger walked back down to zero
+    conn.execute("DELETE FROM stat_counters WHERE value = 0 AND substr(key, 1, 1) != '_'")
+    return len(drifted)
+
 
 def load_sqlite_vec(conn: sqlite3.Connection) -> bool:
     """Load the sqlite-vec extension on a connection.
@@ -110,6 +294,8 @@ class Database:
                 timeout=30.0,
             )
             conn.row_factory = sqlite3.Row
+            # effective_importance() and friends for closed-form decay
+            register_decay_functions(conn)
 
             # Enable WAL mode for crash safety
             conn.execute("PRAGMA journal_mode = WAL")
@@ -157,21 +343,80 @@ class Database:
         """Context manager that wraps all db operations in this thread in a single transaction.
 
         While active, cursor() uses the transaction connection instead of auto-committing.
-        Commits on clean exit; rolls back on exception. Supports nesting by restoring
-        any previously active transaction on exit.
+        Commits on clean exit; rolls back on exception. A transaction() opened
+        inside another one on the same thread becomes a SAVEPOINT, so an inner
+        failure rolls back only the inner block and the outer one carries on.
         """
+        prev = getattr(self._local, "tx_conn", None)
+        if prev is not None:
+            depth = getattr(self._local, "tx_depth", 0) + 1
+            self._local.tx_depth = depth
+            name = f"sp_{depth}"
+            mark = len(self._local.tx_hooks)
+            prev.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+                prev.execute(f"RELEASE {name}")
+            except Exception:
+                prev.execute(f"ROLLBACK TO {name}")
+                prev.execute(f"RELEASE {name}")
+                # The savepoint's work is gone, so are the hooks it registered
+                dropped = self._local.tx_hooks[mark:]
+                del self._local.tx_hooks[mark:]
+                self._run_hooks(dropped, committed=False)
+                raise
+            finally:
+                self._local.tx_depth = depth - 1
+            return
+
         conn = self._get_connection()
         conn.execute("BEGIN")
-        prev = getattr(self._local, "tx_conn", None)
         self._local.tx_conn = conn
+        self._local.tx_hooks = []
+        committed = False
         try:
             yield
             conn.execute("COMMIT")
+            committed = True
         except Exception:
             conn.execute("ROLLBACK")
             raise
         finally:
-            self._local.tx_conn = prev  # restore nesting support
+            self._local.tx_conn = None
+            hooks, self._local.tx_hooks = self._local.tx_hooks, []
+            # after_commit hooks on COMMIT; their on_rollback otherwise
+            self._run_hooks(hooks, committed)
+
+    @staticmethod
+    def _run_hooks(
+        hooks: List[Tuple[Callable[[], None], Optional[Callable[[], None]]]], committed: bool
+    ) -> None:
+        for on_commit, on_rollback in hooks:
+            hook = on_commit if committed else on_rollback
+            if hook is None:
+                continue
+            try:
+                hook()
+            except Exception as e:
+                logger.debug(f"after_commit hook failed: {e}")
+
+    def in_transaction(self) -> bool:
+        """True while a transaction() is open on the calling thread."""
+        return getattr(self._local, "tx_conn", None) is not None
+
+    def after_commit(
+        self, hook: Callable[[], None], on_rollback: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Run `hook` once this thread's open transaction commits.
+
+        Outside a transaction it runs immediately. If the work it belongs to
+        rolls back instead (the whole transaction, or the savepoint `hook`
+        was registered in), `hook` is dropped and `on_rollback` runs.
+        """
+        if self.in_transaction():
+            self._local.tx_hooks.append((hook, on_rollback))
+        else:
+            hook()
 
     @contextmanager
     def cursor(self) -> Generator[sqlite3.Cursor, None, None]:
@@ -417,22 +662,8 @@ class Database:
                 )
 
                 # Auto-sync triggers
-                conn.execute(
-                    """CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
-                        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
-                    END"""
-                )
-                conn.execute(
-                    """CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
-                        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-                    END"""
-                )
-                conn.execute(
-                    """CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
-                        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-                        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
-                    END"""
-                )
+                for stmt in _FTS_TRIGGERS:
+                    conn.execute(stmt)
 
                 # Backfill existing memories into FTS5 index
                 conn.execute(
@@ -1064,22 +1295,8 @@ class Database:
                         tokenize='porter unicode61'
                     )
                 """)
-                conn.execute("""
-                    CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
-                        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
-                    END
-                """)
-                conn.execute("""
-                    CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
-                        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-                    END
-                """)
-                conn.execute("""
-                    CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF content ON memories BEGIN
-                        INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-                        INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
-                    END
-                """)
+                for stmt in _FTS_TRIGGERS:
+                    conn.execute(stmt)
                 # Backfill existing memories
                 conn.execute(
                     "INSERT INTO memories_fts(rowid, content) SELECT id, content FROM memories"
@@ -1095,6 +1312,169 @@ class Database:
             else:
                 logger.warning(f"FTS5 setup failed: {e}")
 
+        if current_version < 22:
+            # Migration 22: content-only FTS maintenance. Runs after the FTS5
+            # setup above so memories_fts exists whenever FTS5 is available.
+            try:
+                has_fts = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='memories_fts'"
+                ).fetchone()
+                if has_fts:
+                    legacy = conn.execute(
+                        f"SELECT name FROM sqlite_master WHERE type='trigger' AND name IN "
+                        f"({', '.join('?' for _ in _LEGACY_FTS_TRIGGERS)})",
+                        _LEGACY_FTS_TRIGGERS,
+                    ).fetchall()
+                    for row in legacy:
+                        conn.execute(f"DROP TRIGGER IF EXISTS {row[0]}")
+                    for stmt in _FTS_TRIGGERS:
+                        conn.execute(stmt)
+                    if legacy:
+                        # Double-indexed rows can't be deleted cleanly; rebuild
+                        # the index from the content table.
+                        conn.execute("INSERT INTO memories_fts(memories_fts) VALUES('rebuild')")
+                        logger.info(f"Dropped legacy FTS triggers {[row[0] for row in legacy]}, rebuilt index")
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Migration 22 (FTS triggers) failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (22, 'Reindex memories_fts only when content changes')"
+            )
+            conn.commit()
+            logger.info("Applied migration 22: content-only FTS maintenance")
+
+        if current_version < 23:
+            # Migration 23: change_log for incremental consolidation
+            try:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS change_log (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        ref_id INTEGER NOT NULL,
+                        changed_at TEXT DEFAULT (datetime('now'))
+                    )"""
+                )
+            except sqlite3.OperationalError as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"Migration 23 statement failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (23, 'Add change_log for incremental consolidation')"
+            )
+            conn.commit()
+            logger.info("Applied migration 23: change_log")
+
+        if current_version < 24:
+            # Migration 24: closed-form decay. Existing values were decayed
+            # through the last nightly pass, so they are anchored at now.
+            now = datetime.utcnow().isoformat()
+            for table, _column in _DECAY_COLUMNS:
+                try:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN decay_ref_at TEXT")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column" not in str(e).lower():
+                        logger.warning(f"Migration 24 statement failed: {e}")
+                try:
+                    conn.execute(
+                        f"UPDATE {table} SET decay_ref_at = ? WHERE decay_ref_at IS NULL", (now,)
+                    )
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"Migration 24 backfill of {table} failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (24, 'Add decay_ref_at for closed-form importance decay')"
+            )
+            conn.commit()
+            logger.info("Applied migration 24: closed-form decay")
+
+        if current_version < 25:
+            # Migration 25: hash chain sealed in the background (services/chain.py)
+            try:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS chain_seals (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        from_id INTEGER NOT NULL,
+                        to_id INTEGER NOT NULL,
+                        row_count INTEGER NOT NULL,
+                        head_hash TEXT NOT NULL,
+                        sealed_at TEXT DEFAULT (datetime('now'))
+                    )"""
+                )
+            except sqlite3.OperationalError as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"Migration 25 statement failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (25, 'Add chain_seals for background hash-chain sealing')"
+            )
+            conn.commit()
+            logger.info("Applied migration 25: chain_seals")
+
+        if current_version < 26:
+            # Migration 26: stat cache for vault edit detection (services/vault_index.py)
+            try:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS vault_file_state (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        sync_hash TEXT,
+                        body_hash TEXT,
+                        entity_id INTEGER,
+                        entity_type TEXT,
+                        checked_at TEXT DEFAULT (datetime('now'))
+                    )"""
+                )
+            except sqlite3.OperationalError as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"Migration 26 statement failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (26, 'Add vault_file_state for incremental vault edit detection')"
+            )
+            conn.commit()
+            logger.info("Applied migration 26: vault_file_state")
+
+        if current_version < 27:
+            # Migration 27: maintained aggregate counts (services/stat_counters.py).
+            # The triggers and the initial count are installed below.
+            try:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS stat_counters (
+                        key TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL DEFAULT 0
+                    ) WITHOUT ROWID"""
+                )
+            except sqlite3.OperationalError as e:
+                if "already exists" not in str(e).lower():
+                    logger.warning(f"Migration 27 statement failed: {e}")
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (27, 'Add stat_counters for maintained aggregate counts')"
+            )
+            conn.commit()
+            logger.info("Applied migration 27: stat_counters")
+
+        if current_version < 28:
+            # Migration 28: unit-length embeddings. Vectors from Ollama's
+            # /api/embeddings fallback were stored unnormalized next to /api/embed's
+            # unit vectors. Until every vec0 table has been rewritten, the
+            # integrity check sends each start back here.
+            self._renormalize_embeddings(conn)
+
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, description) "
+                "VALUES (28, 'Re-normalize stored embeddings to unit length')"
+            )
+            conn.commit()
+            logger.info("Applied migration 28: embedding re-normalization")
+
         # dispatch_tier validation trigger: ensure it exists regardless of migration path.
         # Like FTS5 triggers, CREATE TRIGGER contains internal semicolons that the
         # schema.sql line-based parser can't handle.
@@ -1115,11 +1495,94 @@ class Database:
         except sqlite3.OperationalError as e:
             logger.debug(f"dispatch_tier trigger setup skipped: {e}")
 
+        # decay_ref_at re-anchoring triggers, same reasoning as below
+        try:
+            installed = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'decay_ref_%'"
+            ).fetchone()[0]
+            if installed < len(_DECAY_REF_TRIGGERS):
+                for stmt in _DECAY_REF_TRIGGERS:
+                    conn.execute(stmt)
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"decay_ref trigger setup failed: {e}")
+
+        # change_log triggers: same semicolon problem as above, so they are
+        # ensured here for fresh installs and upgrades alike.
+        try:
+            installed = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'change_log_%'"
+            ).fetchone()[0]
+            if installed < len(_CHANGE_LOG_TRIGGERS):
+                for stmt in _CHANGE_LOG_TRIGGERS:
+                    conn.execute(stmt)
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"change_log trigger setup failed: {e}")
+
+        # stat_counters triggers, same reasoning. Counts start from a full
+        # recount in the same transaction the triggers are created in.
+        try:
+            installed = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'stat_counters_%'"
+            ).fetchone()[0]
+            if installed < len(_STAT_COUNTER_TRIGGERS):
+                for stmt in _STAT_COUNTER_TRIGGERS:
+                    conn.execute(stmt)
+                recount_stat_counters(conn)
+                conn.commit()
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.warning(f"stat_counters trigger setup failed: {e}")
+
     def _get_table_columns(self, conn: sqlite3.Connection, table: str) -> set:
         """Get column names for a table."""
         result = conn.execute(f"PRAGMA table_info({table})").fetchall()
         return {row[1] for row in result}  # row[1] is column name
 
+    def _renormalize_embeddings(self, conn: sqlite3.Connection) -> None:
+        """Scale stored embeddings to unit length (migration 28).
+
+        Only rows whose norm is off are rewritten. Sets _meta
+        embeddings_normalized once every vec0 table has been handled; a table
+        that cannot be read (sqlite-vec not loaded) leaves it unset so the next
+        start retries.
+        """
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ).fetchall()}
+        deferred = False
+        for table, pk in self.VEC0_TABLES:
+            if table not in tables:
+                continue
+            try:
+                rows = conn.execute(f"SELECT {pk}, embedding FROM {table}").fetchall()
+                fixed = []
+                for row in rows:
+                    vector = decode_vector(row[1])
+                    norm = math.sqrt(math.fsum(x * x for x in vector))
+                    if norm and abs(norm - 1.0) > 1e-3:
+                        fixed.append((encode_vector(normalize_vector(vector)), row[0]))
+                # vec0 rejects INSERT OR REPLACE on an existing key; UPDATE works
+                conn.executemany(f"UPDATE {table} SET embedding = ? WHERE {pk} = ?", fixed)
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                logger.info(f"Embedding re-normalization deferred for {table}: {e}")
+                deferred = True
+                continue
+            if fixed:
+                logger.info(f"Re-normalized {len(fixed)} embeddings in {table}")
+
+        if not deferred:
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO _meta (key, value, updated_at)
+                       VALUES ('embeddings_normalized', '1', datetime('now'))"""
+                )
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Migration 28 _meta update failed: {e}")
+
     def _check_migration_integrity(self, conn: sqlite3.Connection) -> Optional[int]:
         """Check if migrations completed properly by verifying expected columns exist.
 
@@ -1215,6 +1678,48 @@ class Database:
             logger.warning("Migration 20 incomplete: entities missing close_circle column")
             return 19
 
+        # Migration 22 replaced the every-update FTS triggers
+        legacy = conn.execute(
+            f"SELECT 1 FROM sqlite_master WHERE type='trigger' AND name IN "
+            f"({', '.join('?' for _ in _LEGACY_FTS_TRIGGERS)})",
+            _LEGACY_FTS_TRIGGERS,
+        ).fetchone()
+        if legacy:
+            logger.warning("Migration 22 incomplete: legacy FTS triggers still installed")
+            return 21
+
+        # Migration 23 added the change_log table
+        if "change_log" not in tables:
+            logger.warning("Migration 23 incomplete: change_log table missing")
+            return 22
+
+        # Migration 24 added decay_ref_at to the decaying tables
+        if "decay_ref_at" not in memory_cols or "decay_ref_at" not in entity_cols:
+            logger.warning("Migration 24 incomplete: decay_ref_at column missing")
+            return 23
+
+        # Migration 25 added the chain_seals table
+        if "chain_seals" not in tables:
+            logger.warning("Migration 25 incomplete: chain_seals table missing")
+            return 24
+
+        # Migration 26 added the vault_file_state table
+        if "vault_file_state" not in tables:
+            logger.warning("Migration 26 incomplete: vault_file_state table missing")
+            return 25
+
+        # Migration 27 added the stat_counters table
+        if "stat_counters" not in tables:
+            logger.warning("Migration 27 incomplete: stat_counters table missing")
+            return 26
+
+        # Migration 28 re-normalized stored embeddings (retried until sqlite-vec loads)
+        if "_meta" in tables and not conn.execute(
+            "SELECT 1 FROM _meta WHERE key = 'embeddings_normalized'"
+        ).fetchone():
+            logger.info("Migration 28 incomplete: stored embeddings not yet re-normalized")
+            return 27
+
         return None  # All good
 
     def _store_workspace_path(self, conn: sqlite3.Connection) -> None:
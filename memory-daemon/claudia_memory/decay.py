@@ -0,0 +1,169 @@
+"""
+Closed-form importance decay for Claudia Memory System.
+
+Memory and entity importance, relationship strength and reflection
+importance are stored as a base value plus decay_ref_at, the moment that
+base was last true (falling back to created_at). The effective value is
+computed when read:
+
+    effective = base * rate ** whole_days_since_reference
+
+so consolidation no longer rewrites every row each night. Each
+consolidation run re-anchors every stored base whose reference is older
+than decay_rebase_days (ConsolidateService.rebase_decay), so readers that
+still look at the raw column trail the effective value by at most that many
+days of decay plus the time since the last run.
+
+Tiering matches the nightly passes this replaces:
+
+- Values above 0.7 decay at the slow rate (midway between 1.0 and the daily
+  rate) until they reach 0.7, then at the daily rate.
+- Nothing decays below the floor, and values already at or below it stay
+  put.
+- Sacred memories and relationships, and close-circle entities, do not
+  decay.
+- Reflections use their own per-row rate, untiered, with a 0.01 floor.
+
+database.py registers the SQL functions below on every connection. Writes
+that change importance or strength re-anchor decay_ref_at via trigger.
+"""
+
+import math
+import sqlite3
+from datetime import datetime
+from typing import Any, Optional
+
+from .config import get_config
+from .utils import parse_naive
+
+HIGH_VALUE_THRESHOLD = 0.7
+STRENGTH_FLOOR = 0.01
+REFLECTION_FLOOR = 0.01
+
+
+def decayed(
+    base: float,
+    days: float,
+    rate: float,
+    floor: float,
+    tiered: bool = True,
+) -> float:
+    """Value of `base` after `days` of decay at `rate` per day."""
+    if days <= 0 or base <= floor or rate >= 1.0:
+        return base
+    if tiered and base > HIGH_VALUE_THRESHOLD:
+        slow = (1.0 + rate) / 2
+        value = base * slow ** days
+        if value >= HIGH_VALUE_THRESHOLD:
+            return max(floor, value)
+        # Slow phase ends when the value reaches the threshold
+        days -= math.log(HIGH_VALUE_THRESHOLD / base) / math.log(slow)
+        base = HIGH_VALUE_THRESHOLD
+    return max(floor, base * rate ** days)
+
+
+def days_since(reference: Optional[str], now: Optional[datetime] = None) -> int:
+    """Whole days from an ISO timestamp to now (0 when unknown).
+
+    Whole days keep a value steady between reads on the same day, the way
+    the nightly pass did, instead of drifting on every call.
+    """
+    if not reference:
+        return 0
+    try:
+        ref = parse_naive(reference)
+    except (TypeError, ValueError):
+        return 0
+    return max(0, ((now or datetime.utcnow()) - ref).days)
+
+
+def effective_importance(
+    base: Optional[float],
+    reference: Optional[str],
+    exempt: Any = False,
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """Effective memory or entity importance."""
+    if base is None or exempt:
+        return base
+    config = get_config()
+    return decayed(base, days_since(reference, now), config.decay_rate_daily, config.min_importance_threshold)
+
+
+def effective_strength(
+    base: Optional[float],
+    reference: Optional[str],
+    exempt: Any = False,
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """Effective relationship strength."""
+    if base is None or exempt:
+        return base
+    return decayed(base, days_since(reference, now), get_config().decay_rate_daily, STRENGTH_FLOOR)
+
+
+def effective_reflection(
+    base: Optional[float],
+    reference: Optional[str],
+    rate: Optional[float],
+    now: Optional[datetime] = None,
+) -> Optional[float]:
+    """Effective reflection importance (per-row rate, untiered)."""
+    if base is None or rate is None:
+        return base
+    return decayed(base, days_since(reference, now), rate, REFLECTION_FLOOR, tiered=False)
+
+
+def row_importance(row: Any, now: Optional[datetime] = None) -> Optional[float]:
+    """Effective importance of a memories row fetched with SELECT m.*."""
+    keys = row.keys()
+    reference = row["decay_ref_at"] if "decay_ref_at" in keys else None
+    if reference is None:
+        # Without the column (older schema, narrow SELECT) the stored value
+        # is the best there is
+        if "decay_ref_at" not in keys:
+            return row["importance"]
+        reference = row["created_at"] if "created_at" in keys else None
+    sacred = "lifecycle_tier" in keys and row["lifecycle_tier"] == "sacred"
+    return effective_importance(row["importance"], reference, sacred, now)
+
+
+# SQL expressions for the effective value, by table alias
+
+
+def memory_importance_sql(alias: str = "m") -> str:
+    return (
+        f"effective_importance({alias}.importance, "
+        f"COALESCE({alias}.decay_ref_at, {alias}.created_at), "
+        f"{alias}.lifecycle_tier = 'sacred')"
+    )
+
+
+def entity_importance_sql(alias: str = "e") -> str:
+    return (
+        f"effective_importance({alias}.importance, "
+        f"COALESCE({alias}.decay_ref_at, {alias}.created_at), "
+        f"COALESCE({alias}.close_circle, 0))"
+    )
+
+
+def relationship_strength_sql(alias: str = "r") -> str:
+    return (
+        f"effective_strength({alias}.strength, "
+        f"COALESCE({alias}.decay_ref_at, {alias}.created_at), "
+        f"{alias}.lifecycle_tier = 'sacred')"
+    )
+
+
+def reflection_importance_sql(alias: str = "r") -> str:
+    return (
+        f"effective_reflection({alias}.importance, "
+        f"COALESCE({alias}.decay_ref_at, {alias}.created_at), {alias}.decay_rate)"
+    )
+
+
+def register_functions(conn: sqlite3.Connection) -> None:
+    """Expose the effective-value functions to SQL on this connection."""
+    conn.create_function("effective_importance", 3, effective_importance)
+    conn.create_function("effective_strength", 3, effective_strength)
+    conn.create_function("effective_reflection", 3, effective_reflection)
@@ -5,25 +5,48 @@ Connects to local Ollama for generating text embeddings.
 Uses all-minilm:l6-v2 model (384 dimensions) for semantic search.
 
 Includes retry logic to wait for Ollama to start (e.g., after system boot).
+
+Requests go to Ollama's /api/embed endpoint, which accepts an ``input`` array,
+so batch callers send size-bounded micro-batches instead of one request per
+text. Servers that predate /api/embed get per-text /api/embeddings calls.
+
+Embeddings are returned as packed float32 ``array('f')`` values (see
+vector_codec), ready to bind directly to vec0 columns.
 """
 
 import asyncio
 import hashlib
 import logging
+import sqlite3
 import threading
 import time
+from array import array
 from collections import OrderedDict
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
 
 import httpx
 
 from .config import get_config
+from .metrics import get_metrics
+from .vector_codec import (
+    VectorLike,
+    decode as decode_vector,
+    encode as encode_vector,
+    normalize,
+    to_array,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingCache:
-    """Thread-safe LRU cache for embeddings, keyed by SHA256 of input text."""
+    """Thread-safe LRU cache for embeddings, keyed by SHA256 of input text.
+
+    Entries are stored as ``array('f')``, roughly a quarter of the memory of
+    the equivalent list of Python floats.
+    """
 
     def __init__(self, maxsize: int = 256):
         self._cache: OrderedDict = OrderedDict()
@@ -35,7 +58,7 @@ class EmbeddingCache:
     def _key(self, text: str) -> str:
         return hashlib.sha256(text.encode()).hexdigest()
 
-    def get(self, text: str) -> Optional[List[float]]:
+    def get(self, text: str) -> Optional[array]:
         key = self._key(text)
         with self._lock:
             if key in self._cache:
@@ -45,8 +68,9 @@ class EmbeddingCache:
             self._misses += 1
             return None
 
-    def put(self, text: str, embedding: List[float]) -> None:
+    def put(self, text: str, embedding: VectorLike) -> None:
         key = self._key(text)
+        embedding = to_array(embedding)
         with self._lock:
             if key in self._cache:
                 self._cache.move_to_end(key)
@@ -70,6 +94,214 @@ class EmbeddingCache:
                 "maxsize": self._maxsize,
             }
 
+
+class PersistentEmbeddingCache:
+    """On-disk embedding cache shared across daemon restarts and projects.
+
+    A small SQLite file keyed by ``(model, dimensions, sha256(text))`` holding
+    packed float32 blobs. The in-process EmbeddingCache sits in front of it;
+    this tier is what lets a freshly started daemon answer recurring queries
+    without a round-trip to Ollama.
+
+    Eviction is least-recently-used by total blob size. ``last_used`` is only
+    rewritten when it is older than TOUCH_INTERVAL so that hot entries do not
+    turn every read into a write.
+    """
+
+    # PRAGMA user_version of the cache file. 1: every vector is unit length
+    # (version 0 files may hold raw /api/embeddings vectors and are cleared).
+    FORMAT_VERSION = 1
+    TOUCH_INTERVAL = 300.0  # seconds
+    EVICT_CHECK_EVERY = 64  # puts between size checks
+    LOW_WATER = 0.9  # evict down to this fraction of max_bytes
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._puts_since_check = 0
+
+    def _get_conn(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5.0)
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.execute("PRAGMA synchronous = NORMAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        model TEXT NOT NULL,
+                        dimensions INTEGER NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        last_used REAL NOT NULL,
+                        PRIMARY KEY (model, dimensions, text_hash)
+                    ) WITHOUT ROWID
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+                    "ON embedding_cache(last_used)"
+                )
+                if conn.execute("PRAGMA user_version").fetchone()[0] < self.FORMAT_VERSION:
+                    conn.execute("DELETE FROM embedding_cache")
+                    conn.execute(f"PRAGMA user_version = {self.FORMAT_VERSION}")
+                conn.commit()
+                self._conn = conn
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Persistent embedding cache disabled ({self.path}): {e}")
+                self._disabled = True
+        return self._conn
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, model: str, dimensions: int, text: str) -> Optional[array]:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return None
+            try:
+                key = self._key(text)
+                row = conn.execute(
+                    "SELECT vector, last_used FROM embedding_cache "
+                    "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                    (model, dimensions, key),
+                ).fetchone()
+                if row is None:
+                    self._misses += 1
+                    return None
+                now = time.time()
+                if now - row[1] > self.TOUCH_INTERVAL:
+                    conn.execute(
+                        "UPDATE embedding_cache SET last_used = ? "
+                        "WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                        (now, model, dimensions, key),
+                    )
+                    conn.commit()
+                self._hits += 1
+                return decode_vector(row[0])
+            except sqlite3.Error as e:
+                logger.debug(f"Persistent embedding cache read failed: {e}")
+                return None
+
+    def put(self, model: str, dimensions: int, text: str, embedding: VectorLike) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO embedding_cache "
+                    "(model, dimensions, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (model, dimensions, self._key(text), encode_vector(embedding), time.time()),
+                )
+                conn.commit()
+                self._puts_since_check += 1
+                if self._puts_since_check >= self.EVICT_CHECK_EVERY:
+                    self._puts_since_check = 0
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                logger.debug(f"Persistent embedding cache write failed: {e}")
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache").fetchone()
+        return row[0] if row else 0
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Drop least-recently-used entries until under the low-water mark."""
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return 0
+        target = int(self.max_bytes * self.LOW_WATER)
+        removed = 0
+        rows = conn.execute(
+            "SELECT model, dimensions, text_hash, LENGTH(vector) FROM embedding_cache "
+            "ORDER BY last_used ASC"
+        )
+        victims = []
+        for model, dims, key, size in rows:
+            if total <= target:
+                break
+            victims.append((model, dims, key))
+            total -= size
+        if victims:
+            conn.executemany(
+                "DELETE FROM embedding_cache WHERE model = ? AND dimensions = ? AND text_hash = ?",
+                victims,
+            )
+            conn.commit()
+            removed = len(victims)
+            self._evictions += removed
+        return removed
+
+    def evict(self) -> int:
+        """Run a size check now. Returns the number of entries evicted."""
+        with self._lock:
+            conn = self._get_conn()
+            return self._evict(conn) if conn is not None else 0
+
+    def invalidate_other_models(self, model: str, dimensions: int) -> int:
+        """Delete entries that were not produced by ``(model, dimensions)``."""
+        with self._lock:
+            conn = self._get_conn()
+            if conn is None:
+                return 0
+            try:
+                cur = conn.execute(
+                    "DELETE FROM embedding_cache WHERE model != ? OR dimensions != ?",
+                    (model, dimensions),
+                )
+                conn.commit()
+                return cur.rowcount
+            except sqlite3.Error as e:
+                logger.debug(f"Persistent embedding cache invalidation failed: {e}")
+                return 0
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            if conn is not None:
+                conn.execute("DELETE FROM embedding_cache")
+                conn.commit()
+
+    def stats(self, include_size: bool = True) -> dict:
+        """Counters plus, unless include_size is False, entries/bytes (a table scan)."""
+        with self._lock:
+            stats = {
+                "path": str(self.path),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "max_bytes": self.max_bytes,
+                "entries": 0 if include_size else None,
+                "bytes": 0 if include_size else None,
+                "enabled": not self._disabled,
+            }
+            conn = self._get_conn() if include_size else None
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+                    ).fetchone()
+                    stats["entries"], stats["bytes"] = row[0], row[1]
+                except sqlite3.Error:
+                    pass
+            return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
 # Retry configuration for waiting on Ollama
 OLLAMA_RETRY_ATTEMPTS = 5
 OLLAMA_RETRY_DELAY = 2  # seconds
@@ -78,15 +310,32 @@ OLLAMA_RETRY_DELAY = 2  # seconds
 class EmbeddingService:
     """Generate embeddings using local Ollama"""
 
+    # Batching defaults (overridden from config in __init__)
+    batch_size = 32
+    batch_max_chars = 16000
+    max_concurrency = 4
+    # None until the first request tells us whether /api/embed exists
+    _batch_endpoint: Optional[bool] = None
+    # Second cache tier on disk (None when disabled)
+    _disk_cache: Optional[PersistentEmbeddingCache] = None
+
     def __init__(self, host: Optional[str] = None, model: Optional[str] = None):
         config = get_config()
         self.host = host or config.ollama_host
         self.model = model or config.embedding_model
         self.dimensions = config.embedding_dimensions
+        self.batch_size = config.embedding_batch_size
+        self.batch_max_chars = config.embedding_batch_max_chars
+        self.max_concurrency = config.embedding_max_concurrency
         self._client: Optional[httpx.AsyncClient] = None
         self._sync_client: Optional[httpx.Client] = None
         self._available: Optional[bool] = None
         self._cache = EmbeddingCache()
+        if config.embedding_disk_cache_mb > 0:
+            self._disk_cache = PersistentEmbeddingCache(
+                config.embedding_cache_path,
+                max_bytes=config.embedding_disk_cache_mb * 1024 * 1024,
+            )
         self._model_mismatch = False
 
     async def _get_client(self) -> httpx.AsyncClient:
@@ -121,6 +370,7 @@ class EmbeddingService:
                         f"Run --migrate-embeddings to regenerate all embeddings."
                     )
                     self._model_mismatch = True
+                    self._invalidate_caches()
                 else:
                     self._model_mismatch = False
             else:
@@ -143,6 +393,7 @@ class EmbeddingService:
                         f"Run --migrate-embeddings to regenerate."
                     )
                     self._model_mismatch = True
+                    self._invalidate_caches()
         except Exception as e:
             logger.debug(f"Model consistency check skipped: {e}")
 
@@ -253,82 +504,296 @@ class EmbeddingService:
 
         return self._available
 
-    async def embed(self, text: str) -> Optional[List[float]]:
-        """Generate embedding for a single text"""
-        if not await self.is_available():
-            return None
+    # ------------------------------------------------------------------
+    # Cache tiers
+    # ------------------------------------------------------------------
 
+    def _cache_lookup(self, text: str) -> Optional[array]:
+        """Check the in-process cache, then the on-disk tier (promoting hits)."""
         cached = self._cache.get(text)
-        if cached is not None:
+        if cached is not None or self._disk_cache is None:
             return cached
+        cached = self._disk_cache.get(self.model, self.dimensions, text)
+        if cached is not None:
+            self._cache.put(text, cached)
+        return cached
+
+    def _cache_store(self, text: str, embedding: array, persist: bool = True) -> None:
+        self._cache.put(text, embedding)
+        if persist and self._disk_cache is not None:
+            self._disk_cache.put(self.model, self.dimensions, text, embedding)
+
+    def _invalidate_caches(self) -> None:
+        """Drop cached vectors that no longer match the configured model."""
+        self._cache.clear()
+        if self._disk_cache is not None:
+            removed = self._disk_cache.invalidate_other_models(self.model, self.dimensions)
+            if removed:
+                logger.info(f"Dropped {removed} persisted embeddings from other models")
+
+    def cache_stats(self, include_size: bool = True) -> dict:
+        """Hit/miss stats for both cache tiers.
+
+        include_size=False skips sizing the disk tier, which scans its table.
+        """
+        disk = self._disk_cache
+        return {
+            "memory": self._cache.stats(),
+            "disk": disk.stats(include_size=include_size) if disk is not None else None,
+        }
 
-        try:
-            client = await self._get_client()
-            response = await client.post(
-                f"{self.host}/api/embeddings",
-                json={"model": self.model, "prompt": text},
-            )
+    # ------------------------------------------------------------------
+    # Request helpers
+    # ------------------------------------------------------------------
+
+    def _micro_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into batches bounded by count and total characters.
+
+        A single text longer than the character budget gets a batch of its own.
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        chars = 0
+        for text in texts:
+            if current and (
+                len(current) >= self.batch_size or chars + len(text) > self.batch_max_chars
+            ):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(text)
+            chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _parse_vectors(self, data: dict, expected: int) -> List[Optional[array]]:
+        """Validate an Ollama response into one unit-length float32 array (or None) per input.
+
+        /api/embed already normalizes; /api/embeddings does not. Normalizing
+        here keeps vectors from either endpoint comparable.
+        """
+        vectors = data.get("embeddings")
+        if vectors is None and "embedding" in data:
+            vectors = [data["embedding"]]
+        vectors = vectors or []
+        if len(vectors) != expected:
+            logger.warning(f"Embedding response has {len(vectors)} vectors (expected {expected})")
+        results: List[Optional[array]] = []
+        for vector in vectors[:expected]:
+            if len(vector) == self.dimensions:
+                results.append(normalize(vector))
+            else:
+                logger.warning(
+                    f"Unexpected embedding dimensions: {len(vector)} "
+                    f"(expected {self.dimensions})"
+                )
+                results.append(None)
+        results.extend([None] * (expected - len(results)))
+        return results
+
+    def _check_batch_response(self, response: httpx.Response) -> Optional[bool]:
+        """Interpret an /api/embed response status.
 
+        Returns True when the body should be parsed, False when the server
+        lacks /api/embed (switches to per-text calls), None on other errors.
+        """
+        if response.status_code == 200:
+            self._batch_endpoint = True
+            return True
+        if response.status_code in (404, 405):
+            if self._batch_endpoint is not False:
+                logger.info("Ollama has no /api/embed endpoint; using per-text /api/embeddings")
+            self._batch_endpoint = False
+            return False
+        logger.error(f"Embedding request failed: {response.status_code}")
+        return None
+
+    def _post_batch_sync(self, texts: List[str]) -> List[Optional[array]]:
+        """Embed one micro-batch, falling back to per-text calls on older servers."""
+        client = self._get_sync_client()
+        if self._batch_endpoint is not False:
+            with get_metrics().timer("ollama.embed", endpoint="embed"):
+                response = client.post(
+                    f"{self.host}/api/embed",
+                    json={"model": self.model, "input": texts},
+                )
+            status = self._check_batch_response(response)
+            if status:
+                return self._parse_vectors(response.json(), len(texts))
+            if status is None:
+                return [None] * len(texts)
+        results = []
+        for text in texts:
+            with get_metrics().timer("ollama.embed", endpoint="embeddings"):
+                response = client.post(
+                    f"{self.host}/api/embeddings",
+                    json={"model": self.model, "prompt": text},
+                )
             if response.status_code == 200:
-                data = response.json()
-                embedding = data.get("embedding", [])
-                if len(embedding) == self.dimensions:
-                    self._cache.put(text, embedding)
-                    return embedding
-                else:
-                    logger.warning(
-                        f"Unexpected embedding dimensions: {len(embedding)} "
-                        f"(expected {self.dimensions})"
-                    )
+                results.append(self._parse_vectors(response.json(), 1)[0])
+            else:
+                logger.error(f"Embedding request failed: {response.status_code}")
+                results.append(None)
+        return results
+
+    async def _post_batch(self, texts: List[str]) -> List[Optional[array]]:
+        """Async counterpart of _post_batch_sync."""
+        client = await self._get_client()
+        if self._batch_endpoint is not False:
+            with get_metrics().timer("ollama.embed", endpoint="embed"):
+                response = await client.post(
+                    f"{self.host}/api/embed",
+                    json={"model": self.model, "input": texts},
+                )
+            status = self._check_batch_response(response)
+            if status:
+                return self._parse_vectors(response.json(), len(texts))
+            if status is None:
+                return [None] * len(texts)
+        results = []
+        for text in texts:
+            with get_metrics().timer("ollama.embed", endpoint="embeddings"):
+                response = await client.post(
+                    f"{self.host}/api/embeddings",
+                    json={"model": self.model, "prompt": text},
+                )
+            if response.status_code == 200:
+                results.append(self._parse_vectors(response.json(), 1)[0])
             else:
                 logger.error(f"Embedding request failed: {response.status_code}")
+                results.append(None)
+        return results
+
+    def _collect_misses(
+        self, texts: List[str], results: List[Optional[array]]
+    ) -> Dict[str, List[int]]:
+        """Fill cached results in place; return uncached text -> input positions."""
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(i)
+                continue
+            cached = self._cache_lookup(text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[text] = [i]
+        return pending
+
+    def _store_batch(
+        self,
+        batch: List[str],
+        vectors: List[Optional[array]],
+        pending: Dict[str, List[int]],
+        results: List[Optional[array]],
+    ) -> None:
+        for text, vector in zip(batch, vectors):
+            if vector is None:
+                continue
+            # Batch callers embed stored content (backfills, migrations,
+            # memory_batch), not recurring queries, so the results stay out
+            # of the size-bounded disk tier.
+            self._cache_store(text, vector, persist=False)
+            for i in pending[text]:
+                results[i] = vector
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def embed(self, text: str) -> Optional[array]:
+        """Generate embedding for a single text"""
+        if not await self.is_available():
+            return None
+
+        cached = self._cache_lookup(text)
+        if cached is not None:
+            return cached
 
+        try:
+            embedding = (await self._post_batch([text]))[0]
+            if embedding is not None:
+                self._cache_store(text, embedding)
+                return embedding
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
 
         return None
 
-    def embed_sync(self, text: str) -> Optional[List[float]]:
+    def embed_sync(self, text: str) -> Optional[array]:
         """Synchronous embedding generation"""
         if not self.is_available_sync():
             return None
 
-        cached = self._cache.get(text)
+        cached = self._cache_lookup(text)
         if cached is not None:
             return cached
 
         try:
-            client = self._get_sync_client()
-            response = client.post(
-                f"{self.host}/api/embeddings",
-                json={"model": self.model, "prompt": text},
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                embedding = data.get("embedding", [])
-                if len(embedding) == self.dimensions:
-                    self._cache.put(text, embedding)
-                    return embedding
-            else:
-                logger.error(f"Embedding request failed: {response.status_code}")
-
+            embedding = self._post_batch_sync([text])[0]
+            if embedding is not None:
+                self._cache_store(text, embedding)
+                return embedding
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
 
         return None
 
-    async def embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts"""
-        # Ollama doesn't have native batch support, so we parallelize
-        tasks = [self.embed(text) for text in texts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        # Convert exceptions to None so callers get consistent Optional results
-        return [r if not isinstance(r, BaseException) else None for r in results]
+    async def embed_batch(self, texts: List[str]) -> List[Optional[array]]:
+        """Generate embeddings for multiple texts.
 
-    def embed_batch_sync(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Synchronous batch embedding"""
-        return [self.embed_sync(text) for text in texts]
+        Cached texts are answered locally; the rest are deduplicated, packed
+        into micro-batches and sent with at most ``max_concurrency`` requests
+        in flight. Results line up with ``texts``; failures are None.
+        """
+        results: List[Optional[array]] = [None] * len(texts)
+        if not texts or not await self.is_available():
+            return results
+
+        pending = self._collect_misses(texts, results)
+        if not pending:
+            return results
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[str]) -> None:
+            async with semaphore:
+                try:
+                    vectors = await self._post_batch(batch)
+                except Exception as e:
+                    logger.error(f"Error generating batch embeddings: {e}")
+                    return
+            self._store_batch(batch, vectors, pending, results)
+
+        await asyncio.gather(*(run(b) for b in self._micro_batches(list(pending))))
+        return results
+
+    def embed_batch_sync(self, texts: List[str]) -> List[Optional[array]]:
+        """Synchronous batch embedding (same batching rules as embed_batch)."""
+        results: List[Optional[array]] = [None] * len(texts)
+        if not texts or not self.is_available_sync():
+            return results
+
+        pending = self._collect_misses(texts, results)
+        if not pending:
+            return results
+
+        def run(batch: List[str]) -> List[Optional[array]]:
+            try:
+                return self._post_batch_sync(batch)
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {e}")
+                return [None] * len(batch)
+
+        batches = self._micro_batches(list(pending))
+        if len(batches) == 1 or self.max_concurrency == 1:
+            outputs = [run(b) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                outputs = list(pool.map(run, batches))
+        for batch, vectors in zip(batches, outputs):
+            self._store_batch(batch, vectors, pending, results)
+        return results
 
     async def close(self) -> None:
         """Close the HTTP client"""
@@ -338,6 +803,8 @@ class EmbeddingService:
         if self._sync_client:
             self._sync_client.close()
             self._sync_client = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
 
 
 # Global embedding service instance
@@ -352,11 +819,11 @@ def get_embedding_service() -> EmbeddingService:
     return _embedding_service
 
 
-async def embed(text: str) -> Optional[List[float]]:
+async def embed(text: str) -> Optional[array]:
     """Convenience function for embedding text"""
     return await get_embedding_service().embed(text)
 
 
-def embed_sync(text: str) -> Optional[List[float]]:
+def embed_sync(text: str) -> Optional[array]:
     """Convenience function for synchronous embedding"""
     return get_embedding_service().embed_sync(text)
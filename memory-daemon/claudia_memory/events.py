@@ -0,0 +1,168 @@
+"""
+In-process event bus for live activity.
+
+Monitors and hooks learned about activity only by polling: the Brain
+Monitor re-queried SQLite every few seconds and hooks polled /health.
+Publishers now push small events here, and the health server's /events
+route streams them (daemon/stream.py):
+
+- audit.py publishes each audit entry as a ``write``, ``read`` or ``link``
+  event (OPERATION_KINDS), or ``audit`` for other operations
+- the daemon scheduler publishes a ``job`` event when a job finishes
+- full consolidation publishes a ``consolidation`` event as each phase ends
+- the MCP dispatcher publishes a ``tool`` event when a call finishes
+
+publish() never blocks and never touches the database. Each subscriber
+has a bounded queue; one that falls behind loses its oldest events and
+its ``dropped`` count says how many. The last HISTORY_SIZE events are
+kept so a reconnecting client can resume after the last id it saw.
+
+The bus is per process. MCP servers run in their own processes, so the
+daemon learns of their audit entries by tailing audit_log; publish_audit()
+remembers recent audit ids so an entry seen both ways is published once.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+HISTORY_SIZE = 512
+SUBSCRIBER_QUEUE_SIZE = 1024
+_AUDIT_DEDUPE_SIZE = 4096
+
+# audit_log operation -> event type
+OPERATION_KINDS: Dict[str, str] = {
+    **{op: "write" for op in (
+        "mem_create", "mem_correct", "mem_invalidate", "entity_new",
+        "entity_update", "entity_merge", "entity_delete", "batch",
+    )},
+    **{op: "read" for op in (
+        "recall", "recall_about", "search_entities", "session_context",
+        "morning_context", "briefing",
+    )},
+    **{op: "link" for op in ("relate", "relate_update", "entity_link")},
+}
+
+Event = Dict[str, Any]
+
+
+class Subscription:
+    """One subscriber's bounded event queue. Use as a context manager."""
+
+    def __init__(self, bus: "EventBus", maxsize: int):
+        self._bus = bus
+        self._events: Deque[Event] = deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def _push(self, event: Event) -> None:
+        with self._cond:
+            if len(self._events) >= self._maxsize:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> List[Event]:
+        """Wait up to `timeout` seconds for events, then return all queued (possibly none)."""
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBus:
+    """Fan-out of events to subscribers, with a short replay history."""
+
+    def __init__(self, history: int = HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscribers: List[Subscription] = []
+        self._audit_seen: Deque[Tuple[int, str]] = deque()
+        self._audit_seen_set: Set[Tuple[int, str]] = set()
+
+    def publish(self, type: str, **data: Any) -> Event:
+        """Publish an event of `type`; `data` must be JSON-serializable."""
+        with self._lock:
+            self._seq += 1
+            event = {
+                "id": self._seq,
+                "type": type,
+                "time": datetime.utcnow().isoformat(),
+                "data": data,
+            }
+            self._history.append(event)
+            for subscription in self._subscribers:
+                subscription._push(event)
+        return event
+
+    def publish_audit(self, audit_id: int, operation: str, **data: Any) -> Optional[Event]:
+        """Publish an audit entry once, however many times it is reported."""
+        key = (audit_id, operation)
+        with self._lock:
+            if key in self._audit_seen_set:
+                return None
+            self._audit_seen.append(key)
+            self._audit_seen_set.add(key)
+            if len(self._audit_seen) > _AUDIT_DEDUPE_SIZE:
+                self._audit_seen_set.discard(self._audit_seen.popleft())
+        return self.publish(
+            OPERATION_KINDS.get(operation, "audit"),
+            operation=operation, audit_id=audit_id, **data,
+        )
+
+    def subscribe(
+        self, after: Optional[int] = None, maxsize: int = SUBSCRIBER_QUEUE_SIZE
+    ) -> Subscription:
+        """Start receiving events; with `after`, first replay held events newer than that id."""
+        subscription = Subscription(self, maxsize)
+        with self._lock:
+            if after is not None:
+                for event in self._history:
+                    if event["id"] > after:
+                        subscription._push(event)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+# Global bus instance
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Get or create the process-wide event bus"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
+
+
+def publish(type: str, **data: Any) -> Event:
+    """Publish an event on the process-wide bus"""
+    return get_event_bus().publish(type, **data)
@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional
 import httpx
 
 from .config import get_config
+from .metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -185,10 +186,11 @@ class LanguageModelService:
             if format_json:
                 payload["format"] = "json"
 
-            response = await client.post(
-                f"{self.host}/api/generate",
-                json=payload,
-            )
+            with get_metrics().timer("ollama.generate", model=self.model):
+                response = await client.post(
+                    f"{self.host}/api/generate",
+                    json=payload,
+                )
 
             if response.status_code == 200:
                 data = response.json()
@@ -235,10 +237,11 @@ class LanguageModelService:
             if format_json:
                 payload["format"] = "json"
 
-            response = client.post(
-                f"{self.host}/api/generate",
-                json=payload,
-            )
+            with get_metrics().timer("ollama.generate", model=self.model):
+                response = client.post(
+                    f"{self.host}/api/generate",
+                    json=payload,
+                )
 
             if response.status_code == 200:
                 return response.json().get("response", "")
@@ -0,0 +1,310 @@
+"""
+Execution lanes for MCP tool calls.
+
+Every tool handler is ``async`` but calls synchronous services: recall does a
+blocking httpx round-trip to Ollama and then runs SQLite queries. Running those
+on the event loop meant concurrent tool calls (several Claude Code windows
+sharing one daemon) all queued behind the slowest Ollama request.
+
+The dispatcher moves handler execution off the event loop:
+
+- Read lane: a bounded thread pool. Each worker gets its own thread-local
+  ``Database`` connection (WAL allows concurrent readers), and statements
+  auto-commit individually. Recall access counts are buffered by
+  services.access_tracker and written back in batches off the read lane.
+- Write lane: a single worker thread. Mutating tools run there one at a time,
+  each wrapped in ``db.transaction()`` exactly as before, so writes never
+  contend with each other for the SQLite write lock. Each write-lane call
+  that commits drops cached recalls, so a handler that writes SQL directly
+  (memory_lifecycle archive, for one) cannot leave stale results behind.
+
+Per-tool metrics (calls, errors, in-flight, peak concurrency, queue wait and
+latency percentiles) are kept in memory and surfaced by memory_system_health.
+Tool latencies and queue waits are also recorded in the process metrics
+registry (claudia_memory.metrics), which flushes them to the metrics table.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from ..events import publish as publish_event
+from ..metrics import get_metrics
+from ..services.recall_cache import get_recall_cache
+
+logger = logging.getLogger(__name__)
+
+READ_LANE = "read"
+WRITE_LANE = "write"
+
+# Tools that never mutate user data, whatever their arguments.
+READ_TOOLS = frozenset({
+    "memory_recall",
+    "memory_about",
+    "memory_multi_recall",
+    "memory_deep_context",
+    "memory_briefing",
+    "memory_summary",
+    "memory_context",
+    "memory_system_health",
+    "memory_project_health",
+    # memory_temporal and its backward-compat names
+    "memory_temporal",
+    "memory_upcoming",
+    "memory_since",
+    "memory_timeline",
+    "memory_morning_context",
+    # memory_graph and its backward-compat names
+    "memory_graph",
+    "memory_project_network",
+    "memory_find_path",
+    "memory_network_hubs",
+    "memory_dormant_relationships",
+    "memory_reconnections",
+    # memory_provenance and its backward-compat names
+    "memory_provenance",
+    "memory_trace",
+    "memory_audit_history",
+    # Read-only backward-compat names of multiplexed tools
+    "memory_search_entities",
+    "memory_entity_overview",
+    "memory_vault_status",
+    # memory_session_context is left out: it marks the Telegram/Slack inbox read
+    "memory_unsummarized",
+    "memory_documents",
+})
+
+# Multiplexed tools: (argument key, default value, read-only values).
+# Any other value routes to the write lane.
+READ_OPERATIONS: Dict[str, tuple] = {
+    "memory_entities": ("operation", "search", frozenset({"search", "overview"})),
+    "memory_vault": ("operation", "status", frozenset({"status"})),
+    # "context" claims unread inbox episodes; it must stay in the single writer
+    "memory_session": ("operation", "context", frozenset({"unsummarized"})),
+    "memory_document": ("operation", "search", frozenset({"search"})),
+    "memory_reflections": ("action", "get", frozenset({"get", "search"})),
+    "memory_lifecycle": ("operation", None, frozenset({"status"})),
+    "memory_checkpoint": ("operation", None, frozenset({"list", "load"})),
+    "memory_rollback": ("operation", None, frozenset({"status"})),
+}
+
+# Latency samples kept per tool for percentile estimates
+LATENCY_WINDOW = 512
+
+
+def classify_tool(name: str, arguments: Optional[Dict[str, Any]] = None) -> str:
+    """Return the lane (READ_LANE or WRITE_LANE) a tool call should run in.
+
+    Unknown tools default to the write lane, which preserves the old
+    one-at-a-time behavior for anything not explicitly marked read-only.
+    """
+    canonical = name.replace(".", "_", 1) if name.startswith("memory.") else name
+    if canonical in READ_TOOLS:
+        return READ_LANE
+    spec = READ_OPERATIONS.get(canonical)
+    if spec is not None:
+        key, default, read_values = spec
+        value = (arguments or {}).get(key, default)
+        if value in read_values:
+            return READ_LANE
+    return WRITE_LANE
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class ToolMetrics:
+    """Concurrency and latency counters for one tool."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_ms = 0.0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._queue_waits: Deque[float] = deque(maxlen=window)
+
+    def started(self, queue_wait_ms: float) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._queue_waits.append(queue_wait_ms)
+
+    def finished(self, elapsed_ms: float, ok: bool) -> None:
+        self.in_flight -= 1
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        if not ok:
+            self.errors += 1
+        self._latencies.append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        waits = sorted(self._queue_waits)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "mean_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "queue_wait_p99_ms": round(_percentile(waits, 99), 2),
+        }
+
+
+class ToolDispatcher:
+    """Runs tool handlers on a bounded read pool or a single writer thread."""
+
+    def __init__(self, read_workers: int = 4):
+        self.read_workers = max(1, read_workers)
+        self._read_pool: Optional[ThreadPoolExecutor] = None
+        self._write_pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._metrics: Dict[str, ToolMetrics] = {}
+        self._lane_in_flight = {READ_LANE: 0, WRITE_LANE: 0}
+        self._lane_peak = {READ_LANE: 0, WRITE_LANE: 0}
+        self._metrics_lock = threading.Lock()
+        # Each worker thread keeps one event loop for its lifetime, so async
+        # clients cached by services (e.g. httpx.AsyncClient) stay bound to
+        # the loop that created them.
+        self._thread_state = threading.local()
+
+    def _pool(self, lane: str) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if lane == WRITE_LANE:
+                if self._write_pool is None:
+                    self._write_pool = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="claudia-mcp-write",
+                    )
+                return self._write_pool
+            if self._read_pool is None:
+                self._read_pool = ThreadPoolExecutor(
+                    max_workers=self.read_workers, thread_name_prefix="claudia-mcp-read",
+                )
+            return self._read_pool
+
+    def _worker_loop(self) -> asyncio.AbstractEventLoop:
+        loop = getattr(self._thread_state, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._thread_state.loop = loop
+        return loop
+
+    def _metrics_for(self, name: str) -> ToolMetrics:
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = self._metrics[name] = ToolMetrics()
+        return metrics
+
+    def _run_in_worker(
+        self,
+        name: str,
+        lane: str,
+        submitted_at: float,
+        make_coro: Callable[[], Awaitable[Any]],
+        db: Any,
+    ) -> Any:
+        """Worker-thread body: run the handler coroutine to completion."""
+        started_at = time.perf_counter()
+        with self._metrics_lock:
+            self._metrics_for(name).started((started_at - submitted_at) * 1000)
+            self._lane_in_flight[lane] += 1
+            self._lane_peak[lane] = max(self._lane_peak[lane], self._lane_in_flight[lane])
+
+        ok = False
+        try:
+            loop = self._worker_loop()
+            if lane == WRITE_LANE:
+                with db.transaction():
+                    # Bumps the recall cache generation once this call commits
+                    get_recall_cache(db).invalidate()
+                    result = loop.run_until_complete(make_coro())
+            else:
+                result = loop.run_until_complete(make_coro())
+            ok = not getattr(result, "isError", False)
+            return result
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            with self._metrics_lock:
+                self._metrics_for(name).finished(elapsed_ms, ok)
+                self._lane_in_flight[lane] -= 1
+            registry = get_metrics()
+            registry.observe("mcp.tool", elapsed_ms, tool=name, lane=lane)
+            registry.observe("mcp.queue_wait", (started_at - submitted_at) * 1000, lane=lane)
+            if not ok:
+                registry.incr("mcp.tool_errors", tool=name)
+            publish_event("tool", tool=name, lane=lane, ok=ok, duration_ms=round(elapsed_ms, 1))
+
+    async def dispatch(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        make_coro: Callable[[], Awaitable[Any]],
+        db: Any,
+    ) -> Any:
+        """Run ``make_coro()`` in the lane for this tool and await its result.
+
+        ``make_coro`` is called on the worker thread so the coroutine is
+        created and driven by that thread's event loop.
+        """
+        lane = classify_tool(name, arguments)
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        return await loop.run_in_executor(
+            self._pool(lane), self._run_in_worker, name, lane, submitted_at, make_coro, db,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of lane and per-tool metrics."""
+        with self._metrics_lock:
+            tools = {name: m.snapshot() for name, m in sorted(self._metrics.items())}
+            return {
+                "read_workers": self.read_workers,
+                "lanes": {
+                    lane: {"in_flight": self._lane_in_flight[lane], "peak_in_flight": self._lane_peak[lane]}
+                    for lane in (READ_LANE, WRITE_LANE)
+                },
+                "tools": tools,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop both lanes. Pending calls finish when ``wait`` is True."""
+        with self._pool_lock:
+            for pool in (self._read_pool, self._write_pool):
+                if pool is not None:
+                    pool.shutdown(wait=wait)
+            self._read_pool = None
+            self._write_pool = None
+
+
+# Global dispatcher instance
+_dispatcher: Optional[ToolDispatcher] = None
+
+
+def get_dispatcher() -> ToolDispatcher:
+    """Get or create the global tool dispatcher"""
+    global _dispatcher
+    if _dispatcher is None:
+        from ..config import get_config
+        _dispatcher = ToolDispatcher(read_workers=get_config().mcp_read_workers)
+    return _dispatcher
+
+
+def reset_dispatcher() -> None:
+    """Shut down and discard the global dispatcher (tests, daemon shutdown)."""
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.shutdown(wait=True)
+        _dispatcher = None
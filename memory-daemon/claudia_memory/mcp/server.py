@@ -51,6 +51,13 @@ from ..services.recall import (
     search_reflections,
     trace_memory,
 )
+from ..metrics import get_metrics
+from ..services.access_tracker import get_access_tracker
+from ..services.chain import get_chain_sealer
+from ..services.recall_cache import get_recall_cache
+from ..services.stat_counters import read_counters, row_counts
+from ..services.vault_writer import get_vault_writer
+from ..services.write_queue import get_write_queue
 from ..services.ingest import get_ingest_service
 from ..services.documents import get_document_service
 from ..services.audit import (
@@ -76,6 +83,7 @@ from ..services.remember import (
     remember_message,
 )
 from ..embeddings import get_embedding_service
+from .dispatch import get_dispatcher, reset_dispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -780,30 +788,16 @@ async def _handle_provenance(arguments, db, config, logger, **ctx):
             }))]
         )
     elif op == "verify_chain":
-        from ..services.remember import _compute_chain_hash
-        rows = db.execute(
-            "SELECT id, content, metadata, hash, prev_hash FROM memories ORDER BY id ASC",
-            fetch=True,
-        ) or []
-        chain_length = 0
-        is_valid = True
-        first_break_at = None
-        for row in rows:
-            if row["hash"] is None:
-                continue
-            chain_length += 1
-            meta = json.loads(row["metadata"]) if row["metadata"] else None
-            expected = _compute_chain_hash(row["content"], meta, row["prev_hash"])
-            if expected != row["hash"]:
-                is_valid = False
-                if first_break_at is None:
-                    first_break_at = row["id"]
+        from ..services.chain import verify_chain
+        _coerce_int(arguments, "from_id")
+        _coerce_int(arguments, "to_id")
+        # memory_provenance runs in the read lane, which must not write;
+        # pending rows are left to the chain sealer and reported as unsealed
+        result = verify_chain(
+            db, from_id=arguments.get("from_id"), to_id=arguments.get("to_id"), seal=False,
+        )
         return CallToolResult(
-            content=[TextContent(type="text", text=json.dumps({
-                "chain_length": chain_length,
-                "is_valid": is_valid,
-                "first_break_at": first_break_at,
-            }))]
+            content=[TextContent(type="text", text=json.dumps(result))]
         )
     else:
         return CallToolResult(
@@ -1689,6 +1683,12 @@ async def _handle_system_health(arguments, db, config, logger, **ctx):
         if "components" not in report:
             report["components"] = {}
         report["components"]["embedding_model_mismatch"] = True
+    report["mcp_dispatch"] = get_dispatcher().stats()
+    report["access_tracking"] = get_access_tracker().stats()
+    report["write_queue"] = get_write_queue().stats()
+    report["vault_writer"] = get_vault_writer().stats()
+    report["recall_cache"] = get_recall_cache().stats()
+    report["latency"] = get_metrics().snapshot()
     return CallToolResult(
         content=[
             TextContent(
@@ -3074,7 +3074,8 @@ async def list_tools() -> ListToolsResult:
                 "Trace memory origins, get full audit trails, or verify hash chain integrity. "
                 "Use operation='trace' to reconstruct a memory's full provenance chain, "
                 "'audit' to get the audit history for an entity or memory, "
-                "'verify_chain' to check SHA-256 hash chain integrity across all memories."
+                "'verify_chain' to check SHA-256 hash chain integrity across all memories "
+                "(or the memory id range from_id..to_id), after sealing any not yet hashed."
             ),
             annotations=ToolAnnotations(readOnlyHint=True),
             inputSchema={
@@ -3098,6 +3099,14 @@ async def list_tools() -> ListToolsResult:
                         "description": "Maximum audit entries (default 20)",
                         "default": 20,
                     },
+                    "from_id": {
+                        "type": "string",
+                        "description": "First memory ID to verify (for verify_chain)",
+                    },
+                    "to_id": {
+                        "type": "string",
+                        "description": "Last memory ID to verify (for verify_chain)",
+                    },
                 },
                 "required": ["operation"],
             },
@@ -3219,22 +3228,29 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
         # only ever see canonical parameter names. Purely additive: tools
         # without registered aliases are unchanged. See _PARAM_ALIASES.
         arguments = _apply_parameter_aliases(name, arguments)
-        with db.transaction():
-            handler = _TOOL_HANDLERS.get(name)
-            if handler:
-                return await handler(
+        handler = _TOOL_HANDLERS.get(name)
+        if handler:
+            # Handlers call blocking services (Ollama, SQLite), so they run in
+            # the dispatcher's read pool or writer lane, never on the event
+            # loop. The writer lane wraps each call in db.transaction().
+            return await get_dispatcher().dispatch(
+                name,
+                arguments,
+                lambda: handler(
                     arguments, db=db, config=None, logger=logger, tool_name=name,
-                )
-            else:
-                return CallToolResult(
-                    content=[
-                        TextContent(
-                            type="text",
-                            text=json.dumps({"error": f"Unknown tool: {name}"}),
-                        )
-                    ],
-                    isError=True,
-                )
+                ),
+                db,
+            )
+        else:
+            return CallToolResult(
+                content=[
+                    TextContent(
+                        type="text",
+                        text=json.dumps({"error": f"Unknown tool: {name}"}),
+                    )
+                ],
+                isError=True,
+            )
 
     except Exception as e:
         logger.exception(f"Error in tool {name}")
@@ -3281,12 +3297,10 @@ def _build_briefing() -> str:
                     consolidated_at = parse_naive(ts_row[0]["updated_at"])
                     if (datetime.utcnow() - consolidated_at) < _td(minutes=5):
                         # Just consolidated, include stats
-                        mem_row = db.execute("SELECT COUNT(*) as c FROM memories", fetch=True)
-                        ent_row = db.execute("SELECT COUNT(*) as c FROM entities WHERE deleted_at IS NULL", fetch=True)
-                        rel_row = db.execute("SELECT COUNT(*) as c FROM relationships", fetch=True)
-                        mem_c = mem_row[0]["c"] if mem_row else 0
-                        ent_c = ent_row[0]["c"] if ent_row else 0
-                        rel_c = rel_row[0]["c"] if rel_row else 0
+                        counts = row_counts(db)
+                        mem_c = counts["memories"]
+                        ent_c = counts["entities"]
+                        rel_c = counts["relationships"]
                         lines.append(
                             f"**✅ DATABASE CONSOLIDATED:** All memories unified into claudia.db. "
                             f"Current state: {mem_c:,} memories, {ent_c:,} entities, {rel_c:,} relationships. "
@@ -3426,9 +3440,13 @@ def _build_briefing() -> str:
 
     # 6. Embedding health check
     try:
-        mem_total = db.execute("SELECT COUNT(*) as c FROM memories WHERE invalidated_at IS NULL", fetch=True)
+        counters = read_counters(db)
+        if counters is not None:
+            mem_c = counters.get("memories.live", 0)
+        else:
+            mem_total = db.execute("SELECT COUNT(*) as c FROM memories WHERE invalidated_at IS NULL", fetch=True)
+            mem_c = mem_total[0]["c"] if mem_total else 0
         emb_total = db.execute("SELECT COUNT(*) as c FROM memory_embeddings", fetch=True)
-        mem_c = mem_total[0]["c"] if mem_total else 0
         emb_c = emb_total[0]["c"] if emb_total else 0
         if mem_c > 0:
             coverage = (emb_c / mem_c) * 100
@@ -3922,6 +3940,17 @@ async def run_server():
     db = get_db()
     db.initialize()
 
+    # Recall access counts are buffered and written back in the background,
+    # so read-only tool calls never take the write lock for bookkeeping.
+    access_tracker = get_access_tracker(db)
+    access_tracker.start()
+    # Latency timers are flushed to the metrics table the same way
+    get_metrics().start(db)
+    # New memories are inserted unhashed; without the daemon's scheduler
+    # nothing else would seal them into the hash chain
+    chain_sealer = get_chain_sealer(db)
+    chain_sealer.start()
+
     # Log stdin state for diagnostics (helps debug "exits immediately" issues)
     stdin_info = "unknown"
     try:
@@ -3962,6 +3991,12 @@ async def run_server():
     except Exception:
         logger.exception("MCP server crashed with exception")
     finally:
+        reset_dispatcher()
+        access_tracker.stop()
+        get_metrics().stop()
+        get_write_queue(db).stop()
+        chain_sealer.stop()
+        get_vault_writer(db).stop()
         _cleanup_startup_manifest()
 
 
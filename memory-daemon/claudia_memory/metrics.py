@@ -0,0 +1,399 @@
+"""
+Latency and counter instrumentation for hot paths.
+
+Migration 12 created a metrics table that nothing wrote to, so there was no
+way to see where the milliseconds went in a slow recall or tool call. This
+module records timings and counts in memory and flushes them to that table
+in batches:
+
+- Timers go into log-linear histograms (HDR-style: exact below 64us, then
+  32 sub-buckets per power of two, so any percentile is within ~3%). An
+  observation is a lock, a bucket computation and two dict increments.
+- Each (name, labels) pair keeps a cumulative histogram, for the
+  percentiles served by the health server's /metrics route and by
+  memory_system_health, and an interval histogram that the flusher drains.
+- flush() writes one metrics row per timer or counter touched since the
+  last flush. For a timer, metric_value is the interval's p95 in ms, and
+  dimensions (JSON) holds the labels, count, sum/max and the bucket counts,
+  so intervals from any process can be merged exactly later. For a
+  counter, metric_value is the increment.
+
+Only the background flusher writes to the database (start(db) is called by
+the MCP server and the daemon; stop() flushes what is left), so library
+and test callers never touch a database they did not open.
+
+Metric names are dotted (``recall.embed``, ``mcp.tool``); timer values are
+milliseconds.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Values below 2**_PRECISION microseconds get a bucket each; above that each
+# power of two is split into 2**(_PRECISION - 1) buckets.
+_PRECISION = 6
+_LINEAR = 1 << _PRECISION
+_HALF = _LINEAR >> 1
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _bucket(us: int) -> int:
+    if us < _LINEAR:
+        return max(us, 0)
+    shift = us.bit_length() - _PRECISION
+    return _LINEAR + (shift - 1) * _HALF + ((us >> shift) - _HALF)
+
+
+def _bucket_value(index: int) -> float:
+    """Midpoint of a bucket, in microseconds."""
+    if index < _LINEAR:
+        return float(index)
+    shift = (index - _LINEAR) // _HALF + 1
+    low = ((index - _LINEAR) % _HALF + _HALF) << shift
+    return low + (1 << shift) / 2
+
+
+class Histogram:
+    """Log-linear latency histogram (milliseconds in, milliseconds out)."""
+
+    __slots__ = ("counts", "count", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        index = _bucket(int(ms * 1000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, counts: Dict[int, int], count: int, sum_ms: float, max_ms: float) -> None:
+        for index, n in counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += count
+        self.sum_ms += sum_ms
+        self.max_ms = max(self.max_ms, max_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile in ms (bucket midpoint, capped at the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * pct // 100))
+        if rank >= self.count:
+            return self.max_ms
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(_bucket_value(index) / 1000, self.max_ms)
+        return self.max_ms
+
+    def cumulative(self, bounds_ms: List[float]) -> List[int]:
+        """Observations at or below each bound (by bucket midpoint), for exposition formats."""
+        out = [0] * len(bounds_ms)
+        for index, n in self.counts.items():
+            value_ms = _bucket_value(index) / 1000
+            for i, bound in enumerate(bounds_ms):
+                if value_ms <= bound:
+                    out[i] += n
+                    break
+        for i in range(1, len(out)):
+            out[i] += out[i - 1]
+        return out
+
+    def copy(self) -> "Histogram":
+        other = Histogram()
+        other.merge(self.counts, self.count, self.sum_ms, self.max_ms)
+        return other
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+def _labels(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+
+class StageClock:
+    """Times consecutive stages of one operation: each lap() records the time since the last."""
+
+    __slots__ = ("_registry", "_prefix", "_labels", "_start", "_last")
+
+    def __init__(self, registry: "MetricsRegistry", prefix: str, labels: LabelKey):
+        self._registry = registry
+        self._prefix = prefix
+        self._labels = labels
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._registry._observe(f"{self._prefix}.{stage}", self._labels, (now - self._last) * 1000)
+        self._last = now
+
+    def done(self) -> None:
+        """Record the whole operation as ``<prefix>.total``."""
+        self._registry._observe(
+            f"{self._prefix}.total", self._labels, (time.perf_counter() - self._start) * 1000
+        )
+
+
+class MetricsRegistry:
+    """In-memory timers and counters for this process, flushed to the metrics table."""
+
+    def __init__(self, flush_interval: float = 60.0, enabled: bool = True):
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timers: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._pending_timers: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._pending_counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._since = datetime.utcnow().isoformat()
+        self._db = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self.flush_count = 0
+        self.flushed_rows = 0
+
+    # ── Recording ──────────────────────────────────────────────
+
+    def _observe(self, name: str, labels: LabelKey, ms: float) -> None:
+        if not self.enabled:
+            return
+        key = (name, labels)
+        with self._lock:
+            total = self._timers.get(key)
+            if total is None:
+                total = self._timers[key] = Histogram()
+            total.record(ms)
+            interval = self._pending_timers.get(key)
+            if interval is None:
+                interval = self._pending_timers[key] = Histogram()
+            interval.record(ms)
+
+    def observe(self, name: str, ms: float, **labels: Any) -> None:
+        """Record one duration in milliseconds."""
+        self._observe(name, _labels(labels), ms)
+
+    def incr(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._pending_counters[key] = self._pending_counters.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Time the body of a with-block (recorded even if it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe(name, _labels(labels), (time.perf_counter() - start) * 1000)
+
+    def stages(self, prefix: str, **labels: Any) -> StageClock:
+        """Start timing an operation made of consecutive stages."""
+        return StageClock(self, prefix, _labels(labels))
+
+    # ── Reading ────────────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cumulative percentiles and counter totals since the process started."""
+        with self._lock:
+            timers: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), histogram in sorted(self._timers.items()):
+                timers.setdefault(name, []).append({"labels": dict(labels), **histogram.summary()})
+            counters: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return {"since": self._since, "timers": timers, "counters": counters}
+
+    def series(self) -> Tuple[List[Tuple[str, LabelKey, Histogram]], List[Tuple[str, LabelKey, float]]]:
+        """Copies of every cumulative timer and counter, sorted by name then labels."""
+        with self._lock:
+            timers = [(name, labels, h.copy()) for (name, labels), h in sorted(self._timers.items())]
+            counters = [(name, labels, v) for (name, labels), v in sorted(self._counters.items())]
+        return timers, counters
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        """The cumulative histogram for one timer, if it has been observed."""
+        with self._lock:
+            return self._timers.get((name, _labels(labels)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending_timers) + len(self._pending_counters)
+        return {
+            "enabled": self.enabled,
+            "pending_series": pending,
+            "flushes": self.flush_count,
+            "flushed_rows": self.flushed_rows,
+            "background": int(self._thread is not None),
+        }
+
+    # ── Flushing ───────────────────────────────────────────────
+
+    def flush(self, db=None) -> int:
+        """Write interval aggregates to the metrics table. Returns rows written."""
+        db = db or self._db
+        if db is None:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                timers, self._pending_timers = self._pending_timers, {}
+                counters, self._pending_counters = self._pending_counters, {}
+            if not timers and not counters:
+                return 0
+            stamp = datetime.utcnow().isoformat()
+            pid = os.getpid()
+            rows = []
+            for (name, labels), h in timers.items():
+                dimensions = {
+                    "kind": "timer",
+                    "labels": dict(labels),
+                    "pid": pid,
+                    "count": h.count,
+                    "sum_ms": round(h.sum_ms, 3),
+                    "max_ms": round(h.max_ms, 3),
+                    "buckets": h.counts,
+                }
+                rows.append((stamp, name, round(h.percentile(95), 3), json.dumps(dimensions)))
+            for (name, labels), value in counters.items():
+                dimensions = {"kind": "counter", "labels": dict(labels), "pid": pid}
+                rows.append((stamp, name, value, json.dumps(dimensions)))
+            try:
+                db.execute_many(
+                    "INSERT INTO metrics (timestamp, metric_name, metric_value, dimensions) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            except Exception as e:
+                logger.debug(f"Metrics flush failed, keeping {len(rows)} series pending: {e}")
+                with self._lock:
+                    for key, h in timers.items():
+                        pending = self._pending_timers.setdefault(key, Histogram())
+                        pending.merge(h.counts, h.count, h.sum_ms, h.max_ms)
+                    for key, value in counters.items():
+                        self._pending_counters[key] = self._pending_counters.get(key, 0) + value
+                return 0
+            self.flush_count += 1
+            self.flushed_rows += len(rows)
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"Metrics flusher error: {e}")
+        # The thread-local connection this thread opened is not reused
+        if self._db is not None:
+            self._db.close()
+
+    def start(self, db) -> None:
+        """Flush to `db` every flush_interval seconds on a background thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                return
+            self._db = db
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write whatever is still pending."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout=5)
+        self.flush()
+
+
+def summarize_rows(rows) -> Dict[str, List[Dict[str, Any]]]:
+    """Merge timer rows read back from the metrics table into percentiles per (name, labels).
+
+    Rows need metric_name and dimensions columns; counter rows are skipped.
+    """
+    merged: Dict[Tuple[str, LabelKey], Histogram] = {}
+    for row in rows:
+        try:
+            dims = json.loads(row["dimensions"] or "{}")
+        except (TypeError, ValueError):
+            continue
+        if dims.get("kind") != "timer":
+            continue
+        key = (row["metric_name"], _labels(dims.get("labels") or {}))
+        histogram = merged.setdefault(key, Histogram())
+        histogram.merge(
+            {int(k): v for k, v in (dims.get("buckets") or {}).items()},
+            dims.get("count", 0), dims.get("sum_ms", 0.0), dims.get("max_ms", 0.0),
+        )
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for (name, labels), histogram in sorted(merged.items()):
+        out.setdefault(name, []).append({"labels": dict(labels), **histogram.summary()})
+    return out
+
+
+def recent(db, minutes: float = 15, max_rows: int = 5000) -> Dict[str, List[Dict[str, Any]]]:
+    """Timer percentiles over the last `minutes`, merged across every process that flushed.
+
+    Only the newest `max_rows` rows are considered (a rowid range, so the
+    read stays cheap however long the table gets).
+    """
+    cutoff = datetime.utcfromtimestamp(time.time() - minutes * 60).isoformat()
+    rows = db.execute(
+        """
+        SELECT metric_name, dimensions FROM metrics
+        WHERE id > (SELECT COALESCE(MAX(id), 0) FROM metrics) - ? AND timestamp >= ?
+        """,
+        (max_rows, cutoff),
+        fetch=True,
+    ) or []
+    return summarize_rows(rows)
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the process-wide metrics registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                from .config import get_config
+                config = get_config()
+                _registry = MetricsRegistry(
+                    flush_interval=config.metrics_flush_interval_seconds,
+                    enabled=config.metrics_enabled,
+                )
+    return _registry
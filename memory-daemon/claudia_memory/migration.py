@@ -1274,13 +1274,10 @@ def rebuild_fts_index(db_path: Path) -> int:
     """
     try:
         conn = sqlite3.connect(str(db_path), timeout=30)
-        # Clear existing FTS data
-        conn.execute("INSERT INTO memories_fts(memories_fts) VALUES('delete-all')")
-        # Repopulate from memories table
-        conn.execute(
-            "INSERT INTO memories_fts(rowid, content) "
-            "SELECT id, content FROM memories WHERE invalidated_at IS NULL"
-        )
+        # memories_fts is an external-content index over memories; 'rebuild'
+        # repopulates it from every row so the delete trigger stays consistent
+        # (query time filters out invalidated memories).
+        conn.execute("INSERT INTO memories_fts(memories_fts) VALUES('rebuild')")
         conn.commit()
         count = conn.execute("SELECT COUNT(*) FROM memories_fts").fetchone()[0]
         conn.close()
@@ -27,6 +27,7 @@ CREATE TABLE IF NOT EXISTS entities (
     attention_tier TEXT DEFAULT 'standard',  -- active, watchlist, standard, archive
     close_circle BOOLEAN DEFAULT FALSE,  -- Inner circle: never decay, auto-sacred
     close_circle_reason TEXT,  -- Why this entity is close-circle
+    decay_ref_at TEXT,  -- When importance was last true (closed-form decay)
     UNIQUE(canonical_name, type)
 );
 
@@ -80,7 +81,8 @@ CREATE TABLE IF NOT EXISTS memories (
     fact_id TEXT UNIQUE,  -- UUID for human-friendly reference
     hash TEXT,  -- SHA-256 chain hash
     prev_hash TEXT,  -- Previous hash in chain (NULL for genesis)
-    workspace_id TEXT  -- Origin workspace (provenance, not partition)
+    workspace_id TEXT,  -- Origin workspace (provenance, not partition)
+    decay_ref_at TEXT  -- When importance was last true (closed-form decay)
 );
 
 CREATE INDEX IF NOT EXISTS idx_memories_type ON memories(type);
@@ -121,6 +123,7 @@ CREATE TABLE IF NOT EXISTS relationships (
     updated_at TEXT DEFAULT (datetime('now')),
     metadata TEXT,
     lifecycle_tier TEXT DEFAULT 'active',  -- Mirrors memory lifecycle for consistency
+    decay_ref_at TEXT,  -- When strength was last true (closed-form decay)
     UNIQUE(source_entity_id, target_entity_id, relationship_type)
 );
 
@@ -389,7 +392,8 @@ CREATE TABLE IF NOT EXISTS reflections (
     created_at TEXT DEFAULT (datetime('now')),
     updated_at TEXT,
     surfaced_count INTEGER DEFAULT 0,
-    last_surfaced_at TEXT
+    last_surfaced_at TEXT,
+    decay_ref_at TEXT  -- When importance was last true (closed-form decay)
 );
 
 CREATE INDEX IF NOT EXISTS idx_reflections_type ON reflections(reflection_type);
@@ -480,3 +484,80 @@ VALUES (20, 'Add lifecycle tiers, sacred memories, close-circle entities, fact_i
 
 INSERT OR IGNORE INTO schema_migrations (version, description)
 VALUES (21, 'Add workspace_id to memories for unified database provenance tracking');
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (22, 'Reindex memories_fts only when content changes');
+
+-- ============================================================================
+-- CHANGE LOG: Ids touched since the last consolidation pass
+-- ============================================================================
+-- Appended to by triggers (created in database.py, like the FTS5 triggers)
+-- and consumed by services/change_log.py.
+
+CREATE TABLE IF NOT EXISTS change_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,  -- memory, entity, relationship
+    ref_id INTEGER NOT NULL,
+    changed_at TEXT DEFAULT (datetime('now'))
+);
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (23, 'Add change_log for incremental consolidation');
+
+-- decay_ref_at on memories, entities, relationships and reflections is
+-- added to existing databases by migration 24 in database.py; see decay.py.
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (24, 'Add decay_ref_at for closed-form importance decay');
+
+-- Sealed ranges of the memory hash chain (services/chain.py). The chain
+-- itself lives in memories.hash / prev_hash; each row here records one
+-- sealing batch and the head hash it ended on.
+
+CREATE TABLE IF NOT EXISTS chain_seals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_id INTEGER NOT NULL,
+    to_id INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    head_hash TEXT NOT NULL,
+    sealed_at TEXT DEFAULT (datetime('now'))
+);
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (25, 'Add chain_seals for background hash-chain sealing');
+
+-- Stat cache for vault notes (services/vault_index.py). A note is re-read
+-- only when its mtime or size differs from the row recorded here.
+
+CREATE TABLE IF NOT EXISTS vault_file_state (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sync_hash TEXT,               -- From frontmatter; NULL if the note has none
+    body_hash TEXT,               -- Hash of the body when last read
+    entity_id INTEGER,
+    entity_type TEXT,
+    checked_at TEXT DEFAULT (datetime('now'))
+);
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (26, 'Add vault_file_state for incremental vault edit detection');
+
+-- Aggregate counts (services/stat_counters.py): rows per table, live
+-- memories by type, lifecycle tier and importance bucket, entities by type,
+-- pending predictions. Kept current by triggers created in database.py and
+-- recounted by a periodic reconcile job.
+
+CREATE TABLE IF NOT EXISTS stat_counters (
+    key TEXT PRIMARY KEY,         -- e.g. memories.type:fact; _reconciled_at is bookkeeping
+    value INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (27, 'Add stat_counters for maintained aggregate counts');
+
+-- Stored embeddings are unit length (embeddings.py normalizes every vector
+-- Ollama returns). Older databases are re-normalized by migration 28.
+
+INSERT OR IGNORE INTO schema_migrations (version, description)
+VALUES (28, 'Re-normalize stored embeddings to unit length');
@@ -0,0 +1,177 @@
+"""
+Buffered access tracking for recall results.
+
+Every recall bumps access_count and last_accessed_at on the memories it
+returns (the rehearsal signal boost_accessed_memories feeds on). Doing that
+with one UPDATE per result put a burst of writes, and the SQLite write lock,
+inside every read tool call; memory_multi_recall and memory_deep_context
+multiplied it into dozens of statements per call.
+
+Recall now only records ids here. Hits are summed per memory in memory and
+written back with a single executemany by flush(), which runs:
+
+- on a background flusher thread every flush_interval seconds, once start()
+  has been called (the MCP server does this at startup),
+- inline from record() when no flusher is running and the buffer is due,
+  so library and CLI callers still get their counts written,
+- at interpreter exit, for every tracker still holding counts, since
+  short-lived CLI and hook processes never call stop(),
+- before boost_accessed_memories and merge scoring read the columns.
+
+A failed flush puts its counts back into the buffer for the next attempt.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AccessTracker:
+    """In-memory access counters for one database, flushed in batches."""
+
+    def __init__(self, db, flush_interval: float = 30.0, max_pending: int = 500):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # memory_id -> (hits, latest access timestamp)
+        self._pending: Dict[int, Tuple[int, str]] = {}
+        self._last_flush = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self.flushed_total = 0
+        self.flush_count = 0
+        _live_trackers.add(self)
+
+    def record(self, memory_ids: Iterable[int], when: Optional[datetime] = None) -> None:
+        """Count one access for each id (repeats count once per occurrence)."""
+        stamp = (when or datetime.utcnow()).isoformat()
+        with self._lock:
+            for memory_id in memory_ids:
+                hits, last = self._pending.get(memory_id, (0, stamp))
+                self._pending[memory_id] = (hits + 1, max(last, stamp))
+            size = len(self._pending)
+        if self._thread is not None:
+            if size >= self.max_pending:
+                self._wake.set()
+        elif size >= self.max_pending or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def pending(self) -> Dict[int, Tuple[int, str]]:
+        """Snapshot of unflushed counts: memory_id -> (hits, last accessed)."""
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self) -> int:
+        """Write buffered counts to the memories table. Returns rows updated."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+            try:
+                self.db.execute_many(
+                    """
+                    UPDATE memories
+                    SET access_count = access_count + ?,
+                        last_accessed_at = MAX(COALESCE(last_accessed_at, ''), ?)
+                    WHERE id = ?
+                    """,
+                    [(hits, last, memory_id) for memory_id, (hits, last) in batch.items()],
+                )
+            except Exception as e:
+                logger.warning(f"Access count flush failed, keeping {len(batch)} pending: {e}")
+                with self._lock:
+                    for memory_id, (hits, last) in batch.items():
+                        cur_hits, cur_last = self._pending.get(memory_id, (0, last))
+                        self._pending[memory_id] = (cur_hits + hits, max(cur_last, last))
+                return 0
+            self.flushed_total += len(batch)
+            self.flush_count += 1
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"Access flusher error: {e}")
+
+    def start(self) -> None:
+        """Start the background flusher thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="access-flusher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and write whatever is still buffered."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "flushes": self.flush_count,
+            "flushed_rows": self.flushed_total,
+            "background": int(self._thread is not None),
+        }
+
+
+_trackers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+# Every tracker still alive, so buffered counts are written at exit
+_live_trackers: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    for tracker in list(_live_trackers):
+        db_path = getattr(tracker.db, "db_path", None)
+        # A database removed before exit has nowhere to take the counts
+        if not tracker._pending or (db_path is not None and not os.path.exists(db_path)):
+            continue
+        try:
+            tracker.flush()
+        except Exception as e:
+            logger.debug(f"Access count flush at exit failed: {e}")
+
+
+def get_access_tracker(db=None) -> AccessTracker:
+    """Get or create the access tracker for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _trackers_lock:
+        tracker = _trackers.get(db)
+        if tracker is None:
+            from ..config import get_config
+            config = get_config()
+            tracker = _trackers[db] = AccessTracker(
+                db,
+                flush_interval=config.access_flush_interval_seconds,
+                max_pending=config.access_flush_max_pending,
+            )
+        return tracker
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from ..database import get_db
+from ..events import get_event_bus
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,14 @@ class AuditService:
             },
         )
         logger.debug(f"Audit logged: {operation} (id={entry_id})")
+        # Published only once the row commits: a rolled-back id is reused by
+        # SQLite and would otherwise be deduped away when it really commits
+        self.db.after_commit(
+            lambda: get_event_bus().publish_audit(
+                entry_id, operation,
+                memory_id=memory_id, entity_id=entity_id, user_initiated=user_initiated,
+            )
+        )
         return entry_id
 
     def get_recent(
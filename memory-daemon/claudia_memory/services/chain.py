@@ -0,0 +1,292 @@
+"""
+SHA-256 hash chain over memories, sealed in the background.
+
+Each memory's hash covers its content, its metadata and the previous
+memory's hash, so editing or deleting any sealed row breaks every link
+after it. remember_fact used to extend the chain inline: read
+_meta.chain_head, hash, update the memory, upsert the head. That added
+three statements to every insert and made all writers queue on one _meta
+row.
+
+Memories are now inserted unhashed. seal_pending() walks new rows in id
+order, in batches. It runs as the daemon's chain_seal scheduler job and on
+ChainSealer, the background thread the MCP server starts (MCP-only
+installs run no scheduler). Both may run against one database: the
+transaction that loses the race to write fails and its rows are sealed on
+the next pass. For each batch it hashes the rows against the running head,
+writes hash/prev_hash with one executemany, advances _meta.chain_head and
+_meta.chain_sealed_through, and records the batch in chain_seals. SQLite
+has one writer, so ids become visible in increasing order and the cursor
+never skips a row that commits later.
+
+verify_chain() first seals whatever is pending in its range (when chaining
+is enabled and the caller may write), so a check never silently skips rows
+that simply have not been hashed yet. It then walks the range in batches
+of `batch` rows, so memory use is bounded whatever the range. It
+recomputes each hash, checks each prev_hash against the row before it, and
+checks every recorded seal head.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_HEAD_KEY = "chain_head"
+_CURSOR_KEY = "chain_sealed_through"
+
+
+def compute_chain_hash(content: str, metadata, prev_hash) -> str:
+    """Compute SHA-256 chain hash for memory integrity verification."""
+    payload = f"{content}|{json.dumps(metadata, sort_keys=True) if metadata else ''}|{prev_hash or ''}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _row_hash(row, prev_hash) -> str:
+    metadata = json.loads(row["metadata"]) if row["metadata"] else None
+    return compute_chain_hash(row["content"], metadata, prev_hash)
+
+
+def _meta_value(db, key: str) -> Optional[str]:
+    rows = db.execute("SELECT value FROM _meta WHERE key = ?", (key,), fetch=True)
+    return rows[0]["value"] if rows else None
+
+
+def _set_meta(db, key: str, value: str) -> None:
+    db.execute(
+        """INSERT INTO _meta (key, value, updated_at) VALUES (?, ?, datetime('now'))
+           ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at""",
+        (key, value),
+    )
+
+
+def sealed_through(db) -> int:
+    """Highest memory id covered by the chain."""
+    value = _meta_value(db, _CURSOR_KEY)
+    if value is not None:
+        return int(value)
+    # Before the first seal: rows hashed inline by older versions count
+    rows = db.execute("SELECT MAX(id) AS hi FROM memories WHERE hash IS NOT NULL", fetch=True)
+    return (rows[0]["hi"] if rows else None) or 0
+
+
+def seal_pending(
+    db,
+    batch: int = 1000,
+    max_batches: Optional[int] = None,
+    through: Optional[int] = None,
+) -> int:
+    """Extend the chain over unsealed memories (up to id `through`). Returns rows sealed."""
+    sealed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with db.transaction():
+            cursor = sealed_through(db)
+            head = _meta_value(db, _HEAD_KEY)
+            sql = "SELECT id, content, metadata FROM memories WHERE id > ?"
+            params: list = [cursor]
+            if through is not None:
+                sql += " AND id <= ?"
+                params.append(through)
+            rows = db.execute(sql + " ORDER BY id LIMIT ?", (*params, batch), fetch=True) or []
+            if not rows:
+                break
+
+            updates = []
+            prev = head
+            for row in rows:
+                chain_hash = _row_hash(row, prev)
+                updates.append((chain_hash, prev, row["id"]))
+                prev = chain_hash
+            db.execute_many("UPDATE memories SET hash = ?, prev_hash = ? WHERE id = ?", updates)
+
+            first_id, last_id = rows[0]["id"], rows[-1]["id"]
+            _set_meta(db, _HEAD_KEY, prev)
+            _set_meta(db, _CURSOR_KEY, str(last_id))
+            db.insert("chain_seals", {
+                "from_id": first_id,
+                "to_id": last_id,
+                "row_count": len(rows),
+                "head_hash": prev,
+                "sealed_at": datetime.utcnow().isoformat(),
+            })
+        sealed += len(rows)
+        batches += 1
+        if len(rows) < batch:
+            break
+
+    if sealed:
+        logger.debug(f"Sealed {sealed} memories into the hash chain")
+    return sealed
+
+
+def verify_chain(
+    db,
+    from_id: Optional[int] = None,
+    to_id: Optional[int] = None,
+    batch: int = 1000,
+    seal: bool = True,
+) -> Dict[str, Any]:
+    """Verify hashes and links for memories in [from_id, to_id].
+
+    With `seal`, pending rows up to to_id are sealed first (`sealed_now`),
+    unless enable_chain_verification is off. Sealing writes, so read-only
+    callers pass seal=False. Rows still without a hash (inserted while
+    chaining was disabled, or sealing failed) are skipped, as before;
+    `unsealed` counts the ones past the sealed cursor.
+    """
+    from ..config import get_config
+
+    lo = from_id if from_id is not None else 0
+    hi = to_id
+    sealed_now = 0
+    if seal and get_config().enable_chain_verification:
+        try:
+            sealed_now = seal_pending(db, batch=batch, through=hi)
+        except Exception as e:
+            logger.warning(f"Sealing before verification failed: {e}")
+    result: Dict[str, Any] = {
+        "from_id": from_id,
+        "to_id": to_id,
+        "chain_length": 0,
+        "is_valid": True,
+        "first_break_at": None,
+        "sealed_through": sealed_through(db),
+        "sealed_now": sealed_now,
+    }
+
+    def broken(memory_id: int) -> None:
+        result["is_valid"] = False
+        if result["first_break_at"] is None or memory_id < result["first_break_at"]:
+            result["first_break_at"] = memory_id
+
+    # The link into the range comes from the last hashed row before it
+    before = db.execute(
+        "SELECT hash FROM memories WHERE id < ? AND hash IS NOT NULL ORDER BY id DESC LIMIT 1",
+        (lo,),
+        fetch=True,
+    )
+    prev_hash = before[0]["hash"] if before else None
+    check_link = bool(before) or lo == 0
+
+    last_id = lo - 1
+    while True:
+        sql = "SELECT id, content, metadata, hash, prev_hash FROM memories WHERE id > ? AND hash IS NOT NULL"
+        params: list = [last_id]
+        if hi is not None:
+            sql += " AND id <= ?"
+            params.append(hi)
+        sql += " ORDER BY id LIMIT ?"
+        params.append(batch)
+        rows = db.execute(sql, tuple(params), fetch=True) or []
+        for row in rows:
+            result["chain_length"] += 1
+            if _row_hash(row, row["prev_hash"]) != row["hash"]:
+                broken(row["id"])
+            elif check_link and row["prev_hash"] != prev_hash:
+                broken(row["id"])
+            prev_hash = row["hash"]
+            check_link = True
+        if len(rows) < batch:
+            break
+        last_id = rows[-1]["id"]
+
+    # Every recorded seal head must still be the hash of its last row
+    seal_sql = (
+        "SELECT s.to_id, s.head_hash, m.hash FROM chain_seals s "
+        "LEFT JOIN memories m ON m.id = s.to_id WHERE s.to_id >= ?"
+    )
+    seal_params: list = [lo]
+    if hi is not None:
+        seal_sql += " AND s.to_id <= ?"
+        seal_params.append(hi)
+    try:
+        for seal in db.execute(seal_sql, tuple(seal_params), fetch=True) or []:
+            if seal["hash"] != seal["head_hash"]:
+                broken(seal["to_id"])
+    except Exception as e:
+        logger.debug(f"Seal head check skipped: {e}")
+
+    unsealed = db.execute(
+        "SELECT COUNT(*) AS n FROM memories WHERE id > ?", (result["sealed_through"],), fetch=True
+    )
+    result["unsealed"] = unsealed[0]["n"] if unsealed else 0
+    return result
+
+
+class ChainSealer:
+    """Background thread that runs seal_pending() every `interval` seconds."""
+
+    def __init__(self, db, interval: float = 60.0, batch: int = 1000, enabled: bool = True):
+        self.db = db
+        self.interval = interval
+        self.batch = batch
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self.sealed_total = 0
+
+    def seal(self) -> int:
+        try:
+            sealed = seal_pending(self.db, batch=self.batch)
+        except Exception as e:
+            logger.debug(f"Chain sealing failed: {e}")
+            return 0
+        self.sealed_total += sealed
+        return sealed
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stopping:
+                self.seal()
+
+    def start(self) -> None:
+        """Start the sealer thread (idempotent; does nothing when chaining is disabled)."""
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="chain-sealer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sealer thread and seal whatever is still pending."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            self._wake.set()
+            thread.join(timeout=5)
+            self.seal()
+
+
+_sealers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_sealers_lock = threading.Lock()
+
+
+def get_chain_sealer(db=None) -> ChainSealer:
+    """Get or create the chain sealer for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _sealers_lock:
+        sealer = _sealers.get(db)
+        if sealer is None:
+            from ..config import get_config
+            config = get_config()
+            sealer = _sealers[db] = ChainSealer(
+                db,
+                interval=config.chain_seal_interval_seconds,
+                batch=config.chain_seal_batch,
+                enabled=config.enable_chain_verification,
+            )
+        return sealer
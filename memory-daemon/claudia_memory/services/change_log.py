@@ -0,0 +1,134 @@
+"""
+Change tracking for incremental consolidation.
+
+Triggers installed by database.py append a row to change_log whenever a
+memory is written, re-dated or invalidated, a memory is linked to or
+unlinked from an entity (remember_fact, merge_entities, delete_entity), an
+entity is created, retyped or soft-deleted, or a relationship is created or
+changes shape (relate_entities, merge_entities, invalidation). Importance
+and strength updates from decay touch every row and are not logged.
+
+Nightly consolidation reads everything past its cursor, recomputes only
+the entities those rows affect, and commits the cursor. The log lives in
+the database rather than in memory because the MCP server (which takes the
+writes) and the daemon (which consolidates) are separate processes.
+
+A consumer with no cursor yet, or whose unread rows were pruned by
+retention, gets a ChangeSet with full=True and must do a complete pass.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Set
+
+logger = logging.getLogger(__name__)
+
+_CURSOR_PREFIX = "change_log_cursor:"
+_CHUNK = 500
+
+
+@dataclass
+class ChangeSet:
+    """Ids touched since a consumer's cursor."""
+
+    consumer: str
+    last_id: int
+    full: bool = False
+    memory_ids: Set[int] = field(default_factory=set)
+    entity_ids: Set[int] = field(default_factory=set)
+    relationship_ids: Set[int] = field(default_factory=set)
+
+    def __len__(self) -> int:
+        return len(self.memory_ids) + len(self.entity_ids) + len(self.relationship_ids)
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), _CHUNK):
+        yield ids[start:start + _CHUNK]
+
+
+def pending_changes(db, consumer: str) -> ChangeSet:
+    """Collect the ids logged since `consumer` last committed."""
+    row = db.execute(
+        "SELECT value FROM _meta WHERE key = ?", (_CURSOR_PREFIX + consumer,), fetch=True
+    )
+    cursor = int(row[0]["value"]) if row and row[0]["value"] is not None else None
+
+    # AUTOINCREMENT keeps the high-water mark even after rows are pruned
+    seq = db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'", fetch=True)
+    hi = seq[0]["seq"] if seq else 0
+
+    if cursor is None:
+        return ChangeSet(consumer, last_id=hi, full=True)
+    if hi <= cursor:
+        return ChangeSet(consumer, last_id=cursor)
+    lo = db.execute("SELECT MIN(id) AS lo FROM change_log", fetch=True)[0]["lo"]
+    if lo is None or lo > cursor + 1:
+        # Rows this consumer never saw were pruned
+        logger.info(f"change_log pruned past {consumer} cursor, falling back to a full pass")
+        return ChangeSet(consumer, last_id=hi, full=True)
+
+    changes = ChangeSet(consumer, last_id=hi)
+    buckets = {
+        "memory": changes.memory_ids,
+        "entity": changes.entity_ids,
+        "relationship": changes.relationship_ids,
+    }
+    rows = db.execute(
+        "SELECT DISTINCT kind, ref_id FROM change_log WHERE id > ? AND id <= ?",
+        (cursor, hi),
+        fetch=True,
+    ) or []
+    for r in rows:
+        bucket = buckets.get(r["kind"])
+        if bucket is not None:
+            bucket.add(r["ref_id"])
+    return changes
+
+
+def affected_entities(db, changes: ChangeSet) -> Set[int]:
+    """Entities touched directly, via a linked memory, or as a relationship endpoint."""
+    entity_ids = set(changes.entity_ids)
+    for chunk in _chunks(sorted(changes.memory_ids)):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = db.execute(
+            f"SELECT DISTINCT entity_id FROM memory_entities WHERE memory_id IN ({placeholders})",
+            tuple(chunk),
+            fetch=True,
+        ) or []
+        entity_ids.update(r["entity_id"] for r in rows)
+    for chunk in _chunks(sorted(changes.relationship_ids)):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = db.execute(
+            f"SELECT source_entity_id, target_entity_id FROM relationships WHERE id IN ({placeholders})",
+            tuple(chunk),
+            fetch=True,
+        ) or []
+        for r in rows:
+            entity_ids.add(r["source_entity_id"])
+            entity_ids.add(r["target_entity_id"])
+    return entity_ids
+
+
+def commit_changes(db, changes: ChangeSet) -> int:
+    """Advance the consumer's cursor and drop rows every consumer has read.
+
+    Returns the number of change_log rows pruned.
+    """
+    now = datetime.utcnow().isoformat()
+    db.execute(
+        "INSERT OR REPLACE INTO _meta (key, value, updated_at) VALUES (?, ?, ?)",
+        (_CURSOR_PREFIX + changes.consumer, str(changes.last_id), now),
+    )
+    row = db.execute(
+        "SELECT MIN(CAST(value AS INTEGER)) AS low FROM _meta WHERE key LIKE ?",
+        (_CURSOR_PREFIX + "%",),
+        fetch=True,
+    )
+    low = row[0]["low"] if row else None
+    if low is None:
+        return 0
+    db.execute("DELETE FROM change_log WHERE id <= ?", (low,))
+    result = db.execute("SELECT changes()", fetch=True)
+    return result[0][0] if result else 0
@@ -7,14 +7,39 @@ Runs on a schedule (typically overnight) to maintain memory health.
 
 import json
 import logging
+import math
+import operator
+import time
+from array import array
 from collections import Counter, defaultdict
+from itertools import islice
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import numpy as _np
+except ImportError:  # optional: pip install claudia-memory[vector]
+    _np = None
 
 from ..config import get_config
 from ..database import get_db
+from ..events import publish as publish_event
+from ..decay import (
+    REFLECTION_FLOOR,
+    STRENGTH_FLOOR,
+    entity_importance_sql,
+    memory_importance_sql,
+    reflection_importance_sql,
+    relationship_strength_sql,
+)
 from ..utils import parse_naive
+from ..vector_codec import decode as decode_vector, encode as encode_vector
+from .access_tracker import get_access_tracker
+from .change_log import affected_entities, commit_changes, pending_changes
+from .fuzzy_index import get_fuzzy_index
+from .graph_index import get_graph_index
+from .recall_cache import invalidates_recall
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +56,189 @@ def _cosine_similarity(a: list, b: list) -> float:
     return dot / (norm_a * norm_b)
 
 
+# Rows per similarity block when merging near-duplicates with numpy
+MERGE_BLOCK_ROWS = 512
+# Neighbours fetched per memory when merging through vec0 KNN instead
+MERGE_KNN_K = 16
+
+
+def _unit(vector: array) -> array:
+    """Scale a float32 vector to unit length (zero vectors stay zero)."""
+    norm = math.sqrt(sum(map(operator.mul, vector, vector)))
+    if norm == 0:
+        return vector
+    return array("f", (x / norm for x in vector))
+
+
+def _similar_pairs(
+    vectors: List[array],
+    threshold: float,
+    block_rows: int = MERGE_BLOCK_ROWS,
+) -> Iterator[Tuple[int, int]]:
+    """Yield index pairs (i, j), i < j, whose cosine similarity >= threshold.
+
+    Pairs come out ordered by i, then j. With numpy the vectors are stacked
+    into one normalized matrix and compared ``block_rows`` rows at a time
+    against the rows after them, so memory stays bounded at
+    block_rows x n. Without numpy it falls back to pure Python on
+    pre-normalized vectors (one multiply-add per component per pair).
+    """
+    n = len(vectors)
+    if n < 2:
+        return
+    if _np is not None:
+        matrix = _np.vstack([_np.frombuffer(v, dtype=_np.float32) for v in vectors])
+        norms = _np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        for start in range(0, n, block_rows):
+            sims = matrix[start:start + block_rows] @ matrix[start:].T
+            rows, cols = _np.nonzero(sims >= threshold)
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                if c > r:
+                    yield start + r, start + c
+        return
+
+    units = [_unit(v) for v in vectors]
+    for i in range(n):
+        a = units[i]
+        for j in range(i + 1, n):
+            if sum(map(operator.mul, a, units[j])) >= threshold:
+                yield i, j
+
+
+# Inferred connections reported per detection run, strongest rule first
+MAX_INFERRED_CONNECTIONS = 500
+
+
+class _ConnectionKeys(NamedTuple):
+    """A person's metadata attributes, lower-cased for matching."""
+
+    company: str
+    communities: FrozenSet[str]
+    city: str
+    industries: FrozenSet[str]
+
+
+def _connection_keys(meta: Dict[str, Any]) -> _ConnectionKeys:
+    geography = meta.get("geography") or {}
+    return _ConnectionKeys(
+        company=(meta.get("company") or "").lower(),
+        communities=frozenset(c.lower() for c in meta.get("communities") or []),
+        city=(geography.get("city") or "").lower() if isinstance(geography, dict) else "",
+        industries=frozenset(i.lower() for i in meta.get("industries") or []),
+    )
+
+
+# (relationship type, confidence, attribute keys) in precedence order: a
+# pair gets the first rule under which the two people share a key.
+_CONNECTION_RULES: List[Tuple[str, float, Callable[[_ConnectionKeys], Iterable[Any]]]] = [
+    # Same company = definitely connected (colleagues)
+    ("colleagues", 0.9, lambda k: (k.company,) if k.company else ()),
+    # Same community = probably know each other
+    ("community_connection", 0.6, lambda k: k.communities),
+    # Same city + same industry = might know each other
+    ("likely_connected", 0.3, lambda k: [(k.city, i) for i in k.industries] if k.city else ()),
+    # Same industry alone = weak inference
+    ("industry_peers", 0.2, lambda k: k.industries),
+]
+
+
+def _infer_connection(a: _ConnectionKeys, b: _ConnectionKeys) -> Optional[Tuple[str, float]]:
+    for rel_type, confidence, keys_of in _CONNECTION_RULES:
+        if set(keys_of(a)) & set(keys_of(b)):
+            return rel_type, confidence
+    return None
+
+
+class _Person(NamedTuple):
+    id: int
+    name: str
+    importance: float
+    meta: Dict[str, Any]
+    keys: _ConnectionKeys
+
+
+class ConnectionSnapshot:
+    """People and existing relationships, read once and shared by the relationship detectors.
+
+    Detectors used to compare every pair of the top N people, with one
+    relationships lookup and two entity reads per pair. Here the existing
+    edges are a set of id pairs, each person's metadata is parsed once, and
+    candidate pairs come from inverted indexes (attribute -> people), so
+    only people who share something are ever paired.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._edges: Optional[Set[Tuple[int, int]]] = None
+        self._people: Optional[List[_Person]] = None
+
+    @property
+    def edges(self) -> Set[Tuple[int, int]]:
+        """(lower id, higher id) for every relationship, in either direction."""
+        if self._edges is None:
+            rows = self.db.execute(
+                "SELECT source_entity_id, target_entity_id FROM relationships", fetch=True
+            ) or []
+            self._edges = {
+                (a, b) if a < b else (b, a)
+                for a, b in ((r["source_entity_id"], r["target_entity_id"]) for r in rows)
+            }
+        return self._edges
+
+    def linked(self, a: int, b: int) -> bool:
+        return ((a, b) if a < b else (b, a)) in self.edges
+
+    def people(self, min_importance: float) -> List[_Person]:
+        """People with metadata above `min_importance`, most important first."""
+        if self._people is None:
+            rows = self.db.execute(
+                """
+                SELECT id, name, importance, metadata FROM entities
+                WHERE type = 'person' AND metadata IS NOT NULL
+                ORDER BY importance DESC, id
+                """,
+                fetch=True,
+            ) or []
+            people = []
+            for row in rows:
+                try:
+                    meta = json.loads(row["metadata"]) or {}
+                    people.append(_Person(row["id"], row["name"], row["importance"], meta, _connection_keys(meta)))
+                except (TypeError, ValueError, AttributeError):
+                    continue
+            self._people = people
+        return [p for p in self._people if p.importance > min_importance]
+
+    def connection_candidates(
+        self, people: List[_Person], min_confidence: float = 0.0
+    ) -> Iterator[Tuple[_Person, _Person, str, float, Any]]:
+        """Yield unlinked pairs sharing an attribute: (a, b, rel_type, confidence, shared key).
+
+        Rules are applied strongest first and each pair is yielded once,
+        under the first rule that matches, as infer_connections would
+        classify it. Within a rule, pairs follow the order of `people`.
+        """
+        edges = self.edges
+        seen: Set[Tuple[int, int]] = set()
+        for rel_type, confidence, keys_of in _CONNECTION_RULES:
+            if confidence < min_confidence:
+                break
+            index: Dict[Any, List[_Person]] = {}
+            for person in people:
+                for key in keys_of(person.keys):
+                    index.setdefault(key, []).append(person)
+            for key, members in index.items():
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        pair = (a.id, b.id) if a.id < b.id else (b.id, a.id)
+                        if pair in seen or pair in edges:
+                            continue
+                        seen.add(pair)
+                        yield a, b, rel_type, confidence, key
+
+
 @dataclass
 class DetectedPattern:
     """A pattern detected in the user's behavior or data"""
@@ -57,6 +265,9 @@ class Prediction:
 class ConsolidateService:
     """Memory consolidation and analysis"""
 
+    # Timing of the most recent merge_similar_memories() pass
+    last_merge_stats: Optional[Dict[str, Any]] = None
+
     def __init__(self):
         self.db = get_db()
         self.config = get_config()
@@ -64,8 +275,8 @@ class ConsolidateService:
     def _surge_approaching_deadlines(self) -> Dict[str, int]:
         """Boost importance of memories with approaching deadlines.
 
-        Runs BEFORE decay so that deadline-driven items resist decay.
-        Tiered surge:
+        Runs BEFORE the decay rebase; surged rows are re-anchored at their
+        new importance, so deadline-driven items resist decay. Tiered surge:
         - Overdue: surge to 1.0
         - Due within 48 hours: surge to 0.95
         - Due within 7 days: surge to 0.85
@@ -75,15 +286,19 @@ class ConsolidateService:
         two_days = (now + timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
         one_week = (now + timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
 
+        effective = memory_importance_sql("memories")
+
         with self.db.transaction():
             # Overdue: surge to 1.0
+            # Filtered on the effective value: a row stored at 1.0 with an
+            # old decay reference has decayed and must be re-anchored
             self.db.execute(
-                """
+                f"""
                 UPDATE memories SET importance = 1.0, updated_at = datetime('now')
                 WHERE deadline_at IS NOT NULL
                   AND deadline_at < ?
                   AND invalidated_at IS NULL
-                  AND importance < 1.0
+                  AND {effective} < 1.0
                 """,
                 (now_str,),
             )
@@ -92,8 +307,8 @@ class ConsolidateService:
 
             # Due within 48 hours: surge to 0.95
             self.db.execute(
-                """
-                UPDATE memories SET importance = MAX(importance, 0.95), updated_at = datetime('now')
+                f"""
+                UPDATE memories SET importance = MAX({effective}, 0.95), updated_at = datetime('now')
                 WHERE deadline_at IS NOT NULL
                   AND deadline_at BETWEEN ? AND ?
                   AND invalidated_at IS NULL
@@ -105,8 +320,8 @@ class ConsolidateService:
 
             # Due within 7 days: surge to 0.85
             self.db.execute(
-                """
-                UPDATE memories SET importance = MAX(importance, 0.85), updated_at = datetime('now')
+                f"""
+                UPDATE memories SET importance = MAX({effective}, 0.85), updated_at = datetime('now')
                 WHERE deadline_at IS NOT NULL
                   AND deadline_at BETWEEN ? AND ?
                   AND invalidated_at IS NULL
@@ -122,145 +337,127 @@ class ConsolidateService:
 
         return {"overdue_surged": overdue, "near_surged": near, "week_surged": week}
 
+    @invalidates_recall
     def run_decay(self) -> Dict[str, int]:
-        """Apply tiered importance decay to memories and entities.
-
-        Tier 1 (high-value): importance > 0.7 -> decay at half standard rate
-        Tier 2 (standard): everything else -> decay at config rate (0.995)
+        """Surge deadlines and re-anchor a batch of decayed values.
 
-        All decays have a floor at min_importance_threshold to prevent memories
-        from becoming permanently invisible.
+        Decay itself is computed at read time (see claudia_memory.decay):
+        stored importance is a base value plus decay_ref_at, so there is no
+        nightly pass over every row. This only surges approaching deadlines
+        and folds elapsed decay into the oldest stored bases so readers of
+        the raw column stay close to the effective value.
         """
-        # Surge approaching deadlines BEFORE decay (so they resist decay)
+        # Surge approaching deadlines first so they are anchored at the surge value
         try:
             surge_results = self._surge_approaching_deadlines()
         except Exception as e:
             logger.debug(f"Deadline surge skipped (column may not exist): {e}")
             surge_results = {}
 
-        decay_rate = self.config.decay_rate_daily
-        slow_decay_rate = (1.0 + decay_rate) / 2  # Midpoint between 1.0 and standard rate
-        floor = self.config.min_importance_threshold
-
-        # Tier 1: High-value memories decay slower
-        self.db.execute(
-            """
-            UPDATE memories
-            SET importance = MAX(?, importance * ?),
-                updated_at = ?
-            WHERE importance > 0.7
-              AND importance > ?
-              AND (lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')
-            """,
-            (floor, slow_decay_rate, datetime.utcnow().isoformat(), floor),
-        )
-        tier1_result = self.db.execute("SELECT changes()", fetch=True)
-        tier1_count = tier1_result[0][0] if tier1_result else 0
-
-        # Tier 2: Standard memories decay normally
-        self.db.execute(
-            """
-            UPDATE memories
-            SET importance = MAX(?, importance * ?),
-                updated_at = ?
-            WHERE importance <= 0.7
-              AND importance > ?
-              AND (lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')
-            """,
-            (floor, decay_rate, datetime.utcnow().isoformat(), floor),
-        )
-        tier2_result = self.db.execute("SELECT changes()", fetch=True)
-        tier2_count = tier2_result[0][0] if tier2_result else 0
+        rebased = self.rebase_decay()
 
-        memories_decayed = tier1_count + tier2_count
+        return {
+            "memories_decayed": rebased["memories"],
+            "reflections_decayed": rebased["reflections"],
+            **surge_results,
+        }
 
-        # Entities: same tiered approach (close-circle entities are protected from decay)
-        self.db.execute(
-            """
-            UPDATE entities
-            SET importance = MAX(?, importance * ?),
-                updated_at = ?
-            WHERE importance > 0.7
-              AND importance > ?
-              AND (close_circle IS NULL OR close_circle = 0)
-            """,
-            (floor, slow_decay_rate, datetime.utcnow().isoformat(), floor),
-        )
-        self.db.execute(
-            """
-            UPDATE entities
-            SET importance = MAX(?, importance * ?),
-                updated_at = ?
-            WHERE importance <= 0.7
-              AND importance > ?
-              AND (close_circle IS NULL OR close_circle = 0)
-            """,
-            (floor, decay_rate, datetime.utcnow().isoformat(), floor),
-        )
+    @invalidates_recall
+    def rebase_decay(self, max_age_days: Optional[int] = None, batch: Optional[int] = None) -> Dict[str, int]:
+        """Write effective importance/strength back as the new stored base.
+
+        Rebases every row whose decay reference is older than max_age_days
+        (default config.decay_rebase_days, at least 1), oldest first, in
+        statements of at most `batch` rows (default
+        config.decay_rebase_batch). A raw stored value is therefore never
+        more than max_age_days plus the time since the last run behind the
+        effective one. Exempt rows and rows already at the floor are left
+        alone; their effective value equals the stored one. The reference
+        advances by the whole days folded in, so the part-day remainder keeps
+        counting toward the next day of decay.
+
+        Leaves updated_at alone: updated_at drives incremental vault sync and
+        recall_since, and a rebase does not change what a row means.
+        """
+        max_age_days = self.config.decay_rebase_days if max_age_days is None else max_age_days
+        batch = self.config.decay_rebase_batch if batch is None else batch
+        now = datetime.utcnow()
+        # A rebased reference lands less than a day before now, so a cutoff
+        # at least a day back guarantees each row is rebased at most once
+        cutoff = (now - timedelta(days=max(1, max_age_days))).isoformat()
+        now_str = now.isoformat()
+        floor = self.config.min_importance_threshold
 
-        # Relationships: tiered by strength
-        self.db.execute(
-            """
-            UPDATE relationships
-            SET strength = MAX(0.01, strength * ?),
-                updated_at = ?
-            WHERE strength > 0.7
-              AND strength > 0.01
-              AND (lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')
-            """,
-            (slow_decay_rate, datetime.utcnow().isoformat()),
-        )
-        self.db.execute(
-            """
-            UPDATE relationships
-            SET strength = MAX(0.01, strength * ?),
-                updated_at = ?
-            WHERE strength <= 0.7
-              AND strength > 0.01
-              AND (lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')
-            """,
-            (decay_rate, datetime.utcnow().isoformat()),
+        plans = (
+            ("memories", "importance", memory_importance_sql("memories"),
+             "(lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')", floor),
+            ("entities", "importance", entity_importance_sql("entities"),
+             "(close_circle IS NULL OR close_circle = 0)", floor),
+            ("relationships", "strength", relationship_strength_sql("relationships"),
+             "(lifecycle_tier IS NULL OR lifecycle_tier != 'sacred')", STRENGTH_FLOOR),
+            ("reflections", "importance", reflection_importance_sql("reflections"),
+             "1 = 1", REFLECTION_FLOOR),
         )
+        counts: Dict[str, int] = {}
+        for table, column, effective, not_exempt, table_floor in plans:
+            counts[table] = 0
+            try:
+                while True:
+                    self.db.execute(
+                        f"""
+                        UPDATE {table}
+                        SET {column} = {effective},
+                            decay_ref_at = strftime(
+                                '%Y-%m-%dT%H:%M:%f', COALESCE(decay_ref_at, created_at),
+                                '+' || CAST(julianday(?) - julianday(COALESCE(decay_ref_at, created_at)) AS INTEGER)
+                                || ' days'
+                            )
+                        WHERE id IN (
+                            SELECT id FROM {table}
+                            WHERE COALESCE(decay_ref_at, created_at) < ?
+                              AND {column} > ?
+                              AND {not_exempt}
+                            ORDER BY COALESCE(decay_ref_at, created_at)
+                            LIMIT ?
+                        )
+                        """,
+                        (now_str, cutoff, table_floor, batch),
+                    )
+                    result = self.db.execute("SELECT changes()", fetch=True)
+                    changed = result[0][0] if result else 0
+                    counts[table] += changed
+                    if not changed or changed < batch:
+                        break
+            except Exception as e:
+                logger.debug(f"Decay rebase skipped for {table}: {e}")
 
-        # Reflections: keep using per-row decay_rate (unchanged)
-        try:
-            self.db.execute(
-                """
-                UPDATE reflections
-                SET importance = MAX(0.01, importance * decay_rate),
-                    updated_at = ?
-                WHERE importance > 0.01
-                """,
-                (datetime.utcnow().isoformat(),),
-            )
-            reflections_result = self.db.execute("SELECT changes()", fetch=True)
-            reflections_decayed = reflections_result[0][0] if reflections_result else 0
-        except Exception as e:
-            logger.debug(f"Reflection decay skipped (table may not exist): {e}")
-            reflections_decayed = 0
+        if counts["relationships"]:
+            # Stored strengths moved; rebuild the adjacency index lazily
+            get_graph_index(self.db).invalidate()
 
         logger.info(
-            f"Decay applied: standard_rate={decay_rate}, slow_rate={slow_decay_rate:.4f}, floor={floor}"
+            "Decay rebase: "
+            + ", ".join(f"{table}={n}" for table, n in counts.items())
+            + f" (older than {max_age_days}d, batch {batch})"
         )
+        return counts
 
-        return {
-            "memories_decayed": memories_decayed,
-            "reflections_decayed": reflections_decayed,
-            **surge_results,
-        }
-
+    @invalidates_recall
     def boost_accessed_memories(self) -> int:
         """
         Boost importance of recently accessed memories (rehearsal effect).
         Memories accessed in the last 24 hours get a small importance boost.
         """
+        # Recall buffers access timestamps; write them back before reading
+        get_access_tracker(self.db).flush()
+
         cutoff = (datetime.utcnow() - timedelta(hours=24)).isoformat()
         boost_factor = 1.05  # 5% boost per access
 
         self.db.execute(
-            """
+            f"""
             UPDATE memories
-            SET importance = MIN(1.0, importance * ?),
+            SET importance = MIN(1.0, {memory_importance_sql("memories")} * ?),
                 updated_at = ?
             WHERE last_accessed_at >= ?
             """,
@@ -293,16 +490,19 @@ class ConsolidateService:
         comm_patterns = self._detect_communication_patterns()
         patterns.extend(comm_patterns)
 
+        # Relationship detectors share one read of people and existing edges
+        snapshot = ConnectionSnapshot(self.db)
+
         # Detect cross-entity patterns (co-mentioned people without explicit relationships)
-        cross_patterns = self._detect_cross_entity_patterns()
+        cross_patterns = self._detect_cross_entity_patterns(snapshot)
         patterns.extend(cross_patterns)
 
         # Detect inferred connections (attribute-based: same city, industry, community)
-        inferred_patterns = self.detect_inferred_connections()
+        inferred_patterns = self.detect_inferred_connections(snapshot)
         patterns.extend(inferred_patterns)
 
         # Detect introduction opportunities (people who should know each other)
-        intro_patterns = self._detect_introduction_opportunities()
+        intro_patterns = self._detect_introduction_opportunities(snapshot)
         patterns.extend(intro_patterns)
 
         # Detect forming clusters (3+ people mentioned together frequently)
@@ -313,11 +513,15 @@ class ConsolidateService:
         opportunity_patterns = self.detect_opportunities()
         patterns.extend(opportunity_patterns)
 
-        # Update contact velocity and attention tiers
+        # Update contact velocity and attention tiers, recomputing only the
+        # entities touched since the last run (first run does everything)
         try:
-            self._update_contact_velocity()
+            changes = pending_changes(self.db, "consolidation")
+            dirty = None if changes.full else affected_entities(self.db, changes)
+            self._update_contact_velocity(dirty)
             self._update_attention_tiers()
             self._generate_reconnection_suggestions()
+            commit_changes(self.db, changes)
         except Exception as e:
             logger.debug(f"Velocity/tier update skipped (columns may not exist): {e}")
 
@@ -330,7 +534,52 @@ class ConsolidateService:
 
     # ── Contact velocity and attention tiers ────────────────────
 
-    def _update_contact_velocity(self) -> None:
+    @staticmethod
+    def _contact_velocity(
+        timestamps: List[datetime], now: datetime
+    ) -> Tuple[datetime, Optional[float], str]:
+        """Last contact, average interval (days) and trend from sorted mention times."""
+        last_contact = timestamps[-1]
+
+        # Calculate intervals between consecutive mentions (in days)
+        intervals = []
+        for i in range(1, len(timestamps)):
+            delta = (timestamps[i] - timestamps[i - 1]).total_seconds() / 86400
+            if delta > 0:
+                intervals.append(delta)
+
+        # Need at least 2 intervals for trend detection
+        if len(intervals) < 2:
+            avg_freq = intervals[0] if intervals else None
+            trend = "stable"
+        else:
+            # Rolling average: last 5 intervals vs historical
+            recent = intervals[-5:] if len(intervals) >= 5 else intervals
+            avg_freq = sum(recent) / len(recent)
+
+            if len(intervals) >= 4:
+                historical = intervals[:-len(recent)] if len(intervals) > len(recent) else intervals[:len(intervals) // 2]
+                hist_avg = sum(historical) / len(historical) if historical else avg_freq
+
+                ratio = avg_freq / hist_avg if hist_avg > 0 else 1.0
+
+                if ratio < 0.7:
+                    trend = "accelerating"  # Recent intervals shorter
+                elif ratio > 1.5:
+                    trend = "decelerating"  # Recent intervals longer
+                else:
+                    trend = "stable"
+            else:
+                trend = "stable"
+
+        # Check for dormancy: last contact > 2x average frequency
+        days_since_contact = (now - last_contact).total_seconds() / 86400
+        if avg_freq and days_since_contact > avg_freq * 2 and days_since_contact > 30:
+            trend = "dormant"
+
+        return last_contact, avg_freq, trend
+
+    def _update_contact_velocity(self, entity_ids: Optional[Iterable[int]] = None) -> None:
         """Calculate contact frequency and trend for person entities.
 
         For each person entity:
@@ -338,82 +587,57 @@ class ConsolidateService:
         2. Calculate intervals between mentions
         3. Compute rolling average (last 5 intervals)
         4. Determine trend: accelerating, stable, decelerating, dormant
-        """
-        entities = self.db.execute(
-            "SELECT id, name FROM entities WHERE type = 'person' AND deleted_at IS NULL",
-            fetch=True,
-        ) or []
 
+        With entity_ids, only those entities are recomputed. Everyone else
+        keeps their stored values, which only change when their memories
+        do, except for going dormant with time; that is applied in one
+        set-based UPDATE.
+        """
         now = datetime.utcnow()
-
-        for entity in entities:
-            # Get all memory timestamps for this entity
-            rows = self.db.execute(
-                """
-                SELECT m.created_at
-                FROM memories m
-                JOIN memory_entities me ON m.id = me.memory_id
-                WHERE me.entity_id = ?
-                  AND m.invalidated_at IS NULL
-                ORDER BY m.created_at ASC
-                """,
-                (entity["id"],),
-                fetch=True,
-            ) or []
-
-            if not rows:
-                continue
-
-            timestamps = []
+        sql = """
+            SELECT me.entity_id, m.created_at, e.last_contact_at,
+                   e.contact_frequency_days, e.contact_trend
+            FROM entities e
+            JOIN memory_entities me ON me.entity_id = e.id
+            JOIN memories m ON m.id = me.memory_id
+            WHERE e.type = 'person'
+              AND e.deleted_at IS NULL
+              AND m.invalidated_at IS NULL
+        """
+        if entity_ids is None:
+            batches: List[Tuple[int, ...]] = [()]
+        else:
+            ids = sorted(set(entity_ids))
+            batches = [tuple(ids[i:i + 500]) for i in range(0, len(ids), 500)]
+
+        timestamps: Dict[int, List[datetime]] = defaultdict(list)
+        stored: Dict[int, Tuple] = {}
+        for batch in batches:
+            batch_sql = sql
+            if entity_ids is not None:
+                batch_sql += f" AND e.id IN ({', '.join('?' for _ in batch)})"
+            rows = self.db.execute(batch_sql, batch, fetch=True) or []
             for r in rows:
+                stored[r["entity_id"]] = (r["last_contact_at"], r["contact_frequency_days"], r["contact_trend"])
                 try:
-                    timestamps.append(parse_naive(r["created_at"]))
+                    timestamps[r["entity_id"]].append(parse_naive(r["created_at"]))
                 except (ValueError, TypeError):
                     continue
 
-            if not timestamps:
-                continue
-
-            last_contact = timestamps[-1]
-
-            # Calculate intervals between consecutive mentions (in days)
-            intervals = []
-            for i in range(1, len(timestamps)):
-                delta = (timestamps[i] - timestamps[i - 1]).total_seconds() / 86400
-                if delta > 0:
-                    intervals.append(delta)
-
-            # Need at least 2 intervals for trend detection
-            if len(intervals) < 2:
-                avg_freq = intervals[0] if intervals else None
-                trend = "stable"
-            else:
-                # Rolling average: last 5 intervals vs historical
-                recent = intervals[-5:] if len(intervals) >= 5 else intervals
-                avg_freq = sum(recent) / len(recent)
-
-                if len(intervals) >= 4:
-                    historical = intervals[:-len(recent)] if len(intervals) > len(recent) else intervals[:len(intervals) // 2]
-                    hist_avg = sum(historical) / len(historical) if historical else avg_freq
-
-                    ratio = avg_freq / hist_avg if hist_avg > 0 else 1.0
-
-                    if ratio < 0.7:
-                        trend = "accelerating"  # Recent intervals shorter
-                    elif ratio > 1.5:
-                        trend = "decelerating"  # Recent intervals longer
-                    else:
-                        trend = "stable"
-                else:
-                    trend = "stable"
-
-            # Check for dormancy: last contact > 2x average frequency
-            days_since_contact = (now - last_contact).total_seconds() / 86400
-            if avg_freq and days_since_contact > avg_freq * 2 and days_since_contact > 30:
-                trend = "dormant"
+        updates = []
+        for entity_id, times in timestamps.items():
+            times.sort()
+            last_contact, avg_freq, trend = self._contact_velocity(times, now)
+            values = (
+                last_contact.isoformat(),
+                round(avg_freq, 1) if avg_freq else None,
+                trend,
+            )
+            if values != stored[entity_id]:
+                updates.append((*values, entity_id))
 
-            # Update entity
-            self.db.execute(
+        if updates:
+            self.db.execute_many(
                 """
                 UPDATE entities
                 SET last_contact_at = ?,
@@ -422,15 +646,33 @@ class ConsolidateService:
                     updated_at = datetime('now')
                 WHERE id = ?
                 """,
-                (
-                    last_contact.isoformat(),
-                    round(avg_freq, 1) if avg_freq else None,
-                    trend,
-                    entity["id"],
-                ),
+                updates,
             )
 
-        logger.info(f"Updated contact velocity for {len(entities)} entities")
+        dormant = 0
+        if entity_ids is not None:
+            # Untouched entities: the only change time alone can cause
+            self.db.execute(
+                """
+                UPDATE entities
+                SET contact_trend = 'dormant',
+                    updated_at = datetime('now')
+                WHERE type = 'person'
+                  AND deleted_at IS NULL
+                  AND contact_trend IS NOT 'dormant'
+                  AND contact_frequency_days > 0
+                  AND julianday(?) - julianday(last_contact_at) > MAX(30, contact_frequency_days * 2)
+                """,
+                (now.isoformat(),),
+            )
+            result = self.db.execute("SELECT changes()", fetch=True)
+            dormant = result[0][0] if result else 0
+
+        requested = "all" if entity_ids is None else sum(len(batch) for batch in batches)
+        logger.info(
+            f"Updated contact velocity: {len(timestamps)} recomputed ({requested} requested), "
+            f"{len(updates)} changed, {dormant} went dormant"
+        )
 
     def _update_attention_tiers(self) -> None:
         """Assign attention tiers based on recency and deadlines.
@@ -439,6 +681,10 @@ class ConsolidateService:
         - Watchlist: decelerating trend OR has deadline within 30 days
         - Standard: default
         - Archive: not mentioned in 90+ days AND importance < 0.3
+
+        Tiers depend on the clock as well as on writes, so every entity is
+        evaluated, but in a single statement that only writes rows whose
+        tier actually changes.
         """
         now = datetime.utcnow()
         seven_days = (now - timedelta(days=7)).isoformat()
@@ -447,66 +693,41 @@ class ConsolidateService:
         thirty_days_ahead = (now + timedelta(days=30)).strftime("%Y-%m-%d %H:%M:%S")
         now_str = now.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Reset all to standard first
-        self.db.execute(
-            "UPDATE entities SET attention_tier = 'standard' WHERE deleted_at IS NULL"
-        )
-
-        # Archive: no contact in 90+ days AND low importance
-        self.db.execute(
-            """
-            UPDATE entities SET attention_tier = 'archive'
-            WHERE deleted_at IS NULL
-              AND type = 'person'
-              AND (last_contact_at IS NULL OR last_contact_at < ?)
-              AND importance < 0.3
-            """,
-            (ninety_days,),
-        )
-
-        # Watchlist: decelerating trend OR deadline within 30 days
-        self.db.execute(
-            """
-            UPDATE entities SET attention_tier = 'watchlist'
-            WHERE deleted_at IS NULL
-              AND type = 'person'
-              AND (
-                contact_trend = 'decelerating'
-                OR id IN (
-                    SELECT DISTINCT me.entity_id
-                    FROM memory_entities me
-                    JOIN memories m ON me.memory_id = m.id
-                    WHERE m.deadline_at IS NOT NULL
-                      AND m.deadline_at BETWEEN ? AND ?
-                      AND m.invalidated_at IS NULL
-                )
-              )
-            """,
-            (now_str, thirty_days_ahead),
+        deadline_entities = """
+            SELECT DISTINCT me.entity_id
+            FROM memory_entities me
+            JOIN memories m ON me.memory_id = m.id
+            WHERE m.deadline_at IS NOT NULL
+              AND m.deadline_at BETWEEN ? AND ?
+              AND m.invalidated_at IS NULL
+        """
+        tier = f"""
+            CASE
+                WHEN type != 'person' THEN 'standard'
+                WHEN last_contact_at >= ? OR id IN ({deadline_entities}) THEN 'active'
+                WHEN contact_trend = 'decelerating' OR id IN ({deadline_entities}) THEN 'watchlist'
+                WHEN (last_contact_at IS NULL OR last_contact_at < ?) AND importance < 0.3 THEN 'archive'
+                ELSE 'standard'
+            END
+        """
+        tier_params = (
+            seven_days, now_str, fourteen_days_ahead,
+            now_str, thirty_days_ahead,
+            ninety_days,
         )
 
-        # Active: mentioned in last 7 days OR deadline within 14 days
         self.db.execute(
-            """
-            UPDATE entities SET attention_tier = 'active'
+            f"""
+            UPDATE entities SET attention_tier = {tier}
             WHERE deleted_at IS NULL
-              AND type = 'person'
-              AND (
-                last_contact_at >= ?
-                OR id IN (
-                    SELECT DISTINCT me.entity_id
-                    FROM memory_entities me
-                    JOIN memories m ON me.memory_id = m.id
-                    WHERE m.deadline_at IS NOT NULL
-                      AND m.deadline_at BETWEEN ? AND ?
-                      AND m.invalidated_at IS NULL
-                )
-              )
+              AND attention_tier IS NOT {tier}
             """,
-            (seven_days, now_str, fourteen_days_ahead),
+            tier_params + tier_params,
         )
+        result = self.db.execute("SELECT changes()", fetch=True)
+        changed = result[0][0] if result else 0
 
-        logger.info("Updated attention tiers")
+        logger.info(f"Updated attention tiers: {changed} changed")
 
     def _generate_reconnection_suggestions(self) -> None:
         """Generate actionable reconnection predictions for dormant/decelerating contacts.
@@ -747,47 +968,25 @@ class ConsolidateService:
             a_meta = json.loads(a_meta_raw) if a_meta_raw else {}
             b_meta = json.loads(b_meta_raw) if b_meta_raw else {}
 
-            # Same company = definitely connected (colleagues)
-            a_company = a_meta.get("company")
-            b_company = b_meta.get("company")
-            if a_company and b_company and a_company.lower() == b_company.lower():
-                return ("colleagues", 0.9)
-
-            # Same community = probably know each other
-            a_communities = set(c.lower() for c in a_meta.get("communities", []))
-            b_communities = set(c.lower() for c in b_meta.get("communities", []))
-            if a_communities & b_communities:
-                shared = a_communities & b_communities
-                return ("community_connection", 0.6)
-
-            # Same city + same industry = might know each other
-            a_geo = a_meta.get("geography", {})
-            b_geo = b_meta.get("geography", {})
-            a_city = a_geo.get("city", "").lower() if a_geo else ""
-            b_city = b_geo.get("city", "").lower() if b_geo else ""
-
-            a_industries = set(i.lower() for i in a_meta.get("industries", []))
-            b_industries = set(i.lower() for i in b_meta.get("industries", []))
-
-            if a_city and a_city == b_city and a_industries & b_industries:
-                return ("likely_connected", 0.3)
-
-            # Same industry alone = weak inference
-            if a_industries & b_industries and len(a_industries & b_industries) >= 1:
-                return ("industry_peers", 0.2)
-
-            return None
+            return _infer_connection(_connection_keys(a_meta), _connection_keys(b_meta))
 
         except Exception as e:
             logger.debug(f"Connection inference failed: {e}")
             return None
 
-    def detect_inferred_connections(self) -> List[DetectedPattern]:
+    def detect_inferred_connections(
+        self, snapshot: Optional[ConnectionSnapshot] = None
+    ) -> List[DetectedPattern]:
         """
         Detect potential connections between entities based on shared attributes.
 
-        Scans person entities for shared geography, industry, or communities
-        and suggests relationships that don't yet exist.
+        Finds person entities sharing a company, community, city and
+        industry, or industry (strongest first, up to
+        MAX_INFERRED_CONNECTIONS) and suggests relationships that don't yet
+        exist.
+
+        Args:
+            snapshot: People and relationships already read this run
 
         Returns:
             List of DetectedPattern for potential connections
@@ -795,56 +994,33 @@ class ConsolidateService:
         patterns = []
 
         try:
-            # Get person entities with metadata
-            entities = self.db.execute(
-                """
-                SELECT id, name, metadata FROM entities
-                WHERE type = 'person' AND importance > 0.2 AND metadata IS NOT NULL
-                ORDER BY importance DESC
-                LIMIT 100
-                """,
-                fetch=True,
-            ) or []
-
-            # Compare pairs
-            for i in range(len(entities)):
-                for j in range(i + 1, len(entities)):
-                    entity_a = entities[i]
-                    entity_b = entities[j]
-
-                    # Check if relationship already exists
-                    existing = self.db.get_one(
-                        "relationships",
-                        where="(source_entity_id = ? AND target_entity_id = ?) OR (source_entity_id = ? AND target_entity_id = ?)",
-                        where_params=(entity_a["id"], entity_b["id"], entity_b["id"], entity_a["id"]),
+            snapshot = snapshot or ConnectionSnapshot(self.db)
+            people = snapshot.people(min_importance=0.2)
+            candidates = snapshot.connection_candidates(people)
+            for entity_a, entity_b, rel_type, confidence, _ in islice(candidates, MAX_INFERRED_CONNECTIONS):
+                patterns.append(
+                    DetectedPattern(
+                        name=f"inferred_connection_{entity_a.id}_{entity_b.id}",
+                        description=f"{entity_a.name} and {entity_b.name} may be connected ({rel_type})",
+                        pattern_type="relationship",
+                        confidence=confidence,
+                        evidence=[f"Inferred relationship type: {rel_type}"],
                     )
-                    if existing:
-                        continue
-
-                    # Try to infer connection
-                    inference = self.infer_connections(entity_a["id"], entity_b["id"])
-                    if inference:
-                        rel_type, confidence = inference
-                        patterns.append(
-                            DetectedPattern(
-                                name=f"inferred_connection_{entity_a['id']}_{entity_b['id']}",
-                                description=f"{entity_a['name']} and {entity_b['name']} may be connected ({rel_type})",
-                                pattern_type="relationship",
-                                confidence=confidence,
-                                evidence=[f"Inferred relationship type: {rel_type}"],
-                            )
-                        )
+                )
 
         except Exception as e:
             logger.debug(f"Inferred connection detection failed: {e}")
 
         return patterns
 
-    def _detect_cross_entity_patterns(self) -> List[DetectedPattern]:
+    def _detect_cross_entity_patterns(
+        self, snapshot: Optional[ConnectionSnapshot] = None
+    ) -> List[DetectedPattern]:
         """Detect person entities that co-occur in memories but have no explicit relationship."""
         patterns = []
 
         try:
+            snapshot = snapshot or ConnectionSnapshot(self.db)
             # Find pairs of person entities that appear together in 2+ memories
             co_mentions = self.db.execute(
                 """
@@ -858,22 +1034,14 @@ class ConsolidateService:
                 JOIN entities e2 ON me2.entity_id = e2.id AND e2.type = 'person'
                 GROUP BY me1.entity_id, me2.entity_id
                 HAVING co_count >= 2
-                ORDER BY co_count DESC
-                LIMIT 20
+                ORDER BY co_count DESC, me1.entity_id, me2.entity_id
                 """,
                 fetch=True,
             ) or []
 
-            for row in co_mentions:
-                # Check if a relationship already exists between them
-                existing = self.db.get_one(
-                    "relationships",
-                    where="(source_entity_id = ? AND target_entity_id = ?) OR (source_entity_id = ? AND target_entity_id = ?)",
-                    where_params=(row["id1"], row["id2"], row["id2"], row["id1"]),
-                )
-                if existing:
-                    continue
-
+            # Skip pairs that already have a relationship, then keep the top 20
+            unlinked = (row for row in co_mentions if not snapshot.linked(row["id1"], row["id2"]))
+            for row in islice(unlinked, 20):
                 co_count = row["co_count"]
                 confidence = min(0.9, 0.4 + co_count * 0.1)
 
@@ -892,78 +1060,56 @@ class ConsolidateService:
 
         return patterns
 
-    def _detect_introduction_opportunities(self) -> List[DetectedPattern]:
+    def _detect_introduction_opportunities(
+        self, snapshot: Optional[ConnectionSnapshot] = None
+    ) -> List[DetectedPattern]:
         """
         Detect pairs of people who share attributes but aren't directly connected.
 
-        Uses the infer_connections logic to find people who likely should know
+        Uses the infer_connections rules to find people who likely should know
         each other based on shared geography, industry, or communities.
 
+        Args:
+            snapshot: People and relationships already read this run
+
         Returns:
             List of DetectedPattern for introduction opportunities
         """
         patterns = []
 
         try:
-            # Get person entities with metadata
-            entities = self.db.execute(
-                """
-                SELECT id, name, metadata FROM entities
-                WHERE type = 'person' AND importance > 0.3 AND metadata IS NOT NULL
-                ORDER BY importance DESC
-                LIMIT 50
-                """,
-                fetch=True,
-            ) or []
-
-            for i in range(len(entities)):
-                for j in range(i + 1, len(entities)):
-                    entity_a = entities[i]
-                    entity_b = entities[j]
-
-                    # Check if relationship already exists
-                    existing = self.db.get_one(
-                        "relationships",
-                        where="(source_entity_id = ? AND target_entity_id = ?) OR (source_entity_id = ? AND target_entity_id = ?)",
-                        where_params=(entity_a["id"], entity_b["id"], entity_b["id"], entity_a["id"]),
+            snapshot = snapshot or ConnectionSnapshot(self.db)
+            people = snapshot.people(min_importance=0.3)
+            # Only strong inferences
+            candidates = snapshot.connection_candidates(people, min_confidence=0.5)
+            for entity_a, entity_b, rel_type, confidence, shared in islice(candidates, 10):
+                # Build reason
+                reason_parts = []
+                if rel_type == "colleagues":
+                    reason_parts.append(f"both at {entity_a.meta.get('company', 'same company')}")
+                elif rel_type == "community_connection":
+                    community = next(
+                        (c for c in entity_a.meta.get("communities", []) if c.lower() == shared),
+                        shared,
                     )
-                    if existing:
-                        continue
+                    reason_parts.append(f"both in {community}")
 
-                    # Try to infer connection
-                    inference = self.infer_connections(entity_a["id"], entity_b["id"])
-                    if inference and inference[1] >= 0.5:  # Only strong inferences
-                        rel_type, confidence = inference
-                        a_meta_raw = entity_a["metadata"] if "metadata" in entity_a.keys() else None
-                        b_meta_raw = entity_b["metadata"] if "metadata" in entity_b.keys() else None
-                        a_meta = json.loads(a_meta_raw) if a_meta_raw else {}
-                        b_meta = json.loads(b_meta_raw) if b_meta_raw else {}
-
-                        # Build reason
-                        reason_parts = []
-                        if rel_type == "colleagues":
-                            reason_parts.append(f"both at {a_meta.get('company', 'same company')}")
-                        elif rel_type == "community_connection":
-                            shared_communities = set(a_meta.get("communities", [])) & set(b_meta.get("communities", []))
-                            if shared_communities:
-                                reason_parts.append(f"both in {list(shared_communities)[0]}")
-
-                        reason = " and ".join(reason_parts) if reason_parts else rel_type
+                reason = " and ".join(reason_parts) if reason_parts else rel_type
 
-                        patterns.append(
-                            DetectedPattern(
-                                name=f"intro_opportunity_{entity_a['id']}_{entity_b['id']}",
-                                description=f"{entity_a['name']} and {entity_b['name']} might benefit from meeting ({reason})",
-                                pattern_type="relationship",
-                                confidence=confidence,
-                                evidence=[f"Shared attributes suggest connection: {rel_type}"],
-                            )
-                        )
+                patterns.append(
+                    DetectedPattern(
+                        name=f"intro_opportunity_{entity_a.id}_{entity_b.id}",
+                        description=f"{entity_a.name} and {entity_b.name} might benefit from meeting ({reason})",
+                        pattern_type="relationship",
+                        confidence=confidence,
+                        evidence=[f"Shared attributes suggest connection: {rel_type}"],
+                    )
+                )
 
         except Exception as e:
             logger.debug(f"Introduction opportunity detection failed: {e}")
 
-        return patterns[:10]  # Limit to top 10
+        return patterns
 
     def _detect_cluster_forming(self) -> List[DetectedPattern]:
         """
@@ -1537,11 +1683,20 @@ class ConsolidateService:
             logger.debug(f"Feedback lookup failed: {e}")
             return 1.0
 
+    @invalidates_recall
     def merge_similar_memories(self) -> int:
         """
         Merge semantically similar memories during consolidation.
         Uses existing stored embeddings -- no new Ollama calls.
 
+        Memories are compared within blocks: the memories linked to each
+        entity, plus one block for memories not linked to any entity. All
+        embeddings are loaded once. With numpy, each block is compared with
+        blocked matrix multiplies. Without it, candidates come from a vec0
+        KNN query per memory, and pure Python is only the last resort.
+        Timing and throughput for the pass are kept in
+        ``self.last_merge_stats``.
+
         Returns:
             Count of merged memory pairs
         """
@@ -1550,94 +1705,172 @@ class ConsolidateService:
 
         threshold = self.config.similarity_merge_threshold
         merged_count = 0
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {"backend": None, "memories": 0, "blocks": 0, "candidates": 0}
 
         try:
-            # Find entities with 5+ linked memories (high-memory entities first)
-            entity_rows = self.db.execute(
-                """
-                SELECT me.entity_id, COUNT(DISTINCT me.memory_id) as mem_count
-                FROM memory_entities me
-                GROUP BY me.entity_id
-                HAVING mem_count >= 5
-                ORDER BY mem_count DESC
-                LIMIT 50
-                """,
-                fetch=True,
-            ) or []
-
-            for entity_row in entity_rows:
-                entity_id = entity_row["entity_id"]
-
-                # Load memory IDs and embeddings for this entity
-                mem_rows = self.db.execute(
-                    """
-                    SELECT me.memory_id, m.importance, m.access_count,
-                           emb.embedding
-                    FROM memory_entities me
-                    JOIN memories m ON me.memory_id = m.id
-                    LEFT JOIN memory_embeddings emb ON m.id = emb.memory_id
-                    WHERE me.entity_id = ?
-                      AND m.importance > 0.01
-                    ORDER BY m.importance DESC
-                    """,
-                    (entity_id,),
-                    fetch=True,
-                ) or []
-
-                # Parse embeddings
-                memories_with_emb = []
-                for row in mem_rows:
-                    if row["embedding"]:
-                        try:
-                            emb = json.loads(row["embedding"]) if isinstance(row["embedding"], str) else row["embedding"]
-                            memories_with_emb.append({
-                                "id": row["memory_id"],
-                                "importance": row["importance"],
-                                "access_count": row["access_count"] or 0,
-                                "embedding": emb,
-                            })
-                        except (json.JSONDecodeError, TypeError):
-                            continue
-
-                if len(memories_with_emb) < 2:
-                    continue
+            memories = self._load_merge_candidates()
+            stats["memories"] = len(memories)
+            if len(memories) >= 2:
+                blocks, memberships = self._merge_blocks(memories)
+                stats["blocks"] = len(blocks)
+
+                pairs = None
+                if _np is not None:
+                    stats["backend"] = "numpy"
+                else:
+                    pairs = self._knn_merge_pairs(memories, memberships, threshold)
+                    stats["backend"] = "vec0" if pairs is not None else "python"
+                if pairs is None:
+                    pairs = (
+                        (block[i], block[j])
+                        for block in blocks
+                        for i, j in _similar_pairs([memories[p]["embedding"] for p in block], threshold)
+                    )
 
-                # Pairwise cosine similarity
                 already_merged = set()
-                for i in range(len(memories_with_emb)):
-                    if memories_with_emb[i]["id"] in already_merged:
+                # A pair sharing several entities turns up in several blocks
+                seen_pairs = set()
+                for a, b in pairs:
+                    pair = (a, b) if a < b else (b, a)
+                    if pair in seen_pairs:
                         continue
-                    for j in range(i + 1, len(memories_with_emb)):
-                        if memories_with_emb[j]["id"] in already_merged:
-                            continue
+                    seen_pairs.add(pair)
+                    stats["candidates"] += 1
+                    mem_a, mem_b = memories[a], memories[b]
+                    if mem_a["id"] in already_merged or mem_b["id"] in already_merged:
+                        continue
+                    # Keep the one with higher importance * (1 + access_count)
+                    score_a = mem_a["importance"] * (1 + mem_a["access_count"])
+                    score_b = mem_b["importance"] * (1 + mem_b["access_count"])
+                    primary, duplicate = (mem_a, mem_b) if score_a >= score_b else (mem_b, mem_a)
 
-                        sim = _cosine_similarity(
-                            memories_with_emb[i]["embedding"],
-                            memories_with_emb[j]["embedding"],
-                        )
-                        if sim >= threshold:
-                            # Keep the one with higher importance * (1 + access_count)
-                            score_i = memories_with_emb[i]["importance"] * (1 + memories_with_emb[i]["access_count"])
-                            score_j = memories_with_emb[j]["importance"] * (1 + memories_with_emb[j]["access_count"])
-
-                            if score_i >= score_j:
-                                primary_id = memories_with_emb[i]["id"]
-                                duplicate_id = memories_with_emb[j]["id"]
-                            else:
-                                primary_id = memories_with_emb[j]["id"]
-                                duplicate_id = memories_with_emb[i]["id"]
-
-                            self._merge_memory_pair(primary_id, duplicate_id)
-                            already_merged.add(duplicate_id)
-                            merged_count += 1
+                    self._merge_memory_pair(primary["id"], duplicate["id"])
+                    already_merged.add(duplicate["id"])
+                    merged_count += 1
 
         except Exception as e:
             logger.warning(f"Memory merging failed: {e}")
 
+        elapsed = time.perf_counter() - started
+        stats["merged"] = merged_count
+        stats["seconds"] = round(elapsed, 3)
+        stats["memories_per_sec"] = round(stats["memories"] / elapsed, 1) if elapsed > 0 else None
+        self.last_merge_stats = stats
+
         if merged_count > 0:
             logger.info(f"Merged {merged_count} near-duplicate memory pairs")
+        logger.debug(f"Merge pass: {stats}")
         return merged_count
 
+    def _load_merge_candidates(self) -> List[Dict[str, Any]]:
+        """Load every mergeable memory with its embedding, most important first.
+
+        Vectors whose dimension differs from the majority (left over from an
+        older embedding model) are skipped, as they cannot be compared.
+        """
+        get_access_tracker(self.db).flush()
+        rows = self.db.execute(
+            """
+            SELECT m.id, m.importance, m.access_count, emb.embedding
+            FROM memories m
+            JOIN memory_embeddings emb ON emb.memory_id = m.id
+            WHERE m.importance > 0.01
+            ORDER BY m.importance DESC, m.id
+            """,
+            fetch=True,
+        ) or []
+
+        memories = []
+        for row in rows:
+            if not row["embedding"]:
+                continue
+            try:
+                emb = decode_vector(row["embedding"])
+            except (json.JSONDecodeError, TypeError, ValueError):
+                continue
+            memories.append({
+                "id": row["id"],
+                "importance": row["importance"],
+                "access_count": row["access_count"] or 0,
+                "embedding": emb,
+            })
+
+        if memories:
+            dims = Counter(len(m["embedding"]) for m in memories).most_common(1)[0][0]
+            memories = [m for m in memories if len(m["embedding"]) == dims]
+        return memories
+
+    def _merge_blocks(self, memories: List[Dict[str, Any]]) -> Tuple[List[List[int]], List[set]]:
+        """Group memory positions into comparison blocks.
+
+        Returns the blocks (ascending positions, so most important first)
+        and, per memory position, the set of block keys it belongs to.
+        """
+        position = {m["id"]: i for i, m in enumerate(memories)}
+        by_entity: Dict[int, set] = defaultdict(set)
+        for row in self.db.execute(
+            "SELECT DISTINCT memory_id, entity_id FROM memory_entities", fetch=True
+        ) or []:
+            pos = position.get(row["memory_id"])
+            if pos is not None:
+                by_entity[row["entity_id"]].add(pos)
+
+        memberships: List[set] = [set() for _ in memories]
+        for entity_id, positions in by_entity.items():
+            for pos in positions:
+                memberships[pos].add(entity_id)
+
+        blocks = [sorted(positions) for positions in by_entity.values() if len(positions) >= 2]
+        unlinked = [pos for pos, keys in enumerate(memberships) if not keys]
+        for pos in unlinked:
+            memberships[pos].add(None)
+        if len(unlinked) >= 2:
+            blocks.append(unlinked)
+        return blocks, memberships
+
+    def _knn_merge_pairs(
+        self,
+        memories: List[Dict[str, Any]],
+        memberships: List[set],
+        threshold: float,
+    ) -> Optional[List[Tuple[int, int]]]:
+        """Find near-duplicate pairs through one vec0 KNN query per memory.
+
+        Each memory's MERGE_KNN_K nearest neighbours are kept when they share
+        a block with it, and their exact cosine similarity is then checked.
+        Returns None if the KNN query is unavailable.
+        """
+        position = {m["id"]: i for i, m in enumerate(memories)}
+        units: Dict[int, array] = {}
+        pairs = set()
+        k = min(MERGE_KNN_K + 1, len(memories))
+        for pos, mem in enumerate(memories):
+            try:
+                rows = self.db.execute(
+                    "SELECT memory_id FROM memory_embeddings WHERE embedding MATCH ? AND k = ?",
+                    (encode_vector(mem["embedding"]), k),
+                    fetch=True,
+                ) or []
+            except Exception as e:
+                if pos == 0:
+                    logger.debug(f"vec0 KNN unavailable for merging, using pairwise scan: {e}")
+                    return None
+                raise
+            for row in rows:
+                other = position.get(row["memory_id"])
+                if other is None or other == pos or not (memberships[pos] & memberships[other]):
+                    continue
+                pair = (min(pos, other), max(pos, other))
+                if pair in pairs:
+                    continue
+                for p in pair:
+                    if p not in units:
+                        units[p] = _unit(memories[p]["embedding"])
+                if sum(map(operator.mul, units[pair[0]], units[pair[1]])) >= threshold:
+                    pairs.add(pair)
+        return sorted(pairs)
+
     def _merge_memory_pair(self, primary_id: int, duplicate_id: int) -> None:
         """
         Merge a duplicate memory into the primary.
@@ -1690,6 +1923,7 @@ class ConsolidateService:
 
         logger.debug(f"Merged memory {duplicate_id} into {primary_id}")
 
+    @invalidates_recall
     def run_llm_consolidation(self) -> Dict[str, Any]:
         """
         Run LLM-powered memory consolidation (sleep-time processing).
@@ -1915,7 +2149,7 @@ class ConsolidateService:
             for row in rows:
                 if row["embedding"]:
                     try:
-                        emb = json.loads(row["embedding"]) if isinstance(row["embedding"], str) else row["embedding"]
+                        emb = decode_vector(row["embedding"])
                         reflections_with_emb.append({
                             "id": row["id"],
                             "content": row["content"],
@@ -1926,7 +2160,7 @@ class ConsolidateService:
                             "last_confirmed_at": row["last_confirmed_at"],
                             "embedding": emb,
                         })
-                    except (json.JSONDecodeError, TypeError):
+                    except (json.JSONDecodeError, TypeError, ValueError):
                         continue
 
             # Pairwise similarity, same type only
@@ -2061,11 +2295,13 @@ class ConsolidateService:
             logger.warning(f"close_stale_episodes failed: {e}")
             return 0
 
+    @invalidates_recall
     def run_retention_cleanup(self) -> Dict[str, int]:
         """Clean up old data per retention policies.
 
         Removes:
         - Old audit_log entries
+        - Unconsumed change_log rows past the audit retention window
         - Expired predictions past retention window
         - Archived turn_buffer from old episodes
         - Old metrics rows
@@ -2126,6 +2362,18 @@ class ConsolidateService:
             logger.warning(f"Metrics cleanup failed: {e}")
             results["metrics_deleted"] = 0
 
+        # Change log: normally pruned as consolidation consumes it; this
+        # bounds it if consolidation stops running (the next run then does
+        # a full pass)
+        try:
+            cutoff = (now - timedelta(days=self.config.audit_log_retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+            self.db.execute("DELETE FROM change_log WHERE changed_at < ?", (cutoff,))
+            rows = self.db.execute("SELECT changes()", fetch=True)
+            results["change_log_deleted"] = rows[0][0] if rows else 0
+        except Exception as e:
+            logger.warning(f"Change log cleanup failed: {e}")
+            results["change_log_deleted"] = 0
+
         # Auto-close orphan episodes (no end_session after 24 h)
         results["stale_episodes_closed"] = self.close_stale_episodes()
 
@@ -2376,6 +2624,7 @@ class ConsolidateService:
                 },
             )
 
+    @invalidates_recall
     def auto_dedupe_entities(self) -> List[Dict[str, Any]]:
         """
         Find and flag potential entity duplicates using embedding similarity.
@@ -2473,47 +2722,40 @@ class ConsolidateService:
             logger.debug(f"Embedding-based dedupe unavailable: {e}")
 
         # Method 2: Alias overlap detection
+        # Alias postings come from the fuzzy name index, so this is one pass
+        # over shared aliases instead of a self-join on entity_aliases.
         try:
-            alias_rows = self.db.execute(
-                """
-                SELECT a1.entity_id as eid1, a2.entity_id as eid2,
-                       a1.canonical_alias as alias
-                FROM entity_aliases a1
-                JOIN entity_aliases a2 ON a1.canonical_alias = a2.canonical_alias
-                    AND a1.entity_id < a2.entity_id
-                JOIN entities e1 ON a1.entity_id = e1.id AND e1.deleted_at IS NULL
-                JOIN entities e2 ON a2.entity_id = e2.id AND e2.deleted_at IS NULL
-                    AND e1.type = e2.type
-                """,
-                fetch=True,
-            ) or []
-
-            # Build alias frequency map for specificity scoring (#27).
-            # Count how many live entities share each canonical alias.
-            alias_entity_counts: dict = {}
-            if alias_rows:
-                count_rows = self.db.execute(
-                    """
-                    SELECT a.canonical_alias, COUNT(DISTINCT a.entity_id) as cnt
-                    FROM entity_aliases a
-                    JOIN entities e ON a.entity_id = e.id AND e.deleted_at IS NULL
-                    GROUP BY a.canonical_alias
-                    HAVING cnt >= 2
-                    """,
+            fuzzy = get_fuzzy_index(self.db)
+            shared_aliases = fuzzy.shared_aliases()
+
+            alias_pairs = []
+            for alias, owner_ids in sorted(shared_aliases.items()):
+                owners = sorted(owner_ids)
+                for i, eid1 in enumerate(owners):
+                    for eid2 in owners[i + 1:]:
+                        if fuzzy.entity_type(eid1) == fuzzy.entity_type(eid2):
+                            alias_pairs.append((eid1, eid2, alias))
+
+            # Fetch names for every entity involved in one query
+            alias_entities: dict = {}
+            involved = sorted({eid for eid1, eid2, _ in alias_pairs for eid in (eid1, eid2)})
+            if involved:
+                placeholders = ",".join("?" * len(involved))
+                for row in self.db.execute(
+                    f"SELECT id, name, type FROM entities WHERE id IN ({placeholders}) AND deleted_at IS NULL",
+                    tuple(involved),
                     fetch=True,
-                ) or []
-                for cr in count_rows:
-                    alias_entity_counts[cr["canonical_alias"]] = cr["cnt"]
+                ) or []:
+                    alias_entities[row["id"]] = row
 
-            for row in alias_rows:
-                pair_key = (row["eid1"], row["eid2"])
+            for eid1, eid2, alias in alias_pairs:
+                pair_key = (eid1, eid2)
                 if pair_key not in seen_pairs:
                     seen_pairs.add(pair_key)
-                    # Look up names
-                    e1 = self.db.get_one("entities", where="id = ?", where_params=(row["eid1"],))
-                    e2 = self.db.get_one("entities", where="id = ?", where_params=(row["eid2"],))
-                    if e1 and e2:
-                        shared = row["alias"].strip()
+                    e1 = alias_entities.get(eid1)
+                    e2 = alias_entities.get(eid2)
+                    if e1 and e2 and e1["type"] == e2["type"]:
+                        shared = alias.strip()
 
                         # Single-token alias filter (#26): a shared first name
                         # like "joel" is weak evidence when full names diverge.
@@ -2530,8 +2772,9 @@ class ConsolidateService:
                                 continue
 
                         # Dynamic specificity scoring (#27): rare aliases
-                        # score higher than common ones.
-                        alias_count = alias_entity_counts.get(shared, 2)
+                        # score higher than common ones. Count how many live
+                        # entities share the alias.
+                        alias_count = len(shared_aliases.get(shared, ())) or 2
                         specificity = 1.0 / alias_count
                         score = 0.70 + 0.25 * specificity
                         # Multi-token aliases are stronger evidence
@@ -2544,7 +2787,7 @@ class ConsolidateService:
                             "entity_2": {"id": e2["id"], "name": e2["name"], "type": e2["type"]},
                             "similarity": score,
                             "method": "alias_overlap",
-                            "shared_alias": row["alias"],
+                            "shared_alias": alias,
                         })
         except Exception as e:
             logger.debug(f"Alias overlap dedupe failed: {e}")
@@ -2552,6 +2795,8 @@ class ConsolidateService:
         # Method 3: Fuzzy name comparison (SequenceMatcher)
         # Catches typo variants and prefix matches that embeddings and aliases miss.
         # Runs even without sqlite-vec. Advisory only: never auto-merges.
+        # Ratio candidates come from the trigram-blocked fuzzy name index;
+        # prefix candidates from a forward scan over names sorted per type.
         try:
             from difflib import SequenceMatcher
 
@@ -2567,42 +2812,53 @@ class ConsolidateService:
 
             # Group by type for same-type comparison only
             by_type: dict = {}
+            located: dict = {}
             for ent in all_entities:
-                by_type.setdefault(ent["type"], []).append(ent)
-
+                group = by_type.setdefault(ent["type"], [])
+                located[ent["id"]] = (ent["type"], len(group))
+                group.append(ent)
+
+            # (type, i, j) -> (method, similarity), i < j positions in the group
+            fuzzy_hits: dict = {}
+            for id1, id2 in get_fuzzy_index(self.db).candidate_pairs(threshold):
+                if id1 not in located or id2 not in located:
+                    continue
+                etype, pos1 = located[id1]
+                etype2, pos2 = located[id2]
+                if etype != etype2:
+                    continue
+                group = by_type[etype]
+                i, j = min(pos1, pos2), max(pos1, pos2)
+                ratio = SequenceMatcher(None, group[i]["canonical_name"], group[j]["canonical_name"]).ratio()
+                if ratio >= threshold:
+                    fuzzy_hits[(etype, i, j)] = ("fuzzy_name", round(ratio, 3))
+
+            # Prefix match: short name is prefix of longer name. Names that
+            # extend a prefix sort directly after it within the type group.
             for etype, group in by_type.items():
                 for i, e1 in enumerate(group):
-                    for e2 in group[i + 1:]:
-                        pair_key = (min(e1["id"], e2["id"]), max(e1["id"], e2["id"]))
-                        if pair_key in seen_pairs:
-                            continue
-
-                        cn1 = e1["canonical_name"]
-                        cn2 = e2["canonical_name"]
-
-                        # Fuzzy ratio check
-                        ratio = SequenceMatcher(None, cn1, cn2).ratio()
-                        if ratio >= threshold:
-                            seen_pairs.add(pair_key)
-                            candidates.append({
-                                "entity_1": {"id": e1["id"], "name": e1["name"], "type": e1["type"]},
-                                "entity_2": {"id": e2["id"], "name": e2["name"], "type": e2["type"]},
-                                "similarity": round(ratio, 3),
-                                "method": "fuzzy_name",
-                            })
-                            continue
-
-                        # Prefix match: short name is prefix of longer name
-                        shorter, longer = (cn1, cn2) if len(cn1) <= len(cn2) else (cn2, cn1)
-                        if len(shorter) >= 3 and longer.startswith(shorter):
-                            if pair_key not in seen_pairs:
-                                seen_pairs.add(pair_key)
-                                candidates.append({
-                                    "entity_1": {"id": e1["id"], "name": e1["name"], "type": e1["type"]},
-                                    "entity_2": {"id": e2["id"], "name": e2["name"], "type": e2["type"]},
-                                    "similarity": 0.80,
-                                    "method": "fuzzy_name_prefix",
-                                })
+                    cn1 = e1["canonical_name"]
+                    if len(cn1) < 3:
+                        continue
+                    for j in range(i + 1, len(group)):
+                        if not group[j]["canonical_name"].startswith(cn1):
+                            break
+                        fuzzy_hits.setdefault((etype, i, j), ("fuzzy_name_prefix", 0.80))
+
+            type_order = {etype: n for n, etype in enumerate(by_type)}
+            for etype, i, j in sorted(fuzzy_hits, key=lambda k: (type_order[k[0]], k[1], k[2])):
+                e1, e2 = by_type[etype][i], by_type[etype][j]
+                pair_key = (min(e1["id"], e2["id"]), max(e1["id"], e2["id"]))
+                if pair_key in seen_pairs:
+                    continue
+                seen_pairs.add(pair_key)
+                method, similarity = fuzzy_hits[(etype, i, j)]
+                candidates.append({
+                    "entity_1": {"id": e1["id"], "name": e1["name"], "type": e1["type"]},
+                    "entity_2": {"id": e2["id"], "name": e2["name"], "type": e2["type"]},
+                    "similarity": similarity,
+                    "method": method,
+                })
         except Exception as e:
             logger.debug(f"Fuzzy name dedupe failed: {e}")
 
@@ -2650,6 +2906,7 @@ class ConsolidateService:
             logger.info(f"Found {len(candidates)} potential entity duplicates")
         return candidates
 
+    @invalidates_recall
     def run_lifecycle_transitions(self) -> dict:
         """Apply lifecycle tier transitions based on access patterns.
 
@@ -2707,6 +2964,7 @@ class ConsolidateService:
 
         return {"cooled": cooled, "archived": archived}
 
+    @invalidates_recall
     def detect_auto_sacred(self) -> int:
         """Auto-promote memories about close-circle entities that match sacred keywords."""
         config = self.config
@@ -2807,10 +3065,12 @@ class ConsolidateService:
         Run complete consolidation: decay, patterns, predictions.
         Typically called overnight. Wraps each phase in a transaction
         so partial failures don't leave the database in an inconsistent state.
+        Publishes a ``consolidation`` event as each phase ends.
         """
         logger.info("Starting full consolidation")
 
         results = {}
+        publish_event("consolidation", phase="started")
 
         # Phase 0: Pre-consolidation backup
         if self.config.enable_pre_consolidation_backup:
@@ -2821,6 +3081,8 @@ class ConsolidateService:
                 logger.warning(f"Pre-consolidation backup failed: {e}")
                 results["backup_error"] = str(e)
 
+        publish_event("consolidation", phase="backup")
+
         # [4R: Reduce]
         # Phase 1: Decay + boost (modifies importance scores)
         try:
@@ -2831,6 +3093,8 @@ class ConsolidateService:
             results["decay"] = {"error": str(e)}
             results["boosted"] = 0
 
+        publish_event("consolidation", phase="decay")
+
         # Phase 1b: Lifecycle transitions + auto-sacred
         try:
             results["lifecycle"] = self.run_lifecycle_transitions()
@@ -2840,16 +3104,21 @@ class ConsolidateService:
             logger.warning(f"Lifecycle phase failed: {e}")
             results["lifecycle"] = {"error": str(e)}
 
+        publish_event("consolidation", phase="lifecycle")
+
         # [4R: Reflect]
         # Phase 2: Merging (modifies memory content)
         try:
             results["merged"] = self.merge_similar_memories()
+            results["merge_stats"] = self.last_merge_stats
             results["reflections_aggregated"] = self.aggregate_reflections()
         except Exception as e:
             logger.warning(f"Merge phase failed: {e}")
             results["merged"] = 0
             results["reflections_aggregated"] = 0
 
+        publish_event("consolidation", phase="merge")
+
         # [4R: Reweave]
         # Phase 3: Detection (read-heavy, writes new pattern rows)
         try:
@@ -2859,6 +3128,8 @@ class ConsolidateService:
             logger.warning(f"Pattern detection failed: {e}")
             results["patterns_detected"] = 0
 
+        publish_event("consolidation", phase="patterns")
+
         # [4R: Reweave] Propagate updated patterns/tiers to vault inline
         try:
             if self.config.vault_sync_enabled:
@@ -2870,6 +3141,8 @@ class ConsolidateService:
             logger.warning(f"[4R: Reweave] Vault sync skipped: {e}")
             # Non-fatal: 3:15 AM scheduler will catch any missed updates
 
+        publish_event("consolidation", phase="vault_sync")
+
         # Phase 4: Entity summaries (hierarchical graph retrieval)
         try:
             results["entity_summaries_generated"] = self.generate_entity_summaries()
@@ -2877,6 +3150,8 @@ class ConsolidateService:
             logger.warning(f"Entity summary generation failed: {e}")
             results["entity_summaries_generated"] = 0
 
+        publish_event("consolidation", phase="entity_summaries")
+
         # [4R: Verify]
         # Phase 5: Auto-dedupe entities
         try:
@@ -2886,6 +3161,8 @@ class ConsolidateService:
             logger.warning(f"Auto dedupe failed: {e}")
             results["dedupe_candidates_found"] = 0
 
+        publish_event("consolidation", phase="dedupe")
+
         # Phase 6: Retention cleanup (removes old data)
         try:
             results["retention"] = self.run_retention_cleanup()
@@ -2893,7 +3170,10 @@ class ConsolidateService:
             logger.warning(f"Retention cleanup failed: {e}")
             results["retention"] = {"error": str(e)}
 
+        publish_event("consolidation", phase="retention")
+
         logger.info(f"Consolidation complete: {results}")
+        publish_event("consolidation", phase="complete")
         return results
 
 
@@ -0,0 +1,287 @@
+"""
+Entity name matcher for query-time entity resolution.
+
+Recall needs to know which known entities a query mentions ("what did Sarah
+say about Acme?"). Doing that with one regex per entity means compiling and
+running O(entities) patterns on every recall. This module keeps an
+Aho-Corasick automaton over every canonical name and alias instead, so
+finding all mentions is a single left-to-right pass over the query.
+
+The automaton is built once per database from the entities and
+entity_aliases tables. After that it is kept up to date by the write paths
+in RememberService (remember_entity, merge_entities, delete_entity). Rows
+inserted by other writers are picked up by an id high-water mark check, and
+the whole index is rebuilt every REBUILD_INTERVAL seconds as a backstop for
+out-of-band renames and soft-deletes.
+
+Matches follow the same rules as the regex it replaces:
+``\\b<name>\\b`` on lowercased text, names shorter than two characters are
+ignored.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Pattern kinds. A canonical name outranks an alias for the same entity.
+NAME = "name"
+ALIAS = "alias"
+
+
+def _is_word(ch: str) -> bool:
+    """Same character class as the regex ``\\w``."""
+    return ch.isalnum() or ch == "_"
+
+
+def _at_boundary(text: str, pos: int) -> bool:
+    """True where ``\\b`` would match between text[pos - 1] and text[pos]."""
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+class EntityMatcher:
+    """Multi-pattern matcher over entity canonical names and aliases."""
+
+    MIN_LENGTH = 2
+    REBUILD_INTERVAL = 3600.0
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._built_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Trie: node 0 is the root. _goto[n] maps a character to a child node.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Nearest node on the failure chain that ends a pattern (0 = none)
+        self._dict_link: List[int] = [0]
+        # Terminal node -> pattern text, and pattern -> {entity_id: kind}
+        self._terminal: Dict[int, str] = {}
+        self._node_of: Dict[str, int] = {}
+        self._owners: Dict[str, Dict[int, str]] = {}
+        # entity_id -> patterns it owns, so removals do not scan every pattern
+        self._by_entity: Dict[int, Set[str]] = {}
+        self._links_stale = False
+        self._max_entity_id = 0
+        self._max_alias_id = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load_entities(self, min_id: int) -> None:
+        rows = self.db.execute(
+            "SELECT id, canonical_name FROM entities WHERE id > ? AND deleted_at IS NULL",
+            (min_id,),
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._add(row["id"], row["canonical_name"], NAME)
+            self._max_entity_id = max(self._max_entity_id, row["id"])
+
+    def _load_aliases(self, min_id: int) -> None:
+        rows = self.db.execute(
+            """
+            SELECT a.id, a.entity_id, a.canonical_alias
+            FROM entity_aliases a
+            JOIN entities e ON e.id = a.entity_id
+            WHERE a.id > ? AND e.deleted_at IS NULL
+            """,
+            (min_id,),
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._add(row["entity_id"], row["canonical_alias"], ALIAS)
+            self._max_alias_id = max(self._max_alias_id, row["id"])
+
+    def _refresh(self) -> None:
+        """Build on first use, then catch up with rows added by other writers.
+
+        Reads go through this thread's open transaction, if any, and would
+        pick up its uncommitted rows; so inside one nothing is caught up
+        (the transaction's own writes arrive through after_commit hooks),
+        and an index first built there is rebuilt outside it.
+        """
+        in_transaction = self.db.in_transaction()
+        stale = time.monotonic() - self._built_at > self.REBUILD_INTERVAL
+        if not self._loaded or (stale and not in_transaction):
+            self._reset()
+            self._load_entities(0)
+            self._load_aliases(0)
+            self._loaded = True
+            self._built_at = float("-inf") if in_transaction else time.monotonic()
+            logger.debug(f"Entity matcher built: {len(self._owners)} patterns")
+            return
+        if in_transaction:
+            return
+
+        marks = self.db.execute(
+            "SELECT (SELECT MAX(id) FROM entities) AS e, (SELECT MAX(id) FROM entity_aliases) AS a",
+            fetch=True,
+        )
+        if not marks:
+            return
+        if (marks[0]["e"] or 0) > self._max_entity_id:
+            self._load_entities(self._max_entity_id)
+        if (marks[0]["a"] or 0) > self._max_alias_id:
+            self._load_aliases(self._max_alias_id)
+
+    # ------------------------------------------------------------------
+    # Automaton
+    # ------------------------------------------------------------------
+
+    def _add(self, entity_id: int, pattern: Optional[str], kind: str) -> None:
+        if not pattern:
+            return
+        pattern = pattern.lower()
+        if len(pattern) < self.MIN_LENGTH:
+            return
+
+        owners = self._owners.get(pattern)
+        if owners is None:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._dict_link.append(0)
+                node = nxt
+            self._terminal[node] = pattern
+            self._node_of[pattern] = node
+            owners = self._owners[pattern] = {}
+            self._links_stale = True
+
+        if owners.get(entity_id) != NAME:
+            owners[entity_id] = kind
+        self._by_entity.setdefault(entity_id, set()).add(pattern)
+
+    def _build_links(self) -> None:
+        """Recompute failure and dictionary-suffix links breadth-first."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._dict_link[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                fail = self._goto[f].get(ch, 0)
+                if fail == child:
+                    fail = 0
+                self._fail[child] = fail
+                self._dict_link[child] = fail if fail in self._terminal else self._dict_link[fail]
+                queue.append(child)
+        self._links_stale = False
+
+    def _scan(self, text: str, stop_at_first: bool = False) -> Dict[int, str]:
+        if self._links_stale:
+            self._build_links()
+
+        found: Dict[int, str] = {}
+        goto, fail, dict_link, terminal = self._goto, self._fail, self._dict_link, self._terminal
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            out = node if node in terminal else dict_link[node]
+            while out:
+                pattern = terminal.get(out)
+                if pattern is not None:
+                    start = i - len(pattern) + 1
+                    if _at_boundary(text, start) and _at_boundary(text, i + 1):
+                        for entity_id, kind in self._owners[pattern].items():
+                            if found.get(entity_id) != NAME:
+                                found[entity_id] = kind
+                        if stop_at_first and found:
+                            return found
+                out = dict_link[out]
+        return found
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def find(self, text: str) -> Dict[int, str]:
+        """Return {entity_id: NAME | ALIAS} for every entity mentioned in text."""
+        if not text or len(text.strip()) < self.MIN_LENGTH:
+            return {}
+        with self._lock:
+            self._refresh()
+            return self._scan(text.lower())
+
+    def mentions_any(self, text: str) -> bool:
+        """True if text mentions at least one known entity."""
+        if not text or len(text.strip()) < self.MIN_LENGTH:
+            return False
+        with self._lock:
+            self._refresh()
+            return bool(self._scan(text.lower(), stop_at_first=True))
+
+    def add(self, entity_id: int, name: Optional[str], kind: str = NAME) -> None:
+        """Register a canonical name or alias written by the caller.
+
+        A no-op until the matcher has been built; the first build reads the
+        row from the database anyway.
+        """
+        with self._lock:
+            if self._loaded:
+                self._add(entity_id, name, kind)
+
+    def remove_entity(self, entity_id: int) -> None:
+        """Forget every name and alias of a deleted or merged-away entity."""
+        with self._lock:
+            for pattern in self._by_entity.pop(entity_id, ()):
+                owners = self._owners.get(pattern)
+                if owners is None:
+                    continue
+                owners.pop(entity_id, None)
+                if not owners:
+                    # The trie node stays; it just stops being a match.
+                    del self._owners[pattern]
+                    self._terminal.pop(self._node_of.pop(pattern), None)
+
+    def invalidate(self) -> None:
+        """Drop the automaton; the next lookup rebuilds it from the database."""
+        with self._lock:
+            self._loaded = False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "patterns": len(self._owners),
+                "entities": len(self._by_entity),
+                "nodes": len(self._goto),
+            }
+
+
+_matchers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_matchers_lock = threading.Lock()
+
+
+def get_entity_matcher(db=None) -> EntityMatcher:
+    """Get or create the matcher for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _matchers_lock:
+        matcher = _matchers.get(db)
+        if matcher is None:
+            matcher = _matchers[db] = EntityMatcher(db)
+        return matcher
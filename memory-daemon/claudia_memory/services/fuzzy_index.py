@@ -0,0 +1,332 @@
+"""
+Fuzzy entity name index for duplicate detection.
+
+Several code paths look for entities whose names are "almost the same":
+RememberService._fuzzy_find_entity and the remember_entity near-duplicate
+guard (on every entity write), RecallService.find_duplicate_entities, and
+the alias/fuzzy passes of ConsolidateService.auto_dedupe_entities. Comparing every name against every
+other name with difflib.SequenceMatcher is O(n) per write and O(n^2) per
+scan, which takes minutes at a few thousand entities.
+
+This module keeps trigram postings per entity type instead. Candidates are
+the entities that share enough padded trigrams with the query name (the
+q-gram count filter) and whose length allows the requested ratio at all.
+Only that shortlist is scored with SequenceMatcher by the caller. Names are
+padded pg_trgm style (two leading spaces, one trailing) so short names and
+shared prefixes still produce trigrams.
+
+The index also keeps canonical alias -> entity postings, which answers the
+"two entities share an alias" question without a self-join.
+
+Like entity_matcher, the index is built once per database, kept current by
+RememberService's write paths, catches up with rows from other writers via
+an id high-water mark, and is rebuilt every REBUILD_INTERVAL seconds.
+"""
+
+import logging
+import math
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+GRAM = 3
+
+
+def trigrams(name: str) -> FrozenSet[str]:
+    """Distinct padded trigrams of a canonical name."""
+    padded = "  " + name + " "
+    return frozenset(padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1))
+
+
+def _could_reach(min_ratio: float, len_a: int, len_b: int, grams_a: int, grams_b: int, shared: int) -> bool:
+    """Cheap necessary conditions for SequenceMatcher ratio >= min_ratio.
+
+    ratio = 2M / (len_a + len_b) and M <= min(len_a, len_b), which bounds the
+    ratio by length alone. The matched characters form a common subsequence,
+    so the strings are at most k = (1 - ratio) * (len_a + len_b) insertions
+    or deletions apart. Each edit destroys at most GRAM distinct trigrams.
+    """
+    total = len_a + len_b
+    if 2 * min(len_a, len_b) < min_ratio * total - 1e-9:
+        return False
+    edits = math.floor((1.0 - min_ratio) * total + 1e-9)
+    return shared >= max(grams_a, grams_b) - GRAM * edits
+
+
+class FuzzyNameIndex:
+    """Trigram and alias postings over live entities."""
+
+    REBUILD_INTERVAL = 3600.0
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._built_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        # entity_id -> (type, canonical_name, trigrams)
+        self._entities: Dict[int, Tuple[str, str, FrozenSet[str]]] = {}
+        # type -> trigram -> entity ids
+        self._postings: Dict[str, Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        # canonical alias -> entity ids, and the reverse for removals
+        self._alias_owners: Dict[str, Set[int]] = defaultdict(set)
+        self._aliases_of: Dict[int, Set[str]] = defaultdict(set)
+        self._max_entity_id = 0
+        self._max_alias_id = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load_entities(self, min_id: int) -> None:
+        rows = self.db.execute(
+            "SELECT id, type, canonical_name FROM entities WHERE id > ? AND deleted_at IS NULL",
+            (min_id,),
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._add_entity(row["id"], row["type"], row["canonical_name"])
+            self._max_entity_id = max(self._max_entity_id, row["id"])
+
+    def _load_aliases(self, min_id: int) -> None:
+        rows = self.db.execute(
+            """
+            SELECT a.id, a.entity_id, a.canonical_alias
+            FROM entity_aliases a
+            JOIN entities e ON e.id = a.entity_id
+            WHERE a.id > ? AND e.deleted_at IS NULL
+            """,
+            (min_id,),
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._add_alias(row["entity_id"], row["canonical_alias"])
+            self._max_alias_id = max(self._max_alias_id, row["id"])
+
+    def _refresh(self) -> None:
+        """Build on first use, then catch up with rows added by other writers.
+
+        Reads go through this thread's open transaction, if any, and would
+        pick up its uncommitted rows; so inside one nothing is caught up
+        (the transaction's own writes arrive through after_commit hooks),
+        and an index first built there is rebuilt outside it.
+        """
+        in_transaction = self.db.in_transaction()
+        stale = time.monotonic() - self._built_at > self.REBUILD_INTERVAL
+        if not self._loaded or (stale and not in_transaction):
+            self._reset()
+            self._load_entities(0)
+            self._load_aliases(0)
+            self._loaded = True
+            self._built_at = float("-inf") if in_transaction else time.monotonic()
+            logger.debug(f"Fuzzy name index built: {len(self._entities)} entities")
+            return
+        if in_transaction:
+            return
+
+        marks = self.db.execute(
+            "SELECT (SELECT MAX(id) FROM entities) AS e, (SELECT MAX(id) FROM entity_aliases) AS a",
+            fetch=True,
+        )
+        if not marks:
+            return
+        if (marks[0]["e"] or 0) > self._max_entity_id:
+            self._load_entities(self._max_entity_id)
+        if (marks[0]["a"] or 0) > self._max_alias_id:
+            self._load_aliases(self._max_alias_id)
+
+    # ------------------------------------------------------------------
+    # Postings
+    # ------------------------------------------------------------------
+
+    def _add_entity(self, entity_id: int, entity_type: Optional[str], canonical: Optional[str]) -> None:
+        if not canonical:
+            return
+        entity_type = entity_type or ""
+        if entity_id in self._entities:
+            self._drop_entity_name(entity_id)
+        grams = trigrams(canonical)
+        self._entities[entity_id] = (entity_type, canonical, grams)
+        postings = self._postings[entity_type]
+        for gram in grams:
+            postings[gram].add(entity_id)
+
+    def _drop_entity_name(self, entity_id: int) -> None:
+        entry = self._entities.pop(entity_id, None)
+        if entry is None:
+            return
+        entity_type, _, grams = entry
+        postings = self._postings.get(entity_type, {})
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(entity_id)
+                if not ids:
+                    del postings[gram]
+
+    def _add_alias(self, entity_id: int, canonical_alias: Optional[str]) -> None:
+        if not canonical_alias:
+            return
+        self._alias_owners[canonical_alias].add(entity_id)
+        self._aliases_of[entity_id].add(canonical_alias)
+
+    def _remove(self, entity_id: int) -> None:
+        self._drop_entity_name(entity_id)
+        for alias in self._aliases_of.pop(entity_id, ()):
+            owners = self._alias_owners.get(alias)
+            if owners is not None:
+                owners.discard(entity_id)
+                if not owners:
+                    del self._alias_owners[alias]
+
+    def _shortlist(
+        self,
+        canonical: str,
+        grams: FrozenSet[str],
+        entity_type: str,
+        min_ratio: float,
+        above: int = 0,
+    ) -> List[int]:
+        postings = self._postings.get(entity_type)
+        if not postings:
+            return []
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for other in postings.get(gram, ()):
+                if other > above:
+                    shared[other] += 1
+
+        out = []
+        for other, count in shared.items():
+            _, other_name, other_grams = self._entities[other]
+            if _could_reach(min_ratio, len(canonical), len(other_name), len(grams), len(other_grams), count):
+                out.append(other)
+        return out
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def candidates(self, canonical: str, entity_type: str, min_ratio: float) -> List[int]:
+        """Entities of entity_type whose name could be min_ratio similar to canonical.
+
+        The result is a superset to be scored exactly by the caller. Names
+        that share no trigram with canonical are never returned.
+        """
+        if not canonical:
+            return []
+        with self._lock:
+            self._refresh()
+            return self._shortlist(canonical, trigrams(canonical), entity_type or "", min_ratio)
+
+    def similar_names(self, canonical: str, min_ratio: float) -> List[str]:
+        """Canonical names of any type that could be min_ratio similar to canonical."""
+        if not canonical:
+            return []
+        grams = trigrams(canonical)
+        with self._lock:
+            self._refresh()
+            names = set()
+            for entity_type in list(self._postings):
+                for eid in self._shortlist(canonical, grams, entity_type, min_ratio):
+                    names.add(self._entities[eid][1])
+        return sorted(names)
+
+    def candidate_pairs(self, min_ratio: float, entity_type: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+        """Yield (lower_id, higher_id) same-type pairs worth scoring exactly."""
+        with self._lock:
+            self._refresh()
+            entries = [
+                (eid, entry) for eid, entry in self._entities.items()
+                if entity_type is None or entry[0] == entity_type
+            ]
+            pairs = []
+            for eid, (etype, canonical, grams) in entries:
+                for other in self._shortlist(canonical, grams, etype, min_ratio, above=eid):
+                    pairs.append((eid, other))
+        pairs.sort()
+        return iter(pairs)
+
+    def shared_aliases(self) -> Dict[str, Set[int]]:
+        """Canonical aliases held by two or more live entities."""
+        with self._lock:
+            self._refresh()
+            return {alias: set(ids) for alias, ids in self._alias_owners.items() if len(ids) >= 2}
+
+    def entity_type(self, entity_id: int) -> Optional[str]:
+        with self._lock:
+            entry = self._entities.get(entity_id)
+            return entry[0] if entry else None
+
+    def add_entity(self, entity_id: int, entity_type: str, canonical: str) -> None:
+        """Register an entity written by the caller (no-op until built)."""
+        with self._lock:
+            if self._loaded:
+                self._add_entity(entity_id, entity_type, canonical)
+
+    def add_alias(self, entity_id: int, canonical_alias: str) -> None:
+        """Register an alias written by the caller (no-op until built)."""
+        with self._lock:
+            if self._loaded:
+                self._add_alias(entity_id, canonical_alias)
+
+    def remove_entity(self, entity_id: int) -> None:
+        """Forget a deleted or merged-away entity."""
+        with self._lock:
+            self._remove(entity_id)
+
+    def reload_entity(self, entity_id: int) -> None:
+        """Re-read one entity's name and aliases, e.g. after a merge moved aliases onto it."""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._remove(entity_id)
+            row = self.db.execute(
+                "SELECT type, canonical_name FROM entities WHERE id = ? AND deleted_at IS NULL",
+                (entity_id,),
+                fetch=True,
+            )
+            if not row:
+                return
+            self._add_entity(entity_id, row[0]["type"], row[0]["canonical_name"])
+            for alias in self.db.execute(
+                "SELECT canonical_alias FROM entity_aliases WHERE entity_id = ?",
+                (entity_id,),
+                fetch=True,
+            ) or []:
+                self._add_alias(entity_id, alias["canonical_alias"])
+
+    def invalidate(self) -> None:
+        """Drop the postings; the next lookup rebuilds them from the database."""
+        with self._lock:
+            self._loaded = False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entities": len(self._entities),
+                "trigrams": sum(len(p) for p in self._postings.values()),
+                "aliases": len(self._alias_owners),
+            }
+
+
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_fuzzy_index(db=None) -> FuzzyNameIndex:
+    """Get or create the fuzzy name index for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _indexes_lock:
+        index = _indexes.get(db)
+        if index is None:
+            index = _indexes[db] = FuzzyNameIndex(db)
+        return index
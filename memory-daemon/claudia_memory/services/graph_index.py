@@ -0,0 +1,399 @@
+"""
+In-memory adjacency index over the relationships table.
+
+Graph-aware recall used to re-derive the graph from SQL on every call: a
+query per hop per seed entity in _expand_graph_weighted, a recursive CTE in
+_expand_graph and find_path, and a self-join with GROUP_CONCAT in
+get_hub_entities. With 10k+ entities those dominate recall latency.
+
+GraphIndex holds every relationship once, keyed by id, plus a per-entity
+adjacency map (entity_id -> {relationship_id: neighbour_id}). Each edge
+keeps its endpoints, type, strength and validity, so traversals can apply
+the same filters the SQL did (``strength > 0.1``, ``invalid_at IS NULL``)
+without touching the database. Entity attributes (name, importance, type)
+are not cached here: they change under decay and consolidation, so callers
+fetch them for the handful of ids a traversal returns.
+
+The index is kept in sync the same way as the entity name matcher:
+
+- RememberService applies its own writes (relate_entities,
+  invalidate_relationship, merge_entities) from after_commit hooks, so a
+  rolled-back write never reaches the index.
+- Rows inserted by other writers are picked up through the id high-water
+  mark on every lookup.
+- Bulk updates (relationship decay) call invalidate(), and the whole index
+  is rebuilt every REBUILD_INTERVAL seconds as a backstop.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Relationships at or below this strength are ignored by every traversal
+MIN_STRENGTH = 0.1
+
+
+class Edge(NamedTuple):
+    source: int
+    target: int
+    rel_type: str
+    strength: float
+    valid: bool
+
+
+class Neighbor(NamedTuple):
+    entity_id: int
+    rel_id: int
+    rel_type: str
+    strength: float
+    forward: bool  # True when the walk follows source -> target
+
+
+NodeInfo = Callable[[Iterable[int]], Dict[int, Mapping[str, Any]]]
+
+
+class GraphIndex:
+    """Adjacency index with k-hop expansion, shortest paths and degree ranking."""
+
+    REBUILD_INTERVAL = 3600.0
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._built_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._edges: Dict[int, Edge] = {}
+        self._adj: Dict[int, Dict[int, int]] = {}
+        self._max_rel_id = 0
+        self._version = 0
+        self._degree_cache: Optional[Tuple[int, float, List[Tuple[int, int]]]] = None
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self, where: str = "id > ?", params: tuple = (0,)) -> None:
+        rows = self.db.execute(
+            f"""
+            SELECT id, source_entity_id, target_entity_id, relationship_type, strength,
+                   invalid_at IS NULL AS valid
+            FROM relationships
+            WHERE {where}
+            """,
+            params,
+            fetch=True,
+        ) or []
+        for row in rows:
+            self._put(
+                row["id"], row["source_entity_id"], row["target_entity_id"],
+                row["relationship_type"], row["strength"], bool(row["valid"]),
+            )
+            self._max_rel_id = max(self._max_rel_id, row["id"])
+
+    def _refresh(self) -> None:
+        """Build on first use, then catch up with rows added by other writers.
+
+        Reads go through this thread's open transaction, if any, and would
+        pick up its uncommitted rows; so inside one nothing is caught up
+        (the transaction's own writes arrive through after_commit hooks),
+        and an index first built there is rebuilt outside it.
+        """
+        in_transaction = self.db.in_transaction()
+        stale = time.monotonic() - self._built_at > self.REBUILD_INTERVAL
+        if not self._loaded or (stale and not in_transaction):
+            self._reset()
+            self._load()
+            self._loaded = True
+            self._built_at = float("-inf") if in_transaction else time.monotonic()
+            logger.debug(f"Graph index built: {len(self._adj)} entities, {len(self._edges)} relationships")
+            return
+        if in_transaction:
+            return
+
+        marks = self.db.execute("SELECT MAX(id) AS m FROM relationships", fetch=True)
+        if marks and (marks[0]["m"] or 0) > self._max_rel_id:
+            self._load("id > ?", (self._max_rel_id,))
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def _put(self, rel_id: int, source: int, target: int, rel_type: str,
+             strength: float, valid: bool) -> None:
+        self._drop(rel_id)
+        self._edges[rel_id] = Edge(source, target, rel_type, strength or 0.0, valid)
+        self._adj.setdefault(source, {})[rel_id] = target
+        self._adj.setdefault(target, {})[rel_id] = source
+        self._version += 1
+
+    def _drop(self, rel_id: int) -> None:
+        edge = self._edges.pop(rel_id, None)
+        if edge is None:
+            return
+        for node in (edge.source, edge.target):
+            links = self._adj.get(node)
+            if links is not None:
+                links.pop(rel_id, None)
+                if not links:
+                    del self._adj[node]
+        self._version += 1
+
+    def upsert_edge(self, rel_id: int, source: int, target: int, rel_type: str,
+                    strength: float, valid: bool = True) -> None:
+        """Record a relationship created or strengthened by the caller."""
+        with self._lock:
+            if self._loaded:
+                self._put(rel_id, source, target, rel_type, strength, valid)
+
+    def mark_invalid(self, rel_id: int) -> None:
+        """Record that a relationship has been invalidated or superseded."""
+        with self._lock:
+            edge = self._edges.get(rel_id)
+            if edge is not None:
+                self._edges[rel_id] = edge._replace(valid=False)
+                self._version += 1
+
+    def remove_entity(self, entity_id: int) -> None:
+        """Drop every relationship touching an entity (merged away or deleted)."""
+        with self._lock:
+            for rel_id in list(self._adj.get(entity_id, {})):
+                self._drop(rel_id)
+
+    def reload_entity(self, entity_id: int) -> None:
+        """Re-read an entity's relationships after they were rewritten in SQL."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for rel_id in list(self._adj.get(entity_id, {})):
+                self._drop(rel_id)
+            self._load(
+                "source_entity_id = ? OR target_entity_id = ?",
+                (entity_id, entity_id),
+            )
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup rebuilds it from the database."""
+        with self._lock:
+            self._loaded = False
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _neighbors(self, entity_id: int, min_strength: float, valid_only: bool) -> List[Neighbor]:
+        out = []
+        edges = self._edges
+        for rel_id, other in self._adj.get(entity_id, {}).items():
+            edge = edges[rel_id]
+            if edge.strength <= min_strength or (valid_only and not edge.valid):
+                continue
+            out.append(Neighbor(other, rel_id, edge.rel_type, edge.strength, edge.source == entity_id))
+        out.sort(key=lambda n: -n.strength)
+        return out
+
+    def neighbors(self, entity_id: int, min_strength: float = MIN_STRENGTH,
+                  valid_only: bool = True) -> List[Neighbor]:
+        """Direct neighbours of an entity, strongest relationship first."""
+        with self._lock:
+            self._refresh()
+            return self._neighbors(entity_id, min_strength, valid_only)
+
+    def expand_weighted(
+        self,
+        seed: int,
+        node_info: NodeInfo,
+        depth: int = 2,
+        limit_per_hop: int = 15,
+        fan_out: int = 10,
+        min_strength: float = MIN_STRENGTH,
+    ) -> List[Dict[str, Any]]:
+        """Strength-aware k-hop expansion from a seed entity.
+
+        ``node_info`` receives candidate entity ids for one hop and returns
+        {id: row} for the ones that may be visited (callers apply their
+        importance filter there), so each hop costs one batched lookup.
+
+        Hop 1 keeps the ``limit_per_hop`` strongest links (ties broken by
+        importance). Each later hop expands the first ``fan_out`` entities
+        of the previous hop, ``limit_per_hop // 2`` links each. Path strength
+        is the product of edge strengths along the path.
+        """
+        with self._lock:
+            self._refresh()
+
+        connected: List[Dict[str, Any]] = []
+        seen = {seed}
+        path_strength = {seed: 1.0}
+        frontier = [seed]
+
+        for hop in range(1, depth + 1):
+            with self._lock:
+                expansions = [
+                    (node, self._neighbors(node, min_strength, True))
+                    for node in (frontier if hop == 1 else frontier[:fan_out])
+                ]
+            candidates = {n.entity_id for _, links in expansions for n in links} - {seed}
+            if not candidates:
+                break
+            info = node_info(candidates)
+
+            next_frontier = []
+            for node, links in expansions:
+                rows = [n for n in links if n.entity_id in info]
+                if hop == 1:
+                    rows.sort(key=lambda n: (-n.strength, -(info[n.entity_id].get("importance") or 0.0)))
+                    rows = rows[:limit_per_hop]
+                else:
+                    rows = rows[:limit_per_hop // 2]
+                for n in rows:
+                    if n.entity_id in seen:
+                        continue
+                    seen.add(n.entity_id)
+                    strength = path_strength[node] * n.strength
+                    path_strength[n.entity_id] = strength
+                    entry = dict(info[n.entity_id])
+                    entry.update({
+                        "id": n.entity_id,
+                        "distance": hop,
+                        "path_strength": strength,
+                        "via_relationship": n.rel_type,
+                    })
+                    connected.append(entry)
+                    next_frontier.append(n.entity_id)
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        return connected
+
+    def hop_distances(self, seed: int, depth: int, min_strength: float = MIN_STRENGTH,
+                      valid_only: bool = True) -> Dict[int, int]:
+        """Breadth-first hop distance to every entity within ``depth`` hops."""
+        with self._lock:
+            self._refresh()
+            dist = {seed: 0}
+            frontier = [seed]
+            for hop in range(1, depth + 1):
+                nxt = []
+                for node in frontier:
+                    for n in self._neighbors(node, min_strength, valid_only):
+                        if n.entity_id not in dist:
+                            dist[n.entity_id] = hop
+                            nxt.append(n.entity_id)
+                frontier = nxt
+                if not frontier:
+                    break
+            del dist[seed]
+            return dist
+
+    def shortest_path(self, a: int, b: int, max_depth: int = 4,
+                      min_strength: float = MIN_STRENGTH) -> Optional[List[Tuple[int, Optional[Neighbor]]]]:
+        """Bidirectional BFS over valid relationships.
+
+        Returns [(entity_id, link used to reach it)] from a to b, where the
+        first element's link is None, or None when no path of at most
+        ``max_depth`` hops exists.
+        """
+        if a == b:
+            return [(a, None)]
+        with self._lock:
+            self._refresh()
+            # parent[node] = (previous node, link walked from previous to node)
+            parents = ({a: None}, {b: None})
+            frontiers = ([a], [b])
+            depths = [0, 0]
+
+            while frontiers[0] and frontiers[1] and depths[0] + depths[1] < max_depth:
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                mine, other = parents[side], parents[1 - side]
+                nxt = []
+                meetings = []
+                for node in frontiers[side]:
+                    for n in self._neighbors(node, min_strength, True):
+                        if n.entity_id in mine:
+                            continue
+                        mine[n.entity_id] = (node, n)
+                        nxt.append(n.entity_id)
+                        if n.entity_id in other:
+                            meetings.append(n.entity_id)
+                depths[side] += 1
+                if meetings:
+                    meet = min(meetings, key=lambda m: self._depth_of(m, other))
+                    return self._join(meet, parents)
+                frontiers = (nxt, frontiers[1]) if side == 0 else (frontiers[0], nxt)
+            return None
+
+    @staticmethod
+    def _depth_of(node: int, parents: Dict[int, Any]) -> int:
+        depth = 0
+        while parents[node] is not None:
+            node = parents[node][0]
+            depth += 1
+        return depth
+
+    def _join(self, meet: int, parents) -> List[Tuple[int, Optional[Neighbor]]]:
+        from_a, from_b = parents
+        left = []
+        node = meet
+        while from_a[node] is not None:
+            prev, link = from_a[node]
+            left.append((node, link))
+            node = prev
+        left.append((node, None))
+        left.reverse()
+
+        # Links on b's side were walked toward a's side; flip their direction
+        node = meet
+        while from_b[node] is not None:
+            prev, link = from_b[node]
+            left.append((prev, link._replace(entity_id=prev, forward=not link.forward)))
+            node = prev
+        return left
+
+    def degree_ranking(self, min_degree: int = 1,
+                       min_strength: float = MIN_STRENGTH) -> List[Tuple[int, int]]:
+        """(entity_id, live relationship count), most connected first."""
+        with self._lock:
+            self._refresh()
+            cached = self._degree_cache
+            if cached is None or cached[0] != self._version or cached[1] != min_strength:
+                edges = self._edges
+                ranking = []
+                for node, links in self._adj.items():
+                    degree = 0
+                    for rel_id in links:
+                        edge = edges[rel_id]
+                        if edge.valid and edge.strength > min_strength:
+                            degree += 1
+                    if degree:
+                        ranking.append((node, degree))
+                ranking.sort(key=lambda item: -item[1])
+                self._degree_cache = cached = (self._version, min_strength, ranking)
+            return [item for item in cached[2] if item[1] >= min_degree]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entities": len(self._adj), "relationships": len(self._edges)}
+
+
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_graph_index(db=None) -> GraphIndex:
+    """Get or create the graph index for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _indexes_lock:
+        index = _indexes.get(db)
+        if index is None:
+            index = _indexes[db] = GraphIndex(db)
+        return index
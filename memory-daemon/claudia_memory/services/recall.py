@@ -13,16 +13,57 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from ..config import get_config
 from ..database import get_db
+from ..decay import memory_importance_sql, reflection_importance_sql, row_importance
 from ..embeddings import embed_sync, get_embedding_service
+from ..metrics import get_metrics
+from ..vector_codec import encode as encode_vector
 from ..utils import parse_naive
 from ..extraction.entity_extractor import get_extractor
+from .access_tracker import get_access_tracker
+from .entity_matcher import ALIAS, NAME, get_entity_matcher
+from .fuzzy_index import get_fuzzy_index
+from .graph_index import get_graph_index
+from .recall_cache import get_recall_cache, normalize_query
 
 logger = logging.getLogger(__name__)
 
+_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+_FTS_MAX_TERMS = 16
+_FTS_STOPWORDS = frozenset(
+    "a an and are as at be but by did do does for from had has have how i if in "
+    "is it its me my of on or our so that the their them they this to was we "
+    "were what when where which who why will with you your".split()
+)
+
+
+def compile_fts_query(text: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Raw user text ("what's Sarah's email?", "C++ vs. Rust", "NOT-urgent")
+    is FTS5 syntax and throws on quotes, operators and column filters. Each
+    word is quoted as a literal term (the porter tokenizer still stems it)
+    and the terms are ORed so BM25 ranks partial matches instead of requiring
+    every word. Stopwords are dropped unless nothing else is left.
+
+    Returns None when the text has no indexable words.
+    """
+    terms: List[str] = []
+    seen = set()
+    for token in _FTS_TOKEN.findall(text.lower()):
+        if token not in seen:
+            seen.add(token)
+            terms.append(token)
+    content_terms = [t for t in terms if t not in _FTS_STOPWORDS]
+    terms = (content_terms or terms)[:_FTS_MAX_TERMS]
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"' for t in terms)
+
 
 @dataclass
 class RecallResult:
@@ -123,14 +164,51 @@ class RecallService:
         Returns:
             List of RecallResult ordered by relevance
         """
+        cache = get_recall_cache(self.db)
+        key = (
+            "recall", normalize_query(query), limit,
+            tuple(memory_types) if memory_types else None, about_entity,
+            min_importance, include_low_importance, date_after, date_before,
+            include_archived,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            self._update_access_counts(cached, datetime.utcnow())
+            get_metrics().incr("recall.cache_hit")
+            return cached
+
+        generation = cache.generation
+        results = self._recall(
+            query, limit, memory_types, about_entity, min_importance,
+            include_low_importance, date_after, date_before, include_archived,
+        )
+        cache.put(key, results, generation)
+        return results
+
+    def _recall(
+        self,
+        query: str,
+        limit: Optional[int],
+        memory_types: Optional[List[str]],
+        about_entity: Optional[str],
+        min_importance: Optional[float],
+        include_low_importance: bool,
+        date_after: Optional[datetime],
+        date_before: Optional[datetime],
+        include_archived: bool,
+    ) -> List[RecallResult]:
+        """recall() without the result cache."""
         if limit is None:
             limit = self.config.max_recall_results
 
         if min_importance is None and not include_low_importance:
             min_importance = self.config.min_importance_threshold
 
+        clock = get_metrics().stages("recall")
+
         # Get query embedding
         query_embedding = embed_sync(query)
+        clock.lap("embed")
 
         # --- Vector search ---
         vector_scores: Dict[int, float] = {}
@@ -149,7 +227,7 @@ class RecallService:
                 AND k = ?
                 """
             )
-            params.append(json.dumps(query_embedding))
+            params.append(encode_vector(query_embedding))
             params.append(limit * 2)
 
             self._apply_filters(sql_parts, params, memory_types, min_importance, date_after, date_before, about_entity, include_archived)
@@ -166,9 +244,11 @@ class RecallService:
                 if not RecallService._vec0_warned:
                     logger.warning(f"Vector search failed (will fall back silently from now on): {e}")
                     RecallService._vec0_warned = True
+        clock.lap("vector_knn")
 
         # --- FTS5 search ---
         fts_scores = self._fts_search(query, limit * 2, memory_types, min_importance)
+        clock.lap("fts")
 
         # --- Fallback: if neither vector nor FTS returned results, use keyword LIKE ---
         if not vector_scores and not fts_scores:
@@ -181,6 +261,8 @@ class RecallService:
             results.sort(key=lambda r: r.score, reverse=True)
             results = results[:limit]
             self._update_access_counts(results, now)
+            clock.lap("keyword_fallback")
+            clock.done()
             return results
 
         # --- Merge: collect all memory IDs from both sources ---
@@ -204,6 +286,7 @@ class RecallService:
             ) or []
             for row in fts_rows:
                 vector_rows[row["id"]] = row
+        clock.lap("row_fetch")
 
         # --- Score and build results ---
         now = datetime.utcnow()
@@ -229,7 +312,7 @@ class RecallService:
             for mid in all_ids:
                 row = vector_rows.get(mid)
                 if row:
-                    importance_data[mid] = row["importance"]
+                    importance_data[mid] = row_importance(row, now)
             if importance_data:
                 signal_rankings["importance"] = sorted(
                     importance_data.keys(), key=lambda mid: importance_data[mid], reverse=True
@@ -250,12 +333,15 @@ class RecallService:
                     recency_data.keys(), key=lambda mid: recency_data[mid]  # smallest age = most recent = best
                 )
 
+            clock.lap("rank_signals")
+
             # Graph proximity ranking
             graph_scores = self._compute_graph_scores(query, all_ids)
             if graph_scores:
                 signal_rankings["graph"] = sorted(
                     graph_scores.keys(), key=lambda mid: graph_scores[mid], reverse=True
                 )
+            clock.lap("graph")
 
             # Fuse via RRF
             rrf_scores = self._rrf_score(all_ids, signal_rankings, k=self.config.rrf_k)
@@ -268,6 +354,7 @@ class RecallService:
                 result = self._row_to_result(row, vector_scores.get(mid, 0.0), fts_scores.get(mid, 0.0), now)
                 result.score = rrf_scores.get(mid, 0.0)
                 results.append(result)
+            clock.lap("rrf")
         else:
             # Legacy weighted-sum scoring
             results = []
@@ -278,12 +365,14 @@ class RecallService:
                 vs = vector_scores.get(mid, 0.0)
                 fs = fts_scores.get(mid, 0.0)
                 results.append(self._row_to_result(row, vs, fs, now))
+            clock.lap("weighted_score")
 
         # Sort by combined score and limit
         results.sort(key=lambda r: r.score, reverse=True)
         results = results[:limit]
 
         self._update_access_counts(results, now)
+        clock.done()
         return results
 
     def _apply_filters(
@@ -316,7 +405,7 @@ class RecallService:
             sql_parts.append(f"AND m.type IN ({placeholders})")
             params.extend(memory_types)
         if min_importance is not None:
-            sql_parts.append("AND m.importance >= ?")
+            sql_parts.append(f"AND {memory_importance_sql()} >= ?")
             params.append(min_importance)
         if date_after:
             sql_parts.append("AND m.created_at >= ?")
@@ -331,7 +420,8 @@ class RecallService:
 
     def _row_to_result(self, row: Any, vector_score: float, fts_score: float, now: datetime) -> RecallResult:
         """Convert a database row + scores into a RecallResult with combined scoring."""
-        importance_score = row["importance"]
+        # Closed-form decay: the stored value is a base plus decay_ref_at
+        importance_score = row_importance(row, now)
 
         # Recency score (configurable half-life decay)
         created = parse_naive(row["created_at"])
@@ -387,7 +477,7 @@ class RecallService:
             content=row["content"],
             type=row["type"],
             score=combined_score,
-            importance=row["importance"],
+            importance=importance_score,
             created_at=row["created_at"],
             entities=entity_names,
             metadata=json.loads(metadata_val) if metadata_val else None,
@@ -433,7 +523,9 @@ class RecallService:
         """
         Match entity names in query text against known entities.
 
-        Uses n-gram matching against canonical entity names and aliases.
+        Canonical names and aliases are matched as whole words in a single
+        pass by the shared EntityMatcher. Canonical-name hits win; alias
+        hits are only used when no canonical name matched.
 
         Returns:
             List of entity IDs found in the text
@@ -441,36 +533,32 @@ class RecallService:
         if not text or len(text.strip()) < 2:
             return []
 
-        text_lower = text.lower()
-        entity_ids = []
-
-        # Try canonical name matching
         try:
-            entities = self.db.execute(
-                "SELECT id, canonical_name FROM entities WHERE importance > 0.05",
+            matches = get_entity_matcher(self.db).find(text)
+            if not matches:
+                return []
+
+            # The matcher only knows names; importance and deletion state
+            # change elsewhere, so check them for the handful of hits.
+            ids = list(matches)
+            placeholders = ", ".join("?" * len(ids))
+            rows = self.db.execute(
+                f"SELECT id, importance FROM entities WHERE id IN ({placeholders}) AND deleted_at IS NULL",
+                tuple(ids),
                 fetch=True,
             ) or []
 
-            for entity in entities:
-                canonical = entity["canonical_name"]
-                if canonical and len(canonical) > 1 and re.search(r'\b' + re.escape(canonical.lower()) + r'\b', text_lower):
-                    entity_ids.append(entity["id"])
-
-            # Also check aliases
-            if not entity_ids:
-                aliases = self.db.execute(
-                    "SELECT entity_id, canonical_alias FROM entity_aliases",
-                    fetch=True,
-                ) or []
-                for alias in aliases:
-                    alias_val = alias["canonical_alias"]
-                    if alias_val and len(alias_val) > 1 and re.search(r'\b' + re.escape(alias_val.lower()) + r'\b', text_lower):
-                        entity_ids.append(alias["entity_id"])
+            by_name = [
+                row["id"] for row in rows
+                if matches[row["id"]] == NAME and (row["importance"] or 0) > 0.05
+            ]
+            if by_name:
+                return by_name
+            return [row["id"] for row in rows if matches[row["id"]] == ALIAS]
 
         except Exception as e:
             logger.debug(f"Entity resolution from text failed: {e}")
-
-        return list(set(entity_ids))
+            return []
 
     def _compute_graph_scores(
         self,
@@ -579,6 +667,8 @@ class RecallService:
 
         Like _expand_graph but tracks cumulative path strength through
         the graph, allowing typed/strong relationships to score higher.
+        Walks the in-memory GraphIndex; entity details are fetched once
+        per hop.
 
         Args:
             entity_id: Starting entity ID
@@ -589,113 +679,39 @@ class RecallService:
             List of dicts with entity info, distance, and path_strength
         """
         try:
-            # Get direct neighbors with relationship strength and type
-            direct_rows = self.db.execute(
-                """
-                SELECT DISTINCT
-                    CASE WHEN r.source_entity_id = ? THEN r.target_entity_id
-                         ELSE r.source_entity_id END as neighbor_id,
-                    e.name, e.type, e.importance,
-                    r.strength as rel_strength,
-                    r.relationship_type
-                FROM relationships r
-                JOIN entities e ON e.id = CASE
-                    WHEN r.source_entity_id = ? THEN r.target_entity_id
-                    ELSE r.source_entity_id END
-                WHERE (r.source_entity_id = ? OR r.target_entity_id = ?)
-                  AND r.strength > 0.1
-                  AND r.invalid_at IS NULL
-                  AND e.importance > 0.05
-                  AND e.id != ?
-                ORDER BY r.strength DESC, e.importance DESC
-                LIMIT ?
-                """,
-                (entity_id, entity_id, entity_id, entity_id, entity_id, limit_per_hop),
-                fetch=True,
-            ) or []
-
-            connected = []
-            seen_ids = {entity_id}
-
-            for row in direct_rows:
-                nid = row["neighbor_id"]
-                if nid in seen_ids:
-                    continue
-                seen_ids.add(nid)
-                path_strength = row["rel_strength"]
-                connected.append({
-                    "id": nid,
-                    "name": row["name"],
-                    "type": row["type"],
-                    "importance": row["importance"],
-                    "distance": 1,
-                    "path_strength": path_strength,
-                    "via_relationship": row["relationship_type"],
-                })
-
-            # Second hop if requested
-            if depth >= 2:
-                hop1_ids = [c["id"] for c in connected]
-                for hop1 in connected[:10]:  # Limit fan-out
-                    hop2_rows = self.db.execute(
-                        """
-                        SELECT DISTINCT
-                            CASE WHEN r.source_entity_id = ? THEN r.target_entity_id
-                                 ELSE r.source_entity_id END as neighbor_id,
-                            e.name, e.type, e.importance,
-                            r.strength as rel_strength,
-                            r.relationship_type
-                        FROM relationships r
-                        JOIN entities e ON e.id = CASE
-                            WHEN r.source_entity_id = ? THEN r.target_entity_id
-                            ELSE r.source_entity_id END
-                        WHERE (r.source_entity_id = ? OR r.target_entity_id = ?)
-                          AND r.strength > 0.1
-                          AND r.invalid_at IS NULL
-                          AND e.importance > 0.05
-                          AND e.id != ?
-                        ORDER BY r.strength DESC
-                        LIMIT ?
-                        """,
-                        (hop1["id"], hop1["id"], hop1["id"], hop1["id"],
-                         entity_id, limit_per_hop // 2),
-                        fetch=True,
-                    ) or []
-
-                    for row in hop2_rows:
-                        nid = row["neighbor_id"]
-                        if nid in seen_ids:
-                            continue
-                        seen_ids.add(nid)
-                        # Path strength is product of edge strengths
-                        path_strength = hop1["path_strength"] * row["rel_strength"]
-                        connected.append({
-                            "id": nid,
-                            "name": row["name"],
-                            "type": row["type"],
-                            "importance": row["importance"],
-                            "distance": 2,
-                            "path_strength": path_strength,
-                            "via_relationship": row["relationship_type"],
-                        })
-
-            return connected
-
+            return get_graph_index(self.db).expand_weighted(
+                entity_id,
+                lambda ids: self._entity_rows(ids, min_importance=0.05),
+                depth=depth,
+                limit_per_hop=limit_per_hop,
+            )
         except Exception as e:
             logger.debug(f"Weighted graph traversal failed: {e}")
             return []
 
+    def _entity_rows(
+        self,
+        entity_ids: Iterable[int],
+        min_importance: Optional[float] = None,
+        columns: str = "id, name, type, importance",
+    ) -> Dict[int, Dict[str, Any]]:
+        """Fetch entity rows by id, keyed by id, optionally skipping low-importance ones."""
+        ids = list(entity_ids)
+        if not ids:
+            return {}
+        placeholders = ", ".join("?" * len(ids))
+        sql = f"SELECT {columns} FROM entities WHERE id IN ({placeholders})"
+        params: List[Any] = ids
+        if min_importance is not None:
+            sql += " AND importance > ?"
+            params = ids + [min_importance]
+        rows = self.db.execute(sql, tuple(params), fetch=True) or []
+        return {row["id"]: dict(row) for row in rows}
+
     def _update_access_counts(self, results: List[RecallResult], now: datetime) -> None:
-        """Update access counts for rehearsal effect."""
-        for result in results:
-            self.db.execute(
-                """
-                UPDATE memories
-                SET last_accessed_at = ?, access_count = access_count + 1
-                WHERE id = ?
-                """,
-                (now.isoformat(), result.id),
-            )
+        """Record accesses for the rehearsal effect (written back in batches)."""
+        if results:
+            get_access_tracker(self.db).record((result.id for result in results), now)
 
     def _fts_search(
         self,
@@ -710,6 +726,9 @@ class RecallService:
         Returns:
             Dict mapping memory_id -> normalized FTS score (0-1, 1 = best)
         """
+        match = compile_fts_query(query)
+        if match is None:
+            return {}
         try:
             sql = """
                 SELECT m.id, fts.rank
@@ -719,7 +738,7 @@ class RecallService:
                 AND m.invalidated_at IS NULL
                 AND (m.lifecycle_tier IS NULL OR m.lifecycle_tier != 'archived')
             """
-            params: list = [query]
+            params: list = [match]
 
             if memory_types:
                 placeholders = ", ".join(["?" for _ in memory_types])
@@ -727,7 +746,7 @@ class RecallService:
                 params.extend(memory_types)
 
             if min_importance is not None:
-                sql += " AND m.importance >= ?"
+                sql += f" AND {memory_importance_sql()} >= ?"
                 params.append(min_importance)
 
             sql += " ORDER BY fts.rank LIMIT ?"
@@ -805,6 +824,28 @@ class RecallService:
         Returns:
             Dict with entity info, memories, and relationships
         """
+        cache = get_recall_cache(self.db)
+        key = (
+            "recall_about", normalize_query(entity_name), limit,
+            tuple(memory_types) if memory_types else None, include_historical,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = cache.generation
+        result = self._recall_about(entity_name, limit, memory_types, include_historical)
+        cache.put(key, result, generation)
+        return result
+
+    def _recall_about(
+        self,
+        entity_name: str,
+        limit: Optional[int],
+        memory_types: Optional[List[str]],
+        include_historical: bool,
+    ) -> Dict[str, Any]:
+        """recall_about() without the result cache."""
         if limit is None:
             limit = self.config.max_recall_results
 
@@ -1025,7 +1066,8 @@ class RecallService:
         """
         Find potential duplicate entities using fuzzy name matching.
 
-        Uses SequenceMatcher ratio with first-letter boost.
+        Uses SequenceMatcher ratio with first-letter boost, scored only on
+        the trigram-blocked candidate pairs from the fuzzy name index.
 
         Args:
             threshold: Similarity threshold (0.85 = 85% similar)
@@ -1046,50 +1088,43 @@ class RecallService:
             sql += " AND type = ?"
             params.append(entity_type)
 
-        entities = self.db.execute(sql, tuple(params), fetch=True) or []
+        entities = {
+            row["id"]: row
+            for row in self.db.execute(sql, tuple(params), fetch=True) or []
+        }
 
-        duplicates = []
-        seen_pairs = set()
+        # The first-letter boost can lift a raw ratio by up to 0.05
+        pairs = get_fuzzy_index(self.db).candidate_pairs(threshold - 0.05, entity_type or None)
 
-        for i, e1 in enumerate(entities):
-            for e2 in entities[i + 1:]:
-                # Skip if already processed or different types
-                if e1["type"] != e2["type"]:
-                    continue
+        duplicates = []
+        for id1, id2 in pairs:
+            e1, e2 = entities.get(id1), entities.get(id2)
+            if e1 is None or e2 is None or e1["type"] != e2["type"]:
+                continue
 
-                pair_key = (min(e1["id"], e2["id"]), max(e1["id"], e2["id"]))
-                if pair_key in seen_pairs:
-                    continue
-                seen_pairs.add(pair_key)
-
-                # Calculate similarity
-                ratio = self._name_similarity(e1["canonical_name"], e2["canonical_name"])
-
-                if ratio >= threshold:
-                    duplicates.append({
-                        "entity_1": {
-                            "id": e1["id"],
-                            "name": e1["name"],
-                            "type": e1["type"],
-                            "importance": e1["importance"],
-                        },
-                        "entity_2": {
-                            "id": e2["id"],
-                            "name": e2["name"],
-                            "type": e2["type"],
-                            "importance": e2["importance"],
-                        },
-                        "similarity": round(ratio, 3),
-                    })
+            # Calculate similarity
+            ratio = self._name_similarity(e1["canonical_name"], e2["canonical_name"])
 
-                    if len(duplicates) >= limit:
-                        break
-            if len(duplicates) >= limit:
-                break
+            if ratio >= threshold:
+                duplicates.append({
+                    "entity_1": {
+                        "id": e1["id"],
+                        "name": e1["name"],
+                        "type": e1["type"],
+                        "importance": e1["importance"],
+                    },
+                    "entity_2": {
+                        "id": e2["id"],
+                        "name": e2["name"],
+                        "type": e2["type"],
+                        "importance": e2["importance"],
+                    },
+                    "similarity": round(ratio, 3),
+                })
 
         # Sort by similarity descending
         duplicates.sort(key=lambda x: x["similarity"], reverse=True)
-        return duplicates
+        return duplicates[:limit]
 
     def _name_similarity(self, name1: str, name2: str) -> float:
         """
@@ -1381,7 +1416,7 @@ class RecallService:
                     ORDER BY relevance DESC
                     LIMIT ?
                     """,
-                    (json.dumps(query_embedding), limit, limit),
+                    (encode_vector(query_embedding), limit, limit),
                     fetch=True,
                 ) or []
             except Exception as e:
@@ -1701,7 +1736,7 @@ class RecallService:
         limit_per_hop: int = 3,
     ) -> List[Dict[str, Any]]:
         """
-        Traverse the relationship graph from an entity using recursive CTEs.
+        Traverse the relationship graph from an entity.
 
         Returns connected entities (1 hop by default) with their top memories.
         Prevents cycles and prunes weak relationships (importance < 0.1).
@@ -1715,47 +1750,17 @@ class RecallService:
             List of dicts with entity info and top memories
         """
         try:
-            # Use recursive CTE to find connected entities
-            rows = self.db.execute(
-                """
-                WITH RECURSIVE graph(entity_id, hop) AS (
-                    -- Seed: direct neighbors
-                    SELECT CASE
-                        WHEN r.source_entity_id = ? THEN r.target_entity_id
-                        ELSE r.source_entity_id
-                    END, 1
-                    FROM relationships r
-                    WHERE (r.source_entity_id = ? OR r.target_entity_id = ?)
-                      AND r.strength > 0.1
-
-                    UNION
-
-                    -- Recurse: neighbors of neighbors (up to depth)
-                    SELECT CASE
-                        WHEN r.source_entity_id = g.entity_id THEN r.target_entity_id
-                        ELSE r.source_entity_id
-                    END, g.hop + 1
-                    FROM relationships r
-                    JOIN graph g ON (r.source_entity_id = g.entity_id OR r.target_entity_id = g.entity_id)
-                    WHERE g.hop < ?
-                      AND r.strength > 0.1
-                      AND CASE
-                          WHEN r.source_entity_id = g.entity_id THEN r.target_entity_id
-                          ELSE r.source_entity_id
-                      END != ?
-                )
-                SELECT DISTINCT e.id, e.name, e.type, e.description, e.importance,
-                       MIN(g.hop) as distance
-                FROM graph g
-                JOIN entities e ON g.entity_id = e.id
-                WHERE e.id != ? AND e.importance > 0.1
-                GROUP BY e.id
-                ORDER BY distance ASC, e.importance DESC
-                LIMIT ?
-                """,
-                (entity_id, entity_id, entity_id, depth, entity_id, entity_id, limit_per_hop * depth),
-                fetch=True,
-            ) or []
+            distances = get_graph_index(self.db).hop_distances(entity_id, depth, valid_only=False)
+            found = self._entity_rows(
+                distances, min_importance=0.1,
+                columns="id, name, type, description, importance",
+            )
+            rows = sorted(
+                found.values(),
+                key=lambda r: (distances[r["id"]], -(r["importance"] or 0.0)),
+            )[:limit_per_hop * depth]
+            for row in rows:
+                row["distance"] = distances[row["id"]]
 
             connected = []
             for row in rows:
@@ -1915,7 +1920,7 @@ class RecallService:
         """
         Find shortest path between two entities via relationships.
 
-        Uses BFS through the relationships table to find a connection path.
+        Uses bidirectional BFS over the in-memory graph index.
 
         Args:
             entity_a: Name of first entity
@@ -1947,52 +1952,21 @@ class RecallService:
             return [{"entity": ent_a["name"], "relationship": None, "direction": None}]
 
         try:
-            # BFS using recursive CTE
-            rows = self.db.execute(
-                """
-                WITH RECURSIVE path_search(entity_id, path, depth) AS (
-                    -- Start from entity A
-                    SELECT ?, json_array(json_object('entity_id', ?, 'name', ?)), 0
-
-                    UNION ALL
-
-                    -- Expand to neighbors
-                    SELECT
-                        CASE
-                            WHEN r.source_entity_id = ps.entity_id THEN r.target_entity_id
-                            ELSE r.source_entity_id
-                        END,
-                        json_insert(
-                            ps.path,
-                            '$[#]',
-                            json_object(
-                                'entity_id', CASE WHEN r.source_entity_id = ps.entity_id THEN r.target_entity_id ELSE r.source_entity_id END,
-                                'name', e.name,
-                                'relationship', r.relationship_type,
-                                'direction', CASE WHEN r.source_entity_id = ps.entity_id THEN 'forward' ELSE 'backward' END
-                            )
-                        ),
-                        ps.depth + 1
-                    FROM path_search ps
-                    JOIN relationships r ON (r.source_entity_id = ps.entity_id OR r.target_entity_id = ps.entity_id)
-                    JOIN entities e ON e.id = CASE WHEN r.source_entity_id = ps.entity_id THEN r.target_entity_id ELSE r.source_entity_id END
-                    WHERE ps.depth < ?
-                      AND r.strength > 0.1
-                      AND r.invalid_at IS NULL
-                      AND json_extract(ps.path, '$[#-1].entity_id') != CASE WHEN r.source_entity_id = ps.entity_id THEN r.target_entity_id ELSE r.source_entity_id END
-                )
-                SELECT path, depth FROM path_search
-                WHERE entity_id = ?
-                ORDER BY depth ASC
-                LIMIT 1
-                """,
-                (ent_a["id"], ent_a["id"], ent_a["name"], max_depth, ent_b["id"]),
-                fetch=True,
-            )
-
-            if rows:
-                path_json = json.loads(rows[0]["path"])
-                return path_json
+            hops = get_graph_index(self.db).shortest_path(ent_a["id"], ent_b["id"], max_depth)
+            if hops:
+                names = {
+                    eid: row["name"]
+                    for eid, row in self._entity_rows([eid for eid, _ in hops]).items()
+                }
+                path = [{"entity_id": ent_a["id"], "name": ent_a["name"]}]
+                for eid, link in hops[1:]:
+                    path.append({
+                        "entity_id": eid,
+                        "name": names.get(eid),
+                        "relationship": link.rel_type,
+                        "direction": "forward" if link.forward else "backward",
+                    })
+                return path
 
         except Exception as e:
             logger.debug(f"Path finding failed: {e}")
@@ -2020,49 +1994,43 @@ class RecallService:
             List of dicts with entity info and connection counts
         """
         try:
-            sql = """
-                SELECT
-                    e.id, e.name, e.type, e.description, e.importance,
-                    COUNT(DISTINCT r.id) as connection_count,
-                    GROUP_CONCAT(DISTINCT
-                        CASE
-                            WHEN r.source_entity_id = e.id THEN t.name
-                            ELSE s.name
-                        END
-                    ) as connected_names
-                FROM entities e
-                LEFT JOIN relationships r ON (e.id = r.source_entity_id OR e.id = r.target_entity_id)
-                    AND r.strength > 0.1 AND r.invalid_at IS NULL
-                LEFT JOIN entities s ON r.source_entity_id = s.id
-                LEFT JOIN entities t ON r.target_entity_id = t.id
-                WHERE e.importance > 0.1
-            """
-            params = []
+            index = get_graph_index(self.db)
+            degrees = dict(index.degree_ranking(min_degree=min_connections))
+            if not degrees:
+                return []
 
+            columns = "id, name, type, description, importance"
+            found = self._entity_rows(degrees, min_importance=0.1, columns=columns)
             if entity_type:
-                sql += " AND e.type = ?"
-                params.append(entity_type)
-
-            sql += """
-                GROUP BY e.id
-                HAVING connection_count >= ?
-                ORDER BY connection_count DESC, e.importance DESC
-                LIMIT ?
-            """
-            params.extend([min_connections, limit])
-
-            rows = self.db.execute(sql, tuple(params), fetch=True) or []
+                found = {eid: row for eid, row in found.items() if row["type"] == entity_type}
+            hubs = sorted(
+                found.values(),
+                key=lambda r: (-degrees[r["id"]], -(r["importance"] or 0.0)),
+            )[:limit]
+
+            # Names of each hub's strongest connections, in one lookup
+            top_links = {row["id"]: index.neighbors(row["id"]) for row in hubs}
+            names = {
+                eid: row["name"]
+                for eid, row in self._entity_rows(
+                    {n.entity_id for links in top_links.values() for n in links}
+                ).items()
+            }
 
             results = []
-            for row in rows:
-                connected_names = row["connected_names"].split(",") if row["connected_names"] else []
+            for row in hubs:
+                connected_names = []
+                for n in top_links[row["id"]]:
+                    name = names.get(n.entity_id)
+                    if name and name not in connected_names:
+                        connected_names.append(name)
                 results.append({
                     "id": row["id"],
                     "name": row["name"],
                     "type": row["type"],
                     "description": row["description"],
                     "importance": row["importance"],
-                    "connection_count": row["connection_count"],
+                    "connection_count": degrees[row["id"]],
                     "top_connections": connected_names[:5],  # Top 5 connections
                 })
 
@@ -2176,11 +2144,11 @@ class RecallService:
         Returns:
             List of ReflectionResult ordered by importance then recency
         """
-        sql = """
-            SELECT r.*, e.name as entity_name
+        sql = f"""
+            SELECT r.*, e.name as entity_name, {reflection_importance_sql("r")} AS current_importance
             FROM reflections r
             LEFT JOIN entities e ON r.about_entity_id = e.id
-            WHERE r.importance >= ?
+            WHERE current_importance >= ?
         """
         params: list = [min_importance]
 
@@ -2194,7 +2162,7 @@ class RecallService:
             sql += " AND e.canonical_name = ?"
             params.append(canonical)
 
-        sql += " ORDER BY r.importance DESC, r.last_confirmed_at DESC LIMIT ?"
+        sql += " ORDER BY current_importance DESC, r.last_confirmed_at DESC LIMIT ?"
         params.append(limit)
 
         rows = self.db.execute(sql, tuple(params), fetch=True) or []
@@ -2204,14 +2172,14 @@ class RecallService:
                 id=row["id"],
                 content=row["content"],
                 reflection_type=row["reflection_type"],
-                importance=row["importance"],
+                importance=row["current_importance"],
                 confidence=row["confidence"],
                 about_entity=row["entity_name"],
                 first_observed_at=row["first_observed_at"],
                 last_confirmed_at=row["last_confirmed_at"],
                 aggregation_count=row["aggregation_count"],
                 episode_id=row["episode_id"],
-                score=row["importance"],
+                score=row["current_importance"],
             )
             for row in rows
         ]
@@ -2235,12 +2203,12 @@ class RecallService:
             List of ReflectionResult ordered by importance then recency
         """
         rows = self.db.execute(
-            """
-            SELECT r.*, e.name as entity_name
+            f"""
+            SELECT r.*, e.name as entity_name, {reflection_importance_sql("r")} AS current_importance
             FROM reflections r
             LEFT JOIN entities e ON r.about_entity_id = e.id
-            WHERE r.importance >= ?
-            ORDER BY r.importance DESC, r.last_confirmed_at DESC
+            WHERE current_importance >= ?
+            ORDER BY current_importance DESC, r.last_confirmed_at DESC
             LIMIT ?
             """,
             (min_importance, limit),
@@ -2252,14 +2220,14 @@ class RecallService:
                 id=row["id"],
                 content=row["content"],
                 reflection_type=row["reflection_type"],
-                importance=row["importance"],
+                importance=row["current_importance"],
                 confidence=row["confidence"],
                 about_entity=row["entity_name"],
                 first_observed_at=row["first_observed_at"],
                 last_confirmed_at=row["last_confirmed_at"],
                 aggregation_count=row["aggregation_count"],
                 episode_id=row["episode_id"],
-                score=row["importance"],
+                score=row["current_importance"],
             )
             for row in rows
         ]
@@ -2297,7 +2265,7 @@ class RecallService:
                     WHERE re.embedding MATCH ?
                     AND k = ?
                 """
-                params: list = [json.dumps(query_embedding), limit]
+                params: list = [encode_vector(query_embedding), limit]
 
                 if reflection_types:
                     placeholders = ", ".join(["?" for _ in reflection_types])
@@ -2411,7 +2379,8 @@ class RecallService:
     ) -> List[Dict]:
         """Fallback keyword-based search. Tries FTS5 MATCH first, then LIKE."""
         # Try FTS5 first for better keyword matching
-        try:
+        match = compile_fts_query(query)
+        if match is not None:
             sql = """
                 SELECT m.*, GROUP_CONCAT(e.name) as entity_names
                 FROM memories_fts fts
@@ -2422,7 +2391,7 @@ class RecallService:
                 AND m.invalidated_at IS NULL
                 AND (m.lifecycle_tier IS NULL OR m.lifecycle_tier != 'archived')
             """
-            params: list = [query]
+            params: list = [match]
 
             if memory_types:
                 placeholders = ", ".join(["?" for _ in memory_types])
@@ -2430,19 +2399,20 @@ class RecallService:
                 params.extend(memory_types)
 
             if min_importance is not None:
-                sql += " AND m.importance >= ?"
+                sql += f" AND {memory_importance_sql()} >= ?"
                 params.append(min_importance)
 
             sql += " GROUP BY m.id ORDER BY fts.rank LIMIT ?"
             params.append(limit)
 
-            rows = self.db.execute(sql, tuple(params), fetch=True) or []
-            if rows:
-                return rows
-            # FTS5 succeeded but returned 0 rows (empty index after migration).
-            # Fall through to LIKE instead of returning empty.
-        except Exception:
-            pass  # FTS5 not available, fall through to LIKE
+            try:
+                rows = self.db.execute(sql, tuple(params), fetch=True) or []
+                if rows:
+                    return rows
+                # FTS5 succeeded but found nothing: LIKE still catches
+                # substrings and rows written behind the triggers' back.
+            except Exception as e:
+                logger.debug(f"FTS5 keyword search failed (table may not exist): {e}")
 
         # Final fallback: LIKE search
         sql = """
@@ -2462,7 +2432,7 @@ class RecallService:
             params.extend(memory_types)
 
         if min_importance is not None:
-            sql += " AND m.importance >= ?"
+            sql += f" AND {memory_importance_sql()} >= ?"
             params.append(min_importance)
 
         sql += " GROUP BY m.id ORDER BY m.importance DESC, m.created_at DESC LIMIT ?"
@@ -0,0 +1,174 @@
+"""
+Result cache for recall() and recall_about().
+
+Session-start hooks, briefings, session context, memory_deep_context and
+build_context run the same recalls many times per session. Each run
+re-embeds the query and repeats vector KNN, FTS, graph expansion and RRF
+fusion, although nothing was written in between.
+
+RecallCache is a bounded LRU keyed on the normalized query and every
+filter argument. It is tied to a write generation:
+
+- Write paths bump the generation (see invalidates_recall), and a bump
+  drops every cached entry. Inside a transaction the bump waits for the
+  commit (db.after_commit).
+- A result computed while a write committed is not stored. put() is given
+  the generation the read started at and ignores the result if it has
+  moved on.
+- The UTC day is part of every key. Effective importance decays in whole
+  days (decay.py), so yesterday's rankings are never reused.
+- Entries also expire after ttl_seconds. Writes made by another process
+  (the standalone daemon's consolidation) do not bump this process's
+  generation, and the TTL bounds how stale they can leave results.
+
+Hits return copies, so callers can adjust scores or lists freely.
+"""
+
+import copy
+import functools
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different spellings share an entry."""
+    return " ".join((query or "").split())
+
+
+def _clone(value: Any) -> Any:
+    """Copy containers and result objects; leave scalars shared."""
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if hasattr(value, "__dataclass_fields__"):
+        clone = copy.copy(value)
+        for name in value.__dataclass_fields__:
+            field_value = getattr(value, name)
+            if isinstance(field_value, (list, dict)):
+                setattr(clone, name, _clone(field_value))
+        return clone
+    return value
+
+
+class RecallCache:
+    """Thread-safe LRU of recall results, invalidated by write generation."""
+
+    def __init__(self, db, maxsize: int = 256, ttl_seconds: float = 300.0):
+        self.db = db
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _key(self, key: Hashable) -> Hashable:
+        return (datetime.utcnow().date(), key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for `key` (a copy), or None."""
+        if self.maxsize <= 0:
+            return None
+        full_key = self._key(key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at <= self.ttl_seconds:
+                    self.hits += 1
+                    self._entries.move_to_end(full_key)
+                    return _clone(value)
+                del self._entries[full_key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, generation: int) -> None:
+        """Store `value` if no write has committed since `generation` was read."""
+        if self.maxsize <= 0:
+            return
+        full_key = self._key(key)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[full_key] = (time.monotonic(), _clone(value))
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self) -> None:
+        """Start a new generation, dropping every cached result."""
+        with self._lock:
+            self.generation += 1
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def invalidate(self) -> None:
+        """Bump once the calling thread's writes commit (now, outside a transaction)."""
+        self.db.after_commit(self.bump)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "generation": self.generation,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+_caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def get_recall_cache(db=None) -> RecallCache:
+    """Get or create the recall cache for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _caches_lock:
+        cache = _caches.get(db)
+        if cache is None:
+            from ..config import get_config
+            config = get_config()
+            cache = _caches[db] = RecallCache(
+                db,
+                maxsize=config.recall_cache_size,
+                ttl_seconds=config.recall_cache_ttl_seconds,
+            )
+        return cache
+
+
+def invalidates_recall(method):
+    """Decorate a service method that writes: cached recalls are dropped after it.
+
+    The instance's `db` attribute picks the cache. The bump happens even if
+    the method raises, since it may have written part of its work.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            try:
+                get_recall_cache(self.db).invalidate()
+            except Exception as e:
+                logger.debug(f"Recall cache invalidation skipped: {e}")
+    return wrapper
@@ -5,7 +5,6 @@ Handles storing memories, processing conversation turns,
 and auto-extracting entities and facts.
 """
 
-import hashlib as _hashlib
 import json
 import logging
 import re
@@ -13,10 +12,14 @@ import uuid
 import uuid as _uuid
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import Future
 from typing import Any, Dict, List, Optional
 
 from ..database import content_hash, get_db
+from ..decay import effective_strength
 from ..embeddings import embed_sync, get_embedding_service
+from ..metrics import get_metrics
+from ..vector_codec import VectorLike, encode as encode_vector
 from ..extraction.entity_extractor import (
     ExtractedEntity,
     ExtractedMemory,
@@ -24,7 +27,14 @@ from ..extraction.entity_extractor import (
     get_extractor,
 )
 from .entities import infer_entity_type as _smart_infer_entity_type
+from .entity_matcher import ALIAS, NAME, get_entity_matcher
+from .fuzzy_index import get_fuzzy_index
+from .graph_index import get_graph_index
+from .chain import compute_chain_hash as _compute_chain_hash  # noqa: F401 (compat)
 from .guards import validate_entity, validate_memory, validate_relationship
+from .recall_cache import invalidates_recall
+from .vault_writer import get_vault_writer
+from .write_queue import get_write_queue
 
 logger = logging.getLogger(__name__)
 
@@ -38,12 +48,6 @@ def _audit_log(operation: str, **kwargs) -> None:
         logger.debug(f"Could not log audit entry: {e}")
 
 
-def _compute_chain_hash(content: str, metadata, prev_hash) -> str:
-    """Compute SHA-256 chain hash for memory integrity verification."""
-    payload = f"{content}|{json.dumps(metadata, sort_keys=True) if metadata else ''}|{prev_hash or ''}"
-    return _hashlib.sha256(payload.encode()).hexdigest()
-
-
 _PRIVATE_RE = re.compile(r'<private>.*?</private>', re.DOTALL | re.IGNORECASE)
 
 
@@ -106,6 +110,7 @@ class RememberService:
         self.embedding_service = get_embedding_service()
         self.extractor = get_extractor()
 
+    @invalidates_recall
     def remember_message(
         self,
         content: str,
@@ -157,7 +162,7 @@ class RememberService:
             try:
                 self.db.execute(
                     "INSERT OR REPLACE INTO message_embeddings (message_id, embedding) VALUES (?, ?)",
-                    (message_id, json.dumps(embedding)),
+                    (message_id, encode_vector(embedding)),
                 )
             except Exception as e:
                 logger.warning(f"Could not store message embedding: {e}")
@@ -196,6 +201,7 @@ class RememberService:
 
         return result
 
+    @invalidates_recall
     def remember_fact(
         self,
         content: str,
@@ -211,7 +217,9 @@ class RememberService:
         source_channel: Optional[str] = None,
         critical: bool = False,
         fact_id: Optional[str] = None,
-        _precomputed_embedding: Optional[List[float]] = None,
+        _precomputed_embedding: Optional[VectorLike] = None,
+        _write_through: bool = True,
+        _embedding_attempted: bool = False,
     ) -> Optional[int]:
         """
         Store a discrete fact/memory.
@@ -230,10 +238,14 @@ class RememberService:
             source_channel: Origin channel: claude_code, telegram, slack
             critical: If True, mark this memory as sacred (immune to decay)
             fact_id: Optional UUID for the memory; auto-generated if not provided
+            _embedding_attempted: The caller already tried to embed (queued
+                intents); store without an embedding rather than call Ollama
 
         Returns:
             Memory ID or None if duplicate
         """
+        clock = get_metrics().stages("remember_fact")
+
         # Strip <private> tags before any processing
         content = _strip_private(content)
 
@@ -242,6 +254,7 @@ class RememberService:
         existing = self.db.get_one(
             "memories", where="content_hash = ?", where_params=(mem_hash,)
         )
+        clock.lap("dedupe")
         if existing:
             # Update access count and timestamp
             self.db.update(
@@ -253,6 +266,7 @@ class RememberService:
                 "id = ?",
                 (existing["id"],),
             )
+            clock.done()
             return existing["id"]
 
         if fact_id is None:
@@ -330,42 +344,28 @@ class RememberService:
             insert_data["lifecycle_tier"] = "sacred"
             insert_data["sacred_reason"] = "user-protected"
 
+        clock.lap("prepare")
         memory_id = self.db.insert("memories", insert_data)
+        clock.lap("insert")
 
-        # SHA-256 chain linking for memory integrity verification
-        try:
-            from ..config import get_config as _get_config
-            config = _get_config()
-            if config.enable_chain_verification:
-                prev_hash_rows = self.db.execute(
-                    "SELECT value FROM _meta WHERE key = 'chain_head'",
-                    fetch=True,
-                )
-                prev_hash = prev_hash_rows[0]["value"] if prev_hash_rows and prev_hash_rows[0]["value"] else None
-                chain_hash = _compute_chain_hash(content, metadata, prev_hash)
-                self.db.execute(
-                    "UPDATE memories SET hash = ?, prev_hash = ? WHERE id = ?",
-                    (chain_hash, prev_hash, memory_id),
-                )
-                self.db.execute(
-                    """INSERT INTO _meta (key, value, updated_at)
-                       VALUES ('chain_head', ?, datetime('now'))
-                       ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at""",
-                    (chain_hash,),
-                )
-        except Exception as e:
-            logger.debug(f"Chain hash skipped: {e}")
+        # The SHA-256 integrity chain is extended in the background by
+        # services.chain.seal_pending, not on this path
 
-        # Store embedding (use precomputed if available, otherwise generate)
-        embedding = _precomputed_embedding or embed_sync(content)
+        # Store embedding (use precomputed if available, otherwise generate,
+        # unless the caller already tried and this runs inside a write group)
+        embedding = _precomputed_embedding
+        if embedding is None and not _embedding_attempted:
+            embedding = embed_sync(content)
+        clock.lap("embed")
         if embedding:
             try:
                 self.db.execute(
                     "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-                    (memory_id, json.dumps(embedding)),
+                    (memory_id, encode_vector(embedding)),
                 )
             except Exception as e:
                 logger.warning(f"Could not store memory embedding: {e}")
+        clock.lap("store_embedding")
 
         # Link to entities. Pass the memory content as context so the type
         # inference heuristic can use it (Proposal #51).
@@ -398,6 +398,7 @@ class RememberService:
                         )
                     except Exception as e:
                         logger.debug(f"Could not touch entity {entity_id}: {e}")
+            clock.lap("link_entities")
 
         logger.debug(f"Remembered {memory_type}: {content[:50]}...")
 
@@ -407,13 +408,82 @@ class RememberService:
             details={"type": memory_type, "source": source, "importance": importance},
             memory_id=memory_id,
         )
+        clock.lap("audit")
 
         # Real-time vault write-through: update vault notes for linked entities
-        if about_entities:
+        if about_entities and _write_through:
             self._vault_write_through(about_entities)
+            clock.lap("write_through")
 
+        clock.done()
         return memory_id
 
+    def remember_fact_async(self, content: str, **kwargs) -> Future:
+        """Queue remember_fact on the database's writer thread.
+
+        Returns a Future for the memory id that resolves once the fact's
+        write group has committed. The embedding is computed here, on the
+        caller's thread, so the writer never waits on Ollama; vault
+        write-through runs after the commit.
+        """
+        if kwargs.get("_precomputed_embedding") is None:
+            kwargs["_precomputed_embedding"] = embed_sync(_strip_private(content))
+        # A failed embed stays failed: retrying on the writer would hold the
+        # whole group's transaction open across an Ollama round-trip
+        kwargs["_embedding_attempted"] = True
+        about_entities = kwargs.get("about_entities")
+        return get_write_queue(self.db).submit(
+            lambda: self.remember_fact(content, _write_through=False, **kwargs),
+            after_commit=(
+                (lambda memory_id: memory_id and self._vault_write_through(about_entities))
+                if about_entities else None
+            ),
+        )
+
+    def remember_facts(self, facts: List[Dict[str, Any]]) -> List[Optional[int]]:
+        """Store many facts through the writer queue, group-committed.
+
+        Each item holds remember_fact keyword arguments (content required).
+        Embeddings are fetched in one batch up front. Returns memory ids in
+        input order; a fact that fails to store yields None and is logged.
+        Inside an open transaction (the MCP write lane) the facts are stored
+        directly, each in its own savepoint: queued futures would only
+        resolve once the caller commits.
+        """
+        contents = [_strip_private(f["content"]) for f in facts]
+        embeddings = get_embedding_service().embed_batch_sync(contents) if contents else []
+        if self.db.in_transaction():
+            ids: List[Optional[int]] = []
+            for fact, embedding in zip(facts, embeddings):
+                kwargs = dict(fact)
+                if kwargs.get("_precomputed_embedding") is None:
+                    kwargs["_precomputed_embedding"] = embedding
+                # The batch was the attempt; don't call Ollama per fact while
+                # the caller's transaction is open
+                kwargs["_embedding_attempted"] = True
+                try:
+                    with self.db.transaction():
+                        ids.append(self.remember_fact(**kwargs))
+                except Exception as e:
+                    logger.warning(f"Could not store fact {fact['content'][:50]!r}: {e}")
+                    ids.append(None)
+            return ids
+        futures = []
+        for fact, embedding in zip(facts, embeddings):
+            kwargs = dict(fact)
+            if kwargs.get("_precomputed_embedding") is None:
+                kwargs["_precomputed_embedding"] = embedding
+            futures.append(self.remember_fact_async(**kwargs))
+        ids = []
+        for fact, future in zip(facts, futures):
+            try:
+                ids.append(future.result())
+            except Exception as e:
+                logger.warning(f"Could not store fact {fact['content'][:50]!r}: {e}")
+                ids.append(None)
+        return ids
+
+    @invalidates_recall
     def remember_entity(
         self,
         name: str,
@@ -421,7 +491,7 @@ class RememberService:
         description: Optional[str] = None,
         aliases: Optional[List[str]] = None,
         metadata: Optional[Dict] = None,
-        _precomputed_embedding: Optional[List[float]] = None,
+        _precomputed_embedding: Optional[VectorLike] = None,
     ) -> int:
         """
         Create or update an entity.
@@ -445,11 +515,9 @@ class RememberService:
         if not entity_type or not entity_type.strip():
             entity_type = _smart_infer_entity_type(name)
 
-        # Run deterministic guards
-        existing_names = [
-            row["canonical_name"]
-            for row in self.db.query("entities", columns=["canonical_name"])
-        ]
+        # Run deterministic guards. Only names the fuzzy index shortlists can
+        # trip the near-duplicate check, so skip scanning the whole table.
+        existing_names = get_fuzzy_index(self.db).similar_names(name.strip().lower(), 0.85)
         guard_result = validate_entity(name, entity_type, existing_names)
         if guard_result.warnings:
             for w in guard_result.warnings:
@@ -501,11 +569,19 @@ class RememberService:
                 try:
                     self.db.execute(
                         "INSERT OR REPLACE INTO entity_embeddings (entity_id, embedding) VALUES (?, ?)",
-                        (entity_id, json.dumps(embedding)),
+                        (entity_id, encode_vector(embedding)),
                     )
                 except Exception as e:
                     logger.warning(f"Could not store entity embedding: {e}")
 
+            # Indexes learn the name only once the row has committed: a rolled
+            # back id can be reused for a different entity
+            def index_entity() -> None:
+                get_entity_matcher(self.db).add(entity_id, canonical, NAME)
+                get_fuzzy_index(self.db).add_entity(entity_id, entity_type, canonical)
+
+            self.db.after_commit(index_entity)
+
             # Audit log for new entity
             _audit_log(
                 "entity_create",
@@ -527,6 +603,11 @@ class RememberService:
                             "created_at": datetime.utcnow().isoformat(),
                         },
                     )
+                    def index_alias(alias_name: str = canonical_alias) -> None:
+                        get_entity_matcher(self.db).add(entity_id, alias_name, ALIAS)
+                        get_fuzzy_index(self.db).add_alias(entity_id, alias_name)
+
+                    self.db.after_commit(index_alias)
                 except Exception:
                     pass  # Duplicate alias, ignore
 
@@ -536,9 +617,11 @@ class RememberService:
         return entity_id
 
     def _vault_write_through(self, entity_names: List[str]) -> None:
-        """Trigger real-time vault export for entities.
+        """Mark entities' vault notes for re-export.
 
-        Fire-and-forget: vault write errors never break memory operations.
+        The notes are rendered by the database's VaultWriter once writes go
+        quiet, after the current transaction commits. Fire-and-forget: vault
+        write errors never break memory operations.
         """
         try:
             from ..config import get_config
@@ -546,17 +629,11 @@ class RememberService:
             if not getattr(config, "vault_sync_enabled", True):
                 return
 
-            from .vault_sync import get_vault_sync_service
-            vault = get_vault_sync_service()
-            if vault:
-                for entity_name in entity_names:
-                    try:
-                        vault.export_entity_by_name(entity_name)
-                    except Exception as e:
-                        logger.debug(f"Vault write-through skipped for {entity_name}: {e}")
+            get_vault_writer(self.db).mark_dirty(entity_names)
         except Exception as e:
             logger.debug(f"Vault write-through unavailable: {e}")
 
+    @invalidates_recall
     def relate_entities(
         self,
         source_name: str,
@@ -632,6 +709,11 @@ class RememberService:
                         ),
                     )
 
+                # The index follows only committed rows, like the name indexes
+                self.db.after_commit(
+                    lambda: get_graph_index(self.db).mark_invalid(existing_to_supersede["id"])
+                )
+
                 # Audit log for supersede
                 _audit_log(
                     "relationship_supersede",
@@ -665,6 +747,12 @@ class RememberService:
                 },
             )
 
+            self.db.after_commit(
+                lambda: get_graph_index(self.db).upsert_edge(
+                    new_id, source_id, target_id, relationship_type, capped_strength
+                )
+            )
+
             # Audit log for create
             _audit_log(
                 "relationship_create",
@@ -688,8 +776,9 @@ class RememberService:
         )
 
         if existing:
+            row_keys = existing.keys()
             # Determine ceiling: if new origin is higher-authority, upgrade
-            existing_origin = existing["origin_type"] if "origin_type" in existing.keys() else "extracted"
+            existing_origin = existing["origin_type"] if "origin_type" in row_keys else "extracted"
             effective_origin = existing_origin
 
             # Origin upgrade: user_stated/corrected outrank extracted, which outranks inferred
@@ -699,7 +788,15 @@ class RememberService:
 
             ceiling = ORIGIN_STRENGTH_CEILING.get(effective_origin, 0.5)
             increment = REINFORCEMENT_BY_ORIGIN.get(origin_type, 0.1)
-            new_strength = min(ceiling, existing["strength"] + increment)
+            # Reinforce from the decayed strength; the update re-anchors decay
+            current = existing["strength"]
+            if "decay_ref_at" in row_keys:
+                current = effective_strength(
+                    current,
+                    existing["decay_ref_at"] or existing["created_at"],
+                    existing["lifecycle_tier"] == "sacred",
+                )
+            new_strength = min(ceiling, current + increment)
 
             update_data = {
                 "strength": new_strength,
@@ -707,7 +804,6 @@ class RememberService:
                 "origin_type": effective_origin,
             }
             # Ensure valid_at is set on existing relationships
-            row_keys = existing.keys()
             if "valid_at" in row_keys and not existing["valid_at"]:
                 update_data["valid_at"] = existing["created_at"]
             self.db.update(
@@ -716,6 +812,11 @@ class RememberService:
                 "id = ?",
                 (existing["id"],),
             )
+            self.db.after_commit(
+                lambda: get_graph_index(self.db).upsert_edge(
+                    existing["id"], source_id, target_id, relationship_type, new_strength
+                )
+            )
             return existing["id"]
         else:
             # Create new relationship
@@ -735,6 +836,12 @@ class RememberService:
                 },
             )
 
+            self.db.after_commit(
+                lambda: get_graph_index(self.db).upsert_edge(
+                    new_id, source_id, target_id, relationship_type, strength
+                )
+            )
+
             # Audit log
             _audit_log(
                 "relationship_create",
@@ -750,6 +857,7 @@ class RememberService:
 
             return new_id
 
+    @invalidates_recall
     def invalidate_relationship(
         self,
         source_name: str,
@@ -807,6 +915,8 @@ class RememberService:
                 ),
             )
 
+        self.db.after_commit(lambda: get_graph_index(self.db).mark_invalid(existing["id"]))
+
         # Audit log
         _audit_log(
             "relationship_invalidate",
@@ -834,6 +944,7 @@ class RememberService:
             "reason": reason,
         }
 
+    @invalidates_recall
     def merge_entities(
         self,
         source_id: int,
@@ -1014,6 +1125,26 @@ class RememberService:
             (source_id,),
         )
 
+        # The source's name and aliases now resolve to the target, and the
+        # target's re-pointed relationships are re-read, once the merge has
+        # committed
+        def repoint_indexes() -> None:
+            graph = get_graph_index(self.db)
+            graph.remove_entity(source_id)
+            graph.reload_entity(target_id)
+
+            matcher = get_entity_matcher(self.db)
+            matcher.remove_entity(source_id)
+            matcher.add(target_id, source["canonical_name"], ALIAS)
+            for alias in source_aliases:
+                matcher.add(target_id, alias["canonical_alias"], ALIAS)
+
+            fuzzy = get_fuzzy_index(self.db)
+            fuzzy.remove_entity(source_id)
+            fuzzy.reload_entity(target_id)
+
+        self.db.after_commit(repoint_indexes)
+
         result["success"] = True
         logger.info(f"Merged entity {source_id} ({source['name']}) into {target_id} ({target['name']})")
 
@@ -1037,6 +1168,7 @@ class RememberService:
 
         return result
 
+    @invalidates_recall
     def delete_entity(
         self,
         entity_id: int,
@@ -1070,6 +1202,12 @@ class RememberService:
             (entity_id,),
         )
 
+        def unindex_entity() -> None:
+            get_entity_matcher(self.db).remove_entity(entity_id)
+            get_fuzzy_index(self.db).remove_entity(entity_id)
+
+        self.db.after_commit(unindex_entity)
+
         logger.info(f"Soft-deleted entity {entity_id} ({entity['name']}): {reason}")
 
         # Expire dedupe predictions referencing the deleted entity (#28)
@@ -1112,6 +1250,7 @@ class RememberService:
         except Exception as e:
             logger.debug(f"Failed to expire dedupe predictions for entity {entity_id}: {e}")
 
+    @invalidates_recall
     def correct_memory(
         self,
         memory_id: int,
@@ -1174,7 +1313,7 @@ class RememberService:
             try:
                 self.db.execute(
                     "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-                    (memory_id, json.dumps(embedding)),
+                    (memory_id, encode_vector(embedding)),
                 )
             except Exception as e:
                 logger.warning(f"Could not update memory embedding: {e}")
@@ -1201,6 +1340,7 @@ class RememberService:
             "corrected_at": now,
         }
 
+    @invalidates_recall
     def invalidate_memory(
         self,
         memory_id: int,
@@ -1325,6 +1465,7 @@ class RememberService:
         logger.debug(f"Buffered turn {next_turn} for episode {episode_id}")
         return {"episode_id": episode_id, "turn_number": next_turn}
 
+    @invalidates_recall
     def end_session(
         self,
         episode_id: int,
@@ -1388,59 +1529,44 @@ class RememberService:
             try:
                 self.db.execute(
                     "INSERT OR REPLACE INTO episode_embeddings (episode_id, embedding) VALUES (?, ?)",
-                    (episode_id, json.dumps(embedding)),
+                    (episode_id, encode_vector(embedding)),
                 )
             except Exception as e:
                 logger.warning(f"Could not store episode embedding: {e}")
 
-        # 3. Store structured facts
-        if facts:
-            for fact in facts:
-                memory_id = self.remember_fact(
-                    content=fact["content"],
-                    memory_type=fact.get("type", "fact"),
-                    about_entities=fact.get("about"),
-                    importance=fact.get("importance", 1.0),
-                    source=fact.get("source", "session_summary"),
-                    source_id=str(episode_id),
-                    source_context=fact.get("source_context"),
-                )
-                if memory_id:
-                    result["facts_stored"] += 1
-                    # Save source material to disk if provided
-                    if fact.get("source_material"):
-                        self.save_source_material(
-                            memory_id,
-                            fact["source_material"],
-                            metadata={
-                                "source": fact.get("source", "session_summary"),
-                                "source_context": fact.get("source_context"),
-                            },
-                        )
-
-        # 4. Store commitments
-        if commitments:
-            for commitment in commitments:
-                memory_id = self.remember_fact(
-                    content=commitment["content"],
-                    memory_type="commitment",
-                    about_entities=commitment.get("about"),
-                    importance=commitment.get("importance", 1.0),
-                    source=commitment.get("source", "session_summary"),
-                    source_id=str(episode_id),
-                    source_context=commitment.get("source_context"),
+        # 3-4. Store structured facts and commitments in one batch: one
+        # embedding request and one group commit instead of one per item
+        items = []
+        for fact in facts or []:
+            items.append((fact, fact.get("type", "fact"), "facts_stored"))
+        for commitment in commitments or []:
+            items.append((commitment, "commitment", "commitments_stored"))
+        memory_ids = self.remember_facts([
+            {
+                "content": item["content"],
+                "memory_type": memory_type,
+                "about_entities": item.get("about"),
+                "importance": item.get("importance", 1.0),
+                "source": item.get("source", "session_summary"),
+                "source_id": str(episode_id),
+                "source_context": item.get("source_context"),
+            }
+            for item, memory_type, _ in items
+        ])
+        for (item, _, counter), memory_id in zip(items, memory_ids):
+            if not memory_id:
+                continue
+            result[counter] += 1
+            # Save source material to disk if provided
+            if item.get("source_material"):
+                self.save_source_material(
+                    memory_id,
+                    item["source_material"],
+                    metadata={
+                        "source": item.get("source", "session_summary"),
+                        "source_context": item.get("source_context"),
+                    },
                 )
-                if memory_id:
-                    result["commitments_stored"] += 1
-                    if commitment.get("source_material"):
-                        self.save_source_material(
-                            memory_id,
-                            commitment["source_material"],
-                            metadata={
-                                "source": commitment.get("source", "session_summary"),
-                                "source_context": commitment.get("source_context"),
-                            },
-                        )
 
         # 5. Store entities
         if entities:
@@ -1562,7 +1688,7 @@ class RememberService:
             try:
                 self.db.execute(
                     "INSERT OR REPLACE INTO reflection_embeddings (reflection_id, embedding) VALUES (?, ?)",
-                    (reflection_id, json.dumps(embedding)),
+                    (reflection_id, encode_vector(embedding)),
                 )
             except Exception as e:
                 logger.warning(f"Could not store reflection embedding: {e}")
@@ -1604,7 +1730,7 @@ class RememberService:
                 try:
                     self.db.execute(
                         "INSERT OR REPLACE INTO reflection_embeddings (reflection_id, embedding) VALUES (?, ?)",
-                        (reflection_id, json.dumps(embedding)),
+                        (reflection_id, encode_vector(embedding)),
                     )
                 except Exception as e:
                     logger.warning(f"Could not update reflection embedding: {e}")
@@ -1887,14 +2013,21 @@ class RememberService:
     def _fuzzy_find_entity(self, canonical: str, entity_type: str) -> Optional[int]:
         """Find a near-match entity of the same type using fuzzy string matching.
 
-        Queries entities of the given type and returns the ID of the best match
-        if similarity > 0.90 (SequenceMatcher ratio). Returns None if no match.
+        Scores the trigram-blocked shortlist from the fuzzy name index and
+        returns the ID of the best match if similarity > 0.90
+        (SequenceMatcher ratio). Returns None if no match.
         """
         from difflib import SequenceMatcher
 
+        shortlist = get_fuzzy_index(self.db).candidates(canonical, entity_type, 0.90)
+        if not shortlist:
+            return None
+
+        placeholders = ",".join("?" * len(shortlist))
         candidates = self.db.execute(
-            "SELECT id, canonical_name FROM entities WHERE type = ? AND deleted_at IS NULL",
-            (entity_type,),
+            f"SELECT id, canonical_name FROM entities WHERE id IN ({placeholders}) "
+            "AND type = ? AND deleted_at IS NULL ORDER BY id",
+            (*shortlist, entity_type),
             fetch=True,
         ) or []
 
@@ -1928,6 +2061,7 @@ class RememberService:
             insert_data["source"] = source
         return self.db.insert("episodes", insert_data)
 
+    @invalidates_recall
     def set_close_circle(self, entity_id: int, reason: str = "user-designated") -> dict:
         """Mark an entity as close-circle and auto-promote core facts to sacred."""
         from ..config import get_config
@@ -0,0 +1,127 @@
+"""
+Maintained aggregate counts.
+
+The stats route, status report, session briefing, OpenMetrics exporter and
+the Brain Monitor (every few seconds) all used to COUNT(*) and GROUP BY
+whole tables. Triggers installed by database.py now keep those numbers in
+stat_counters as they change, one key per count:
+
+- ``memories`` (all rows) and ``memories.live`` (not invalidated)
+- ``memories.type:<type>``, ``memories.tier:<lifecycle_tier>`` and
+  ``memories.importance:<bucket>`` over live memories
+- ``entities`` and ``entities.type:<type>`` (not deleted)
+- ``relationships``, ``episodes``, ``reflections``, ``patterns.active`` and
+  ``predictions.pending`` (not yet shown)
+
+Reading them is one small SELECT. The importance histogram buckets the
+stored importance (IMPORTANCE_BUCKETS buckets over [0, 1]), which triggers
+can see; effective importance needs the decay SQL functions, which only
+this package's connections have. The histogram is therefore biased
+upward: every consolidation run re-anchors stored values older than
+decay_rebase_days (ConsolidateService.rebase_decay), so a stored value
+trails its effective value by at most decay_rebase_days of decay plus the
+time since the last run. With the defaults (0.995 a day, 7 days, a daily
+run) that is under 4% of the value, and a memory sits at most one bucket
+above where its effective importance would put it. reconcile() recounts
+the same stored values, so it does not remove this bias.
+
+Writes that bypass triggers (a restore, INSERT OR REPLACE, a hand edit)
+can leave a count off; reconcile() recounts everything and is run by the
+daemon's scheduler. ``_reconciled_at`` records when that last happened;
+until it exists (a database this version has not opened yet) readers fall
+back to counting.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from ..database import IMPORTANCE_BUCKETS, recount_stat_counters
+
+logger = logging.getLogger(__name__)
+
+# Names reported by the stats route, status report and exporter
+TABLE_KEYS = {
+    "memories": "memories",
+    "entities": "entities",
+    "relationships": "relationships",
+    "episodes": "episodes",
+    "active_patterns": "patterns.active",
+    "pending_predictions": "predictions.pending",
+    "reflections": "reflections",
+}
+
+FALLBACK_QUERIES = {
+    "memories": "SELECT COUNT(*) as c FROM memories",
+    "entities": "SELECT COUNT(*) as c FROM entities WHERE deleted_at IS NULL",
+    "relationships": "SELECT COUNT(*) as c FROM relationships",
+    "episodes": "SELECT COUNT(*) as c FROM episodes",
+    "active_patterns": "SELECT COUNT(*) as c FROM patterns WHERE is_active = 1",
+    "pending_predictions": "SELECT COUNT(*) as c FROM predictions WHERE is_shown = 0",
+    "reflections": "SELECT COUNT(*) as c FROM reflections",
+}
+
+
+def counters_from_rows(rows) -> Optional[Dict[str, int]]:
+    """Key -> value from ``SELECT key, value FROM stat_counters`` rows.
+
+    None when the counters have never been reconciled (no ``_reconciled_at``).
+    """
+    values = {row["key"]: row["value"] for row in rows or ()}
+    return values if "_reconciled_at" in values else None
+
+
+def read_counters(db) -> Optional[Dict[str, int]]:
+    """All counters, or None if this database has none yet."""
+    try:
+        return counters_from_rows(db.execute("SELECT key, value FROM stat_counters", fetch=True))
+    except Exception as e:
+        logger.debug(f"stat_counters unavailable: {e}")
+        return None
+
+
+def table_counts(values: Dict[str, int]) -> Dict[str, int]:
+    """The TABLE_KEYS counts, zero for keys not present."""
+    return {name: values.get(key, 0) for name, key in TABLE_KEYS.items()}
+
+
+def grouped(values: Dict[str, int], prefix: str) -> Dict[str, int]:
+    """Counts under ``<prefix>:``, largest first (e.g. prefix ``memories.type``)."""
+    start = prefix + ":"
+    found = {k[len(start):]: v for k, v in values.items() if k.startswith(start) and v > 0}
+    return dict(sorted(found.items(), key=lambda item: -item[1]))
+
+
+def importance_histogram(values: Dict[str, int], buckets: int = IMPORTANCE_BUCKETS) -> Optional[List[float]]:
+    """Live memories per importance bucket, or None if `buckets` does not divide IMPORTANCE_BUCKETS."""
+    if buckets <= 0 or IMPORTANCE_BUCKETS % buckets:
+        return None
+    width = IMPORTANCE_BUCKETS // buckets
+    histogram = [0.0] * buckets
+    for bucket, count in grouped(values, "memories.importance").items():
+        histogram[int(bucket) // width] += count
+    return histogram
+
+
+def row_counts(db) -> Dict[str, int]:
+    """TABLE_KEYS counts, from the counters when present and by counting otherwise."""
+    values = read_counters(db)
+    if values is not None:
+        return table_counts(values)
+    counts = {}
+    for name, query in FALLBACK_QUERIES.items():
+        try:
+            rows = db.execute(query, fetch=True)
+            counts[name] = rows[0]["c"] if rows else 0
+        except Exception:
+            counts[name] = -1
+    return counts
+
+
+def reconcile(db) -> Dict[str, int]:
+    """Recount every counter from its table and correct any drift."""
+    with db.transaction():
+        with db.cursor() as cursor:
+            drifted = recount_stat_counters(cursor)
+    if drifted:
+        logger.info(f"stat_counters reconcile corrected {drifted} drifted keys")
+    return {"drifted": drifted}
@@ -0,0 +1,286 @@
+"""
+Incremental detection of user edits in the vault.
+
+detect_user_edits used to read, parse and re-hash every entity note on
+every call, so its cost grew with the vault. VaultFileIndex keeps one
+vault_file_state row per note: (path, mtime_ns, size) plus the note's
+frontmatter sync_hash and the hash of its body when last read. A scan
+lists the note directories and stats each entry (os.scandir returns the
+stat with the listing), and reads only notes whose mtime or size changed.
+Rows for notes that disappeared are dropped.
+
+On Linux, InotifyWatcher goes further: it watches the note directories and
+reports the .md paths created, written or renamed into place since the
+last poll. The daemon's vault_watch job feeds those paths to
+VaultFileIndex.refresh and imports the edits, so an idle vault costs one
+non-blocking read per poll. If the kernel event queue overflows, the next
+poll asks for a full (stat-only) scan instead. inotify is reached through
+ctypes, so there is no extra dependency; other platforms use the scan.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (sync_hash, body_hash, entity_id, entity_type) for one note, or None if
+# it is not an entity note
+NoteState = Optional[Tuple[Optional[str], Optional[str], Optional[int], Optional[str]]]
+
+
+class VaultFileIndex:
+    """Stat-keyed cache of note hashes in the vault_file_state table."""
+
+    def __init__(self, db, read_note: Callable[[Path], NoteState]):
+        """
+        Args:
+            db: Database holding vault_file_state.
+            read_note: Reads and hashes one note (VaultSyncService supplies it).
+        """
+        self.db = db
+        self.read_note = read_note
+        self.notes_read = 0
+
+    def scan(self, directories: Iterable[Path]) -> List[Dict[str, Any]]:
+        """Edits among all *.md notes in `directories`, reading only changed files."""
+        directories = [Path(d) for d in directories]
+        known = self._load(directories)
+        stats: Dict[str, os.stat_result] = {}
+        for directory in directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(".md") or entry.name.startswith("."):
+                    continue
+                try:
+                    stats[entry.path] = entry.stat()
+                except OSError:
+                    continue
+        self._update(known, stats)
+
+        gone = [path for path in known if path not in stats]
+        if gone:
+            self.db.execute_many("DELETE FROM vault_file_state WHERE path = ?", [(p,) for p in gone])
+        return self._edits(known[path] for path in sorted(stats))
+
+    def refresh(self, paths: Iterable[Path]) -> List[Dict[str, Any]]:
+        """Edits among `paths` only (the watcher's changed files)."""
+        paths = sorted({str(p) for p in paths})
+        if not paths:
+            return []
+        known = self._load_paths(paths)
+        stats: Dict[str, os.stat_result] = {}
+        gone = []
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                gone.append(path)
+        self._update(known, stats)
+        if gone:
+            self.db.execute_many("DELETE FROM vault_file_state WHERE path = ?", [(p,) for p in gone])
+        return self._edits(known[path] for path in paths if path in known)
+
+    def _load(self, directories: List[Path]) -> Dict[str, Dict[str, Any]]:
+        known: Dict[str, Dict[str, Any]] = {}
+        for directory in directories:
+            prefix = str(directory) + os.sep
+            rows = self.db.execute(
+                "SELECT * FROM vault_file_state WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+                fetch=True,
+            ) or []
+            for row in rows:
+                # Only direct children; notes are not nested
+                if os.sep not in row["path"][len(prefix):]:
+                    known[row["path"]] = dict(row)
+        return known
+
+    def _load_paths(self, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        known: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT * FROM vault_file_state WHERE path IN ({','.join('?' * len(chunk))})",
+                tuple(chunk),
+                fetch=True,
+            ) or []
+            for row in rows:
+                known[row["path"]] = dict(row)
+        return known
+
+    def _update(self, known: Dict[str, Dict[str, Any]], stats: Dict[str, os.stat_result]) -> None:
+        """Re-read notes whose stat changed and upsert their rows into `known` and the table."""
+        now = datetime.utcnow().isoformat()
+        upserts = []
+        for path, st in stats.items():
+            row = known.get(path)
+            if row is not None and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+                continue
+            state = self.read_note(Path(path))
+            self.notes_read += 1
+            sync_hash, body_hash, entity_id, entity_type = state or (None, None, None, None)
+            row = {
+                "path": path,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sync_hash": sync_hash,
+                "body_hash": body_hash,
+                "entity_id": entity_id,
+                "entity_type": entity_type,
+                "checked_at": now,
+            }
+            known[path] = row
+            upserts.append(tuple(row.values()))
+        if upserts:
+            self.db.execute_many(
+                """INSERT OR REPLACE INTO vault_file_state
+                   (path, mtime_ns, size, sync_hash, body_hash, entity_id, entity_type, checked_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                upserts,
+            )
+
+    @staticmethod
+    def _edits(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "file_path": row["path"],
+                "entity_id": row["entity_id"],
+                "entity_type": row["entity_type"],
+                "old_hash": row["sync_hash"],
+                "new_hash": row["body_hash"],
+            }
+            for row in rows
+            if row["sync_hash"] and row["body_hash"] != row["sync_hash"]
+        ]
+
+
+# ── inotify (Linux) ─────────────────────────────────────────────
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Non-blocking inotify watch over a fixed set of note directories."""
+
+    def __init__(self, directories: Iterable[Path]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories = [Path(d) for d in directories]
+        self._watches: Dict[int, Path] = {}
+        self._lock = threading.Lock()
+        # Nothing before the watch started was seen: first poll asks for a scan
+        self._needs_scan = True
+        self._add_missing()
+
+    @staticmethod
+    def available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            return hasattr(libc, "inotify_init1")
+        except OSError:
+            return False
+
+    def _add_missing(self) -> None:
+        watched = set(self._watches.values())
+        for directory in self._directories:
+            if directory in watched or not directory.is_dir():
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = directory
+            else:
+                logger.debug(f"inotify_add_watch failed for {directory}: errno {ctypes.get_errno()}")
+
+    def poll(self) -> Tuple[Set[Path], bool]:
+        """Drain pending events. Returns (changed .md paths, overflowed).
+
+        After an overflow events were lost, so the caller should scan. The
+        first poll and any poll that starts watching a newly created
+        directory report an overflow too, since earlier changes were unseen.
+        """
+        with self._lock:
+            changed: Set[Path] = set()
+            overflow, self._needs_scan = self._needs_scan, False
+            while True:
+                try:
+                    buf = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                if not buf:
+                    break
+                offset = 0
+                while offset + _EVENT.size <= len(buf):
+                    wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+                    raw = buf[offset + _EVENT.size:offset + _EVENT.size + length]
+                    offset += _EVENT.size + length
+                    if mask & _IN_Q_OVERFLOW:
+                        overflow = True
+                        continue
+                    name = os.fsdecode(raw.rstrip(b"\0"))
+                    directory = self._watches.get(wd)
+                    if directory is None or not name.endswith(".md") or name.startswith("."):
+                        continue
+                    changed.add(directory / name)
+            before = len(self._watches)
+            self._add_missing()
+            if len(self._watches) != before:
+                overflow = True
+            return changed, overflow
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+
+_watchers: Dict[str, InotifyWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_vault_watcher(vault_path: Path, directories: Iterable[Path]) -> Optional[InotifyWatcher]:
+    """Watcher for a vault's note directories, or None where inotify is unavailable."""
+    key = str(vault_path)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            if not InotifyWatcher.available():
+                return None
+            try:
+                watcher = InotifyWatcher(directories)
+            except OSError as e:
+                logger.debug(f"inotify unavailable for {vault_path}: {e}")
+                return None
+            _watchers[key] = watcher
+        return watcher
+
+
+def close_vault_watchers() -> None:
+    with _watchers_lock:
+        for watcher in _watchers.values():
+            watcher.close()
+        _watchers.clear()
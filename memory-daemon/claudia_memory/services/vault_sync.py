@@ -35,7 +35,12 @@ Vault structure (PARA-inspired):
 import hashlib
 import json
 import logging
+import os
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -43,9 +48,17 @@ from typing import Any, Dict, List, Optional, Tuple
 from ..config import get_config
 from ..database import get_db
 from ..utils import parse_naive
+from .vault_index import VaultFileIndex
 
 logger = logging.getLogger(__name__)
 
+# Directories holding entity notes, scanned for user edits
+ENTITY_NOTE_DIRS = (
+    "Active", "Relationships/people", "Relationships/organizations",
+    "Reference/concepts", "Reference/locations",
+    "Archive/people", "Archive/projects", "Archive/organizations",
+)
+
 # Map entity types to vault subdirectories
 ENTITY_TYPE_DIRS = {
     "person": "people",
@@ -99,9 +112,39 @@ def _compute_sync_hash(content: str) -> str:
     return hashlib.sha256(content.encode()).hexdigest()[:12]
 
 
+_SYNC_FOOTER_RE = re.compile(r"^\*Last synced: ([^*\n]*)\*$", re.MULTILINE)
+
+
+def _sync_footer(stamp: str) -> str:
+    return f"\n---\n*Last synced: {stamp}*"
+
+
+def _write_atomic(filepath: Path, content: str) -> None:
+    """Write a file via a temp file in the same directory and a rename.
+
+    Obsidian (or a concurrent edit scan) never sees a half-written note.
+    The temp name starts with a dot and does not end in .md, so vault
+    walkers skip it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 class VaultSyncService:
     """Syncs SQLite memory data to an Obsidian-compatible vault."""
 
+    # Below this many entities, per-entity queries beat whole-table prefetch
+    PREFETCH_MIN_ENTITIES = 50
+
     def __init__(self, vault_path: Path, db=None):
         """
         Args:
@@ -110,6 +153,9 @@ class VaultSyncService:
         """
         self.vault_path = vault_path
         self.db = db or get_db()
+        self.notes_written = 0
+        self.notes_unchanged = 0
+        self._counter_lock = threading.Lock()
 
     def _ensure_directories(self) -> None:
         """Create the PARA vault directory structure."""
@@ -325,7 +371,7 @@ class VaultSyncService:
             SELECT m.* FROM memories m
             JOIN memory_entities me ON m.id = me.memory_id
             WHERE me.entity_id = ? AND m.invalidated_at IS NULL
-            ORDER BY m.importance DESC, m.created_at DESC
+            ORDER BY m.importance DESC, m.created_at DESC, m.id
             """,
             (entity_id,),
             fetch=True,
@@ -343,7 +389,7 @@ class VaultSyncService:
             JOIN entities t ON r.target_entity_id = t.id
             WHERE (r.source_entity_id = ? OR r.target_entity_id = ?)
               AND r.invalid_at IS NULL
-            ORDER BY r.strength DESC
+            ORDER BY r.strength DESC, r.id
             """,
             (entity_id, entity_id),
             fetch=True,
@@ -352,7 +398,7 @@ class VaultSyncService:
     def _get_entity_aliases(self, entity_id: int) -> List[str]:
         """Fetch aliases for an entity."""
         rows = self.db.execute(
-            "SELECT alias FROM entity_aliases WHERE entity_id = ?",
+            "SELECT alias FROM entity_aliases WHERE entity_id = ? ORDER BY id",
             (entity_id,),
             fetch=True,
         ) or []
@@ -430,11 +476,14 @@ class VaultSyncService:
         lines.append("---")
         return "\n".join(lines)
 
-    def _render_status_callout(self, entity: Dict) -> str:
+    def _render_status_callout(
+        self, entity: Dict, project_counts: Optional[Tuple[int, int]] = None
+    ) -> str:
         """Render a status callout box at the top of person/project notes.
 
         Shows attention tier, trend, last contact, frequency, and importance
-        in a compact Obsidian callout block.
+        in a compact Obsidian callout block. Projects show (connected people,
+        open commitments), queried when `project_counts` is not given.
         """
         etype = entity["type"]
 
@@ -476,33 +525,8 @@ class VaultSyncService:
             return "\n".join(lines)
 
         elif etype == "project":
-            # Project variant: connected people count
-            entity_id = entity["id"]
-            people_count = self.db.execute(
-                """
-                SELECT COUNT(DISTINCT e.id) as cnt
-                FROM entities e
-                JOIN relationships r ON (
-                    (r.source_entity_id = ? AND r.target_entity_id = e.id) OR
-                    (r.target_entity_id = ? AND r.source_entity_id = e.id)
-                )
-                WHERE e.type = 'person' AND e.deleted_at IS NULL AND r.invalid_at IS NULL
-                """,
-                (entity_id, entity_id),
-                fetch=True,
-            )
-            pcount = people_count[0]["cnt"] if people_count else 0
-
-            commitment_count = self.db.execute(
-                """
-                SELECT COUNT(*) as cnt FROM memories m
-                JOIN memory_entities me ON m.id = me.memory_id
-                WHERE me.entity_id = ? AND m.type = 'commitment' AND m.invalidated_at IS NULL
-                """,
-                (entity_id,),
-                fetch=True,
-            )
-            ccount = commitment_count[0]["cnt"] if commitment_count else 0
+            # Project variant: connected people and open commitments
+            pcount, ccount = project_counts or self._get_project_counts(entity["id"])
 
             lines = ["> [!info] Status"]
             lines.append(f"> **People:** {pcount} connected | **Open Commitments:** {ccount} | **Importance:** {entity['importance']}")
@@ -510,6 +534,35 @@ class VaultSyncService:
 
         return ""
 
+    def _get_project_counts(self, entity_id: int) -> Tuple[int, int]:
+        """Connected people and open commitments for a project."""
+        people_count = self.db.execute(
+            """
+            SELECT COUNT(DISTINCT e.id) as cnt
+            FROM entities e
+            JOIN relationships r ON (
+                (r.source_entity_id = ? AND r.target_entity_id = e.id) OR
+                (r.target_entity_id = ? AND r.source_entity_id = e.id)
+            )
+            WHERE e.type = 'person' AND e.deleted_at IS NULL AND r.invalid_at IS NULL
+            """,
+            (entity_id, entity_id),
+            fetch=True,
+        )
+        commitment_count = self.db.execute(
+            """
+            SELECT COUNT(*) as cnt FROM memories m
+            JOIN memory_entities me ON m.id = me.memory_id
+            WHERE me.entity_id = ? AND m.type = 'commitment' AND m.invalidated_at IS NULL
+            """,
+            (entity_id,),
+            fetch=True,
+        )
+        return (
+            people_count[0]["cnt"] if people_count else 0,
+            commitment_count[0]["cnt"] if commitment_count else 0,
+        )
+
     def _render_relationships_section(
         self, entity_id: int, relationships: List[Dict]
     ) -> str:
@@ -613,7 +666,11 @@ class VaultSyncService:
 
     def _render_recent_sessions(self, entity_name: str) -> str:
         """Render recent session mentions as Obsidian callout blocks."""
-        rows = self.db.execute(
+        return self._render_session_rows(self._get_recent_sessions(entity_name))
+
+    def _get_recent_sessions(self, entity_name: str) -> List[Dict]:
+        """Latest summarized episodes whose narrative mentions the entity."""
+        return self.db.execute(
             """
             SELECT id, narrative, started_at
             FROM episodes
@@ -626,6 +683,7 @@ class VaultSyncService:
             fetch=True,
         ) or []
 
+    def _render_session_rows(self, rows: List[Dict]) -> str:
         if not rows:
             return ""
 
@@ -658,6 +716,7 @@ class VaultSyncService:
                 FROM patterns p
                 WHERE p.is_active = 1
                   AND p.evidence LIKE ?
+                ORDER BY p.id
                 LIMIT 5
                 """,
                 (f"%{entity_id}%",),
@@ -683,25 +742,210 @@ class VaultSyncService:
             )
         return "\n".join(lines)
 
-    def export_entity(self, entity: Dict) -> Optional[Path]:
+    def export_entity(self, entity: Dict, data: Optional[Dict[str, Any]] = None) -> Optional[Path]:
         """Export a single entity as an Obsidian note.
 
-        Returns the path of the written file, or None on error.
+        `data` holds the entity's related rows as built by _load_entity_data;
+        it is queried here when omitted (export_all prefetches it in bulk).
+        The note is replaced atomically, and not touched at all when its
+        content is unchanged. Returns the note's path, or None on error.
         """
-        entity_id = entity["id"]
-        entity_name = entity["name"]
-        entity_type = entity["type"]
-
         # Determine subdirectory via PARA routing
-        target_dir = self._para_dir(entity_type, entity)
+        target_dir = self._para_dir(entity["type"], entity)
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        # Fetch related data
-        memories = self._get_entity_memories(entity_id)
-        relationships = self._get_entity_relationships(entity_id)
-        aliases = self._get_entity_aliases(entity_id)
+        if data is None:
+            data = self._load_entity_data(entity)
+        content = self._render_entity_content(entity, data)
+        aliases = data["aliases"]
 
-        # Build note body (without frontmatter first, for hash calculation)
+        filename = _sanitize_filename(entity["name"]) + ".md"
+        filepath = target_dir / filename
+
+        # Skip the write when only the sync footer would change: re-render
+        # with the existing note's footer and compare (sync_hash included)
+        previous = self._read_note(filepath)
+        if previous is not None:
+            stamp = _SYNC_FOOTER_RE.search(previous)
+            if stamp and self._render_entity_note(
+                entity, aliases, content, stamp.group(1)
+            ) == previous:
+                with self._counter_lock:
+                    self.notes_unchanged += 1
+                return filepath
+
+        # Sync footer (frontmatter sync_hash covers it)
+        sync_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+        full_content = self._render_entity_note(entity, aliases, content, sync_time)
+
+        try:
+            _write_atomic(filepath, full_content)
+            with self._counter_lock:
+                self.notes_written += 1
+            # Validate markdown tables in the exported note
+            table_warnings = self._validate_markdown_tables(full_content)
+            for warning in table_warnings:
+                logger.warning("%s in %s", warning, filepath.name)
+            return filepath
+        except IOError as e:
+            logger.error(f"Failed to write entity note {filepath}: {e}")
+            return None
+
+    def _load_entity_data(self, entity: Dict) -> Dict[str, Any]:
+        """Query everything an entity note shows, for one entity."""
+        entity_id = entity["id"]
+        data = {
+            "memories": self._get_entity_memories(entity_id),
+            "relationships": self._get_entity_relationships(entity_id),
+            "aliases": self._get_entity_aliases(entity_id),
+            "sessions": self._get_recent_sessions(entity["name"]),
+            "patterns": self._get_related_patterns(entity_id),
+        }
+        if entity["type"] == "project":
+            data["project_counts"] = self._get_project_counts(entity_id)
+        return data
+
+    def _prefetch_entity_data(self, entities: List[Dict]) -> Dict[int, Dict[str, Any]]:
+        """Build _load_entity_data's result for many entities in a few queries.
+
+        Each per-entity lookup becomes one set-based query over the whole
+        table, grouped here by entity id. The ORDER BY and LIMIT rules match
+        the per-entity queries, so either path renders the same note.
+        """
+        data: Dict[int, Dict[str, Any]] = {
+            e["id"]: {
+                "memories": [], "relationships": [], "aliases": [],
+                "sessions": [], "patterns": [],
+            }
+            for e in entities
+        }
+        for e in entities:
+            if e["type"] == "project":
+                data[e["id"]]["project_counts"] = (0, 0)
+
+        def group(key: str, sql: str, column: Optional[str] = None) -> None:
+            for row in self.db.execute(sql, fetch=True) or []:
+                bucket = data.get(row["_entity_id"])
+                if bucket is not None:
+                    bucket[key].append(row[column] if column else row)
+
+        group("memories", """
+            SELECT me.entity_id AS _entity_id, m.* FROM memories m
+            JOIN memory_entities me ON m.id = me.memory_id
+            WHERE m.invalidated_at IS NULL
+            ORDER BY m.importance DESC, m.created_at DESC, m.id
+        """)
+        group("aliases", """
+            SELECT entity_id AS _entity_id, alias FROM entity_aliases ORDER BY id
+        """, column="alias")
+
+        rel_rows = self.db.execute(
+            """
+            SELECT r.*,
+                   s.name as source_name, s.type as source_type,
+                   t.name as target_name, t.type as target_type
+            FROM relationships r
+            JOIN entities s ON r.source_entity_id = s.id
+            JOIN entities t ON r.target_entity_id = t.id
+            WHERE r.invalid_at IS NULL
+            ORDER BY r.strength DESC, r.id
+            """,
+            fetch=True,
+        ) or []
+        for row in rel_rows:
+            for end in {row["source_entity_id"], row["target_entity_id"]}:
+                bucket = data.get(end)
+                if bucket is not None:
+                    bucket["relationships"].append(row)
+
+        # LIKE per (entity, episode) pair, as before, but in one statement
+        group("sessions", """
+            SELECT * FROM (
+                SELECT e.id AS _entity_id, ep.id, ep.narrative, ep.started_at,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY e.id ORDER BY ep.started_at DESC
+                       ) AS rn
+                FROM entities e
+                JOIN episodes ep ON ep.is_summarized = 1
+                 AND ep.narrative LIKE '%' || e.name || '%'
+                WHERE e.deleted_at IS NULL
+            ) WHERE rn <= 10
+            ORDER BY _entity_id, started_at DESC
+        """)
+        try:
+            group("patterns", """
+                SELECT * FROM (
+                    SELECT e.id AS _entity_id, p.id, p.description,
+                           p.pattern_type, p.confidence,
+                           ROW_NUMBER() OVER (PARTITION BY e.id ORDER BY p.id) AS rn
+                    FROM entities e
+                    JOIN patterns p ON p.is_active = 1
+                     AND p.evidence LIKE '%' || e.id || '%'
+                    WHERE e.deleted_at IS NULL
+                ) WHERE rn <= 5
+                ORDER BY _entity_id, id
+            """)
+        except Exception as e:
+            logger.debug(f"Related pattern prefetch skipped: {e}")
+
+        people = self.db.execute(
+            """
+            SELECT x.project_id AS _entity_id, COUNT(DISTINCT x.other_id) AS cnt
+            FROM (
+                SELECT source_entity_id AS project_id, target_entity_id AS other_id
+                FROM relationships WHERE invalid_at IS NULL
+                UNION ALL
+                SELECT target_entity_id, source_entity_id
+                FROM relationships WHERE invalid_at IS NULL
+            ) x
+            JOIN entities e ON e.id = x.other_id
+            WHERE e.type = 'person' AND e.deleted_at IS NULL
+            GROUP BY x.project_id
+            """,
+            fetch=True,
+        ) or []
+        commitments = self.db.execute(
+            """
+            SELECT me.entity_id AS _entity_id, COUNT(*) AS cnt FROM memories m
+            JOIN memory_entities me ON m.id = me.memory_id
+            WHERE m.type = 'commitment' AND m.invalidated_at IS NULL
+            GROUP BY me.entity_id
+            """,
+            fetch=True,
+        ) or []
+        for rows, slot in ((people, 0), (commitments, 1)):
+            for row in rows:
+                bucket = data.get(row["_entity_id"])
+                if bucket is not None and "project_counts" in bucket:
+                    counts = list(bucket["project_counts"])
+                    counts[slot] = row["cnt"]
+                    bucket["project_counts"] = tuple(counts)
+        return data
+
+    def _export_entities(self, entities: List[Dict], timings: Dict[str, float]) -> int:
+        """Prefetch, then render and write notes on a thread pool.
+
+        Workers only render strings and touch files; every query has run
+        by the time they start. Returns notes exported (written or
+        already current).
+        """
+        if not entities:
+            return 0
+        started = time.perf_counter()
+        data = self._prefetch_entity_data(entities)
+        timings["entity_prefetch"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        workers = max(1, getattr(get_config(), "vault_export_workers", 4))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vault-export") as pool:
+            paths = list(pool.map(lambda e: self.export_entity(e, data[e["id"]]), entities))
+        timings["entity_render"] = time.perf_counter() - started
+        return sum(1 for path in paths if path)
+
+    def _render_entity_content(self, entity: Dict, data: Dict[str, Any]) -> str:
+        """Render the note body above the sync footer. Makes no queries."""
+        entity_id = entity["id"]
+        entity_name = entity["name"]
         sections = []
 
         # Title
@@ -713,55 +957,45 @@ class VaultSyncService:
             sections.append(f"\n{desc}")
 
         # Status callout (person/project only)
-        status = self._render_status_callout(entity)
+        status = self._render_status_callout(entity, data.get("project_counts"))
         if status:
             sections.append(f"\n{status}")
 
         # Relationships (table format)
-        rel_section = self._render_relationships_section(entity_id, relationships)
+        rel_section = self._render_relationships_section(entity_id, data["relationships"])
         if rel_section:
             sections.append(f"\n{rel_section}")
 
         # Memories (verification-grouped callouts)
-        mem_section = self._render_memories_section(memories)
+        mem_section = self._render_memories_section(data["memories"])
         if mem_section:
             sections.append(f"\n{mem_section}")
 
         # Recent session mentions (callout timeline)
-        recent = self._render_recent_sessions(entity_name)
+        recent = self._render_session_rows(data["sessions"])
         if recent:
             sections.append(f"\n{recent}")
 
         # Related patterns backlinks
-        related_patterns = self._get_related_patterns(entity_id)
-        if related_patterns:
-            sections.append(f"\n{self._render_related_patterns(related_patterns)}")
+        if data["patterns"]:
+            sections.append(f"\n{self._render_related_patterns(data['patterns'])}")
 
-        # Sync footer
-        sync_time = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
-        sections.append(f"\n---\n*Last synced: {sync_time}*")
-
-        body = "\n".join(sections)
+        return "\n".join(sections)
 
-        # Build frontmatter using consolidated method (includes sync_hash)
+    def _render_entity_note(
+        self, entity: Dict, aliases: List[str], content: str, sync_time: str
+    ) -> str:
+        body = content + "\n" + _sync_footer(sync_time)
         frontmatter = self._build_frontmatter(
             entity, aliases, sync_hash=_compute_sync_hash(body)
         )
+        return f"{frontmatter}\n\n{body}\n"
 
-        full_content = f"{frontmatter}\n\n{body}\n"
-
-        # Write file
-        filename = _sanitize_filename(entity_name) + ".md"
-        filepath = target_dir / filename
+    @staticmethod
+    def _read_note(filepath: Path) -> Optional[str]:
         try:
-            filepath.write_text(full_content, encoding="utf-8")
-            # Validate markdown tables in the exported note
-            table_warnings = self._validate_markdown_tables(full_content)
-            for warning in table_warnings:
-                logger.warning("%s in %s", warning, filepath.name)
-            return filepath
-        except IOError as e:
-            logger.error(f"Failed to write entity note {filepath}: {e}")
+            return filepath.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
             return None
 
     def export_entity_by_name(self, name: str) -> Optional[Path]:
@@ -770,6 +1004,14 @@ class VaultSyncService:
         Convenience method for real-time write-through: looks up the entity
         by name and exports it. Returns the path of the written file, or None.
         """
+        entity = self.find_entity(name)
+        if entity:
+            self._ensure_directories()
+            return self.export_entity(entity)
+        return None
+
+    def find_entity(self, name: str) -> Optional[Dict]:
+        """Look up a live entity by canonical name, then by alias."""
         from ..extraction.entity_extractor import get_extractor
         extractor = get_extractor()
         canonical = extractor.canonical_name(name)
@@ -792,11 +1034,7 @@ class VaultSyncService:
                     where="id = ? AND deleted_at IS NULL",
                     where_params=(alias_row["entity_id"],),
                 )
-
-        if entity:
-            self._ensure_directories()
-            return self.export_entity(entity)
-        return None
+        return entity
 
     def export_entity_by_id(self, entity_id: int) -> Optional[Path]:
         """Export a single entity by ID.
@@ -1851,11 +2089,12 @@ class VaultSyncService:
 
     # ── Public sync methods ─────────────────────────────────────
 
-    def export_all(self) -> Dict[str, int]:
+    def export_all(self) -> Dict[str, Any]:
         """Full vault rebuild from SQLite. Exports all entities, patterns,
         reflections, sessions, Home dashboard, MOC indices, and .obsidian config.
 
-        Returns a dict with counts of exported items.
+        Returns a dict with counts of exported items, how many entity notes
+        were rewritten vs already current, and per-phase timings_ms.
         """
         logger.info(f"Starting full vault export to {self.vault_path}")
         self._ensure_directories()
@@ -1864,48 +2103,55 @@ class VaultSyncService:
         if hasattr(self, "_entity_names_cache"):
             del self._entity_names_cache
 
-        stats = {
+        stats: Dict[str, Any] = {
             "entities": 0,
             "patterns": 0,
             "reflections": 0,
             "sessions": 0,
             "mocs": 0,
         }
+        timings: Dict[str, float] = {}
+        written, unchanged = self.notes_written, self.notes_unchanged
 
         # Export all entities
+        started = time.perf_counter()
         entities = self._get_all_entities()
-        for entity in entities:
-            path = self.export_entity(entity)
-            if path:
-                stats["entities"] += 1
-
-        # Export patterns
-        stats["patterns"] = self._export_patterns()
-
-        # Export reflections
-        stats["reflections"] = self._export_reflections()
-
-        # Export sessions (hierarchical, wikified)
-        stats["sessions"] = self._export_sessions()
-
-        # Export Dataview query templates (only if they don't exist yet)
-        self._export_dataview_templates()
-
-        # Export Home dashboard (always regenerated)
-        self._export_home_dashboard()
-
-        # Export MOC index files (always regenerated)
-        self._export_moc_indices()
+        timings["entity_list"] = time.perf_counter() - started
+        stats["entities"] = self._export_entities(entities, timings)
+
+        phases = [
+            # Patterns, reflections, sessions (hierarchical, wikified)
+            ("patterns", self._export_patterns),
+            ("reflections", self._export_reflections),
+            ("sessions", self._export_sessions),
+            # Dataview query templates (only if they don't exist yet)
+            ("templates", self._export_dataview_templates),
+            # Home dashboard and MOC index files (always regenerated)
+            ("home", self._export_home_dashboard),
+            ("moc_indices", self._export_moc_indices),
+        ]
+        for phase, export in phases:
+            started = time.perf_counter()
+            result = export()
+            if phase in stats:
+                stats[phase] = result
+            timings[phase] = time.perf_counter() - started
 
         # Write top-level MOC files (Claudia's read layer)
+        started = time.perf_counter()
         self._write_moc_file("MOC-People.md", self._generate_moc_people())
         self._write_moc_file("MOC-Commitments.md", self._generate_moc_commitments())
         self._write_moc_file("MOC-Projects.md", self._generate_moc_projects())
         stats["mocs"] = 3
+        timings["mocs"] = time.perf_counter() - started
 
         # Export .obsidian config (idempotent, never overwrites)
         self._export_obsidian_config()
 
+        stats["entities_written"] = self.notes_written - written
+        stats["entities_unchanged"] = self.notes_unchanged - unchanged
+        stats["timings_ms"] = {k: round(v * 1000, 1) for k, v in timings.items()}
+
         # Save metadata with format version
         self._save_sync_metadata(stats)
         self._append_sync_log(
@@ -1939,12 +2185,15 @@ class VaultSyncService:
             "mocs": 0,
         }
 
-        # Export changed entities
+        # Export changed entities; a handful is cheaper queried one by one
         entities = self._get_all_entities(since=last_sync)
-        for entity in entities:
-            path = self.export_entity(entity)
-            if path:
-                stats["entities"] += 1
+        if len(entities) >= self.PREFETCH_MIN_ENTITIES:
+            stats["entities"] = self._export_entities(entities, {})
+        else:
+            for entity in entities:
+                path = self.export_entity(entity)
+                if path:
+                    stats["entities"] += 1
 
         # Patterns and reflections are always fully rebuilt (cheap operation)
         stats["patterns"] = self._export_patterns()
@@ -2016,41 +2265,37 @@ class VaultSyncService:
 
     # ── Bidirectional sync (Phase 4) ────────────────────────────
 
+    def entity_note_dirs(self) -> List[Path]:
+        """Directories holding entity notes (the ones scanned for user edits)."""
+        return [self.vault_path / subdir for subdir in ENTITY_NOTE_DIRS]
+
     def detect_user_edits(self) -> List[Dict[str, Any]]:
         """Detect notes that users have edited in the vault.
 
-        Walks all .md files, compares content hash to sync_hash in frontmatter.
-        Returns list of edits with file path, entity ID, and change info.
+        Compares each note's body hash to the sync_hash in its frontmatter.
+        Hashes are cached in vault_file_state by (mtime, size), so only
+        notes changed since the last check are read. Returns list of edits
+        with file path, entity ID, and change info.
         """
-        edits = []
-        for subdir in [
-            "Active", "Relationships/people", "Relationships/organizations",
-            "Reference/concepts", "Reference/locations",
-            "Archive/people", "Archive/projects", "Archive/organizations",
-        ]:
-            d = self.vault_path / subdir
-            if not d.exists():
-                continue
-            for filepath in d.glob("*.md"):
-                try:
-                    raw = filepath.read_text(encoding="utf-8")
-                    fm, body = self._parse_frontmatter(raw)
-                    if not fm or "sync_hash" not in fm:
-                        continue
+        return VaultFileIndex(self.db, self._note_state).scan(self.entity_note_dirs())
 
-                    current_hash = _compute_sync_hash(body)
-                    if current_hash != fm["sync_hash"]:
-                        edits.append({
-                            "file_path": str(filepath),
-                            "entity_id": fm.get("claudia_id"),
-                            "entity_type": fm.get("type"),
-                            "old_hash": fm["sync_hash"],
-                            "new_hash": current_hash,
-                        })
-                except (IOError, UnicodeDecodeError) as e:
-                    logger.debug(f"Could not read vault note {filepath}: {e}")
-
-        return edits
+    def _note_state(self, filepath: Path):
+        """(sync_hash, body_hash, entity_id, entity_type) for one note, or None."""
+        try:
+            raw = filepath.read_text(encoding="utf-8")
+        except (IOError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not read vault note {filepath}: {e}")
+            return None
+        fm, body = self._parse_frontmatter(raw)
+        if not fm or "sync_hash" not in fm:
+            return None
+        claudia_id = fm.get("claudia_id")
+        return (
+            fm["sync_hash"],
+            _compute_sync_hash(body),
+            int(claudia_id) if claudia_id and str(claudia_id).isdigit() else claudia_id,
+            fm.get("type"),
+        )
 
     def import_vault_edit(self, file_path: Path) -> Dict[str, Any]:
         """Import user edits from a vault note back into SQLite.
@@ -2193,7 +2438,24 @@ class VaultSyncService:
 
         Returns summary of all changes applied.
         """
-        edits = self.detect_user_edits()
+        return self._import_edits(self.detect_user_edits())
+
+    def import_changed_edits(self, watcher=None) -> Dict[str, Any]:
+        """Import user edits from notes changed since the last call.
+
+        With an InotifyWatcher only the paths it reports are checked; without
+        one (or after it lost events) this falls back to detect_user_edits,
+        which still reads only notes whose stat changed.
+        """
+        if watcher is None:
+            return self.import_all_edits()
+        paths, overflow = watcher.poll()
+        if overflow:
+            return self.import_all_edits()
+        index = VaultFileIndex(self.db, self._note_state)
+        return self._import_edits(index.refresh(paths))
+
+    def _import_edits(self, edits: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not edits:
             return {"edits_found": 0, "changes": []}
 
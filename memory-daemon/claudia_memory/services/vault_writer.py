@@ -0,0 +1,219 @@
+"""
+Debounced, coalescing vault write-through.
+
+remember_fact and remember_entity used to re-export each linked entity's
+note synchronously, inside the tool call. Each export re-queries the
+entity's memories, relationships, aliases, sessions and patterns and
+rewrites the whole file, so a memory_batch of 50 facts about one person
+rewrote that note 50 times while the caller waited.
+
+Writers now only mark entities dirty. Names and ids are collected in a set
+and a background thread renders them once writes go quiet:
+
+- Marks made inside a db.transaction() take effect when it commits (via
+  db.after_commit), so the renderer never reads rows still being written
+  and a rolled-back write marks nothing.
+- Rendering starts quiet_ms after the latest mark, and no later than
+  max_delay_ms after the first, so a steady stream of writes still
+  reaches the vault.
+- Names are resolved to entity ids at render time and each id is exported
+  once per round. VaultSyncService.export_entity writes atomically and
+  leaves unchanged notes alone.
+
+The thread starts on the first mark and exits after idle_exit_seconds
+without work, closing its connection. With quiet_ms=0 notes are rendered
+inline once the write commits, as before.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class VaultWriter:
+    """Coalesces dirty entities for one database and renders their notes in the background."""
+
+    def __init__(
+        self,
+        db,
+        quiet_ms: int = 500,
+        max_delay_ms: int = 5000,
+        idle_exit_seconds: float = 5.0,
+    ):
+        self.db = db
+        self.quiet_ms = quiet_ms
+        self.max_delay_ms = max_delay_ms
+        self.idle_exit_seconds = idle_exit_seconds
+        self._cond = threading.Condition()
+        self._render_lock = threading.Lock()
+        self._names: Set[str] = set()
+        self._ids: Set[int] = set()
+        self._first_mark = 0.0
+        self._last_mark = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.marks = 0
+        self.rounds = 0
+        self.notes_written = 0
+        self.notes_unchanged = 0
+
+    def mark_dirty(
+        self,
+        entity_names: Iterable[str] = (),
+        entity_ids: Iterable[int] = (),
+    ) -> None:
+        """Schedule a re-render of these entities' notes once the caller's writes commit."""
+        names = [n for n in entity_names if n]
+        ids = [i for i in entity_ids if i]
+        if names or ids:
+            self.db.after_commit(lambda: self._add(names, ids))
+
+    def flush(self) -> int:
+        """Render everything marked so far on the calling thread. Returns notes exported."""
+        return self._render_pending()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Render what is pending, then stop the background thread."""
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._stopping = False
+        self._render_pending()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._names) + len(self._ids)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending(),
+            "marks": self.marks,
+            "rounds": self.rounds,
+            "written": self.notes_written,
+            "unchanged": self.notes_unchanged,
+            "running": int(self._thread is not None),
+        }
+
+    def _add(self, names, ids) -> None:
+        now = time.monotonic()
+        with self._cond:
+            if not self._names and not self._ids:
+                self._first_mark = now
+            self._last_mark = now
+            self._names.update(names)
+            self._ids.update(ids)
+            self.marks += 1
+            if self.quiet_ms > 0:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="vault-writer", daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+        if self.quiet_ms <= 0:
+            self._render_pending()
+
+    def _due(self) -> float:
+        """Seconds until the pending set should be rendered (<= 0 means now)."""
+        quiet = self._last_mark + self.quiet_ms / 1000
+        latest = self._first_mark + self.max_delay_ms / 1000
+        return min(quiet, latest) - time.monotonic()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while not (self._names or self._ids) and not self._stopping:
+                        if not self._cond.wait(self.idle_exit_seconds) and not (self._names or self._ids):
+                            # Cleared under the lock so the next mark starts a new thread
+                            self._thread = None
+                            return
+                    while not self._stopping:
+                        wait = self._due()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    stopping = self._stopping
+                self._render_pending()
+                if stopping:
+                    return
+        finally:
+            with self._cond:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+            self.db.close()
+
+    def _render_pending(self) -> int:
+        with self._render_lock:
+            with self._cond:
+                names, self._names = self._names, set()
+                ids, self._ids = self._ids, set()
+            if not names and not ids:
+                return 0
+            try:
+                return self._render(names, ids)
+            except Exception as e:
+                logger.debug(f"Vault write-through unavailable: {e}")
+                return 0
+
+    def _render(self, names: Set[str], ids: Set[int]) -> int:
+        from .vault_sync import get_vault_sync_service
+
+        vault = get_vault_sync_service(db=self.db)
+        for name in names:
+            try:
+                entity = vault.find_entity(name)
+            except Exception as e:
+                logger.debug(f"Vault write-through skipped for {name}: {e}")
+                continue
+            if entity:
+                ids.add(entity["id"])
+
+        vault._ensure_directories()
+        exported = 0
+        for entity_id in sorted(ids):
+            entity = self.db.get_one(
+                "entities",
+                where="id = ? AND deleted_at IS NULL",
+                where_params=(entity_id,),
+            )
+            if not entity:
+                continue
+            try:
+                if vault.export_entity(entity) is not None:
+                    exported += 1
+            except Exception as e:
+                logger.debug(f"Vault write-through skipped for entity {entity_id}: {e}")
+
+        self.rounds += 1
+        self.notes_written += vault.notes_written
+        self.notes_unchanged += vault.notes_unchanged
+        return exported
+
+
+_writers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_writers_lock = threading.Lock()
+
+
+def get_vault_writer(db=None) -> VaultWriter:
+    """Get or create the vault writer for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _writers_lock:
+        writer = _writers.get(db)
+        if writer is None:
+            from ..config import get_config
+            config = get_config()
+            writer = _writers[db] = VaultWriter(
+                db,
+                quiet_ms=config.vault_write_quiet_ms,
+                max_delay_ms=config.vault_write_max_delay_ms,
+            )
+        return writer
@@ -0,0 +1,250 @@
+"""
+Single-writer queue with group commit.
+
+remember_fact runs 8-12 statements per fact (dedupe lookup, insert, chain
+head, embedding, entity find-or-create, links, entity touch, audit), and
+outside a transaction each one commits on its own. Bulk writers (session
+and observation ingest on scheduler threads, backfill, end_session) paid
+an fsync per statement and contended with each other for the SQLite write
+lock under the 30s busy timeout.
+
+Writers now hand write intents to one thread that owns the write
+connection. It drains the queue in groups and runs each group in a single
+transaction:
+
+- A group closes once it holds group_max_ops intents or group_window_ms
+  has passed since its first intent arrived.
+- Each intent runs in its own SAVEPOINT (a nested db.transaction()), so a
+  failing intent rolls back alone and the rest of the group still commits.
+- Futures resolve only after COMMIT, so a caller holding an id knows the
+  row is durable. If COMMIT fails, every intent in the group gets the
+  error.
+- after_commit hooks (vault write-through, mostly) run after COMMIT and
+  outside the transaction, so they see committed rows and never hold the
+  write lock.
+
+The thread starts on the first submit and exits after idle_exit_seconds
+without work, closing its connection. An intent submitted from the writer
+thread itself, or from a thread that already holds an open
+db.transaction() (the MCP write lane), runs inline in the caller's
+transaction: queueing it would wait on a write lock the caller holds. Its
+future still resolves only when that transaction commits (or fails if it
+rolls back), so such a caller must not wait on it before then.
+"""
+
+import logging
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_Intent = Tuple[Callable[[], Any], Optional[Callable[[Any], None]], Future]
+
+
+class WriteQueue:
+    """Runs write intents for one database on a single thread, committed in groups."""
+
+    def __init__(
+        self,
+        db,
+        group_window_ms: int = 10,
+        group_max_ops: int = 256,
+        idle_exit_seconds: float = 5.0,
+    ):
+        self.db = db
+        self.group_window_ms = group_window_ms
+        self.group_max_ops = group_max_ops
+        self.idle_exit_seconds = idle_exit_seconds
+        self._queue: "queue.Queue[Optional[_Intent]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.groups_committed = 0
+        self.intents_committed = 0
+        self.intents_failed = 0
+        self.largest_group = 0
+
+    def submit(
+        self,
+        intent: Callable[[], Any],
+        after_commit: Optional[Callable[[Any], None]] = None,
+    ) -> Future:
+        """Queue `intent` and return a Future for its result.
+
+        `intent` runs on the writer thread inside the group transaction and
+        must not block on anything but the database (compute embeddings
+        before submitting). `after_commit(result)` runs once the group has
+        committed.
+        """
+        future: Future = Future()
+        if threading.current_thread() is self._thread or self.db.in_transaction():
+            self._run_inline(intent, after_commit, future)
+            return future
+        self._queue.put((intent, after_commit, future))
+        self._ensure_thread()
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far has committed (or failed)."""
+        marker = self.submit(lambda: None)
+        try:
+            marker.result(timeout)
+        except Exception:
+            return False
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Commit what is queued, then stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "groups": self.groups_committed,
+            "committed": self.intents_committed,
+            "failed": self.intents_failed,
+            "largest_group": self.largest_group,
+            "running": int(self._thread is not None),
+        }
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _run_inline(self, intent, after_commit, future: Future) -> None:
+        # The caller's transaction is open: run as a savepoint within it and
+        # resolve when the outermost transaction commits
+        try:
+            with self.db.transaction():
+                result = intent()
+        except BaseException as e:
+            future.set_exception(e)
+            return
+
+        def committed() -> None:
+            future.set_result(result)
+            if after_commit is not None:
+                self._call_after_commit(after_commit, result)
+
+        self.db.after_commit(
+            committed,
+            on_rollback=lambda: future.set_exception(
+                RuntimeError("enclosing transaction rolled back")
+            ),
+        )
+
+    def _collect(self, first: _Intent) -> Tuple[List[_Intent], bool]:
+        """Gather a group starting with `first`. Returns (group, stop_requested)."""
+        group = [first]
+        deadline = time.monotonic() + self.group_window_ms / 1000
+        while len(group) < self.group_max_ops:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return group, True
+            group.append(item)
+        return group, False
+
+    def _run(self) -> None:
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.idle_exit_seconds)
+                except queue.Empty:
+                    with self._lock:
+                        # A submit may have raced the timeout; keep going if so
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+                if first is None:
+                    break
+                group, stop = self._collect(first)
+                self._commit_group(group)
+                if stop:
+                    break
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+            self.db.close()
+        # Anything submitted after the stop marker gets a fresh thread
+        if not self._queue.empty():
+            self._ensure_thread()
+
+    def _commit_group(self, group: List[_Intent]) -> None:
+        results: List[Tuple[Future, Any, Optional[Callable[[Any], None]]]] = []
+        try:
+            with self.db.transaction():
+                for intent, after_commit, future in group:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with self.db.transaction():
+                            result = intent()
+                    except Exception as e:
+                        self.intents_failed += 1
+                        future.set_exception(e)
+                        continue
+                    results.append((future, result, after_commit))
+        except Exception as e:
+            logger.warning(f"Write group of {len(group)} failed to commit: {e}")
+            # Covers intents that ran (their work was rolled back) and any
+            # the group never reached because BEGIN itself failed
+            for _, _, future in group:
+                if future.done():
+                    continue
+                if future.running() or future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+                    self.intents_failed += 1
+            return
+
+        self.groups_committed += 1
+        self.intents_committed += len(results)
+        self.largest_group = max(self.largest_group, len(group))
+        for future, result, after_commit in results:
+            future.set_result(result)
+        for future, result, after_commit in results:
+            if after_commit is not None:
+                self._call_after_commit(after_commit, result)
+
+    @staticmethod
+    def _call_after_commit(hook: Callable[[Any], None], result: Any) -> None:
+        try:
+            hook(result)
+        except Exception as e:
+            logger.debug(f"after_commit hook failed: {e}")
+
+
+_queues: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db=None) -> WriteQueue:
+    """Get or create the write queue for a database (defaults to the global one)."""
+    if db is None:
+        from ..database import get_db
+        db = get_db()
+    with _queues_lock:
+        writer = _queues.get(db)
+        if writer is None:
+            from ..config import get_config
+            config = get_config()
+            writer = _queues[db] = WriteQueue(
+                db,
+                group_window_ms=config.write_group_window_ms,
+                group_max_ops=config.write_group_max_ops,
+            )
+        return writer
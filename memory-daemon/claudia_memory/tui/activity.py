@@ -0,0 +1,64 @@
+"""
+Ring-buffered activity counts for the Neural Pulse.
+
+DataSource feeds audit_log rows past its cursor into an ActivityRing, so
+each poll costs one primary-key range read over the rows written since the
+last one, however long the window. Buckets rotate on the monotonic clock;
+rows read incrementally land in the current bucket (they were written
+since the previous poll, which is at most about one bucket ago), so their
+timestamps are never parsed. Only the initial fill places rows by
+timestamp.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from ..events import OPERATION_KINDS
+
+SERIES = ("writes", "reads", "links")
+
+# OPERATION_KINDS event type -> index into SERIES
+_SERIES_INDEX = {"write": 0, "read": 1, "link": 2}
+
+
+class ActivityRing:
+    """Counts per series over the last `window_seconds`, in `bucket_seconds` slots."""
+
+    def __init__(self, window_seconds: int = 60, bucket_seconds: int = 3):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.size = max(1, window_seconds // bucket_seconds)
+        self._buckets: Deque[List[int]] = deque(
+            ([0] * len(SERIES) for _ in range(self.size)), maxlen=self.size
+        )
+        self._slot = self._current_slot()
+
+    def _current_slot(self, now: Optional[float] = None) -> int:
+        return int((time.monotonic() if now is None else now) // self.bucket_seconds)
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """Rotate in empty buckets for the slots that have passed."""
+        slot = self._current_slot(now)
+        for _ in range(min(slot - self._slot, self.size)):
+            self._buckets.append([0] * len(SERIES))
+        self._slot = max(self._slot, slot)
+
+    def add(self, operation: str, age_seconds: float = 0.0) -> None:
+        """Count one audit row, `age_seconds` before now (rows outside the window are dropped)."""
+        index = _SERIES_INDEX.get(OPERATION_KINDS.get(operation, ""))
+        if index is None:
+            return
+        back = int(max(age_seconds, 0.0) // self.bucket_seconds)
+        if back >= self.size:
+            return
+        self.advance()
+        self._buckets[self.size - 1 - back][index] += 1
+
+    def series(self) -> Dict[str, List[int]]:
+        """Oldest-first counts per series."""
+        self.advance()
+        return {
+            name: [bucket[i] for bucket in self._buckets]
+            for i, name in enumerate(SERIES)
+        }
@@ -4,12 +4,26 @@ Read-only data source for the Brain Monitor.
 Opens a separate read-only SQLite connection (bypassing the main Database singleton)
 and provides query methods for all dashboard widgets.
 
+Polling is incremental so the monitor can sit beside a busy daemon:
+
+- PRAGMA data_version (which moves only when another connection commits)
+  gates every query; while the daemon is idle a poll runs no SELECTs.
+- The Neural Pulse keeps an audit_log id cursor and an ActivityRing
+  (activity.py), so a poll reads only the rows written since the last one.
+- The constellation keeps its window of memories by id and patches it from
+  the change_log cursor (new, re-dated and invalidated memories), with a
+  full reload every CONSTELLATION_RESYNC_SECONDS to pick up importance
+  changes and re-linked entities, which change_log does not record.
+- Totals, type counts and the importance histogram come from the
+  trigger-maintained stat_counters table.
+
 Also polls the daemon health HTTP endpoint for liveness status.
 """
 
 import logging
 import os
 import sqlite3
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -17,9 +31,31 @@ from typing import Any, Dict, List, Optional, Tuple
 import httpx
 
 from ..config import MemoryConfig, get_config
+from ..decay import row_importance
+from .activity import ActivityRing
+from ..services.stat_counters import (
+    counters_from_rows,
+    grouped,
+    importance_histogram,
+    table_counts,
+)
 
 logger = logging.getLogger(__name__)
 
+CONSTELLATION_RESYNC_SECONDS = 300.0
+
+_CONSTELLATION_SQL = """
+    SELECT m.id, m.importance, m.created_at, m.invalidated_at,
+           COALESCE(e.type, 'unlinked') as entity_type
+    FROM memories m
+    LEFT JOIN memory_entities me ON me.memory_id = m.id
+    LEFT JOIN entities e ON e.id = me.entity_id AND e.deleted_at IS NULL
+    WHERE {where}
+    GROUP BY m.id
+    ORDER BY m.id DESC
+    {limit}
+"""
+
 
 class DataSource:
     """Read-only data layer for the Brain Monitor TUI.
@@ -33,6 +69,17 @@ class DataSource:
         self._db_path = db_path or config.db_path
         self._health_port = config.health_port
         self._conn: Optional[sqlite3.Connection] = None
+        # Incremental state (see module docstring)
+        self._stats_cache: Optional[Tuple[Tuple[int, str], Dict[str, Any]]] = None
+        self._counters_cache: Optional[Tuple[int, Optional[Dict[str, int]]]] = None
+        self._activity: Optional[ActivityRing] = None
+        self._activity_version: Optional[int] = None
+        self._audit_cursor = 0
+        self._constellation: Dict[int, Dict[str, Any]] = {}
+        self._constellation_limit = 0
+        self._constellation_version: Optional[int] = None
+        self._constellation_synced = 0.0
+        self._change_cursor: Optional[int] = None
 
     def _get_conn(self) -> sqlite3.Connection:
         """Get or create read-only connection."""
@@ -102,22 +149,49 @@ class DataSource:
             "online": False,
         }
 
+    def _data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        return self._scalar("PRAGMA data_version")
+
+    # ── Maintained counters ───────────────────────────────────────────
+
+    def _counters(self) -> Optional[Dict[str, int]]:
+        """stat_counters as a dict, or None if the daemon has not created them yet."""
+        version = self._data_version()
+        if self._counters_cache is None or self._counters_cache[0] != version:
+            rows = self._query("SELECT key, value FROM stat_counters")
+            self._counters_cache = (version, counters_from_rows(rows))
+        return self._counters_cache[1]
+
     # ── Stats ─────────────────────────────────────────────────────────
 
     def get_stats(self) -> Dict[str, Any]:
         """Get core counts with today's deltas."""
         today = datetime.now().strftime("%Y-%m-%d")
-
-        total_memories = self._scalar("SELECT COUNT(*) FROM memories") or 0
-        total_entities = self._scalar(
-            "SELECT COUNT(*) FROM entities WHERE deleted_at IS NULL"
-        ) or 0
-        total_relationships = self._scalar("SELECT COUNT(*) FROM relationships") or 0
-        total_episodes = self._scalar("SELECT COUNT(*) FROM episodes") or 0
-        total_patterns = self._scalar(
-            "SELECT COUNT(*) FROM patterns WHERE is_active = 1"
-        ) or 0
-        total_reflections = self._scalar("SELECT COUNT(*) FROM reflections") or 0
+        key = (self._data_version(), today)
+        if self._stats_cache is not None and self._stats_cache[0] == key:
+            return self._stats_cache[1]
+
+        counters = self._counters()
+        if counters is not None:
+            totals = table_counts(counters)
+            total_memories = totals["memories"]
+            total_entities = totals["entities"]
+            total_relationships = totals["relationships"]
+            total_episodes = totals["episodes"]
+            total_patterns = totals["active_patterns"]
+            total_reflections = totals["reflections"]
+        else:
+            total_memories = self._scalar("SELECT COUNT(*) FROM memories") or 0
+            total_entities = self._scalar(
+                "SELECT COUNT(*) FROM entities WHERE deleted_at IS NULL"
+            ) or 0
+            total_relationships = self._scalar("SELECT COUNT(*) FROM relationships") or 0
+            total_episodes = self._scalar("SELECT COUNT(*) FROM episodes") or 0
+            total_patterns = self._scalar(
+                "SELECT COUNT(*) FROM patterns WHERE is_active = 1"
+            ) or 0
+            total_reflections = self._scalar("SELECT COUNT(*) FROM reflections") or 0
 
         # Today's deltas
         memories_today = self._scalar(
@@ -128,7 +202,7 @@ class DataSource:
             (today,),
         ) or 0
 
-        return {
+        stats = {
             "memories": total_memories,
             "entities": total_entities,
             "relationships": total_relationships,
@@ -138,6 +212,8 @@ class DataSource:
             "memories_today": memories_today,
             "entities_today": entities_today,
         }
+        self._stats_cache = (key, stats)
+        return stats
 
     # ── Activity timeseries (for Neural Pulse) ────────────────────────
 
@@ -145,97 +221,171 @@ class DataSource:
         """Get operation counts bucketed into 3-second intervals.
 
         Returns dict with 'writes', 'reads', 'links' lists (20 values each
-        for a 60-second window).
+        for a 60-second window). The first call fills the ring from the
+        window's audit rows; later calls read only rows past the cursor.
         """
+        version = self._data_version()
+        ring = self._activity
+        if ring is None or ring.window_seconds != window_seconds:
+            ring = self._activity = ActivityRing(window_seconds)
+            self._fill_activity(ring)
+        elif version != self._activity_version:
+            rows = self._query(
+                "SELECT id, operation FROM audit_log WHERE id > ? ORDER BY id",
+                (self._audit_cursor,),
+            )
+            for r in rows:
+                ring.add(r["operation"])
+            if rows:
+                self._audit_cursor = rows[-1]["id"]
+        self._activity_version = version
+        return ring.series()
+
+    def _fill_activity(self, ring: ActivityRing) -> None:
+        """Place the window's audit rows by timestamp and set the cursor past them."""
+        head = self._scalar("SELECT MAX(id) FROM audit_log") or 0
         now = datetime.now()
-        cutoff = (now - timedelta(seconds=window_seconds)).isoformat()
-        buckets = window_seconds // 3
-
-        # Classify operations
-        write_ops = (
-            "mem_create", "mem_correct", "mem_invalidate", "entity_new",
-            "entity_update", "entity_merge", "entity_delete", "batch",
-        )
-        read_ops = (
-            "recall", "recall_about", "search_entities", "session_context",
-            "morning_context", "briefing",
-        )
-        link_ops = ("relate", "relate_update", "entity_link")
-
+        cutoff = (now - timedelta(seconds=ring.window_seconds)).isoformat()
         rows = self._query(
             """
             SELECT timestamp, operation
             FROM audit_log
-            WHERE timestamp >= ?
-            ORDER BY timestamp ASC
+            WHERE timestamp >= ? AND id <= ?
             """,
-            (cutoff,),
+            (cutoff, head),
         )
-
-        writes = [0] * buckets
-        reads = [0] * buckets
-        links = [0] * buckets
-
         for r in rows:
             try:
                 ts = datetime.fromisoformat(r["timestamp"])
-                delta = (ts - (now - timedelta(seconds=window_seconds))).total_seconds()
-                bucket = min(int(delta / 3), buckets - 1)
-                if bucket < 0:
-                    continue
-                op = r["operation"]
-                if op in write_ops:
-                    writes[bucket] += 1
-                elif op in read_ops:
-                    reads[bucket] += 1
-                elif op in link_ops:
-                    links[bucket] += 1
             except (ValueError, TypeError):
                 continue
-
-        return {"writes": writes, "reads": reads, "links": links}
+            ring.add(r["operation"], (now - ts).total_seconds())
+        self._audit_cursor = head
 
     # ── Memory constellation ──────────────────────────────────────────
 
     def get_memory_constellation(self, limit: int = 200) -> List[Dict[str, Any]]:
         """Get recent memories with entity type info for the dot grid.
 
-        Returns list of dicts with 'entity_type', 'importance', 'age_hours'.
+        Returns list of dicts with 'entity_type', 'importance', 'age_hours',
+        newest first. The window is reloaded on the first call, when `limit`
+        changes, or every CONSTELLATION_RESYNC_SECONDS; in between it is
+        patched from the change_log rows past the cursor.
         """
-        rows = self._query(
-            """
-            SELECT m.id, m.importance, m.created_at,
-                   COALESCE(e.type, 'unlinked') as entity_type
-            FROM memories m
-            LEFT JOIN memory_entities me ON me.memory_id = m.id
-            LEFT JOIN entities e ON e.id = me.entity_id AND e.deleted_at IS NULL
-            WHERE m.invalidated_at IS NULL
-            GROUP BY m.id
-            ORDER BY m.id DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
+        version = self._data_version()
+        if (
+            limit != self._constellation_limit
+            or self._change_cursor is None
+            or time.monotonic() - self._constellation_synced >= CONSTELLATION_RESYNC_SECONDS
+        ):
+            self._load_constellation(limit)
+        elif version != self._constellation_version:
+            self._patch_constellation()
+        self._constellation_version = version
 
         now = datetime.now()
         result = []
-
-        for r in rows:
-            age_hours = 0.0
-            try:
-                created = datetime.fromisoformat(r["created_at"])
-                age_hours = (now - created).total_seconds() / 3600
-            except (ValueError, TypeError):
-                pass
-
+        for memory_id in sorted(self._constellation, reverse=True):
+            entry = self._constellation[memory_id]
+            created = entry["created"]
             result.append({
-                "entity_type": r["entity_type"],
-                "importance": r["importance"] or 0.5,
-                "age_hours": age_hours,
+                "entity_type": entry["entity_type"],
+                "importance": entry["importance"],
+                "age_hours": (now - created).total_seconds() / 3600 if created else 0.0,
             })
-
         return result
 
+    @staticmethod
+    def _constellation_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        try:
+            created = datetime.fromisoformat(row["created_at"])
+        except (ValueError, TypeError):
+            created = None
+        return {
+            "entity_type": row["entity_type"],
+            "importance": row["importance"] or 0.5,
+            "created": created,
+        }
+
+    def _change_log_head(self) -> Optional[int]:
+        """Highest change_log id ever assigned, or None if there is no change_log."""
+        if not self._query("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'"):
+            return None
+        return self._scalar("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'") or 0
+
+    def _load_constellation(self, limit: int) -> None:
+        # Read the cursor first: a write landing mid-load is replayed by the next patch
+        self._change_cursor = self._change_log_head()
+        rows = self._query(
+            _CONSTELLATION_SQL.format(where="m.invalidated_at IS NULL", limit="LIMIT ?"),
+            (limit,),
+        )
+        self._constellation = {r["id"]: self._constellation_entry(r) for r in rows}
+        self._constellation_limit = limit
+        self._constellation_synced = time.monotonic()
+
+    def _patch_constellation(self) -> None:
+        """Apply memory changes logged since the cursor to the window."""
+        cursor = self._change_cursor
+        head = self._change_log_head()
+        if head is None:
+            self._load_constellation(self._constellation_limit)
+            return
+        if head <= cursor:
+            return
+        oldest = self._scalar("SELECT MIN(id) FROM change_log")
+        if oldest is None or oldest > cursor + 1:
+            # Pruned past the cursor; the changes in between are gone
+            self._load_constellation(self._constellation_limit)
+            return
+
+        changed = [
+            r["ref_id"]
+            for r in self._query(
+                "SELECT DISTINCT ref_id FROM change_log WHERE id > ? AND id <= ? AND kind = 'memory'",
+                (cursor, head),
+            )
+        ]
+        self._change_cursor = head
+        if not changed:
+            return
+
+        limit = self._constellation_limit
+        window = self._constellation
+        floor = min(window) if len(window) >= limit else 0
+        for start in range(0, len(changed), 500):
+            chunk = changed[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            fetched = {
+                r["id"]: r
+                for r in self._query(
+                    _CONSTELLATION_SQL.format(where=f"m.id IN ({placeholders})", limit=""),
+                    tuple(chunk),
+                )
+            }
+            for memory_id in chunk:
+                row = fetched.get(memory_id)
+                if row is None or row["invalidated_at"] is not None:
+                    window.pop(memory_id, None)
+                elif memory_id > floor or memory_id in window:
+                    window[memory_id] = self._constellation_entry(row)
+
+        if len(window) > limit:
+            for memory_id in sorted(window)[:len(window) - limit]:
+                del window[memory_id]
+        elif len(window) < limit:
+            if not window:
+                self._load_constellation(limit)
+                return
+            rows = self._query(
+                _CONSTELLATION_SQL.format(
+                    where="m.invalidated_at IS NULL AND m.id < ?", limit="LIMIT ?"
+                ),
+                (min(window), limit - len(window)),
+            )
+            for r in rows:
+                window[r["id"]] = self._constellation_entry(r)
+
     # ── Importance histogram ──────────────────────────────────────────
 
     def get_importance_histogram(self, buckets: int = 30) -> List[float]:
@@ -243,17 +393,28 @@ class DataSource:
 
         Divides importance range [0, 1] into N buckets and counts memories
         in each. Returns list of N floats for sparkline rendering.
+        Read from the maintained counters, which bucket stored importance
+        (within a bucket of effective). Without them, or for a bucket count
+        they cannot fold into, each row's effective value is computed here
+        (this connection has no decay SQL functions).
         """
+        counters = self._counters()
+        if counters is not None:
+            histogram = importance_histogram(counters, buckets)
+            if histogram is not None:
+                return histogram
+
         rows = self._query(
             """
-            SELECT importance FROM memories
+            SELECT importance, decay_ref_at, created_at, lifecycle_tier FROM memories
             WHERE invalidated_at IS NULL AND importance IS NOT NULL
             """
         )
 
+        now = datetime.utcnow()
         histogram = [0.0] * buckets
         for r in rows:
-            imp = r["importance"] or 0.0
+            imp = row_importance(r, now) or 0.0
             bucket = min(int(imp * buckets), buckets - 1)
             histogram[bucket] += 1.0
 
@@ -263,6 +424,10 @@ class DataSource:
 
     def get_memory_type_counts(self) -> Dict[str, int]:
         """Get memory counts grouped by type."""
+        counters = self._counters()
+        if counters is not None:
+            return grouped(counters, "memories.type")
+
         rows = self._query(
             """
             SELECT type, COUNT(*) as cnt
@@ -0,0 +1,88 @@
+"""
+Packed float32 vector codec for sqlite-vec.
+
+vec0 columns store vectors as little-endian float32 blobs. It also accepts
+JSON text ("[0.1, 0.2, ...]"), which is what the daemon used to send, but that
+means formatting 384 floats to text on every write and query and having
+sqlite-vec parse them back. Passing the packed blob skips both steps.
+
+Embeddings travel through the daemon as ``array('f')``. An array is about
+four times smaller than a ``List[float]`` of boxed Python floats, and it
+exposes the buffer protocol, so ``encode`` can hand sqlite3 a zero-copy
+``memoryview`` on little-endian hosts.
+
+Reading works the same way: ``SELECT embedding FROM memory_embeddings``
+returns the raw blob, and ``decode`` turns it back into an ``array('f')``.
+"""
+
+import json
+import math
+import sys
+from array import array
+from typing import Iterable, Union
+
+# Anything that can be turned into a float32 vector
+VectorLike = Union[array, bytes, bytearray, memoryview, str, Iterable[float]]
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def to_array(vector: VectorLike) -> array:
+    """Coerce a vector in any supported form into ``array('f')``.
+
+    Accepts an existing float32 array (returned as is), a packed
+    little-endian blob from vec0, a JSON list string (legacy rows), or any
+    iterable of numbers.
+    """
+    if isinstance(vector, array) and vector.typecode == "f":
+        return vector
+    if isinstance(vector, (bytes, bytearray, memoryview)):
+        raw = bytes(vector) if isinstance(vector, memoryview) else vector
+        if len(raw) % 4:
+            raise ValueError(f"float32 blob length {len(raw)} is not a multiple of 4")
+        out = array("f")
+        out.frombytes(raw)
+        if not _LITTLE_ENDIAN:
+            out.byteswap()
+        return out
+    if isinstance(vector, str):
+        return array("f", json.loads(vector))
+    return array("f", vector)
+
+
+def normalize(vector: VectorLike) -> array:
+    """Return ``vector`` scaled to unit L2 length as a new ``array('f')``.
+
+    Ollama's /api/embed returns unit vectors and /api/embeddings does not;
+    normalizing everything makes the two interchangeable for cosine and
+    L2 distance. A zero vector is returned unchanged.
+    """
+    arr = to_array(vector)
+    norm = math.sqrt(math.fsum(x * x for x in arr))
+    if norm == 0.0:
+        return array("f", arr)
+    return array("f", (x / norm for x in arr))
+
+
+def encode(vector: VectorLike) -> Union[memoryview, bytes]:
+    """Encode a vector as a vec0 parameter (packed little-endian float32).
+
+    On little-endian hosts an ``array('f')`` is returned as a memoryview over
+    its buffer, without copying.
+    """
+    arr = to_array(vector)
+    if _LITTLE_ENDIAN:
+        return memoryview(arr)
+    swapped = array("f", arr)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def decode(blob: VectorLike) -> array:
+    """Decode a vec0 ``embedding`` column value into ``array('f')``."""
+    return to_array(blob)
+
+
+def dimensions(blob: Union[bytes, bytearray, memoryview]) -> int:
+    """Number of float32 components in a packed blob."""
+    return len(blob) // 4
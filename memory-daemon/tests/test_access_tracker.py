@@ -0,0 +1,169 @@
+"""Tests for buffered recall access-count tracking."""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from claudia_memory.services.access_tracker import AccessTracker, get_access_tracker
+from claudia_memory.services.recall import RecallResult
+
+
+def _insert_memory(db, content, importance=0.5, access_count=0, last_accessed_at=None):
+    return db.insert(
+        "memories",
+        {
+            "content": content,
+            "content_hash": f"hash-{content}",
+            "type": "fact",
+            "importance": importance,
+            "access_count": access_count,
+            "last_accessed_at": last_accessed_at,
+            "created_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat(),
+        },
+    )
+
+
+def _counts(db, memory_id):
+    row = db.execute(
+        "SELECT access_count, last_accessed_at FROM memories WHERE id = ?",
+        (memory_id,),
+        fetch=True,
+    )[0]
+    return row["access_count"], row["last_accessed_at"]
+
+
+def _result(memory_id):
+    return RecallResult(
+        id=memory_id,
+        content="",
+        type="fact",
+        score=1.0,
+        importance=0.5,
+        created_at="",
+        entities=[],
+    )
+
+
+class TestBuffering:
+    def test_record_defers_writes_until_flush(self, db):
+        a = _insert_memory(db, "a")
+        b = _insert_memory(db, "b", access_count=4)
+        tracker = AccessTracker(db, flush_interval=3600, max_pending=100)
+        t1 = datetime(2026, 1, 1, 9, 0)
+        t2 = datetime(2026, 1, 1, 10, 0)
+
+        tracker.record([a, b], t2)
+        tracker.record([a], t1)
+
+        assert _counts(db, a) == (0, None)
+        assert tracker.pending() == {a: (2, t2.isoformat()), b: (1, t2.isoformat())}
+
+        assert tracker.flush() == 2
+        assert _counts(db, a) == (2, t2.isoformat())
+        assert _counts(db, b) == (5, t2.isoformat())
+        assert tracker.pending() == {}
+        assert tracker.flush() == 0
+
+    def test_flush_never_moves_last_accessed_backwards(self, db):
+        newer = datetime(2026, 3, 1).isoformat()
+        a = _insert_memory(db, "a", last_accessed_at=newer)
+        tracker = AccessTracker(db, flush_interval=3600)
+
+        tracker.record([a], datetime(2026, 1, 1))
+        tracker.flush()
+
+        assert _counts(db, a) == (1, newer)
+
+    def test_inline_flush_when_buffer_full(self, db):
+        ids = [_insert_memory(db, str(i)) for i in range(3)]
+        tracker = AccessTracker(db, flush_interval=3600, max_pending=3)
+
+        tracker.record(ids[:2])
+        assert tracker.pending()
+        tracker.record(ids[2:])
+
+        assert tracker.pending() == {}
+        assert all(_counts(db, i)[0] == 1 for i in ids)
+
+    def test_failed_flush_keeps_counts(self, db, monkeypatch):
+        a = _insert_memory(db, "a")
+        tracker = AccessTracker(db, flush_interval=3600)
+        tracker.record([a])
+
+        def boom(*_args, **_kwargs):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(db, "execute_many", boom)
+        assert tracker.flush() == 0
+        tracker.record([a])
+        monkeypatch.undo()
+
+        tracker.flush()
+        assert _counts(db, a)[0] == 2
+
+    def test_exit_flushes_buffered_counts(self, db):
+        from claudia_memory.services.access_tracker import _flush_at_exit
+
+        a = _insert_memory(db, "a")
+        tracker = AccessTracker(db, flush_interval=3600)
+        tracker.record([a])
+        assert _counts(db, a)[0] == 0
+
+        # What atexit runs when a CLI or hook process ends without stop()
+        _flush_at_exit()
+
+        assert _counts(db, a)[0] == 1
+        assert tracker.pending() == {}
+
+    def test_background_flusher(self, db):
+        a = _insert_memory(db, "a")
+        tracker = AccessTracker(db, flush_interval=3600, max_pending=1)
+        tracker.start()
+        try:
+            tracker.record([a])
+            # max_pending wakes the flusher instead of flushing on the caller
+            for _ in range(200):
+                if not tracker.pending():
+                    break
+                time.sleep(0.01)
+        finally:
+            tracker.stop()
+
+        assert _counts(db, a)[0] == 1
+        assert tracker.stats()["background"] == 0
+
+
+class TestServiceIntegration:
+    def test_recall_records_without_writing(self, db):
+        from claudia_memory.services.recall import RecallService
+
+        a = _insert_memory(db, "a")
+        svc = RecallService.__new__(RecallService)
+        svc.db = db
+        tracker = get_access_tracker(db)
+        tracker.flush_interval = 3600
+
+        svc._update_access_counts([_result(a), _result(a)], datetime.utcnow())
+
+        assert _counts(db, a)[0] == 0
+        assert tracker.pending()[a][0] == 2
+
+    def test_boost_flushes_first(self, db):
+        from claudia_memory.config import MemoryConfig
+        from claudia_memory.services.consolidate import ConsolidateService
+
+        stale = (datetime.utcnow() - timedelta(days=3)).isoformat()
+        a = _insert_memory(db, "a", importance=0.5, last_accessed_at=stale)
+        tracker = get_access_tracker(db)
+        tracker.flush_interval = 3600
+        tracker.record([a])
+
+        svc = ConsolidateService.__new__(ConsolidateService)
+        svc.db = db
+        svc.config = MemoryConfig()
+
+        assert svc.boost_accessed_memories() == 1
+        row = db.execute("SELECT importance FROM memories WHERE id = ?", (a,), fetch=True)[0]
+        assert row["importance"] == pytest.approx(0.525)
@@ -0,0 +1,163 @@
+"""Tests for background hash-chain sealing and range verification."""
+
+import hashlib
+import json
+import time
+
+from claudia_memory.services.chain import (
+    ChainSealer,
+    compute_chain_hash,
+    seal_pending,
+    sealed_through,
+    verify_chain,
+)
+
+
+def _insert_memory(db, content, metadata=None):
+    return db.insert("memories", {
+        "content": content,
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+        "type": "fact",
+        "metadata": json.dumps(metadata) if metadata else None,
+    })
+
+
+def _row(db, memory_id):
+    return db.execute("SELECT * FROM memories WHERE id = ?", (memory_id,), fetch=True)[0]
+
+
+class TestSealing:
+    def test_seals_in_id_order_and_batches(self, db):
+        ids = [_insert_memory(db, f"Fact {i}", {"n": i}) for i in range(25)]
+
+        assert seal_pending(db, batch=10) == 25
+
+        prev = None
+        for memory_id in ids:
+            row = _row(db, memory_id)
+            assert row["prev_hash"] == prev
+            prev = row["hash"]
+        seals = db.execute("SELECT from_id, to_id, row_count, head_hash FROM chain_seals ORDER BY id", fetch=True)
+        assert [(s["from_id"], s["to_id"], s["row_count"]) for s in seals] == [
+            (ids[0], ids[9], 10), (ids[10], ids[19], 10), (ids[20], ids[24], 5),
+        ]
+        assert seals[-1]["head_hash"] == prev
+        assert sealed_through(db) == ids[-1]
+        assert seal_pending(db) == 0
+
+    def test_continues_inline_hashed_chain(self, db):
+        legacy = _insert_memory(db, "Hashed by an older version")
+        legacy_hash = compute_chain_hash("Hashed by an older version", None, None)
+        db.execute("UPDATE memories SET hash = ? WHERE id = ?", (legacy_hash, legacy))
+        db.execute("UPDATE _meta SET value = ? WHERE key = 'chain_head'", (legacy_hash,))
+        new = _insert_memory(db, "Inserted after the upgrade")
+
+        assert seal_pending(db) == 1
+        assert _row(db, legacy)["hash"] == legacy_hash
+        assert _row(db, new)["prev_hash"] == legacy_hash
+
+    def test_remember_fact_leaves_rows_unsealed(self, db, monkeypatch):
+        from claudia_memory.services import remember as remember_mod
+
+        monkeypatch.setattr(remember_mod, "embed_sync", lambda text: None)
+        svc = remember_mod.RememberService.__new__(remember_mod.RememberService)
+        svc.db = db
+        memory_id = svc.remember_fact("Nothing hashed inline")
+
+        assert _row(db, memory_id)["hash"] is None
+        assert verify_chain(db, seal=False)["unsealed"] == 1
+
+    def test_seal_through_stops_at_id(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(5)]
+        assert seal_pending(db, through=ids[2]) == 3
+        assert sealed_through(db) == ids[2]
+        assert _row(db, ids[3])["hash"] is None
+
+    def test_background_sealer_seals_and_stop_flushes(self, db):
+        sealer = ChainSealer(db, interval=0.01)
+        sealer.start()
+        first = _insert_memory(db, "Sealed by the thread")
+        for _ in range(200):
+            if sealed_through(db) >= first:
+                break
+            time.sleep(0.01)
+        assert sealed_through(db) >= first
+
+        sealer._stopping = True  # Park the loop so only stop() seals the next row
+        second = _insert_memory(db, "Sealed on stop")
+        sealer.stop()
+        assert sealed_through(db) == second
+
+    def test_disabled_sealer_does_not_start(self, db):
+        sealer = ChainSealer(db, enabled=False)
+        sealer.start()
+        assert sealer._thread is None
+        sealer.stop()
+
+
+class TestVerify:
+    def test_valid_chain(self, db):
+        for i in range(12):
+            _insert_memory(db, f"Fact {i}")
+        seal_pending(db)
+
+        result = verify_chain(db, batch=5)
+        assert result["is_valid"]
+        assert result["chain_length"] == 12
+        assert result["unsealed"] == 0
+
+    def test_detects_edit_and_reports_first_break(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(10)]
+        seal_pending(db)
+        db.execute("UPDATE memories SET content = 'tampered' WHERE id = ?", (ids[6],))
+
+        result = verify_chain(db, batch=3)
+        assert not result["is_valid"]
+        assert result["first_break_at"] == ids[6]
+
+    def test_detects_removed_row_via_links(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(6)]
+        seal_pending(db)
+        db.execute("UPDATE memories SET hash = NULL WHERE id = ?", (ids[2],))
+
+        result = verify_chain(db)
+        assert result["first_break_at"] == ids[3]
+
+    def test_seals_pending_rows_before_checking(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(6)]
+        seal_pending(db, through=ids[1])
+
+        partial = verify_chain(db, to_id=ids[3])
+        assert partial["sealed_now"] == 2
+        assert partial["chain_length"] == 4
+        assert partial["unsealed"] == 2
+
+        result = verify_chain(db)
+        assert result["is_valid"]
+        assert result["sealed_now"] == 2
+        assert result["chain_length"] == 6
+        assert result["unsealed"] == 0
+
+    def test_does_not_seal_when_chaining_disabled(self, db, monkeypatch):
+        from claudia_memory.config import MemoryConfig
+
+        monkeypatch.setattr(
+            "claudia_memory.config.get_config",
+            lambda: MemoryConfig(enable_chain_verification=False),
+        )
+        _insert_memory(db, "Never hashed")
+
+        result = verify_chain(db)
+        assert result["sealed_now"] == 0
+        assert result["unsealed"] == 1
+        assert sealed_through(db) == 0
+
+    def test_range_only_checks_its_rows(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(10)]
+        seal_pending(db)
+        db.execute("UPDATE memories SET content = 'tampered' WHERE id = ?", (ids[1],))
+
+        tail = verify_chain(db, from_id=ids[4], to_id=ids[8])
+        assert tail["is_valid"]
+        assert tail["chain_length"] == 5
+        assert not verify_chain(db, from_id=ids[0], to_id=ids[3])["is_valid"]
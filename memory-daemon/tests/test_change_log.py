@@ -0,0 +1,185 @@
+"""Tests for change tracking and incremental consolidation."""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from claudia_memory.config import MemoryConfig
+from claudia_memory.services.change_log import (
+    affected_entities,
+    commit_changes,
+    pending_changes,
+)
+from claudia_memory.services.consolidate import ConsolidateService
+
+
+def _make_service(db):
+    svc = ConsolidateService.__new__(ConsolidateService)
+    svc.db = db
+    svc.config = MemoryConfig()
+    return svc
+
+
+def _insert_memory(db, content, created_at=None, importance=0.5):
+    now = created_at or datetime.utcnow().isoformat()
+    return db.insert("memories", {
+        "content": content,
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+        "type": "fact",
+        "importance": importance,
+        "created_at": now,
+        "updated_at": now,
+    })
+
+
+def _insert_entity(db, name, entity_type="person", importance=0.8):
+    return db.insert("entities", {
+        "name": name,
+        "type": entity_type,
+        "canonical_name": name.lower(),
+        "importance": importance,
+    })
+
+
+def _link(db, memory_id, entity_id):
+    db.insert("memory_entities", {"memory_id": memory_id, "entity_id": entity_id, "relationship": "about"})
+
+
+def _entity(db, entity_id):
+    return db.execute("SELECT * FROM entities WHERE id = ?", (entity_id,), fetch=True)[0]
+
+
+def _total_changes(db):
+    return db.execute("SELECT total_changes()", fetch=True)[0][0]
+
+
+class TestChangeLog:
+    def test_first_read_is_full(self, db):
+        _insert_entity(db, "Sarah Chen")
+        changes = pending_changes(db, "test")
+        assert changes.full
+        commit_changes(db, changes)
+
+        assert not pending_changes(db, "test").full
+        assert len(pending_changes(db, "test")) == 0
+
+    def test_tracks_structural_writes_only(self, db):
+        commit_changes(db, pending_changes(db, "test"))
+
+        sarah = _insert_entity(db, "Sarah Chen")
+        bob = _insert_entity(db, "Bob Smith")
+        mem = _insert_memory(db, "Sarah met Bob")
+        _link(db, mem, sarah)
+        rel = db.insert("relationships", {
+            "source_entity_id": sarah, "target_entity_id": bob, "relationship_type": "knows",
+        })
+
+        changes = pending_changes(db, "test")
+        assert changes.memory_ids == {mem}
+        assert changes.entity_ids == {sarah, bob}
+        assert changes.relationship_ids == {rel}
+        commit_changes(db, changes)
+
+        # Decay-style writes are not changes
+        _make_service(db).run_decay()
+        db.execute("UPDATE memories SET access_count = 3 WHERE id = ?", (mem,))
+        assert len(pending_changes(db, "test")) == 0
+
+        db.execute("UPDATE memories SET invalidated_at = ? WHERE id = ?", (datetime.utcnow().isoformat(), mem))
+        changes = pending_changes(db, "test")
+        assert changes.memory_ids == {mem}
+        assert affected_entities(db, changes) == {sarah}
+
+    def test_commit_prunes_consumed_rows(self, db):
+        _insert_entity(db, "Sarah Chen")
+        commit_changes(db, pending_changes(db, "test"))
+
+        assert db.execute("SELECT COUNT(*) FROM change_log", fetch=True)[0][0] == 0
+
+    def test_pruned_past_cursor_forces_full_pass(self, db):
+        commit_changes(db, pending_changes(db, "test"))
+        _insert_entity(db, "Sarah Chen")
+        db.execute("DELETE FROM change_log")
+
+        assert pending_changes(db, "test").full
+
+    def test_merge_marks_both_entities(self, db, monkeypatch):
+        from claudia_memory.services import remember as remember_mod
+
+        monkeypatch.setattr(remember_mod.RememberService, "_vault_write_through", lambda self, names: None)
+        svc = remember_mod.RememberService.__new__(remember_mod.RememberService)
+        svc.db = db
+        source = _insert_entity(db, "Sara Chen")
+        target = _insert_entity(db, "Sarah Chen")
+        _link(db, _insert_memory(db, "Sara likes tea"), source)
+        commit_changes(db, pending_changes(db, "test"))
+
+        svc.merge_entities(source, target)
+
+        assert {source, target} <= affected_entities(db, pending_changes(db, "test"))
+
+
+class TestIncrementalConsolidation:
+    def test_velocity_recomputes_only_dirty_entities(self, db):
+        svc = _make_service(db)
+        base = datetime.utcnow() - timedelta(days=40)
+        sarah = _insert_entity(db, "Sarah Chen")
+        bob = _insert_entity(db, "Bob Smith")
+        for i in range(4):
+            ts = (base + timedelta(days=i * 10)).isoformat()
+            _link(db, _insert_memory(db, f"Sarah {i}", created_at=ts), sarah)
+            _link(db, _insert_memory(db, f"Bob {i}", created_at=ts), bob)
+        svc.detect_patterns()
+        assert _entity(db, bob)["contact_frequency_days"] == 10.0
+
+        # Corrupt Bob's stored value; only Sarah gets a new memory
+        db.execute("UPDATE entities SET contact_frequency_days = 99 WHERE id = ?", (bob,))
+        _link(db, _insert_memory(db, "Sarah again"), sarah)
+        svc.detect_patterns()
+
+        assert _entity(db, bob)["contact_frequency_days"] == 99
+        assert _entity(db, sarah)["last_contact_at"] > base.isoformat()
+        assert len(pending_changes(db, "consolidation")) == 0
+
+    def test_untouched_entity_goes_dormant(self, db):
+        svc = _make_service(db)
+        sarah = _insert_entity(db, "Sarah Chen")
+        svc.detect_patterns()
+        db.execute(
+            "UPDATE entities SET last_contact_at = ?, contact_frequency_days = 5, contact_trend = 'stable' WHERE id = ?",
+            ((datetime.utcnow() - timedelta(days=45)).isoformat(), sarah),
+        )
+
+        svc._update_contact_velocity(entity_ids=[])
+
+        assert _entity(db, sarah)["contact_trend"] == "dormant"
+
+    def test_attention_tiers_write_only_changes(self, db):
+        svc = _make_service(db)
+        for i in range(20):
+            _insert_entity(db, f"Person {i}")
+        active = _insert_entity(db, "Active Person")
+        svc._update_attention_tiers()
+
+        db.execute(
+            "UPDATE entities SET last_contact_at = ? WHERE id = ?",
+            (datetime.utcnow().isoformat(), active),
+        )
+        before = _total_changes(db)
+        svc._update_attention_tiers()
+
+        assert _total_changes(db) - before == 1
+        assert _entity(db, active)["attention_tier"] == "active"
+
+    def test_decay_keeps_updated_at(self, db):
+        stamp = "2026-01-01T00:00:00"
+        mem = _insert_memory(db, "Stable memory", created_at=stamp)
+        sarah = _insert_entity(db, "Sarah Chen")
+        db.execute("UPDATE entities SET updated_at = ? WHERE id = ?", (stamp, sarah))
+        db.execute("UPDATE memories SET decay_ref_at = ?", (stamp,))
+
+        _make_service(db).run_decay()  # rebases the stale decay reference
+
+        row = db.execute("SELECT importance, updated_at FROM memories WHERE id = ?", (mem,), fetch=True)[0]
+        assert row["importance"] < 0.5
+        assert row["updated_at"] == stamp
+        assert _entity(db, sarah)["updated_at"] == stamp
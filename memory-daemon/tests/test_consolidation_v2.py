@@ -84,6 +84,31 @@ def test_surge_overdue(db):
     assert rows[0][0] == 1.0
 
 
+def test_surge_overdue_reanchors_decayed_full_importance(db):
+    """An overdue row stored at 1.0 with an old decay reference is surged again."""
+    svc = _make_service(db)
+    now = datetime.utcnow()
+    past_deadline = (now - timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+
+    mem_id = _insert_memory(
+        db, "Long overdue commitment",
+        memory_type="commitment",
+        importance=1.0,
+        deadline_at=past_deadline,
+    )
+    old_ref = (now - timedelta(days=60)).isoformat()
+    db.execute("UPDATE memories SET decay_ref_at = ? WHERE id = ?", (old_ref, mem_id))
+
+    result = svc._surge_approaching_deadlines()
+
+    assert result["overdue_surged"] == 1
+    rows = db.execute(
+        "SELECT importance, decay_ref_at FROM memories WHERE id = ?", (mem_id,), fetch=True
+    )
+    assert rows[0]["importance"] == 1.0
+    assert rows[0]["decay_ref_at"] > old_ref
+
+
 def test_surge_within_48h(db):
     """Commitment due tomorrow should be surged to at least 0.95."""
     svc = _make_service(db)
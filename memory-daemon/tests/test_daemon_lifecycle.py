@@ -71,7 +71,8 @@ class TestSchedulerConfiguration:
         expected = {
             "daily_decay", "pattern_detection", "full_consolidation",
             "daily_backup", "weekly_backup", "vault_sync",
-            "observation_ingest", "session_ingest",
+            "observation_ingest", "session_ingest", "chain_seal",
+            "stat_counters_reconcile",
         }
         assert job_ids == expected, (
             f"Expected jobs {expected}, got: {job_ids}"
@@ -308,3 +308,19 @@ def test_cursor_reuses_tx_connection(db):
         tx_conn = db._local.tx_conn
         with db.cursor() as cur:
             assert cur.connection is tx_conn
+
+
+def test_nested_transaction_rolls_back_inner_only(db):
+    """A transaction() inside another becomes a savepoint."""
+    with db.transaction():
+        db.insert("_meta", {"key": "tx_outer", "value": "kept"})
+        try:
+            with db.transaction():
+                db.insert("_meta", {"key": "tx_inner", "value": "dropped"})
+                raise RuntimeError("simulated error")
+        except RuntimeError:
+            pass
+        assert db.in_transaction()
+    keys = {r["key"] for r in db.execute("SELECT key FROM _meta WHERE key LIKE 'tx_%'", fetch=True)}
+    assert keys == {"tx_outer"}
+    assert not db.in_transaction()
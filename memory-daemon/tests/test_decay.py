@@ -0,0 +1,127 @@
+"""Tests for closed-form importance decay."""
+
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from claudia_memory.config import MemoryConfig
+from claudia_memory.decay import (
+    HIGH_VALUE_THRESHOLD,
+    days_since,
+    decayed,
+    effective_importance,
+    memory_importance_sql,
+)
+from claudia_memory.services.consolidate import ConsolidateService
+
+
+def _make_service(db, **overrides):
+    svc = ConsolidateService.__new__(ConsolidateService)
+    svc.db = db
+    svc.config = MemoryConfig(**overrides)
+    return svc
+
+
+def _insert_memory(db, content, importance=0.5, **extra):
+    now = datetime.utcnow().isoformat()
+    data = {
+        "content": content,
+        "content_hash": hashlib.sha256(content.encode()).hexdigest(),
+        "type": "fact",
+        "importance": importance,
+        "created_at": now,
+        "updated_at": now,
+    }
+    data.update(extra)
+    return db.insert("memories", data)
+
+
+def _ago(days):
+    return (datetime.utcnow() - timedelta(days=days, hours=1)).isoformat()
+
+
+def _memory(db, memory_id):
+    return db.execute(
+        f"SELECT m.*, {memory_importance_sql()} AS effective FROM memories m WHERE m.id = ?",
+        (memory_id,),
+        fetch=True,
+    )[0]
+
+
+class TestClosedForm:
+    def test_matches_repeated_daily_steps(self):
+        rate, floor = 0.995, 0.1
+        slow = (1 + rate) / 2
+        value = 0.95
+        for _ in range(200):
+            value = max(floor, value * (slow if value > HIGH_VALUE_THRESHOLD else rate))
+
+        # The stepwise pass switches rate on whole days, so allow a sliver
+        assert decayed(0.95, 200, rate, floor) == pytest.approx(value, rel=5e-3)
+
+    def test_floor_and_exemptions(self):
+        assert decayed(0.3, 10_000, 0.995, 0.1) == 0.1
+        assert decayed(0.05, 30, 0.995, 0.1) == 0.05
+        assert effective_importance(0.9, _ago(365), exempt=True) == 0.9
+
+    def test_whole_days_only(self):
+        now = datetime(2026, 3, 1, 12, 0)
+        assert days_since("2026-02-28T13:00:00", now) == 0
+        assert days_since("2026-02-27T12:00:00", now) == 2
+        assert days_since(None, now) == 0
+        assert isinstance(days_since(None, now), int)
+        assert isinstance(days_since("not a date", now), int)
+
+
+class TestStorage:
+    def test_insert_and_update_anchor_reference(self, db):
+        mem = _insert_memory(db, "Anchored on insert")
+        assert _memory(db, mem)["decay_ref_at"] is not None
+
+        db.execute("UPDATE memories SET decay_ref_at = ? WHERE id = ?", (_ago(30), mem))
+        assert _memory(db, mem)["effective"] < 0.5
+
+        db.execute("UPDATE memories SET importance = 0.6 WHERE id = ?", (mem,))
+        row = _memory(db, mem)
+        assert row["effective"] == 0.6
+        assert days_since(row["decay_ref_at"]) == 0
+
+    def test_rebase_preserves_effective_value(self, db):
+        mem = _insert_memory(db, "Old fact", importance=0.9)
+        sacred = _insert_memory(db, "Sacred fact", importance=0.9, lifecycle_tier="sacred")
+        db.execute("UPDATE memories SET decay_ref_at = ?", (_ago(40),))
+        before = _memory(db, mem)["effective"]
+
+        counts = _make_service(db).rebase_decay()
+
+        row = _memory(db, mem)
+        assert counts["memories"] == 1
+        assert row["importance"] == pytest.approx(before)
+        assert row["effective"] == pytest.approx(before)
+        assert _memory(db, sacred)["importance"] == 0.9
+
+    def test_rebase_covers_every_stale_row_in_batches(self, db):
+        ids = [_insert_memory(db, f"Fact {i}") for i in range(5)]
+        for age, mem in zip(range(50, 10, -8), ids):
+            db.execute("UPDATE memories SET decay_ref_at = ? WHERE id = ?", (_ago(age), mem))
+        recent = _insert_memory(db, "Recent fact", decay_ref_at=_ago(3))
+
+        counts = _make_service(db, decay_rebase_batch=2).rebase_decay()
+
+        assert counts["memories"] == 5
+        for mem in ids:
+            assert days_since(_memory(db, mem)["decay_ref_at"]) == 0
+        assert days_since(_memory(db, recent)["decay_ref_at"]) == 3
+        # Nothing left to rebase until a reference ages past the cutoff again
+        assert _make_service(db, decay_rebase_batch=2).rebase_decay()["memories"] == 0
+
+    def test_recall_filter_uses_effective_importance(self, db):
+        _insert_memory(db, "Faded memory", importance=0.15, decay_ref_at=_ago(200))
+        _insert_memory(db, "Fresh memory", importance=0.15)
+
+        rows = db.execute(
+            f"SELECT m.content FROM memories m WHERE {memory_importance_sql()} > 0.12",
+            fetch=True,
+        )
+        assert [r["content"] for r in rows] == ["Fresh memory"]
@@ -0,0 +1,179 @@
+"""Tests for batched embedding via Ollama /api/embed.
+
+Covers micro-batch packing, cache short-circuiting, deduplication, the
+per-text /api/embeddings fallback for older Ollama servers, and the
+concurrency cap on async batch calls.
+"""
+
+import asyncio
+import math
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from claudia_memory.embeddings import EmbeddingCache, EmbeddingService
+
+
+def _make_service(dims=3, batch_size=2, batch_max_chars=1000, max_concurrency=2):
+    svc = EmbeddingService.__new__(EmbeddingService)
+    svc._cache = EmbeddingCache(maxsize=100)
+    svc._available = True
+    svc.host = "http://localhost:11434"
+    svc.model = "all-minilm:l6-v2"
+    svc.dimensions = dims
+    svc.batch_size = batch_size
+    svc.batch_max_chars = batch_max_chars
+    svc.max_concurrency = max_concurrency
+    svc._batch_endpoint = None
+    svc._client = None
+    svc._sync_client = None
+    svc._model_mismatch = False
+    return svc
+
+
+def _vector_for(text, dims=3):
+    return [float(len(text))] + [0.5] * (dims - 1)
+
+
+def _unit_for(text, dims=3):
+    """_vector_for scaled to unit length, as /api/embed returns it."""
+    vector = _vector_for(text, dims)
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector]
+
+
+def _response(status, payload=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {}
+    return resp
+
+
+def _fake_ollama(calls, supports_batch=True):
+    """Return a sync post() that mimics /api/embed and /api/embeddings."""
+    def post(url, json):
+        calls.append((url, json))
+        if url.endswith("/api/embed"):
+            if not supports_batch:
+                return _response(404)
+            return _response(200, {"embeddings": [_unit_for(t) for t in json["input"]]})
+        return _response(200, {"embedding": _vector_for(json["prompt"])})
+    return post
+
+
+class TestMicroBatches:
+    def test_bounded_by_count(self):
+        svc = _make_service(batch_size=2)
+        assert svc._micro_batches(["a", "b", "c", "d", "e"]) == [["a", "b"], ["c", "d"], ["e"]]
+
+    def test_bounded_by_characters(self):
+        svc = _make_service(batch_size=10, batch_max_chars=10)
+        batches = svc._micro_batches(["aaaa", "bbbb", "cccc", "d" * 20, "e"])
+        assert batches == [["aaaa", "bbbb"], ["cccc"], ["d" * 20], ["e"]]
+
+
+class TestBatchSync:
+    def test_sends_input_arrays_to_api_embed(self):
+        svc = _make_service(batch_size=2, max_concurrency=1)
+        calls = []
+        client = MagicMock()
+        client.post.side_effect = _fake_ollama(calls)
+
+        with patch.object(svc, "_get_sync_client", return_value=client):
+            results = svc.embed_batch_sync(["one", "three", "seven"])
+
+        assert [list(r) for r in results] == [
+            pytest.approx(_unit_for(t)) for t in ["one", "three", "seven"]
+        ]
+        assert [c[0].rsplit("/", 1)[-1] for c in calls] == ["embed", "embed"]
+        assert calls[0][1]["input"] == ["one", "three"]
+        assert svc._batch_endpoint is True
+
+    def test_cached_and_duplicate_texts_not_resent(self):
+        svc = _make_service(batch_size=10)
+        svc._cache.put("cached", [9.0, 9.0, 9.0])
+        calls = []
+        client = MagicMock()
+        client.post.side_effect = _fake_ollama(calls)
+
+        with patch.object(svc, "_get_sync_client", return_value=client):
+            results = svc.embed_batch_sync(["cached", "new", "new"])
+
+        assert list(results[0]) == [9.0, 9.0, 9.0]
+        assert list(results[1]) == list(results[2]) == pytest.approx(_unit_for("new"))
+        assert len(calls) == 1
+        assert calls[0][1]["input"] == ["new"]
+
+    def test_falls_back_to_per_text_on_old_server(self):
+        svc = _make_service(batch_size=10)
+        calls = []
+        client = MagicMock()
+        client.post.side_effect = _fake_ollama(calls, supports_batch=False)
+
+        with patch.object(svc, "_get_sync_client", return_value=client):
+            first = svc.embed_batch_sync(["a", "bb"])
+            assert svc._batch_endpoint is False
+            calls.clear()
+            second = svc.embed_sync("ccc")
+
+        # /api/embeddings returns raw vectors; they come back unit length like /api/embed's
+        assert [list(r) for r in first] == [
+            pytest.approx(_unit_for("a")), pytest.approx(_unit_for("bb"))
+        ]
+        assert list(second) == pytest.approx(_unit_for("ccc"))
+        # Once detected, /api/embed is not probed again
+        assert [c[0].rsplit("/", 1)[-1] for c in calls] == ["embeddings"]
+
+    def test_wrong_dimensions_yield_none(self):
+        svc = _make_service(dims=4)
+        client = MagicMock()
+        client.post.return_value = _response(200, {"embeddings": [[1.0, 2.0]]})
+
+        with patch.object(svc, "_get_sync_client", return_value=client):
+            assert svc.embed_batch_sync(["x"]) == [None]
+
+    def test_unavailable_returns_nones(self):
+        svc = _make_service()
+        svc._available = False
+        assert svc.embed_batch_sync(["a", "b"]) == [None, None]
+
+
+class TestBatchAsync:
+    def test_concurrency_is_capped(self):
+        svc = _make_service(batch_size=1, max_concurrency=2)
+        state = {"in_flight": 0, "peak": 0}
+
+        class FakeAsyncClient:
+            async def post(self, url, json):
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                await asyncio.sleep(0.01)
+                state["in_flight"] -= 1
+                return _response(200, {"embeddings": [_unit_for(t) for t in json["input"]]})
+
+        async def get_client():
+            return FakeAsyncClient()
+
+        with patch.object(svc, "_get_client", side_effect=get_client):
+            texts = [f"text {i}" for i in range(8)]
+            results = asyncio.run(svc.embed_batch(texts))
+
+        assert all(r is not None for r in results)
+        assert state["peak"] == 2
+
+
+class TestChunkedBackfill:
+    def test_embed_in_chunks_pairs_rows_with_vectors(self):
+        from claudia_memory.__main__ import _embed_in_chunks
+
+        svc = MagicMock()
+        svc.embed_batch_sync.side_effect = lambda texts: [
+            None if t == "skip" else [1.0, 2.0] for t in texts
+        ]
+        rows = [{"id": 1, "content": "a"}, {"id": 2, "content": "skip"}, {"id": 3, "content": "c"}]
+
+        out = list(_embed_in_chunks(svc, rows, lambda r: r["content"], chunk_size=2))
+
+        assert [len(chunk) for chunk, _ in out] == [2, 1]
+        assert [pid for _, pairs in out for pid, _ in pairs] == [1, 3]
+        assert svc.embed_batch_sync.call_count == 2
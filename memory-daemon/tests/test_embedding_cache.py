@@ -22,7 +22,7 @@ class TestEmbeddingCache:
         embedding = [0.1, 0.2, 0.3]
         cache.put("hello", embedding)
         result = cache.get("hello")
-        assert result == [0.1, 0.2, 0.3]
+        assert list(result) == pytest.approx([0.1, 0.2, 0.3])
 
     def test_cache_hit_miss_counters(self):
         cache = EmbeddingCache(maxsize=10)
@@ -48,9 +48,9 @@ class TestEmbeddingCache:
         cache.put("d", [4.0])
 
         assert cache.get("a") is None  # evicted
-        assert cache.get("b") == [2.0]
-        assert cache.get("c") == [3.0]
-        assert cache.get("d") == [4.0]
+        assert list(cache.get("b")) == [2.0]
+        assert list(cache.get("c")) == [3.0]
+        assert list(cache.get("d")) == [4.0]
 
     def test_lru_access_refreshes_position(self):
         cache = EmbeddingCache(maxsize=3)
@@ -64,9 +64,9 @@ class TestEmbeddingCache:
         # Adding d should evict b (now the LRU), not a
         cache.put("d", [4.0])
 
-        assert cache.get("a") == [1.0]  # refreshed, not evicted
+        assert list(cache.get("a")) == [1.0]  # refreshed, not evicted
         assert cache.get("b") is None    # evicted
-        assert cache.get("d") == [4.0]
+        assert list(cache.get("d")) == [4.0]
 
     def test_put_existing_key_refreshes(self):
         cache = EmbeddingCache(maxsize=3)
@@ -78,7 +78,7 @@ class TestEmbeddingCache:
         cache.put("a", [1.5])
 
         cache.put("d", [4.0])  # should evict 'b', not 'a'
-        assert cache.get("a") == [1.5]
+        assert list(cache.get("a")) == [1.5]
         assert cache.get("b") is None
 
     def test_stats_reports_size(self):
@@ -105,7 +105,7 @@ class TestEmbeddingServiceCache:
         svc._sync_client = None
         svc._model_mismatch = False
 
-        fake_embedding = [0.1, 0.2, 0.3]
+        fake_embedding = [0.6, 0.8, 0.0]  # unit length, as Ollama returns it
 
         mock_client = MagicMock()
         mock_response = MagicMock()
@@ -116,12 +116,12 @@ class TestEmbeddingServiceCache:
         with patch.object(svc, '_get_sync_client', return_value=mock_client):
             # First call: hits Ollama
             result1 = svc.embed_sync("test text")
-            assert result1 == fake_embedding
+            assert list(result1) == pytest.approx(fake_embedding)
             assert mock_client.post.call_count == 1
 
             # Second call: should hit cache, not Ollama
             result2 = svc.embed_sync("test text")
-            assert result2 == fake_embedding
+            assert list(result2) == pytest.approx(fake_embedding)
             assert mock_client.post.call_count == 1  # no additional call
 
         stats = svc._cache.stats()
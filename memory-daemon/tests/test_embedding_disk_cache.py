@@ -0,0 +1,194 @@
+"""Tests for the persistent (on-disk) embedding cache tier."""
+
+import json
+import socket
+import sqlite3
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from claudia_memory.embeddings import (
+    EmbeddingCache,
+    EmbeddingService,
+    PersistentEmbeddingCache,
+)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "cache" / "embeddings.db"
+
+
+def _make_service(disk_cache, model="all-minilm:l6-v2", dims=3):
+    svc = EmbeddingService.__new__(EmbeddingService)
+    svc._cache = EmbeddingCache(maxsize=10)
+    svc._disk_cache = disk_cache
+    svc._available = True
+    svc.host = "http://localhost:11434"
+    svc.model = model
+    svc.dimensions = dims
+    svc._sync_client = None
+    svc._model_mismatch = False
+    return svc
+
+
+def _ollama_client(vector):
+    client = MagicMock()
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = {"embeddings": [vector]}
+    client.post.return_value = resp
+    return client
+
+
+class TestPersistentCache:
+    def test_survives_reopen(self, cache_path):
+        cache = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        cache.put("m", 3, "hello", [0.5, 0.25, 1.0])
+        cache.close()
+
+        reopened = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        assert list(reopened.get("m", 3, "hello")) == [0.5, 0.25, 1.0]
+        assert reopened.stats()["hits"] == 1
+        reopened.close()
+
+    def test_keyed_by_model_and_dimensions(self, cache_path):
+        cache = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        cache.put("m1", 3, "hello", [1.0, 2.0, 3.0])
+        assert cache.get("m2", 3, "hello") is None
+        assert cache.get("m1", 4, "hello") is None
+        assert cache.stats()["misses"] == 2
+        cache.close()
+
+    def test_size_based_lru_eviction(self, cache_path):
+        # Each 3-dim float32 vector is 12 bytes; cap at 5 entries
+        cache = PersistentEmbeddingCache(cache_path, max_bytes=60)
+        cache.TOUCH_INTERVAL = 0.0
+        for i in range(5):
+            cache.put("m", 3, f"t{i}", [float(i)] * 3)
+            time.sleep(0.01)
+        cache.get("m", 3, "t0")  # refresh the oldest entry
+        time.sleep(0.01)
+        for i in range(5, 8):
+            cache.put("m", 3, f"t{i}", [float(i)] * 3)
+
+        evicted = cache.evict()
+
+        stats = cache.stats()
+        assert evicted > 0
+        assert stats["bytes"] <= 60 * cache.LOW_WATER
+        assert stats["evictions"] == evicted
+        assert cache.get("m", 3, "t0") is not None  # recently used survives
+        assert cache.get("m", 3, "t1") is None       # least recently used is gone
+        cache.close()
+
+    def test_invalidate_other_models(self, cache_path):
+        cache = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        cache.put("old", 3, "a", [1.0, 1.0, 1.0])
+        cache.put("new", 3, "a", [2.0, 2.0, 2.0])
+        cache.put("new", 4, "a", [2.0, 2.0, 2.0, 2.0])
+
+        assert cache.invalidate_other_models("new", 3) == 2
+        assert cache.stats()["entries"] == 1
+        assert cache.get("new", 3, "a") is not None
+        cache.close()
+
+    def test_clears_entries_from_before_normalization(self, cache_path):
+        cache = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        cache.put("m", 3, "hello", [3.0, 4.0, 0.0])
+        cache.close()
+        conn = sqlite3.connect(str(cache_path))
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+
+        reopened = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        assert reopened.get("m", 3, "hello") is None
+        reopened.put("m", 3, "hello", [0.6, 0.8, 0.0])
+        reopened.close()
+        assert list(
+            PersistentEmbeddingCache(cache_path, max_bytes=1 << 20).get("m", 3, "hello")
+        ) == pytest.approx([0.6, 0.8, 0.0])
+
+    def test_unwritable_path_disables_quietly(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+        cache = PersistentEmbeddingCache(blocker / "embeddings.db", max_bytes=1 << 20)
+        cache.put("m", 3, "a", [1.0, 1.0, 1.0])
+        assert cache.get("m", 3, "a") is None
+        assert cache.stats()["enabled"] is False
+
+
+class TestServiceWarmStart:
+    def test_new_service_skips_ollama_for_persisted_text(self, cache_path):
+        first = _make_service(PersistentEmbeddingCache(cache_path, max_bytes=1 << 20))
+        client = _ollama_client([0.6, 0.8, 0.0])
+        with patch.object(first, "_get_sync_client", return_value=client):
+            first.embed_sync("what do I owe Sarah")
+        assert client.post.call_count == 1
+        first._disk_cache.close()
+
+        # Simulated daemon restart: empty in-process cache, same disk file
+        second = _make_service(PersistentEmbeddingCache(cache_path, max_bytes=1 << 20))
+        client2 = _ollama_client([9.0, 9.0, 9.0])
+        with patch.object(second, "_get_sync_client", return_value=client2):
+            result = second.embed_sync("what do I owe Sarah")
+
+        assert client2.post.call_count == 0
+        assert list(result) == pytest.approx([0.6, 0.8, 0.0])
+        stats = second.cache_stats()
+        assert stats["disk"]["hits"] == 1
+        assert stats["memory"]["size"] == 1  # promoted into the in-process tier
+        second._disk_cache.close()
+
+    def test_model_change_invalidates_disk_tier(self, cache_path, db):
+        disk = PersistentEmbeddingCache(cache_path, max_bytes=1 << 20)
+        disk.put("old-model:v1", 3, "a", [1.0, 1.0, 1.0])
+        db.execute(
+            "INSERT OR REPLACE INTO _meta (key, value) VALUES ('embedding_model', ?)",
+            ("old-model:v1",),
+        )
+        svc = _make_service(disk, model="new-model:v2")
+        svc._cache.put("a", [1.0, 1.0, 1.0])
+
+        with patch("claudia_memory.database.get_db", return_value=db):
+            svc._check_model_consistency()
+
+        assert svc._model_mismatch is True
+        assert disk.stats()["entries"] == 0
+        assert svc._cache.stats()["size"] == 0
+        disk.close()
+
+
+class TestStatsEndpoint:
+    def test_stats_reports_embedding_cache(self, db):
+        import http.client
+        from claudia_memory.daemon.health import HealthServer
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("localhost", 0))
+            port = s.getsockname()[1]
+
+        fake_svc = MagicMock()
+        fake_svc.cache_stats.return_value = {
+            "memory": {"hits": 3, "misses": 1, "size": 2, "maxsize": 256},
+            "disk": {"hits": 5, "misses": 2, "entries": 7},
+        }
+        server = HealthServer(port=port)
+        with patch("claudia_memory.daemon.health.get_db", return_value=db), \
+             patch("claudia_memory.daemon.health.get_embedding_service", return_value=fake_svc):
+            server.start()
+            time.sleep(0.05)
+            try:
+                conn = http.client.HTTPConnection("localhost", port, timeout=5)
+                conn.request("GET", "/stats")
+                resp = conn.getresponse()
+                data = json.loads(resp.read())
+                conn.close()
+            finally:
+                server.stop()
+
+        assert resp.status == 200
+        assert data["embedding_cache"]["disk"]["hits"] == 5
+        assert data["embedding_cache"]["memory"]["hits"] == 3
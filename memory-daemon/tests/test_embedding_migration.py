@@ -9,8 +9,10 @@ from unittest.mock import patch
 
 import pytest
 
+from claudia_memory.config import get_config
 from claudia_memory.database import Database
 from claudia_memory.embeddings import EmbeddingCache, EmbeddingService
+from claudia_memory.vector_codec import decode, encode
 
 
 def _vec0_available() -> bool:
@@ -392,6 +394,66 @@ class TestEmbeddingCacheClear:
         assert cache.get("c") is None
 
 
+class TestRenormalizeEmbeddings:
+    """Migration 28 scales stored embeddings to unit length."""
+
+    def _open_with_vectors(self, db_path, vectors):
+        database = Database(db_path)
+        database.initialize()
+        with database.connection() as conn:
+            tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master").fetchall()}
+            if "memory_embeddings" not in tables:
+                # No sqlite-vec here: a plain table with the vec0 columns stands in
+                conn.execute(
+                    "CREATE TABLE memory_embeddings (memory_id INTEGER PRIMARY KEY, embedding BLOB)"
+                )
+            for memory_id, vector in vectors.items():
+                conn.execute(
+                    "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
+                    (memory_id, encode(vector)),
+                )
+            # Pretend the database predates migration 28
+            conn.execute("DELETE FROM _meta WHERE key = 'embeddings_normalized'")
+            conn.commit()
+        database.close()
+
+    def _stored(self, database):
+        rows = database.execute("SELECT memory_id, embedding FROM memory_embeddings", fetch=True)
+        return {r["memory_id"]: list(decode(r["embedding"])) for r in rows}
+
+    def test_reopen_renormalizes_and_marks_done(self, tmp_path):
+        db_path = tmp_path / "old.db"
+        # Full-width vectors, so a real vec0 table accepts them
+        padding = [0.0] * (get_config().embedding_dimensions - 2)
+        self._open_with_vectors(db_path, {1: [3.0, 4.0] + padding, 2: [0.6, 0.8] + padding})
+
+        database = Database(db_path)
+        database.initialize()
+        try:
+            stored = self._stored(database)
+            assert stored[1] == pytest.approx([0.6, 0.8] + padding)
+            assert stored[2] == pytest.approx([0.6, 0.8] + padding)
+            assert database.execute(
+                "SELECT value FROM _meta WHERE key = 'embeddings_normalized'", fetch=True
+            )[0]["value"] == "1"
+        finally:
+            database.close()
+
+    def test_unreadable_table_is_retried_next_start(self, tmp_path):
+        database = Database(tmp_path / "deferred.db")
+        database.initialize()
+        try:
+            with database.connection() as conn:
+                conn.execute("DELETE FROM _meta WHERE key = 'embeddings_normalized'")
+                conn.execute("DROP TABLE IF EXISTS memory_embeddings")
+                # Stands in for a vec0 table whose module is not loaded
+                conn.execute("CREATE TABLE memory_embeddings (memory_id INTEGER PRIMARY KEY)")
+                database._renormalize_embeddings(conn)
+                assert database._check_migration_integrity(conn) == 27
+        finally:
+            database.close()
+
+
 class TestVec0TablesList:
     """Test the VEC0_TABLES class attribute on Database."""
 
@@ -0,0 +1,170 @@
+"""Tests for the Aho-Corasick entity name matcher used by recall and ingest."""
+
+import random
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from claudia_memory.daemon.scheduler import _is_relevant_observation
+from claudia_memory.services.entity_matcher import ALIAS, NAME, EntityMatcher, get_entity_matcher
+
+
+def _insert_entity(db, name, importance=1.0, entity_type="person"):
+    return db.insert(
+        "entities",
+        {"name": name, "type": entity_type, "canonical_name": name.lower(), "importance": importance},
+    )
+
+
+def _insert_alias(db, entity_id, alias):
+    return db.insert(
+        "entity_aliases",
+        {"entity_id": entity_id, "alias": alias, "canonical_alias": alias.lower()},
+    )
+
+
+@pytest.fixture
+def remember(db, monkeypatch):
+    from claudia_memory.extraction.entity_extractor import get_extractor
+    from claudia_memory.services import remember as remember_mod
+
+    monkeypatch.setattr(remember_mod, "embed_sync", lambda _text: None)
+    monkeypatch.setattr(remember_mod.RememberService, "_vault_write_through", lambda self, names: None)
+    svc = remember_mod.RememberService.__new__(remember_mod.RememberService)
+    svc.db = db
+    svc.extractor = get_extractor()
+    svc.embedding_service = None
+    return svc
+
+
+@pytest.fixture
+def recall(db):
+    from claudia_memory.services.recall import RecallService
+
+    svc = RecallService.__new__(RecallService)
+    svc.db = db
+    return svc
+
+
+class TestMatching:
+    def test_whole_word_and_overlapping_names(self, db):
+        sarah = _insert_entity(db, "Sarah")
+        sarah_chen = _insert_entity(db, "Sarah Chen")
+        tom = _insert_entity(db, "Tom")
+        matcher = EntityMatcher(db)
+
+        assert matcher.find("Lunch with Sarah Chen tomorrow") == {sarah: NAME, sarah_chen: NAME}
+        assert matcher.find("customization at the bottom") == {}
+        assert matcher.find("review tom's draft") == {tom: NAME}
+
+    def test_agrees_with_per_entity_regex(self, db):
+        rng = random.Random(3)
+        words = ["al", "bo", "cal", "al bo", "bo-cal", "x_y", "acme inc.", "o'neil"]
+        ids = {w: _insert_entity(db, w) for w in words}
+        matcher = EntityMatcher(db)
+
+        tokens = words + ["a", "calm", "bob", "x", "y", " ", ",", "-", "_", "."]
+        for _ in range(300):
+            text = " ".join(rng.choice(tokens) for _ in range(rng.randint(1, 8)))
+            expected = {
+                ids[w] for w in words
+                if re.search(r"\b" + re.escape(w) + r"\b", text.lower())
+            }
+            assert set(matcher.find(text)) == expected, text
+
+    def test_name_outranks_alias(self, db):
+        acme = _insert_entity(db, "Acme", entity_type="organization")
+        other = _insert_entity(db, "Acme Holdings", entity_type="organization")
+        _insert_alias(db, other, "acme")
+        matcher = EntityMatcher(db)
+
+        assert matcher.find("acme") == {acme: NAME, other: ALIAS}
+
+    def test_picks_up_rows_from_other_writers(self, db):
+        matcher = EntityMatcher(db)
+        assert matcher.find("ping Priya") == {}
+
+        priya = _insert_entity(db, "Priya")
+        _insert_alias(db, priya, "PK")
+        assert matcher.find("ping Priya") == {priya: NAME}
+        assert matcher.find("ask pk") == {priya: ALIAS}
+
+
+class TestIncrementalUpdates:
+    def test_remember_entity_and_aliases(self, db, remember):
+        matcher = get_entity_matcher(db)
+        matcher.find("warm up")  # build before the writes
+        eid = remember.remember_entity("Jordan Lee", entity_type="person", aliases=["JL"])
+        assert matcher.find("call Jordan Lee and jl") == {eid: NAME}
+        assert matcher.stats()["patterns"] == 2
+
+    def test_merge_moves_names_to_target(self, db, remember):
+        source = remember.remember_entity("Bob Smith", entity_type="person", aliases=["Bobby"])
+        target = remember.remember_entity("Robert Smith", entity_type="person")
+        matcher = get_entity_matcher(db)
+        matcher.find("warm up")
+
+        remember.merge_entities(source, target)
+
+        assert matcher.find("Bob Smith") == {target: ALIAS}
+        assert matcher.find("bobby") == {target: ALIAS}
+        assert source not in matcher.find("robert smith and bob smith")
+
+    def test_delete_removes_entity(self, db, remember):
+        eid = remember.remember_entity("Dana", entity_type="person")
+        matcher = get_entity_matcher(db)
+        assert matcher.find("Dana") == {eid: NAME}
+
+        remember.delete_entity(eid)
+        assert matcher.find("Dana") == {}
+
+
+class TestCallers:
+    def test_recall_prefers_names_and_skips_low_importance(self, db, recall):
+        faded = _insert_entity(db, "Morgan", importance=0.01)
+        org = _insert_entity(db, "Northwind", entity_type="organization")
+        _insert_alias(db, org, "NW")
+
+        assert recall._resolve_entities_from_text("Morgan at Northwind") == [org]
+        assert recall._resolve_entities_from_text("Morgan") == []
+        assert recall._resolve_entities_from_text("the nw deal") == [org]
+        assert faded not in recall._resolve_entities_from_text("nw and morgan")
+
+    def test_observation_relevance_uses_matcher(self, db):
+        _insert_entity(db, "Tom")
+        config = SimpleNamespace(
+            observation_capture_all=False,
+            observation_relevant_tools=[],
+            observation_relevant_paths=[],
+        )
+        matcher = get_entity_matcher(db)
+
+        assert _is_relevant_observation({"tool": "Bash", "input": "ssh Tom"}, config, matcher)
+        assert not _is_relevant_observation({"tool": "Bash", "input": "ls bottom/"}, config, matcher)
+
+
+def test_matcher_skips_entities_from_rolled_back_writes(db):
+    """A rolled-back entity never reaches the matcher (its id may be reused)."""
+    from claudia_memory.extraction.entity_extractor import get_extractor
+    from claudia_memory.services.entity_matcher import get_entity_matcher
+    from claudia_memory.services.remember import RememberService
+
+    svc = RememberService.__new__(RememberService)
+    svc.db = db
+    svc.extractor = get_extractor()
+    matcher = get_entity_matcher(db)
+    assert matcher.find("Nobody known yet") == {}  # Build before writing
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            svc.remember_entity("Phantom Person", entity_type="person", aliases=["Phanto"],
+                                _precomputed_embedding=[0.0])
+            matcher.find("Phantom Person")  # A refresh must not read the uncommitted row
+            raise RuntimeError("write lane call failed")
+    assert matcher.find("I met Phantom Person and Phanto") == {}
+
+    with db.transaction():
+        entity_id = svc.remember_entity("Real Person", entity_type="person",
+                                        _precomputed_embedding=[0.0])
+    assert entity_id in matcher.find("I met Real Person")
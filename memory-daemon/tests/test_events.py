@@ -0,0 +1,138 @@
+"""Tests for the in-process event bus and the /events stream pieces."""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from claudia_memory.daemon.stream import AuditTail, format_jsonl, format_sse, pump
+from claudia_memory.events import EventBus
+from claudia_memory.services.audit import AuditService
+
+
+class TestEventBus:
+    def test_subscribers_receive_events_in_order(self):
+        bus = EventBus()
+        with bus.subscribe() as sub:
+            bus.publish("job", job="daily_decay", ok=True)
+            bus.publish("tool", tool="memory_recall")
+            events = sub.get(timeout=0)
+        assert [e["type"] for e in events] == ["job", "tool"]
+        assert events[0]["data"] == {"job": "daily_decay", "ok": True}
+        assert events[1]["id"] == events[0]["id"] + 1
+        assert bus.subscriber_count() == 0
+
+    def test_slow_subscriber_drops_oldest(self):
+        bus = EventBus()
+        sub = bus.subscribe(maxsize=2)
+        for i in range(5):
+            bus.publish("tool", n=i)
+        assert [e["data"]["n"] for e in sub.get(timeout=0)] == [3, 4]
+        assert sub.dropped == 3
+
+    def test_subscribe_after_replays_history(self):
+        bus = EventBus(history=3)
+        first = bus.publish("job", n=0)
+        for i in range(1, 5):
+            bus.publish("job", n=i)
+        sub = bus.subscribe(after=first["id"] + 2)
+        assert [e["data"]["n"] for e in sub.get(timeout=0)] == [3, 4]
+
+    def test_publish_audit_maps_operations_and_dedupes(self):
+        bus = EventBus()
+        sub = bus.subscribe()
+        bus.publish_audit(7, "mem_create", memory_id=1)
+        bus.publish_audit(7, "mem_create", memory_id=1)
+        bus.publish_audit(8, "recall")
+        bus.publish_audit(9, "relate")
+        bus.publish_audit(10, "sync")
+        assert [e["type"] for e in sub.get(timeout=0)] == ["write", "read", "link", "audit"]
+
+    def test_audit_service_publishes(self, db, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr("claudia_memory.services.audit.get_event_bus", lambda: bus)
+        service = AuditService.__new__(AuditService)
+        service.db = db
+        sub = bus.subscribe()
+        entry_id = service.log("mem_create", memory_id=3)
+        (event,) = sub.get(timeout=0)
+        assert event["type"] == "write"
+        assert event["data"]["audit_id"] == entry_id
+        assert event["data"]["memory_id"] == 3
+
+    def test_rolled_back_audit_is_not_published(self, db, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr("claudia_memory.services.audit.get_event_bus", lambda: bus)
+        service = AuditService.__new__(AuditService)
+        service.db = db
+        sub = bus.subscribe()
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                service.log("mem_create", memory_id=1)
+                raise RuntimeError("boom")
+        assert sub.get(timeout=0) == []
+        # The committed entry reuses the rolled-back id and must still go out
+        entry_id = service.log("mem_create", memory_id=2)
+        (event,) = sub.get(timeout=0)
+        assert event["data"]["audit_id"] == entry_id
+        assert event["data"]["memory_id"] == 2
+
+
+class TestStreamFormat:
+    def test_sse_and_jsonl(self):
+        event = {"id": 4, "type": "write", "time": "t", "data": {"operation": "mem_create"}}
+        sse = format_sse(event)
+        assert sse.startswith("id: 4\nevent: write\ndata: ")
+        assert sse.endswith("\n\n")
+        assert json.loads(format_jsonl(event)) == event
+        assert not format_sse({"type": "dropped", "data": {"count": 2}}).startswith("id:")
+
+    def test_pump_filters_types_and_stops_on_disconnect(self):
+        bus = EventBus()
+        sub = bus.subscribe()
+        bus.publish("tool", tool="memory_recall")
+        bus.publish("job", job="daily_decay")
+        written = []
+
+        def write(chunk):
+            written.append(chunk)
+            raise BrokenPipeError
+
+        pump(write, sub, format_jsonl, threading.Event(), types={"job"})
+        (line,) = written
+        assert json.loads(line)["type"] == "job"
+
+
+class TestAuditTail:
+    def _audit(self, db, operation):
+        return db.insert("audit_log", {"timestamp": "2026-01-01T00:00:00", "operation": operation})
+
+    def test_publishes_rows_committed_by_other_connections(self, db):
+        bus = EventBus()
+        tail = AuditTail(db.db_path, bus=bus)
+        self._audit(db, "recall")
+
+        assert tail.poll() == 0  # Nobody subscribed: no queries
+        sub = bus.subscribe()
+        assert tail.poll() == 0  # First poll starts from the head
+        assert tail.poll() == 0  # Nothing committed since
+
+        audit_id = self._audit(db, "mem_create")
+        assert tail.poll() == 1
+        (event,) = sub.get(timeout=0)
+        assert event["type"] == "write"
+        assert event["data"]["audit_id"] == audit_id
+
+        # Already published in-process: the tail does not repeat it
+        bus.publish_audit(audit_id + 1, "relate")
+        self._audit(db, "relate")
+        assert tail.poll() == 1
+        assert [e["type"] for e in sub.get(timeout=0)] == ["link"]
+
+    def test_missing_database_raises_sqlite_error(self, tmp_path):
+        bus = EventBus()
+        tail = AuditTail(tmp_path / "missing.db", bus=bus)
+        bus.subscribe()
+        with pytest.raises(sqlite3.Error):
+            tail.poll()
@@ -0,0 +1,64 @@
+"""Tests for the OpenMetrics exposition served on /metrics."""
+
+import re
+
+from claudia_memory.daemon import exporter
+from claudia_memory.metrics import MetricsRegistry
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? -?[0-9.e+\-]+$|^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? \+?Inf$')
+
+
+def _samples(text):
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+class TestRender:
+    def test_histograms_and_counters(self, db):
+        registry = MetricsRegistry()
+        for ms in (0.8, 3.0, 40.0, 40.0, 2000.0):
+            registry.observe("mcp.tool", ms, tool="memory_recall", lane="read")
+        registry.incr("scheduler.job_missed", job="daily_decay")
+
+        text = exporter.render(db, registry)
+
+        assert "# TYPE claudia_mcp_tool_seconds histogram" in text
+        assert "# UNIT claudia_mcp_tool_seconds seconds" in text
+        assert 'claudia_mcp_tool_seconds_bucket{lane="read",tool="memory_recall",le="0.001"} 1' in text
+        assert 'claudia_mcp_tool_seconds_bucket{lane="read",tool="memory_recall",le="0.05"} 4' in text
+        assert 'claudia_mcp_tool_seconds_bucket{lane="read",tool="memory_recall",le="+Inf"} 5' in text
+        assert 'claudia_mcp_tool_seconds_count{lane="read",tool="memory_recall"} 5' in text
+        assert "# TYPE claudia_scheduler_job_missed counter" in text
+        assert 'claudia_scheduler_job_missed_total{job="daily_decay"} 1' in text
+        assert text.endswith("# EOF\n")
+        for line in _samples(text):
+            assert SAMPLE.match(line), line
+
+    def test_sqlite_and_row_gauges(self, db):
+        db.execute("INSERT INTO entities (name, type, canonical_name) VALUES ('Sarah', 'person', 'sarah')")
+
+        text = exporter.render(db, MetricsRegistry())
+
+        assert re.search(r"^claudia_sqlite_wal_bytes \d+$", text, re.M)
+        assert re.search(r"^claudia_sqlite_checkpoint_lag_frames \d+$", text, re.M)
+        assert re.search(r"^claudia_sqlite_cache_size_bytes \d+$", text, re.M)
+        assert 'claudia_rows{table="entities"} 1' in text
+
+    def test_label_values_are_escaped(self, db):
+        registry = MetricsRegistry()
+        registry.incr("odd", tool='say "hi"\n')
+        assert 'claudia_odd_total{tool="say \\"hi\\"\\n"} 1' in exporter.render(db, registry)
+
+
+class TestRowCounts:
+    def test_read_from_stat_counters(self, db, monkeypatch):
+        db.execute("INSERT INTO entities (name, type, canonical_name) VALUES ('Sarah', 'person', 'sarah')")
+        db.execute("INSERT INTO memories (content, content_hash, type) VALUES ('x', 'h', 'fact')")
+
+        calls = []
+        original = db.execute
+        monkeypatch.setattr(db, "execute", lambda sql, *a, **k: calls.append(sql) or original(sql, *a, **k))
+        text = exporter.render(db, MetricsRegistry())
+
+        assert not any("COUNT(*)" in sql for sql in calls)
+        assert 'claudia_rows{table="entities"} 1' in text
+        assert 'claudia_live_memories{type="fact"} 1' in text
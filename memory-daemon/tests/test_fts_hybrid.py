@@ -206,3 +206,100 @@ def test_fts5_update_sync():
         assert len(rows) == 1
     finally:
         db.close()
+
+
+def _fts_triggers(db):
+    rows = db.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND sql LIKE '%memories_fts%'",
+        fetch=True,
+    )
+    return sorted(r["name"] for r in rows)
+
+
+@requires_fts5
+def test_fts5_triggers_are_content_only():
+    """Only a content change reindexes; other column updates leave FTS alone."""
+    db, _ = _make_db()
+    try:
+        assert _fts_triggers(db) == [
+            "memories_fts_delete", "memories_fts_insert", "memories_fts_update",
+        ]
+        sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'memories_fts_update'", fetch=True
+        )[0]["sql"]
+        assert "UPDATE OF content" in sql
+    finally:
+        db.close()
+
+
+@requires_fts5
+def test_migration_22_drops_legacy_triggers():
+    """Databases with the old every-update trigger set are cleaned and rebuilt."""
+    db, tmpdir = _make_db()
+    try:
+        mid = _insert_memory(db, "Budget review with finance")
+        db.execute(
+            """CREATE TRIGGER memories_ai AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END"""
+        )
+        db.execute(
+            """CREATE TRIGGER memories_au AFTER UPDATE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+            END"""
+        )
+        db.execute("DELETE FROM schema_migrations WHERE version >= 22")
+        db.close()
+
+        db = Database(Path(tmpdir) / "test.db")
+        db.initialize()
+
+        assert "memories_ai" not in _fts_triggers(db)
+        assert "memories_au" not in _fts_triggers(db)
+        db.update("memories", {"importance": 0.3}, "id = ?", (mid,))
+        rows = db.execute(
+            "SELECT rowid FROM memories_fts WHERE memories_fts MATCH 'budget'", fetch=True
+        )
+        assert [r["rowid"] for r in rows] == [mid]
+        check = db.execute(
+            "INSERT INTO memories_fts(memories_fts, rank) VALUES ('integrity-check', 1)"
+        )
+        assert check is None or check == []
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("what's Sarah's email?", '"s" OR "sarah" OR "email"'),
+        ("C++ vs. Rust", '"c" OR "vs" OR "rust"'),
+        ('NOT "urgent" AND', '"not" OR "urgent"'),
+        ("the of", '"the" OR "of"'),
+        ("?!  ...", None),
+    ],
+)
+def test_compile_fts_query(text, expected):
+    from claudia_memory.services.recall import compile_fts_query
+
+    assert compile_fts_query(text) == expected
+
+
+@requires_fts5
+def test_punctuated_query_uses_fts():
+    """Raw user text with FTS5 syntax characters still goes through the index."""
+    from claudia_memory.services.recall import RecallService
+
+    db, _ = _make_db()
+    try:
+        mid = _insert_memory(db, "Sarah loves chocolate desserts")
+        svc = RecallService.__new__(RecallService)
+        svc.db = db
+
+        scores = svc._fts_search("what's Sarah's favourite dessert?", limit=10)
+        assert list(scores) == [mid]
+        rows = svc._keyword_search('"chocolate" (NEAR', limit=10)
+        assert [r["id"] for r in rows] == [mid]
+    finally:
+        db.close()
@@ -0,0 +1,200 @@
+"""Tests for the trigram-blocked fuzzy entity name index."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from claudia_memory.services.fuzzy_index import FuzzyNameIndex, get_fuzzy_index
+
+
+def _insert_entity(db, name, entity_type="person", importance=1.0):
+    return db.insert(
+        "entities",
+        {"name": name, "type": entity_type, "canonical_name": name.lower(), "importance": importance},
+    )
+
+
+def _insert_alias(db, entity_id, alias):
+    return db.insert(
+        "entity_aliases",
+        {"entity_id": entity_id, "alias": alias, "canonical_alias": alias.lower()},
+    )
+
+
+def _random_names(rng, count):
+    names = set()
+    while len(names) < count:
+        base = "".join(rng.choice("abcdeo") for _ in range(rng.randint(3, 10)))
+        names.add(base)
+        # Near variants so there is something to find
+        if len(base) > 4 and rng.random() < 0.5:
+            i = rng.randrange(len(base))
+            names.add(base[:i] + rng.choice("abcdeo") + base[i + 1:])
+    return sorted(names)
+
+
+@pytest.fixture
+def remember(db, monkeypatch):
+    from claudia_memory.extraction.entity_extractor import get_extractor
+    from claudia_memory.services import remember as remember_mod
+
+    monkeypatch.setattr(remember_mod, "embed_sync", lambda _text: None)
+    monkeypatch.setattr(remember_mod.RememberService, "_vault_write_through", lambda self, names: None)
+    svc = remember_mod.RememberService.__new__(remember_mod.RememberService)
+    svc.db = db
+    svc.extractor = get_extractor()
+    svc.embedding_service = None
+    return svc
+
+
+@pytest.fixture
+def recall(db):
+    from claudia_memory.services.recall import RecallService
+
+    svc = RecallService.__new__(RecallService)
+    svc.db = db
+    return svc
+
+
+class TestCandidates:
+    @pytest.mark.parametrize("threshold", [0.8, 0.85, 0.9])
+    def test_pairs_cover_brute_force(self, db, threshold):
+        rng = random.Random(11)
+        names = _random_names(rng, 120)
+        ids = {_insert_entity(db, n): n for n in names}
+        index = FuzzyNameIndex(db)
+
+        expected = {
+            (a, b)
+            for a in ids for b in ids
+            if a < b and SequenceMatcher(None, ids[a], ids[b]).ratio() >= threshold
+        }
+        pairs = set(index.candidate_pairs(threshold))
+
+        assert expected <= pairs
+        # Blocking must actually prune
+        assert len(pairs) < len(ids) * (len(ids) - 1) // 2
+
+    def test_same_type_only(self, db):
+        person = _insert_entity(db, "Acme Corp", entity_type="person")
+        org = _insert_entity(db, "Acme Corp.", entity_type="organization")
+        index = FuzzyNameIndex(db)
+
+        assert list(index.candidate_pairs(0.85)) == []
+        assert index.candidates("acme corp", "organization", 0.85) == [org]
+        assert index.candidates("acme corp", "person", 0.85) == [person]
+
+    def test_entity_type_filter(self, db):
+        a = _insert_entity(db, "Sarah Chen")
+        b = _insert_entity(db, "Sarah Chen.")
+        _insert_entity(db, "Acme Corp", entity_type="organization")
+        _insert_entity(db, "Acme Corp.", entity_type="organization")
+        index = FuzzyNameIndex(db)
+
+        assert list(index.candidate_pairs(0.85, "person")) == [(a, b)]
+
+    def test_length_filter_drops_unreachable(self, db):
+        _insert_entity(db, "Al")
+        long_id = _insert_entity(db, "Alexandra Montgomery")
+        index = FuzzyNameIndex(db)
+
+        assert long_id not in index.candidates("al", "person", 0.9)
+
+
+class TestMaintenance:
+    def test_catches_up_with_other_writers(self, db):
+        index = get_fuzzy_index(db)
+        assert index.candidates("sarah chen", "person", 0.9) == []
+
+        sarah = _insert_entity(db, "Sarah Chen")
+        _insert_entity(db, "Sarah Chan")
+        index.stats()
+
+        assert sarah in index.candidates("sarah chen", "person", 0.9)
+
+    def test_remove_entity(self, db):
+        a = _insert_entity(db, "Sarah Chen")
+        b = _insert_entity(db, "Sarah Chen.")
+        _insert_alias(db, a, "Sarah")
+        _insert_alias(db, b, "Sarah")
+        index = get_fuzzy_index(db)
+        assert index.shared_aliases() == {"sarah": {a, b}}
+
+        index.remove_entity(b)
+
+        assert list(index.candidate_pairs(0.85)) == []
+        assert index.shared_aliases() == {}
+
+    def test_remember_write_path_keeps_index_current(self, db, remember):
+        index = get_fuzzy_index(db)
+        index.stats()
+        first = remember.remember_entity("Jonathan Smithers", "person")
+
+        assert first in index.candidates("jonathan smithers", "person", 0.9)
+        # A near-typo resolves to the existing entity through the shortlist
+        assert remember._fuzzy_find_entity("jonathan smither", "person") == first
+
+    def test_rolled_back_entity_leaves_no_candidates(self, db, remember):
+        index = get_fuzzy_index(db)
+        index.stats()
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                remember.remember_entity("Jonathan Smithers", "person", aliases=["Jonny S"])
+                index.candidates("jonathan smithers", "person", 0.9)
+                raise RuntimeError("write lane call failed")
+
+        assert index.candidates("jonathan smithers", "person", 0.9) == []
+        assert index.shared_aliases() == {}
+        assert list(index.candidate_pairs(0.85)) == []
+
+    def test_similar_names_spans_types(self, db):
+        _insert_entity(db, "Acme Corp", entity_type="organization")
+        _insert_entity(db, "Acme Corp.", entity_type="project")
+        _insert_entity(db, "Sarah Chen")
+        index = FuzzyNameIndex(db)
+
+        assert index.similar_names("acme corp", 0.85) == ["acme corp", "acme corp."]
+
+    def test_delete_entity_removes_postings(self, db, remember):
+        a = _insert_entity(db, "Jonathan Smithers")
+        index = get_fuzzy_index(db)
+        assert index.candidates("jonathan smithers", "person", 0.9) == [a]
+
+        remember.delete_entity(a, reason="test")
+
+        assert index.candidates("jonathan smithers", "person", 0.9) == []
+
+
+class TestFindDuplicates:
+    def test_matches_all_pairs_scan(self, db, recall):
+        rng = random.Random(5)
+        names = _random_names(rng, 80)
+        rows = {_insert_entity(db, n): n for n in names}
+
+        expected = {
+            (a, b)
+            for a in rows for b in rows
+            if a < b and recall._name_similarity(rows[a], rows[b]) >= 0.85
+        }
+        found = {
+            (d["entity_1"]["id"], d["entity_2"]["id"])
+            for d in recall.find_duplicate_entities(threshold=0.85, limit=10_000)
+        }
+
+        assert found == expected
+
+    def test_limit_keeps_most_similar(self, db, recall):
+        _insert_entity(db, "Sarah Chen")
+        _insert_entity(db, "Sarah Chen.")
+        _insert_entity(db, "Jonathan Smithers")
+        _insert_entity(db, "Jonathan Smithrs")
+
+        dupes = recall.find_duplicate_entities(threshold=0.85, limit=1)
+
+        assert len(dupes) == 1
+        assert dupes[0]["similarity"] == max(
+            recall._name_similarity("sarah chen", "sarah chen."),
+            recall._name_similarity("jonathan smithers", "jonathan smithrs"),
+        )
@@ -0,0 +1,191 @@
+"""Tests for the in-memory relationship adjacency index."""
+
+import random
+from collections import deque
+
+import pytest
+
+from claudia_memory.services.graph_index import GraphIndex, get_graph_index
+
+
+def _insert_entity(db, name, importance=1.0, entity_type="person"):
+    return db.insert(
+        "entities",
+        {"name": name, "type": entity_type, "canonical_name": name.lower(), "importance": importance},
+    )
+
+
+def _relate(db, src, tgt, rel_type="works_with", strength=1.0):
+    return db.insert(
+        "relationships",
+        {
+            "source_entity_id": src,
+            "target_entity_id": tgt,
+            "relationship_type": rel_type,
+            "strength": strength,
+        },
+    )
+
+
+def _bfs_distance(edges, a, b):
+    adj = {}
+    for s, t in edges:
+        adj.setdefault(s, set()).add(t)
+        adj.setdefault(t, set()).add(s)
+    dist = {a: 0}
+    queue = deque([a])
+    while queue:
+        node = queue.popleft()
+        for n in adj.get(node, ()):
+            if n not in dist:
+                dist[n] = dist[node] + 1
+                queue.append(n)
+    return dist.get(b)
+
+
+@pytest.fixture
+def remember(db, monkeypatch):
+    from claudia_memory.extraction.entity_extractor import get_extractor
+    from claudia_memory.services import remember as remember_mod
+
+    monkeypatch.setattr(remember_mod, "embed_sync", lambda _text: None)
+    monkeypatch.setattr(remember_mod.RememberService, "_vault_write_through", lambda self, names: None)
+    svc = remember_mod.RememberService.__new__(remember_mod.RememberService)
+    svc.db = db
+    svc.extractor = get_extractor()
+    svc.embedding_service = None
+    return svc
+
+
+class TestTraversal:
+    def test_neighbors_filter_weak_and_invalid(self, db):
+        a, b, c, d = (_insert_entity(db, n) for n in "ABCD")
+        _relate(db, a, b, strength=0.9)
+        _relate(db, c, a, strength=0.5)
+        _relate(db, a, d, strength=0.05)
+        invalid = _relate(db, a, d, rel_type="knows", strength=0.8)
+        db.execute("UPDATE relationships SET invalid_at = datetime('now') WHERE id = ?", (invalid,))
+        index = GraphIndex(db)
+
+        links = index.neighbors(a)
+        assert [(n.entity_id, n.forward) for n in links] == [(b, True), (c, False)]
+        assert {n.entity_id for n in index.neighbors(a, valid_only=False)} == {b, c, d}
+
+    def test_shortest_path_matches_plain_bfs(self, db):
+        rng = random.Random(5)
+        ids = [_insert_entity(db, f"E{i}") for i in range(40)]
+        edges = set()
+        while len(edges) < 60:
+            s, t = rng.sample(ids, 2)
+            if (t, s) not in edges:
+                edges.add((s, t))
+        for s, t in edges:
+            _relate(db, s, t)
+        index = GraphIndex(db)
+
+        for _ in range(50):
+            a, b = rng.sample(ids, 2)
+            expected = _bfs_distance(edges, a, b)
+            path = index.shortest_path(a, b, max_depth=6)
+            if expected is None or expected > 6:
+                assert path is None
+                continue
+            assert len(path) - 1 == expected
+            assert path[0] == (a, None) and path[-1][0] == b
+            for (prev, _), (node, link) in zip(path, path[1:]):
+                pair = (prev, node) if link.forward else (node, prev)
+                assert pair in edges
+
+    def test_degree_ranking(self, db):
+        hub, x, y, z = (_insert_entity(db, n) for n in ("Hub", "X", "Y", "Z"))
+        for other in (x, y, z):
+            _relate(db, hub, other)
+        _relate(db, x, y)
+        index = GraphIndex(db)
+
+        assert index.degree_ranking(min_degree=2)[0] == (hub, 3)
+        assert dict(index.degree_ranking())[z] == 1
+
+    def test_weighted_expansion_uses_node_filter(self, db):
+        a, b, c, faded = (_insert_entity(db, n) for n in ("A", "B", "C", "Faded"))
+        _relate(db, a, b, strength=0.8)
+        _relate(db, b, c, strength=0.5)
+        _relate(db, a, faded, strength=1.0)
+        index = GraphIndex(db)
+        calls = []
+
+        def node_info(ids):
+            calls.append(set(ids))
+            return {i: {"importance": 1.0} for i in ids if i != faded}
+
+        result = index.expand_weighted(a, node_info, depth=2)
+        assert [(r["id"], r["distance"]) for r in result] == [(b, 1), (c, 2)]
+        assert result[1]["path_strength"] == pytest.approx(0.4)
+        assert len(calls) == 2  # one batched lookup per hop
+
+
+class TestSync:
+    def test_relate_and_invalidate_update_index(self, db, remember):
+        index = get_graph_index(db)
+        ana = remember.remember_entity("Ana", entity_type="person")
+        assert index.neighbors(ana) == []  # builds the index before the writes
+
+        rel_id = remember.relate_entities("Ana", "Ben", "works_with", strength=0.6)
+        ben = db.get_one("entities", where="canonical_name = ?", where_params=("ben",))["id"]
+        assert [n.rel_id for n in index.neighbors(ben)] == [rel_id]
+
+        remember.invalidate_relationship("Ana", "Ben", "works_with")
+        assert index.neighbors(ben) == []
+
+    def test_merge_repoints_relationships(self, db, remember):
+        remember.relate_entities("Bob Smith", "Acme Co", "works_at")
+        index = get_graph_index(db)
+        source = db.get_one("entities", where="canonical_name = ?", where_params=("bob smith",))["id"]
+        acme = db.get_one("entities", where="canonical_name = ?", where_params=("acme co",))["id"]
+        target = remember.remember_entity("Robert Smith", entity_type="person")
+        assert [n.entity_id for n in index.neighbors(acme)] == [source]
+
+        remember.merge_entities(source, target)
+
+        assert [n.entity_id for n in index.neighbors(acme)] == [target]
+        assert index.neighbors(source) == []
+
+    def test_rolled_back_writes_leave_no_edges(self, db, remember):
+        index = get_graph_index(db)
+        ana = remember.remember_entity("Ana", entity_type="person")
+        ben = remember.remember_entity("Ben", entity_type="person")
+        kept = remember.relate_entities("Ana", "Ben", "works_with", strength=0.6)
+        assert [n.rel_id for n in index.neighbors(ana)] == [kept]
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                remember.relate_entities("Ana", "Cleo", "knows", strength=0.9)
+                remember.invalidate_relationship("Ana", "Ben", "works_with")
+                index.neighbors(ana)  # A refresh must not read the uncommitted rows
+                raise RuntimeError("write lane call failed")
+
+        assert [n.rel_id for n in index.neighbors(ana)] == [kept]
+        assert [n.entity_id for n in index.neighbors(ben)] == [ana]
+
+    def test_rows_from_other_writers_and_decay(self, db):
+        from datetime import datetime, timedelta
+
+        from claudia_memory.config import MemoryConfig
+        from claudia_memory.services.consolidate import ConsolidateService
+
+        a, b, c = (_insert_entity(db, n) for n in "ABC")
+        _relate(db, a, b, strength=0.2)
+        index = get_graph_index(db)
+        assert len(index.neighbors(a)) == 1
+
+        _relate(db, a, c, strength=0.9)
+        assert {n.entity_id for n in index.neighbors(a)} == {b, c}
+
+        svc = ConsolidateService.__new__(ConsolidateService)
+        svc.db = db
+        svc.config = MemoryConfig()
+        long_ago = (datetime.utcnow() - timedelta(days=400)).isoformat()
+        db.execute("UPDATE relationships SET decay_ref_at = ?", (long_ago,))
+        svc.run_decay()
+        # 0.2 * 0.995 ** 400 falls under the traversal threshold
+        assert [n.entity_id for n in index.neighbors(a)] == [c]
@@ -1267,6 +1267,53 @@ class TestPatternDetection:
         finally:
             db.close()
 
+    def test_inferred_connections_match_pairwise_inference(self):
+        """Indexed detection classifies each unlinked pair as infer_connections does."""
+        db, tmpdir = _make_db()
+        try:
+            svc = _make_consolidate(db)
+
+            metas = [
+                {"company": "Acme", "industries": ["tech"], "geography": {"city": "Miami"}},
+                {"company": "acme", "communities": ["YPO"]},
+                {"communities": ["ypo"], "industries": ["Tech"], "geography": {"city": "miami"}},
+                {"industries": ["tech"], "geography": {"city": "Austin"}},
+                {"industries": ["law"]},
+            ]
+            ids = [_insert_entity(db, f"P{i}", importance=0.5, metadata=m) for i, m in enumerate(metas)]
+            _relate(db, ids[2], ids[0])
+
+            found = {
+                p.name: p.evidence[0].rsplit(": ", 1)[1]
+                for p in svc.detect_inferred_connections()
+            }
+            expected = {}
+            for i, a in enumerate(ids):
+                for b in ids[i + 1:]:
+                    inference = svc.infer_connections(a, b)
+                    if inference and (a, b) != (ids[0], ids[2]):
+                        expected[f"inferred_connection_{a}_{b}"] = inference[0]
+            assert found == expected
+            assert f"inferred_connection_{ids[0]}_{ids[2]}" not in found
+        finally:
+            db.close()
+
+    def test_inferred_connections_beyond_top_hundred(self):
+        """People outside the 100 most important are still paired."""
+        db, tmpdir = _make_db()
+        try:
+            svc = _make_consolidate(db)
+
+            for i in range(150):
+                _insert_entity(db, f"Filler{i}", importance=0.9, metadata={"company": f"Co{i}"})
+            a = _insert_entity(db, "Alice", importance=0.5, metadata={"company": "Globex"})
+            b = _insert_entity(db, "Bob", importance=0.5, metadata={"company": "Globex"})
+
+            names = [p.name for p in svc.detect_inferred_connections()]
+            assert names == [f"inferred_connection_{a}_{b}"]
+        finally:
+            db.close()
+
     def test_cluster_forming(self):
         """Identifies groups of people mentioned together frequently."""
         db, tmpdir = _make_db()
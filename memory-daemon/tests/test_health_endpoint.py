@@ -92,6 +92,40 @@ class TestHealthEndpointNotFound:
         assert resp.status == 404
 
 
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_metrics_reports_process_and_recent_timers(self, health_server, db):
+        from claudia_memory.metrics import MetricsRegistry
+
+        other_process = MetricsRegistry()
+        other_process.observe("mcp.tool", 8.0, tool="memory_recall")
+        other_process.flush(db)
+
+        server, port = health_server
+        with patch("claudia_memory.daemon.health.get_db", return_value=db):
+            status, data = _get(port, "/metrics?minutes=5&format=json")
+        assert status == 200
+        assert set(data) >= {"process", "recent", "flusher"}
+        assert data["recent"]["minutes"] == 5
+        assert data["recent"]["timers"]["mcp.tool"][0]["labels"] == {"tool": "memory_recall"}
+
+    def test_metrics_defaults_to_openmetrics(self, health_server, db):
+        import http.client
+
+        server, port = health_server
+        with patch("claudia_memory.daemon.health.get_db", return_value=db):
+            conn = http.client.HTTPConnection("localhost", port, timeout=5)
+            conn.request("GET", "/metrics", headers={"Accept": "application/openmetrics-text"})
+            resp = conn.getresponse()
+            body = resp.read().decode()
+            conn.close()
+        assert resp.status == 200
+        assert resp.getheader("Content-Type").startswith("application/openmetrics-text")
+        assert "claudia_sqlite_wal_bytes" in body
+        assert body.endswith("# EOF\n")
+
+
 class TestBuildStatusReport:
     """Tests for the build_status_report() helper (unit tests, no HTTP)."""
 
@@ -151,3 +185,38 @@ class TestBuildStatusReport:
             mock_sched.return_value.is_running.return_value = False
             report = build_status_report(db=mock_db)
         assert "timestamp" in report
+
+
+class TestEventsEndpoint:
+    """Tests for GET /events."""
+
+    def test_streams_json_lines(self, health_server, db):
+        import http.client
+
+        from claudia_memory.events import get_event_bus
+
+        event = get_event_bus().publish("job", job="test_job", ok=True)
+        server, port = health_server
+        with patch("claudia_memory.daemon.health.get_db", return_value=db):
+            conn = http.client.HTTPConnection("localhost", port, timeout=5)
+            conn.request("GET", f"/events?format=jsonl&types=job&after={event['id'] - 1}")
+            resp = conn.getresponse()
+            line = resp.fp.readline()
+            # Other routes keep answering while a stream is open
+            status, data = _get(port, "/health")
+            conn.close()
+        assert resp.status == 200
+        assert resp.getheader("Content-Type") == "application/x-ndjson"
+        assert json.loads(line) == event
+        assert status == 200 and data["status"] == "healthy"
+
+    def test_bad_last_event_id(self, health_server):
+        import http.client
+
+        server, port = health_server
+        conn = http.client.HTTPConnection("localhost", port, timeout=5)
+        conn.request("GET", "/events", headers={"Last-Event-ID": "abc"})
+        resp = conn.getresponse()
+        resp.read()
+        conn.close()
+        assert resp.status == 400
@@ -127,6 +127,8 @@ def _get_consolidate_service(db):
     class MockConfig:
         decay_rate_daily = 0.995
         min_importance_threshold = 0.1
+        decay_rebase_days = 7
+        decay_rebase_batch = 2000
         enable_pre_consolidation_backup = False
         cooling_threshold_days = 60
         archive_threshold_days = 180
@@ -218,6 +220,8 @@ class TestSacredMemory:
                                    lifecycle_tier="sacred", sacred_reason="user-protected")
         normal_id = _insert_memory(db, "Normal fact", importance=0.9)
 
+        month_ago = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        db.execute("UPDATE memories SET decay_ref_at = ?", (month_ago,))
         svc = _get_consolidate_service(db)
         svc.run_decay()
 
@@ -656,16 +660,16 @@ class TestChainHash:
                         id1 = svc.remember_fact(content="First chain fact aaa111")
                         id2 = svc.remember_fact(content="Second chain fact bbb222")
 
+                    # Hashing happens in the background sealer, not inline
+                    from claudia_memory.services.chain import seal_pending
+                    seal_pending(db)
+
                     row1 = db.get_one("memories", where="id = ?", where_params=(id1,))
                     row2 = db.get_one("memories", where="id = ?", where_params=(id2,))
 
-                    # First memory should have hash but prev_hash may be None
-                    if row1["hash"]:
-                        assert len(row1["hash"]) == 64  # SHA-256 hex length
-
+                    assert len(row1["hash"]) == 64  # SHA-256 hex length
                     # Second memory's prev_hash should equal first memory's hash
-                    if row2["hash"] and row1["hash"]:
-                        assert row2["prev_hash"] == row1["hash"]
+                    assert row2["prev_hash"] == row1["hash"]
                 finally:
                     rem_mod._service = old_svc
 
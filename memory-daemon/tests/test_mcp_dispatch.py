@@ -0,0 +1,205 @@
+"""Tests for MCP tool dispatch lanes (read pool + single writer lane).
+
+Handlers call blocking services, so call_tool runs them on worker threads:
+read-only tools share a bounded pool, mutating tools go through one writer
+thread inside db.transaction(). These tests drive ToolDispatcher directly with
+synthetic handlers so timing is controlled, plus one end-to-end call_tool run.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import claudia_memory.database as db_mod
+from claudia_memory.mcp.dispatch import (
+    READ_LANE,
+    WRITE_LANE,
+    ToolDispatcher,
+    classify_tool,
+)
+
+
+@pytest.fixture
+def dispatcher():
+    d = ToolDispatcher(read_workers=4)
+    yield d
+    d.shutdown()
+
+
+class TestClassification:
+    def test_read_tools(self):
+        assert classify_tool("memory_recall", {}) == READ_LANE
+        assert classify_tool("memory_graph", {"operation": "path"}) == READ_LANE
+
+    def test_dot_alias_matches_underscore_name(self):
+        assert classify_tool("memory.recall", {}) == READ_LANE
+        assert classify_tool("memory.remember", {}) == WRITE_LANE
+
+    def test_write_tools(self):
+        assert classify_tool("memory_remember", {}) == WRITE_LANE
+        assert classify_tool("memory_batch", {}) == WRITE_LANE
+        assert classify_tool("cognitive.ingest", {}) == WRITE_LANE
+
+    def test_multiplexed_tool_routes_by_operation(self):
+        assert classify_tool("memory_entities", {}) == READ_LANE  # default search
+        assert classify_tool("memory_entities", {"operation": "merge"}) == WRITE_LANE
+        assert classify_tool("memory_reflections", {"action": "search"}) == READ_LANE
+        assert classify_tool("memory_reflections", {"action": "delete"}) == WRITE_LANE
+        assert classify_tool("memory_rollback", {"operation": "set"}) == WRITE_LANE
+        assert classify_tool("memory_rollback", {"operation": "status"}) == READ_LANE
+
+    def test_session_context_runs_in_write_lane(self):
+        # It marks inbox episodes read; two concurrent reads would both deliver them
+        assert classify_tool("memory_session", {}) == WRITE_LANE
+        assert classify_tool("memory_session", {"operation": "context"}) == WRITE_LANE
+        assert classify_tool("memory_session_context", {}) == WRITE_LANE
+        assert classify_tool("memory_session", {"operation": "unsummarized"}) == READ_LANE
+
+    def test_unknown_tool_defaults_to_write_lane(self):
+        assert classify_tool("memory_something_new", {}) == WRITE_LANE
+
+
+def _slow_handler(seconds, seen_threads=None):
+    async def handler():
+        if seen_threads is not None:
+            seen_threads.add(threading.current_thread().name)
+        time.sleep(seconds)  # blocking, like an Ollama round-trip
+        return "ok"
+    return handler
+
+
+class TestLanes:
+    def test_reads_run_concurrently(self, dispatcher, db):
+        threads = set()
+
+        async def run():
+            return await asyncio.gather(*[
+                dispatcher.dispatch("memory_recall", {}, _slow_handler(0.2, threads), db)
+                for _ in range(4)
+            ])
+
+        start = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+        assert results == ["ok"] * 4
+        assert elapsed < 0.6, f"4 x 0.2s reads took {elapsed:.2f}s; expected parallel execution"
+        assert len(threads) > 1
+        assert dispatcher.stats()["lanes"][READ_LANE]["peak_in_flight"] > 1
+
+    def test_writes_are_serialized(self, dispatcher, db):
+        threads = set()
+
+        async def run():
+            await asyncio.gather(*[
+                dispatcher.dispatch("memory_remember", {}, _slow_handler(0.05, threads), db)
+                for _ in range(3)
+            ])
+
+        asyncio.run(run())
+        assert len(threads) == 1
+        assert dispatcher.stats()["lanes"][WRITE_LANE]["peak_in_flight"] == 1
+        assert dispatcher.stats()["tools"]["memory_remember"]["peak_in_flight"] == 1
+
+    def test_event_loop_not_blocked(self, dispatcher, db):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        async def run():
+            await asyncio.gather(
+                dispatcher.dispatch("memory_recall", {}, _slow_handler(0.2), db),
+                ticker(),
+            )
+
+        asyncio.run(run())
+        assert len(ticks) == 5
+        # The ticker finished while the blocking handler was still sleeping
+        assert ticks[-1] - ticks[0] < 0.2
+
+    def test_write_lane_rolls_back_on_error(self, dispatcher, db):
+        async def failing():
+            db.execute("INSERT INTO _meta (key, value) VALUES ('dispatch_test', 'x')")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(dispatcher.dispatch("memory_remember", {}, failing, db))
+
+        rows = db.execute("SELECT value FROM _meta WHERE key = 'dispatch_test'", fetch=True)
+        assert not rows
+        stats = dispatcher.stats()["tools"]["memory_remember"]
+        assert stats["errors"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_write_lane_commit_drops_cached_recalls(self, dispatcher, db):
+        from claudia_memory.services.recall_cache import get_recall_cache
+
+        cache = get_recall_cache(db)
+
+        async def archive():
+            db.execute("INSERT INTO _meta (key, value) VALUES ('dispatch_cache', 'x')")
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        generation = cache.generation
+        asyncio.run(dispatcher.dispatch("memory_recall", {}, _slow_handler(0), db))
+        assert cache.generation == generation
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(dispatcher.dispatch("memory_lifecycle", {"operation": "archive"}, failing, db))
+        assert cache.generation == generation
+
+        asyncio.run(dispatcher.dispatch("memory_lifecycle", {"operation": "archive"}, archive, db))
+        assert cache.generation == generation + 1
+
+    def test_metrics_record_latency(self, dispatcher, db):
+        async def run():
+            for _ in range(3):
+                await dispatcher.dispatch("memory_recall", {}, _slow_handler(0.01), db)
+
+        asyncio.run(run())
+        stats = dispatcher.stats()["tools"]["memory_recall"]
+        assert stats["calls"] == 3
+        assert stats["errors"] == 0
+        assert stats["p50_ms"] >= 10
+        assert stats["p99_ms"] >= stats["p50_ms"]
+
+
+class TestCallToolIntegration:
+    def test_call_tool_round_trip_through_lanes(self, db):
+        """A write followed by a read via call_tool sees the committed data."""
+        import claudia_memory.mcp.dispatch as dispatch_mod
+        import claudia_memory.services.recall as recall_mod
+        import claudia_memory.services.remember as remember_mod
+        from claudia_memory.mcp.server import call_tool
+
+        old = (db_mod._db, recall_mod._service, remember_mod._service, dispatch_mod._dispatcher)
+        db_mod._db = db
+        recall_mod._service = None
+        remember_mod._service = None
+        dispatch_mod._dispatcher = ToolDispatcher(read_workers=2)
+        try:
+            result = asyncio.run(call_tool("memory_entities", {
+                "operation": "create", "name": "Dispatch Person", "type": "person",
+            }))
+            assert not result.isError, result.content[0].text
+
+            result = asyncio.run(call_tool("memory_entities", {
+                "operation": "search", "query": "Dispatch",
+            }))
+            assert not result.isError, result.content[0].text
+            assert "Dispatch Person" in result.content[0].text
+
+            stats = dispatch_mod._dispatcher.stats()
+            assert stats["tools"]["memory_entities"]["calls"] == 2
+            assert json.dumps(stats)  # serializable for memory_system_health
+        finally:
+            dispatch_mod.reset_dispatcher()
+            db_mod._db, recall_mod._service, remember_mod._service, dispatch_mod._dispatcher = old
@@ -156,3 +156,148 @@ def test_merge_disabled_by_config(db):
 
     result = svc.merge_similar_memories()
     assert result == 0
+
+
+# --- Blocked near-duplicate pass ---
+
+def _vec0_available() -> bool:
+    import sqlite3
+    from claudia_memory.database import load_sqlite_vec
+    try:
+        conn = sqlite3.connect(":memory:")
+        ok = load_sqlite_vec(conn)
+        conn.close()
+        return ok
+    except Exception:
+        return False
+
+
+requires_vec0 = pytest.mark.skipif(
+    not _vec0_available(), reason="sqlite-vec (vec0) not available in this environment"
+)
+
+
+def _unit_vector(seed, dims=384, jitter=None):
+    import random
+    rng = random.Random(seed)
+    vec = [rng.gauss(0, 1) for _ in range(dims)]
+    if jitter is not None:
+        noise = random.Random(jitter)
+        vec = [x + noise.gauss(0, 0.05) for x in vec]
+    return vec
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_similar_pairs_matches_pairwise_cosine(monkeypatch, use_numpy):
+    from array import array
+    from claudia_memory.services import consolidate as consolidate_mod
+
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidate_mod, "_np", None)
+
+    base = [_unit_vector(s, dims=32) for s in range(6)]
+    vectors = [array("f", v) for v in base]
+    vectors += [array("f", _unit_vector(s, dims=32, jitter=100 + s)) for s in (1, 4)]
+    vectors.append(array("f", [0.0] * 32))
+
+    expected = [
+        (i, j)
+        for i in range(len(vectors))
+        for j in range(i + 1, len(vectors))
+        if _cosine_similarity(vectors[i], vectors[j]) >= 0.92
+    ]
+    got = list(consolidate_mod._similar_pairs(vectors, 0.92, block_rows=3))
+    assert got == expected
+    assert len(expected) == 2
+
+
+@requires_vec0
+@pytest.mark.parametrize("backend", ["numpy", "vec0", "python"])
+def test_merge_covers_every_entity_and_unlinked_memories(db, monkeypatch, backend):
+    from claudia_memory.services import consolidate as consolidate_mod
+
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidate_mod, "_np", None)
+    if backend == "python":
+        monkeypatch.setattr(ConsolidateService, "_knn_merge_pairs", lambda self, *a: None)
+
+    alice = _insert_entity(db, "Alice")
+    bob = _insert_entity(db, "Bob")
+
+    # Alice has two memories only: the old top-50 / 5+ memories cut-off skipped her
+    a1 = _insert_memory(db, "Alice likes green tea", importance=0.9)
+    a2 = _insert_memory(db, "Alice enjoys green tea", importance=0.5, access_count=3)
+    for mid, vec in ((a1, _unit_vector(1)), (a2, _unit_vector(1, jitter=2))):
+        _link_memory_entity(db, mid, alice)
+        _store_embedding(db, mid, vec)
+
+    # Same vector but a different entity: never compared across entities
+    b1 = _insert_memory(db, "Bob likes green tea")
+    _link_memory_entity(db, b1, bob)
+    _store_embedding(db, b1, _unit_vector(1))
+
+    # Unlinked near-duplicates are merged too
+    u1 = _insert_memory(db, "Standup moved to 10am", importance=0.8)
+    u2 = _insert_memory(db, "Standup now at 10am", importance=0.4)
+    u3 = _insert_memory(db, "Quarterly goals", importance=0.8)
+    _store_embedding(db, u1, _unit_vector(7))
+    _store_embedding(db, u2, _unit_vector(7, jitter=8))
+    _store_embedding(db, u3, _unit_vector(9))
+
+    svc = ConsolidateService.__new__(ConsolidateService)
+    svc.db = db
+    svc.config = _make_config()
+
+    assert svc.merge_similar_memories() == 2
+
+    importance = {
+        row["id"]: row["importance"]
+        for row in db.execute("SELECT id, importance FROM memories", fetch=True)
+    }
+    # a2 wins on importance * (1 + access_count): 0.5 * 4 > 0.9 * 1
+    assert importance[a1] == pytest.approx(0.001)
+    assert importance[a2] == pytest.approx(0.5)
+    assert importance[b1] == pytest.approx(1.0)
+    assert importance[u2] == pytest.approx(0.001)
+    assert importance[u3] == pytest.approx(0.8)
+
+    stats = svc.last_merge_stats
+    assert stats["backend"] == backend
+    assert stats["memories"] == 6
+    assert stats["merged"] == 2
+    assert stats["memories_per_sec"] > 0
+
+
+@requires_vec0
+@pytest.mark.parametrize("backend", ["numpy", "vec0", "python"])
+def test_merge_counts_each_candidate_pair_once(db, monkeypatch, backend):
+    from claudia_memory.services import consolidate as consolidate_mod
+
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(consolidate_mod, "_np", None)
+    if backend == "python":
+        monkeypatch.setattr(ConsolidateService, "_knn_merge_pairs", lambda self, *a: None)
+
+    alice = _insert_entity(db, "Alice")
+    bob = _insert_entity(db, "Bob")
+    # Both memories are about Alice and Bob, so the pair sits in two blocks
+    m1 = _insert_memory(db, "Alice and Bob share an office", importance=0.9)
+    m2 = _insert_memory(db, "Alice and Bob work in the same office", importance=0.5)
+    for mid, vec in ((m1, _unit_vector(3)), (m2, _unit_vector(3, jitter=4))):
+        _link_memory_entity(db, mid, alice)
+        _link_memory_entity(db, mid, bob)
+        _store_embedding(db, mid, vec)
+
+    svc = ConsolidateService.__new__(ConsolidateService)
+    svc.db = db
+    svc.config = _make_config()
+
+    assert svc.merge_similar_memories() == 1
+    assert svc.last_merge_stats["blocks"] == 2
+    assert svc.last_merge_stats["candidates"] == 1
@@ -0,0 +1,120 @@
+"""Tests for latency histograms, the metrics registry and its flushes."""
+
+import json
+import random
+
+from claudia_memory.metrics import Histogram, MetricsRegistry, recent, summarize_rows
+
+
+class TestHistogram:
+    def test_percentiles_within_bucket_precision(self):
+        random.seed(7)
+        values = [random.lognormvariate(1.0, 1.2) for _ in range(5000)]
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        ordered = sorted(values)
+        for pct in (50, 95, 99):
+            exact = ordered[int(len(ordered) * pct / 100) - 1]
+            assert abs(histogram.percentile(pct) - exact) / exact < 0.04
+        assert histogram.percentile(100) == histogram.max_ms
+        assert histogram.count == 5000
+
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for us in (1, 2, 3, 40):
+            histogram.record(us / 1000)
+        assert histogram.percentile(50) == 0.002
+        assert histogram.percentile(100) == 0.04
+
+    def test_empty(self):
+        assert Histogram().percentile(99) == 0.0
+
+
+class TestRegistry:
+    def test_stage_clock_records_each_stage(self):
+        registry = MetricsRegistry()
+        clock = registry.stages("recall", source="test")
+        clock.lap("embed")
+        clock.lap("fts")
+        clock.done()
+
+        timers = registry.snapshot()["timers"]
+        assert set(timers) == {"recall.embed", "recall.fts", "recall.total"}
+        assert timers["recall.embed"][0]["labels"] == {"source": "test"}
+        assert timers["recall.embed"][0]["count"] == 1
+
+    def test_timer_records_on_error(self):
+        registry = MetricsRegistry()
+        try:
+            with registry.timer("job", job="decay"):
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        assert registry.histogram("job", job="decay").count == 1
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry(enabled=False)
+        registry.observe("x", 1.0)
+        registry.incr("y")
+        assert registry.snapshot()["timers"] == {}
+        assert registry.snapshot()["counters"] == {}
+
+
+class TestFlush:
+    def test_flush_writes_interval_rows(self, db):
+        registry = MetricsRegistry()
+        for ms in (1.0, 2.0, 30.0):
+            registry.observe("mcp.tool", ms, tool="memory_recall")
+        registry.incr("scheduler.job_missed", job="daily_decay")
+
+        assert registry.flush(db) == 2
+        rows = db.execute("SELECT * FROM metrics ORDER BY metric_name", fetch=True)
+        assert [r["metric_name"] for r in rows] == ["mcp.tool", "scheduler.job_missed"]
+        dims = json.loads(rows[0]["dimensions"])
+        assert dims["labels"] == {"tool": "memory_recall"}
+        assert dims["count"] == 3
+        assert rows[1]["metric_value"] == 1
+
+        # Nothing new since the last flush
+        assert registry.flush(db) == 0
+        # Cumulative view is unaffected by flushing
+        assert registry.histogram("mcp.tool", tool="memory_recall").count == 3
+
+    def test_failed_flush_keeps_pending(self, db):
+        registry = MetricsRegistry()
+        registry.observe("recall.total", 5.0)
+
+        class Broken:
+            def execute_many(self, *args):
+                raise RuntimeError("locked")
+
+        assert registry.flush(Broken()) == 0
+        assert registry.flush(db) == 1
+
+    def test_rows_merge_across_flushes(self, db):
+        first, second = MetricsRegistry(), MetricsRegistry()
+        for _ in range(99):
+            first.observe("recall.total", 1.0)
+        second.observe("recall.total", 500.0)
+        first.flush(db)
+        second.flush(db)
+
+        merged = recent(db, minutes=5)["recall.total"][0]
+        assert merged["count"] == 100
+        assert merged["max_ms"] == 500.0
+        assert merged["p50_ms"] < 1.05
+
+        rows = db.execute("SELECT metric_name, dimensions FROM metrics", fetch=True)
+        assert summarize_rows(rows) == recent(db, minutes=5)
+
+    def test_background_flusher_flushes_on_stop(self, db):
+        registry = MetricsRegistry(flush_interval=3600)
+        registry.start(db)
+        registry.observe("ollama.embed", 12.0, endpoint="embed")
+        registry.stop()
+
+        rows = db.execute("SELECT metric_name FROM metrics", fetch=True)
+        assert [r["metric_name"] for r in rows] == ["ollama.embed"]
+        assert registry.stats()["background"] == 0
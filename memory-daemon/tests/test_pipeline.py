@@ -7,7 +7,7 @@ lifecycle, and deduplication all function correctly together.
 """
 
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -164,6 +164,9 @@ def test_decay_reduces_importance(remember_svc, consolidate_svc, db):
     before = db.get_one("memories", where="id = ?", where_params=(mem_id,))
     original_importance = before["importance"]
 
+    # Decay is closed-form over elapsed days; age the decay reference
+    week_ago = (datetime.utcnow() - timedelta(days=8)).isoformat()
+    db.execute("UPDATE memories SET decay_ref_at = ? WHERE id = ?", (week_ago, mem_id))
     consolidate_svc.run_decay()
 
     after = db.get_one("memories", where="id = ?", where_params=(mem_id,))
@@ -0,0 +1,141 @@
+"""Tests for the recall result cache and its write-generation invalidation."""
+
+import pytest
+
+from claudia_memory.config import MemoryConfig
+from claudia_memory.extraction.entity_extractor import get_extractor
+from claudia_memory.services.recall_cache import (
+    RecallCache,
+    get_recall_cache,
+    normalize_query,
+)
+
+
+@pytest.fixture
+def remember_svc(db):
+    from claudia_memory.services.remember import RememberService
+
+    svc = RememberService.__new__(RememberService)
+    svc.db = db
+    svc.embedding_service = None
+    svc.extractor = get_extractor()
+    return svc
+
+
+@pytest.fixture
+def recall_svc(db):
+    from claudia_memory.services.recall import RecallService
+
+    svc = RecallService.__new__(RecallService)
+    svc.db = db
+    svc.embedding_service = None
+    svc.extractor = get_extractor()
+    svc.config = MemoryConfig()
+    return svc
+
+
+class TestRecallCache:
+    def test_hit_returns_a_copy(self, db):
+        cache = RecallCache(db, maxsize=4)
+        cache.put("k", [{"score": 1.0}], cache.generation)
+
+        hit = cache.get("k")
+        hit[0]["score"] = 0.0
+        assert cache.get("k") == [{"score": 1.0}]
+        assert cache.get("other") is None
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_bump_drops_entries(self, db):
+        cache = RecallCache(db, maxsize=4)
+        cache.put("k", [1], cache.generation)
+        cache.invalidate()
+
+        assert cache.get("k") is None
+        assert cache.stats()["generation"] == 1
+        assert cache.stats()["invalidations"] == 1
+
+    def test_result_read_across_a_write_is_not_stored(self, db):
+        cache = RecallCache(db, maxsize=4)
+        generation = cache.generation
+        cache.bump()
+        cache.put("k", [1], generation)
+
+        assert cache.get("k") is None
+
+    def test_invalidation_waits_for_commit(self, db):
+        cache = RecallCache(db, maxsize=4)
+        cache.put("k", [1], cache.generation)
+
+        with db.transaction():
+            cache.invalidate()
+            assert cache.get("k") == [1]
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, db):
+        cache = RecallCache(db, maxsize=2)
+        cache.put("a", 1, 0)
+        cache.put("b", 2, 0)
+        cache.get("a")
+        cache.put("c", 3, 0)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, db):
+        cache = RecallCache(db, maxsize=4, ttl_seconds=0)
+        cache.put("k", [1], 0)
+
+        assert cache.get("k") is None
+
+    def test_disabled(self, db):
+        cache = RecallCache(db, maxsize=0)
+        cache.put("k", [1], 0)
+
+        assert cache.get("k") is None
+        assert cache.stats()["misses"] == 0
+
+    def test_normalize_query(self):
+        assert normalize_query("  what  did\tSarah\nsay ") == "what did Sarah say"
+
+
+class TestRecallServiceCaching:
+    def test_repeat_recall_is_served_from_cache(self, db, remember_svc, recall_svc, monkeypatch):
+        remember_svc.remember_fact("Sarah prefers morning meetings", about_entities=["Sarah"])
+        first = recall_svc.recall("morning meetings")
+
+        calls = []
+        original = type(recall_svc)._recall
+        monkeypatch.setattr(
+            type(recall_svc), "_recall",
+            lambda self, *args: calls.append(args) or original(self, *args),
+        )
+        second = recall_svc.recall("  morning   meetings ")
+
+        assert calls == []
+        assert [r.id for r in second] == [r.id for r in first]
+        assert get_recall_cache(db).stats()["hits"] == 1
+
+    def test_writes_invalidate(self, db, remember_svc, recall_svc):
+        remember_svc.remember_fact("Sarah prefers morning meetings", about_entities=["Sarah"])
+        assert len(recall_svc.recall("morning meetings")) == 1
+
+        remember_svc.remember_fact("Tom also likes morning meetings", about_entities=["Tom"])
+        assert len(recall_svc.recall("morning meetings")) == 2
+
+    def test_filters_are_part_of_the_key(self, db, remember_svc, recall_svc):
+        remember_svc.remember_fact("Sarah prefers morning meetings", about_entities=["Sarah"])
+        remember_svc.remember_fact("Tom prefers morning meetings", about_entities=["Tom"])
+
+        assert len(recall_svc.recall("morning meetings")) == 2
+        assert len(recall_svc.recall("morning meetings", limit=1)) == 1
+
+    def test_recall_about_invalidated_by_correction(self, db, remember_svc, recall_svc):
+        memory_id = remember_svc.remember_fact("Sarah works at Acme", about_entities=["Sarah"])
+        before = recall_svc.recall_about("Sarah")
+        assert before["memories"][0].content == "Sarah works at Acme"
+
+        remember_svc.correct_memory(memory_id, "Sarah works at Globex")
+        after = recall_svc.recall_about("Sarah")
+        assert "Globex" in after["memories"][0].content
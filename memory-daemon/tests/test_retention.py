@@ -16,6 +16,12 @@ def _make_service(db):
     return svc
 
 
+def _age_decay_reference(db, table, days):
+    """Pretend every row's stored value was last true `days` ago."""
+    ref = (datetime.utcnow() - timedelta(days=days, hours=1)).isoformat()
+    db.execute(f"UPDATE {table} SET decay_ref_at = ?", (ref,))
+
+
 # ---------------------------------------------------------------------------
 # Retention cleanup tests
 # ---------------------------------------------------------------------------
@@ -150,6 +156,7 @@ def test_adaptive_decay_tiered(db):
         "INSERT INTO memories (content, content_hash, type, importance) VALUES (?, ?, ?, ?)",
         ("Regular memory", "hash_low", "fact", 0.5),
     )
+    _age_decay_reference(db, "memories", 10)
 
     svc.run_decay()
 
@@ -162,11 +169,11 @@ def test_adaptive_decay_tiered(db):
 
     # High-importance should have decayed less (slow rate)
     slow_rate = (1.0 + svc.config.decay_rate_daily) / 2
-    expected_high = 0.9 * slow_rate
+    expected_high = 0.9 * slow_rate ** 10
     assert abs(high_mem["importance"] - expected_high) < 0.0001
 
     # Low-importance should have decayed at standard rate
-    expected_low = 0.5 * svc.config.decay_rate_daily
+    expected_low = 0.5 * svc.config.decay_rate_daily ** 10
     assert abs(low_mem["importance"] - expected_low) < 0.0001
 
 
@@ -181,9 +188,9 @@ def test_adaptive_decay_floor(db):
         ("Near floor", "hash_floor", "fact", floor + 0.001),
     )
 
-    # Run decay many times
-    for _ in range(100):
-        svc.run_decay()
+    # Long enough that the closed form would go well under the floor
+    _age_decay_reference(db, "memories", 1000)
+    svc.run_decay()
 
     rows = db.execute(
         "SELECT importance FROM memories WHERE content_hash = ?",
@@ -221,6 +228,7 @@ def test_adaptive_decay_entities_tiered(db):
         "INSERT INTO entities (name, type, canonical_name, importance) VALUES (?, ?, ?, ?)",
         ("Low Entity", "person", "low_entity", 0.4),
     )
+    _age_decay_reference(db, "entities", 10)
 
     svc.run_decay()
 
@@ -232,8 +240,8 @@ def test_adaptive_decay_entities_tiered(db):
     low_ent = [r for r in rows if r["name"] == "Low Entity"][0]
 
     slow_rate = (1.0 + svc.config.decay_rate_daily) / 2
-    expected_high = 0.9 * slow_rate
-    expected_low = 0.4 * svc.config.decay_rate_daily
+    expected_high = 0.9 * slow_rate ** 10
+    expected_low = 0.4 * svc.config.decay_rate_daily ** 10
 
     assert abs(high_ent["importance"] - expected_high) < 0.0001
     assert abs(low_ent["importance"] - expected_low) < 0.0001
@@ -256,6 +264,7 @@ def test_adaptive_decay_relationships_tiered(db):
         "INSERT INTO relationships (source_entity_id, target_entity_id, relationship_type, strength) VALUES (?, ?, ?, ?)",
         (id_a, id_c, "knows", 0.4),
     )
+    _age_decay_reference(db, "relationships", 10)
 
     svc.run_decay()
 
@@ -267,8 +276,8 @@ def test_adaptive_decay_relationships_tiered(db):
     works = [r for r in rows if r["relationship_type"] == "works_with"][0]
 
     slow_rate = (1.0 + svc.config.decay_rate_daily) / 2
-    expected_strong = 0.9 * slow_rate
-    expected_weak = 0.4 * svc.config.decay_rate_daily
+    expected_strong = 0.9 * slow_rate ** 10
+    expected_weak = 0.4 * svc.config.decay_rate_daily ** 10
 
     assert abs(works["strength"] - expected_strong) < 0.0001
     assert abs(knows["strength"] - expected_weak) < 0.0001
@@ -0,0 +1,91 @@
+"""Tests for the trigger-maintained aggregate counts and their reconcile."""
+
+from claudia_memory.services.stat_counters import (
+    grouped,
+    importance_histogram,
+    read_counters,
+    reconcile,
+    row_counts,
+)
+
+
+def _memory(db, content, type_="fact", importance=0.5):
+    db.execute(
+        "INSERT INTO memories (content, content_hash, type, importance) VALUES (?, ?, ?, ?)",
+        (content, content, type_, importance),
+    )
+
+
+class TestTriggers:
+    def test_seeded_on_initialize(self, db):
+        values = read_counters(db)
+        assert values is not None
+        assert row_counts(db)["memories"] == 0
+
+    def test_memory_writes(self, db):
+        _memory(db, "a", "fact", 0.55)
+        _memory(db, "b", "commitment", 1.0)
+
+        values = read_counters(db)
+        assert values["memories"] == 2
+        assert values["memories.live"] == 2
+        assert grouped(values, "memories.type") == {"fact": 1, "commitment": 1}
+        assert grouped(values, "memories.tier") == {"active": 2}
+        assert importance_histogram(values)[16] == 1
+        assert importance_histogram(values)[29] == 1
+
+        db.execute("UPDATE memories SET invalidated_at = datetime('now') WHERE content = 'a'")
+        db.execute("UPDATE memories SET importance = 0.2, lifecycle_tier = 'cooling' WHERE content = 'b'")
+
+        values = read_counters(db)
+        assert values["memories"] == 2
+        assert values["memories.live"] == 1
+        assert grouped(values, "memories.type") == {"commitment": 1}
+        assert grouped(values, "memories.tier") == {"cooling": 1}
+        assert importance_histogram(values, 10) == [0, 0, 1, 0, 0, 0, 0, 0, 0, 0]
+
+        db.execute("DELETE FROM memories")
+        assert row_counts(db)["memories"] == 0
+
+    def test_entities_patterns_predictions(self, db):
+        db.execute("INSERT INTO entities (name, type, canonical_name) VALUES ('Sarah', 'person', 'sarah')")
+        db.execute("INSERT INTO entities (name, type, canonical_name) VALUES ('Acme', 'organization', 'acme')")
+        db.execute("UPDATE entities SET deleted_at = datetime('now') WHERE name = 'Acme'")
+        db.execute("INSERT INTO patterns (name, pattern_type, description) VALUES ('p', 'behavioral', 'd')")
+        db.execute("INSERT INTO predictions (content, prediction_type) VALUES ('x', 'reminder')")
+        db.execute("UPDATE predictions SET is_shown = 1")
+
+        counts = row_counts(db)
+        assert counts["entities"] == 1
+        assert counts["active_patterns"] == 1
+        assert counts["pending_predictions"] == 0
+        assert grouped(read_counters(db), "entities.type") == {"person": 1}
+
+    def test_rolled_back_writes_leave_counts_alone(self, db):
+        try:
+            with db.transaction():
+                _memory(db, "a")
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert row_counts(db)["memories"] == 0
+
+
+class TestReconcile:
+    def test_corrects_drift(self, db):
+        _memory(db, "a")
+        db.execute("UPDATE stat_counters SET value = 7 WHERE key = 'memories'")
+        db.execute("INSERT INTO stat_counters (key, value) VALUES ('memories.type:ghost', 3)")
+
+        assert reconcile(db) == {"drifted": 2}
+        values = read_counters(db)
+        assert values["memories"] == 1
+        assert "memories.type:ghost" not in values
+        assert reconcile(db) == {"drifted": 0}
+
+    def test_unseeded_database_falls_back_to_counting(self, db):
+        _memory(db, "a")
+        db.execute("DELETE FROM stat_counters")
+
+        assert read_counters(db) is None
+        assert row_counts(db)["memories"] == 1
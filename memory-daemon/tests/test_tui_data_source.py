@@ -145,6 +145,55 @@ def test_get_activity_timeseries_empty(ds):
     assert all(v == 0 for v in ts["links"])
 
 
+def test_activity_ring_rotates_and_drops_old_rows():
+    """Buckets rotate on the clock; rows older than the window are dropped."""
+    from claudia_memory.tui.activity import ActivityRing
+
+    with patch("claudia_memory.tui.activity.time.monotonic", return_value=1000.0) as clock:
+        ring = ActivityRing(window_seconds=12, bucket_seconds=3)
+        ring.add("mem_create")
+        ring.add("recall", age_seconds=4)
+        ring.add("relate", age_seconds=60)
+        ring.add("unknown_op")
+        assert ring.series() == {
+            "writes": [0, 0, 0, 1],
+            "reads": [0, 0, 1, 0],
+            "links": [0, 0, 0, 0],
+        }
+
+        clock.return_value = 1006.0
+        assert ring.series()["writes"] == [0, 1, 0, 0]
+
+
+def test_get_activity_timeseries_reads_past_cursor(db, ds):
+    """Later polls count only audit rows written since the previous poll."""
+    db.insert("audit_log", {
+        "timestamp": datetime.now().isoformat(),
+        "operation": "mem_create",
+        "user_initiated": 0,
+    })
+    assert sum(ds.get_activity_timeseries()["writes"]) == 1
+
+    # Unchanged database: served from the ring
+    with patch.object(ds, "_query", wraps=ds._query) as query:
+        assert sum(ds.get_activity_timeseries()["writes"]) == 1
+    assert query.call_count == 1  # PRAGMA data_version only
+
+    db.insert("audit_log", {
+        "timestamp": datetime.now().isoformat(),
+        "operation": "mem_create",
+        "user_initiated": 0,
+    })
+    db.insert("audit_log", {
+        "timestamp": datetime.now().isoformat(),
+        "operation": "recall",
+        "user_initiated": 0,
+    })
+    ts = ds.get_activity_timeseries()
+    assert sum(ts["writes"]) == 2
+    assert sum(ts["reads"]) == 1
+
+
 # ── Memory Constellation ─────────────────────────────────────────────
 
 
@@ -214,6 +263,63 @@ def test_get_memory_constellation_excludes_invalidated(db, ds):
     assert len(constellation) == 1
 
 
+def test_get_memory_constellation_patches_from_change_log(db, ds):
+    """New and invalidated memories reach the window without a reload."""
+    now = datetime.now().isoformat()
+    ids = [
+        db.insert("memories", {
+            "content": f"Memory {i}",
+            "content_hash": f"hash_patch_{i}",
+            "type": "fact",
+            "importance": 0.5,
+            "created_at": now,
+        })
+        for i in range(4)
+    ]
+    assert len(ds.get_memory_constellation(limit=3)) == 3
+
+    newest = db.insert("memories", {
+        "content": "Newest",
+        "content_hash": "hash_patch_new",
+        "type": "fact",
+        "importance": 0.9,
+        "created_at": now,
+    })
+    with patch.object(ds, "_load_constellation") as reload:
+        constellation = ds.get_memory_constellation(limit=3)
+    reload.assert_not_called()
+    assert [c["importance"] for c in constellation] == [0.9, 0.5, 0.5]
+    assert sorted(ds._constellation) == [ids[2], ids[3], newest]
+
+    # Invalidating one backfills the window from older memories
+    db.update("memories", {"invalidated_at": now}, "id = ?", (ids[3],))
+    ds.get_memory_constellation(limit=3)
+    assert sorted(ds._constellation) == [ids[1], ids[2], newest]
+
+
+def test_get_memory_constellation_reloads_after_prune(db, ds):
+    """A change_log pruned past the cursor forces a full reload."""
+    now = datetime.now().isoformat()
+    db.insert("memories", {
+        "content": "First",
+        "content_hash": "hash_prune_1",
+        "type": "fact",
+        "importance": 0.5,
+        "created_at": now,
+    })
+    ds.get_memory_constellation(limit=10)
+    db.insert("memories", {
+        "content": "Second",
+        "content_hash": "hash_prune_2",
+        "type": "fact",
+        "importance": 0.5,
+        "created_at": now,
+    })
+    db.execute("DELETE FROM change_log")
+
+    assert len(ds.get_memory_constellation(limit=10)) == 2
+
+
 # ── Importance Histogram ──────────────────────────────────────────────
 
 
@@ -267,6 +373,16 @@ def test_get_memory_type_counts(db, ds):
     assert counts["observation"] == 1
 
 
+def test_counts_fall_back_without_stat_counters(db, ds):
+    """A database the daemon has not seeded counters in is counted directly."""
+    db.insert("memories", {"content": "a", "content_hash": "h_a", "type": "fact", "importance": 0.5})
+    db.execute("DELETE FROM stat_counters")
+
+    assert ds.get_stats()["memories"] == 1
+    assert ds.get_memory_type_counts() == {"fact": 1}
+    assert sum(ds.get_importance_histogram()) == 1
+
+
 # ── Health ────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,132 @@
+"""Tests for the stat-keyed vault edit index and the inotify watcher."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from claudia_memory.services.vault_index import InotifyWatcher, VaultFileIndex
+from claudia_memory.services.vault_sync import VaultSyncService
+
+
+@pytest.fixture
+def vault(db):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        svc = VaultSyncService(Path(tmpdir), db=db)
+        svc._ensure_directories()
+        yield svc
+
+
+def _export(db, svc, name):
+    entity_id = db.insert("entities", {
+        "name": name,
+        "canonical_name": name.lower(),
+        "type": "person",
+        "importance": 0.8,
+    })
+    return svc.export_entity_by_id(entity_id)
+
+
+def _edit(path, text="\nUser added this line.\n"):
+    path.write_text(path.read_text() + text)
+
+
+class TestVaultFileIndex:
+    def test_only_changed_notes_are_read(self, db, vault):
+        paths = [_export(db, vault, name) for name in ("Alice", "Bob", "Carol")]
+        index = VaultFileIndex(db, vault._note_state)
+
+        assert index.scan(vault.entity_note_dirs()) == []
+        assert index.notes_read == 3
+
+        assert index.scan(vault.entity_note_dirs()) == []
+        assert index.notes_read == 3
+
+        _edit(paths[1])
+        edits = index.scan(vault.entity_note_dirs())
+        assert [e["file_path"] for e in edits] == [str(paths[1])]
+        assert edits[0]["entity_id"] is not None
+        assert index.notes_read == 4
+
+    def test_deleted_notes_leave_the_index(self, db, vault):
+        path = _export(db, vault, "Alice")
+        vault.detect_user_edits()
+        path.unlink()
+
+        assert vault.detect_user_edits() == []
+        rows = db.execute("SELECT path FROM vault_file_state", fetch=True)
+        assert rows == []
+
+    def test_refresh_checks_given_paths(self, db, vault):
+        alice = _export(db, vault, "Alice")
+        bob = _export(db, vault, "Bob")
+        _edit(alice)
+        _edit(bob)
+        index = VaultFileIndex(db, vault._note_state)
+
+        edits = index.refresh([bob])
+        assert [e["file_path"] for e in edits] == [str(bob)]
+        assert index.notes_read == 1
+
+
+class _StubWatcher:
+    def __init__(self, paths, overflow=False):
+        self.result = (set(paths), overflow)
+
+    def poll(self):
+        return self.result
+
+
+class TestImportChangedEdits:
+    def test_watcher_paths_are_imported(self, db, vault):
+        alice = _export(db, vault, "Alice")
+        bob = _export(db, vault, "Bob")
+        _edit(alice)
+        _edit(bob)
+
+        result = vault.import_changed_edits(_StubWatcher([alice]))
+        assert result["edits_found"] == 1
+
+    def test_overflow_falls_back_to_scan(self, db, vault):
+        alice = _export(db, vault, "Alice")
+        bob = _export(db, vault, "Bob")
+        _edit(alice)
+        _edit(bob)
+
+        result = vault.import_changed_edits(_StubWatcher([], overflow=True))
+        assert result["edits_found"] == 2
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+    def test_reports_written_and_renamed_notes(self, db, vault):
+        people = vault.vault_path / "Relationships" / "people"
+        watcher = InotifyWatcher(vault.entity_note_dirs())
+        try:
+            assert watcher.poll() == (set(), True)
+
+            (people / "Direct.md").write_text("hello")
+            (people / ".Renamed.md.tmp").write_text("hello")
+            os.replace(people / ".Renamed.md.tmp", people / "Renamed.md")
+            (people / "ignored.txt").write_text("x")
+
+            changed, overflow = watcher.poll()
+            assert changed == {people / "Direct.md", people / "Renamed.md"}
+            assert overflow is False
+            assert watcher.poll() == (set(), False)
+        finally:
+            watcher.close()
+
+    def test_new_directory_requests_scan(self, db):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            later = Path(tmpdir) / "later"
+            watcher = InotifyWatcher([later])
+            try:
+                watcher.poll()
+                later.mkdir()
+                assert watcher.poll() == (set(), True)
+                (later / "Note.md").write_text("x")
+                assert watcher.poll() == ({later / "Note.md"}, False)
+            finally:
+                watcher.close()
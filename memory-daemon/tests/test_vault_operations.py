@@ -295,6 +295,63 @@ def test_export_all_skips_deleted_entities(db, vault_svc, vault_dir):
     assert not (vault_dir / "Relationships" / "people" / "Deleted Person.md").exists()
 
 
+def test_prefetch_matches_per_entity_queries(db, vault_svc):
+    """Bulk prefetch renders every note exactly as per-entity queries do."""
+    sarah = _seed_entity(db, "Sarah Chen", "person", attention_tier="active",
+                         contact_trend="stable")
+    bob = _seed_entity(db, "Bob", "person")
+    launch = _seed_entity(db, "Launch", "project")
+    _seed_entity(db, "Loner", "concept")
+    _seed_memory(db, "Sarah leads the launch", sarah)
+    _seed_memory(db, "Send Sarah the deck", launch, memory_type="commitment")
+    _seed_memory(db, "Bob likes tea", bob, importance=0.9)
+    _seed_relationship(db, sarah, launch)
+    _seed_relationship(db, bob, sarah, rel_type="reports_to")
+    db.execute(
+        "INSERT INTO entity_aliases (entity_id, alias, canonical_alias) VALUES (?, 'SC', 'sc')",
+        (sarah,),
+    )
+    for day in range(1, 13):
+        db.execute(
+            """INSERT INTO episodes (session_id, is_summarized, narrative, started_at)
+               VALUES (?, 1, 'Met Sarah Chen', ?)""",
+            (f"sess-{day}", f"2026-02-{day:02d}T10:00:00"),
+        )
+    db.execute(
+        """INSERT INTO patterns (name, pattern_type, description, confidence, is_active, evidence)
+           VALUES ('p', 'cooling_relationship', 'Cooling', 0.8, 1, ?)""",
+        (json.dumps({"entity_ids": [sarah]}),),
+    )
+
+    entities = vault_svc._get_all_entities()
+    prefetched = vault_svc._prefetch_entity_data(entities)
+
+    for entity in entities:
+        expected = vault_svc._load_entity_data(entity)
+        assert vault_svc._render_entity_content(entity, prefetched[entity["id"]]) == \
+            vault_svc._render_entity_content(entity, expected)
+    assert len(prefetched[sarah]["sessions"]) == 10
+    assert prefetched[launch]["project_counts"] == (1, 1)
+
+
+def test_export_all_skips_unchanged_notes(db, vault_svc, vault_dir):
+    """A second full export rewrites only the notes whose content changed."""
+    alice = _seed_entity(db, "Alice", "person")
+    _seed_entity(db, "Bob", "person")
+
+    first = vault_svc.export_all()
+    assert first["entities_written"] == 2
+    assert {"entity_prefetch", "entity_render", "sessions"} <= set(first["timings_ms"])
+
+    _seed_memory(db, "Alice moved to Berlin", alice)
+    second = vault_svc.export_all()
+
+    assert second["entities"] == 2
+    assert second["entities_written"] == 1
+    assert second["entities_unchanged"] == 1
+    assert "Berlin" in (vault_dir / "Relationships" / "people" / "Alice.md").read_text()
+
+
 # =============================================================================
 # Incremental export tests
 # =============================================================================
@@ -825,6 +882,12 @@ def test_write_through_graceful_failure(db, vault_dir):
     result.chmod(0o444)
     result.parent.chmod(0o555)
 
+    # Change the entity so the note has to be rewritten
+    db.execute(
+        "UPDATE entities SET description = ? WHERE canonical_name = ?",
+        ("Changed", "test person"),
+    )
+
     try:
         # Re-export should fail gracefully (return None), not raise
         result2 = service.export_entity_by_id(
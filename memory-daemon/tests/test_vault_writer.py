@@ -0,0 +1,131 @@
+"""Tests for the debounced vault write-through and unchanged-note skipping."""
+
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from claudia_memory.services import vault_sync
+from claudia_memory.services.vault_sync import VaultSyncService
+from claudia_memory.services.vault_writer import VaultWriter
+
+
+@pytest.fixture
+def vault_dir(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir)
+        monkeypatch.setattr(vault_sync, "get_vault_path", lambda project_id=None: path)
+        yield path
+
+
+@pytest.fixture
+def exports(monkeypatch):
+    """Record the entity id of every export_entity call."""
+    calls = []
+    original = VaultSyncService.export_entity
+
+    def counting(self, entity):
+        calls.append(entity["id"])
+        return original(self, entity)
+
+    monkeypatch.setattr(VaultSyncService, "export_entity", counting)
+    return calls
+
+
+def _entity(db, name):
+    return db.insert("entities", {
+        "name": name,
+        "canonical_name": name.lower(),
+        "type": "person",
+        "importance": 0.8,
+    })
+
+
+def _note(vault_dir, name):
+    return vault_dir / "Relationships" / "people" / f"{name}.md"
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TestExportEntity:
+    def test_unchanged_note_is_not_rewritten(self, db, vault_dir):
+        entity_id = _entity(db, "Sarah")
+        svc = VaultSyncService(vault_dir, db=db)
+        path = svc.export_entity_by_id(entity_id)
+        before = path.stat()
+
+        assert svc.export_entity_by_id(entity_id) == path
+        assert svc.notes_written == 1
+        assert svc.notes_unchanged == 1
+        assert path.stat().st_mtime_ns == before.st_mtime_ns
+        assert path.stat().st_ino == before.st_ino
+
+    def test_changed_note_is_replaced_with_valid_hash(self, db, vault_dir):
+        entity_id = _entity(db, "Sarah")
+        svc = VaultSyncService(vault_dir, db=db)
+        path = svc.export_entity_by_id(entity_id)
+
+        db.execute("UPDATE entities SET description = 'Runs the platform team' WHERE id = ?", (entity_id,))
+        svc.export_entity_by_id(entity_id)
+
+        assert svc.notes_written == 2
+        assert "Runs the platform team" in path.read_text()
+        assert svc.detect_user_edits() == []
+        assert not list(path.parent.glob("*.tmp"))
+
+
+class TestVaultWriter:
+    def test_marks_coalesce_into_one_export(self, db, vault_dir, exports):
+        entity_id = _entity(db, "Sarah")
+        writer = VaultWriter(db, quiet_ms=60_000)
+        for _ in range(50):
+            writer.mark_dirty(["Sarah"])
+        writer.mark_dirty(entity_ids=[entity_id])
+
+        assert writer.pending() == 2
+        assert writer.flush() == 1
+        assert exports == [entity_id]
+        assert _note(vault_dir, "Sarah").exists()
+        writer.stop()
+
+    def test_background_render_after_quiet_period(self, db, vault_dir, exports):
+        _entity(db, "Sarah")
+        writer = VaultWriter(db, quiet_ms=50, idle_exit_seconds=0.2)
+        writer.mark_dirty(["Sarah"])
+
+        assert _wait_for(lambda: _note(vault_dir, "Sarah").exists())
+        assert len(exports) == 1
+        assert _wait_for(lambda: writer.stats()["running"] == 0)
+
+    def test_marks_wait_for_commit(self, db, vault_dir, exports):
+        _entity(db, "Sarah")
+        writer = VaultWriter(db, quiet_ms=60_000)
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                writer.mark_dirty(["Sarah"])
+                raise RuntimeError("rolled back")
+        assert writer.pending() == 0
+
+        with db.transaction():
+            writer.mark_dirty(["Sarah"])
+            assert writer.pending() == 0
+        assert writer.pending() == 1
+        writer.stop()
+        assert len(exports) == 1
+
+    def test_inline_mode_renders_on_commit(self, db, vault_dir, exports):
+        _entity(db, "Sarah")
+        writer = VaultWriter(db, quiet_ms=0)
+        writer.mark_dirty(["Sarah", "Nobody"])
+
+        assert len(exports) == 1
+        assert writer.stats()["running"] == 0
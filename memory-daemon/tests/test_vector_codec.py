@@ -0,0 +1,89 @@
+"""Tests for the packed float32 vector codec used for vec0 reads and writes."""
+
+import json
+import sqlite3
+import struct
+from array import array
+
+import pytest
+
+from claudia_memory.database import load_sqlite_vec
+from claudia_memory.embeddings import EmbeddingCache
+from claudia_memory.vector_codec import decode, dimensions, encode, normalize, to_array
+
+
+def _vec0_available() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        ok = load_sqlite_vec(conn)
+        conn.close()
+        return ok
+    except Exception:
+        return False
+
+
+requires_vec0 = pytest.mark.skipif(
+    not _vec0_available(), reason="sqlite-vec (vec0) not available in this environment"
+)
+
+
+class TestCodec:
+    def test_encode_is_little_endian_float32(self):
+        vec = [1.0, -2.5, 0.125]
+        assert bytes(encode(vec)) == struct.pack("<3f", *vec)
+
+    def test_round_trip_from_every_input_form(self):
+        vec = [0.5, 0.25, -1.0, 2.0]
+        packed = struct.pack("<4f", *vec)
+        for form in (vec, tuple(vec), array("f", vec), array("d", vec), packed,
+                     bytearray(packed), memoryview(packed), json.dumps(vec)):
+            assert list(decode(form)) == vec, type(form)
+
+    def test_float32_array_passes_through_without_copy(self):
+        arr = array("f", [1.0, 2.0])
+        assert to_array(arr) is arr
+        view = encode(arr)
+        assert isinstance(view, memoryview)
+        assert view.obj is arr
+
+    def test_rejects_truncated_blob(self):
+        with pytest.raises(ValueError):
+            decode(b"\x00\x00\x80")
+
+    def test_dimensions(self):
+        assert dimensions(struct.pack("<384f", *([0.0] * 384))) == 384
+
+    def test_normalize_scales_to_unit_length(self):
+        unit = normalize([3.0, 4.0, 0.0])
+        assert isinstance(unit, array) and unit.typecode == "f"
+        assert list(unit) == pytest.approx([0.6, 0.8, 0.0])
+        assert list(normalize(unit)) == pytest.approx([0.6, 0.8, 0.0])
+        assert list(normalize([0.0, 0.0])) == [0.0, 0.0]
+
+    def test_cache_stores_compact_arrays(self):
+        cache = EmbeddingCache(maxsize=4)
+        cache.put("hello", [0.1, 0.2, 0.3])
+        cached = cache.get("hello")
+        assert isinstance(cached, array) and cached.typecode == "f"
+        assert list(cached) == pytest.approx([0.1, 0.2, 0.3])
+
+
+@requires_vec0
+class TestVec0Interop:
+    def test_blob_and_json_rows_are_interchangeable(self):
+        conn = sqlite3.connect(":memory:")
+        load_sqlite_vec(conn)
+        conn.execute("CREATE VIRTUAL TABLE emb USING vec0(id INTEGER PRIMARY KEY, embedding FLOAT[3])")
+        # Legacy JSON row and new packed row side by side
+        conn.execute("INSERT INTO emb (id, embedding) VALUES (1, ?)", (json.dumps([1.0, 0.0, 0.0]),))
+        conn.execute("INSERT INTO emb (id, embedding) VALUES (2, ?)", (encode([0.0, 1.0, 0.0]),))
+
+        rows = conn.execute(
+            "SELECT id, distance FROM emb WHERE embedding MATCH ? AND k = 1",
+            (encode(array("f", [0.0, 0.9, 0.1])),),
+        ).fetchall()
+        assert rows[0][0] == 2
+
+        stored = conn.execute("SELECT embedding FROM emb WHERE id = 1").fetchone()[0]
+        assert list(decode(stored)) == [1.0, 0.0, 0.0]
+        conn.close()
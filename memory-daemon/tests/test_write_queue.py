@@ -0,0 +1,191 @@
+"""Tests for the single-writer queue with group commit."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from claudia_memory.extraction.entity_extractor import get_extractor
+from claudia_memory.services.remember import RememberService
+from claudia_memory.services.write_queue import WriteQueue
+
+
+@pytest.fixture
+def writer(db):
+    queue = WriteQueue(db, group_window_ms=20, group_max_ops=50)
+    yield queue
+    queue.stop()
+
+
+def _meta(db, key):
+    rows = db.execute("SELECT value FROM _meta WHERE key = ?", (key,), fetch=True)
+    return rows[0]["value"] if rows else None
+
+
+def _put(db, key):
+    return db.insert("_meta", {"key": key, "value": "v"})
+
+
+class TestWriteQueue:
+    def test_groups_many_intents_into_few_commits(self, db, writer):
+        futures = [writer.submit(lambda i=i: _put(db, f"k{i}")) for i in range(120)]
+        ids = [f.result(timeout=10) for f in futures]
+
+        assert len(set(ids)) == 120
+        assert writer.stats()["committed"] == 120
+        assert writer.stats()["groups"] < 120
+        assert writer.stats()["largest_group"] <= 50
+
+    def test_result_is_committed_when_future_resolves(self, db, writer):
+        writer.submit(lambda: _put(db, "durable")).result(timeout=10)
+
+        # A separate connection only sees committed rows
+        other = sqlite3.connect(str(db.db_path))
+        try:
+            assert other.execute("SELECT COUNT(*) FROM _meta WHERE key = 'durable'").fetchone()[0] == 1
+        finally:
+            other.close()
+
+    def test_failing_intent_rolls_back_alone(self, db, writer):
+        def bad():
+            _put(db, "half_written")
+            raise ValueError("boom")
+
+        gate = threading.Event()
+        first = writer.submit(lambda: gate.wait(5) and _put(db, "before"))
+        failed = writer.submit(bad)
+        after = writer.submit(lambda: _put(db, "after"))
+        gate.set()
+
+        first.result(timeout=10)
+        after.result(timeout=10)
+        with pytest.raises(ValueError):
+            failed.result(timeout=10)
+        assert _meta(db, "before") and _meta(db, "after")
+        assert _meta(db, "half_written") is None
+
+    def test_after_commit_sees_committed_row(self, db, writer):
+        seen = []
+        done = threading.Event()
+
+        def hook(row_id):
+            other = sqlite3.connect(str(db.db_path))
+            try:
+                seen.append(other.execute("SELECT key FROM _meta WHERE rowid = ?", (row_id,)).fetchone())
+            finally:
+                other.close()
+                done.set()
+
+        writer.submit(lambda: _put(db, "hooked"), after_commit=hook)
+
+        assert done.wait(10)
+        assert seen == [("hooked",)]
+
+    def test_submit_inside_open_transaction_runs_inline(self, db, writer):
+        hooked = []
+        with db.transaction():
+            future = writer.submit(lambda: _put(db, "inline"), after_commit=hooked.append)
+            # Resolves with the enclosing transaction, not the savepoint
+            assert not future.done()
+            assert hooked == []
+        assert future.result(timeout=0)
+        assert hooked == [future.result()]
+        assert _meta(db, "inline") == "v"
+        assert writer.stats()["running"] == 0
+
+    def test_inline_future_fails_when_enclosing_transaction_rolls_back(self, db, writer):
+        hooked = []
+        with pytest.raises(ValueError):
+            with db.transaction():
+                future = writer.submit(lambda: _put(db, "doomed"), after_commit=hooked.append)
+                raise ValueError("caller fails after the intent ran")
+        with pytest.raises(RuntimeError):
+            future.result(timeout=0)
+        assert hooked == []
+        assert _meta(db, "doomed") is None
+
+    def test_hooks_from_rolled_back_savepoint_are_dropped(self, db):
+        ran = []
+        with db.transaction():
+            with pytest.raises(ValueError):
+                with db.transaction():
+                    db.after_commit(lambda: ran.append("inner"), on_rollback=lambda: ran.append("undone"))
+                    raise ValueError
+            db.after_commit(lambda: ran.append("outer"))
+        assert ran == ["undone", "outer"]
+
+
+class TestRememberFacts:
+    def test_bulk_facts_share_commits(self, db, monkeypatch):
+        from claudia_memory.services import remember as remember_mod
+
+        writer = WriteQueue(db, group_window_ms=20, group_max_ops=100)
+        monkeypatch.setattr(remember_mod, "get_write_queue", lambda _db: writer)
+        monkeypatch.setattr(remember_mod, "embed_sync", lambda text: None)
+        monkeypatch.setattr(
+            remember_mod, "get_embedding_service",
+            lambda: type("Stub", (), {"embed_batch_sync": lambda self, texts: [None] * len(texts)})(),
+        )
+        monkeypatch.setattr(RememberService, "_vault_write_through", lambda self, names: None)
+        svc = RememberService.__new__(RememberService)
+        svc.db = db
+        svc.extractor = get_extractor()
+
+        facts = [{"content": f"Fact number {i}", "about_entities": ["Sarah Chen"]} for i in range(200)]
+        facts.append({"content": "Fact number 0"})  # duplicate resolves to the first id
+        try:
+            ids = svc.remember_facts(facts)
+        finally:
+            writer.stop()
+
+        assert all(ids)
+        assert ids[-1] == ids[0]
+        assert writer.stats()["groups"] < len(facts)
+        linked = db.execute("SELECT COUNT(*) AS n FROM memory_entities", fetch=True)[0]["n"]
+        assert linked == 200
+
+    def test_failed_batch_embeds_are_never_retried_on_the_writer(self, db, monkeypatch):
+        from claudia_memory.services import remember as remember_mod
+
+        writer = WriteQueue(db, group_window_ms=20, group_max_ops=100)
+        embed_threads = []
+
+        def embed_sync(text):
+            embed_threads.append(threading.current_thread())
+            return None  # Ollama still down
+
+        monkeypatch.setattr(remember_mod, "get_write_queue", lambda _db: writer)
+        monkeypatch.setattr(remember_mod, "embed_sync", embed_sync)
+        monkeypatch.setattr(
+            remember_mod, "get_embedding_service",
+            lambda: type("Stub", (), {"embed_batch_sync": lambda self, texts: [[1.0, 0.0], None]})(),
+        )
+        svc = RememberService.__new__(RememberService)
+        svc.db = db
+        svc.extractor = get_extractor()
+
+        try:
+            ids = svc.remember_facts([{"content": "Embedded fact"}, {"content": "Unembedded fact"}])
+        finally:
+            writer.stop()
+
+        assert all(ids)
+        # The missing vector was retried once on the caller's thread, not the writer
+        assert embed_threads == [threading.current_thread()]
+
+    def test_bulk_facts_inside_transaction_store_directly(self, db, monkeypatch):
+        from claudia_memory.services import remember as remember_mod
+
+        monkeypatch.setattr(
+            remember_mod, "get_embedding_service",
+            lambda: type("Stub", (), {"embed_batch_sync": lambda self, texts: [None] * len(texts)})(),
+        )
+        monkeypatch.setattr(RememberService, "_vault_write_through", lambda self, names: None)
+        monkeypatch.setattr(remember_mod, "get_write_queue", lambda _db: pytest.fail("queued"))
+        svc = RememberService.__new__(RememberService)
+        svc.db = db
+        svc.extractor = get_extractor()
+
+        with db.transaction():
+            ids = svc.remember_facts([{"content": "First direct fact"}, {"content": "Second direct fact"}])
+        assert all(ids) and ids[0] != ids[1]